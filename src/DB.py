@@ -1,72 +1,239 @@
 from typing import Optional
 from typing import List
-from classes import Tarefa, Tipo, Status
+from typing import Callable
+from typing import Dict
+from classes import Tarefa, Tipo, Status, Lembrete
+from indices import IndiceTarefas
+from estatisticas import EstatisticasTarefas
+from busca import IndiceBusca
+from colunar import ArmazemColunar, colunas_de_tarefas
+from carregador import (
+    ArquivoVerificado,
+    RelatorioCarga,
+    TarefasPreguicosas,
+    formatar_journal,
+    indexar_offsets,
+    ler_journal,
+    ler_linhas,
+    verificar_arquivo,
+)
+from concorrencia import TravaLeituraEscrita
+from collections.abc import Iterable
 import csv
+import metricas
 from datetime import datetime
 import os
+import threading
+
+
+CAMPOS_CSV = [
+    "id",
+    "titulo",
+    "descricao",
+    "data_entrega",
+    "tipo",
+    "status",
+    "nota",
+    "id_disciplina",
+    "lembretes",
+]
+
+
+DISCIPLINAS = {  # Exemplo de disciplinas existentes (mock)
+    1: "Matemática",
+    2: "Português",
+    3: "História",
+    4: "Geografia",
+    5: "Ciências",
+    6: "Biologia",
+    7: "Física",
+    8: "Química",
+    9: "Inglês",
+    10: "Espanhol",
+    11: "Artes",
+    12: "Educação Física",
+    13: "Literatura",
+    14: "Redação",
+    15: "Gramática",
+    16: "Sociologia",
+    17: "Filosofia",
+    18: "Tecnologia da Informação",
+    19: "Programação",
+    20: "Robótica",
+    21: "Educação Financeira",
+    22: "Empreendedorismo",
+    23: "Música",
+    24: "Teatro",
+    25: "Desenho Geométrico",
+    26: "Estatística",
+    27: "Geometria",
+    28: "Algebra",
+    29: "Cálculo",
+    30: "Astronomia",
+    31: "Ecologia",
+    32: "Psicologia",
+    33: "Direito",
+    34: "Metodologia Científica",
+    35: "Informática",
+    36: "Lógica",
+    37: "Educação Ambiental",
+    38: "Educação Digital",
+    39: "Projetos Interdisciplinares",
+    40: "Oficina de Texto",
+    41: "Comunicação",
+    42: "Geopolítica",
+    43: "Atualidades",
+    44: "Arqueologia",
+    45: "Antropologia",
+    46: "Administração",
+    47: "Marketing",
+    48: "Economia",
+    49: "Contabilidade",
+    50: "Desenvolvimento Web",
+}
+
+
+def _fsync_diretorio(caminho: str) -> None:
+    """fsync do diretório, para o rename sobreviver a uma queda (onde houver suporte)."""
+    try:
+        fd = os.open(caminho, os.O_RDONLY)
+    except OSError:
+        return  # ex.: Windows não abre diretórios
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
 
 
 class BancoDeDados:
-    """Banco de dados em memória com persistência CSV simples."""
+    """Banco de dados em memória com persistência CSV simples.
+
+    Em modo journal, cada mutação apenas acrescenta um registro ao arquivo
+    ``<CSV_FILENAME>.journal``; o snapshot CSV só é reescrito na compactação.
+
+    Pode ser compartilhado entre threads: consultas rodam em paralelo sob a
+    trava de leitura, mutações em memória são exclusivas e a gravação em
+    disco acontece fora dessa trava, uma thread por vez, juntando num só
+    append as mutações que se acumularam enquanto outra gravava.
+
+    Em modo grupo (group commit), as mutações só marcam o banco como sujo e
+    retornam; uma thread de fundo grava tudo de uma vez a cada
+    INTERVALO_GRUPO segundos, ou o próprio chamador grava quando há
+    LIMITE_SUJOS mutações pendentes. Essa é a janela máxima de perda numa
+    queda; flush(duravel=True) e fechar() gravam na hora.
+    """
 
     CSV_FILENAME = os.path.join(os.path.dirname(__file__), "tarefas.csv")
+    MODO_JOURNAL = True
+    # Compacta quando o journal passa de max(LIMITE_COMPACTACAO, metade das tarefas)
+    LIMITE_COMPACTACAO = 1000
+    # Modo preguiçoso: indexa offsets do snapshot e materializa sob demanda
+    MODO_PREGUICOSO = False
+    # Modo colunar: tarefas em arrays paralelos (ArmazemColunar); o banco inteiro,
+    # com índices, fica em ~2/3 da memória do modo objetos (benchmark.py memoria)
+    MODO_COLUNAR = False
+    # Snapshots anteriores mantidos como <CSV_FILENAME>.1 .. .N (hard links, sem cópia)
+    BACKUPS = 3
+    # Modo grupo: gravação adiada e agrupada (janela de perda: intervalo ou quantidade)
+    MODO_GRUPO = False
+    INTERVALO_GRUPO = 0.2  # segundos
+    LIMITE_SUJOS = 1000  # linhas pendentes
+    # Carga adiada: o CSV é lido numa thread; o construtor não bloqueia (início rápido)
+    CARGA_ADIADA = False
+
+    def __init__(
+        self,
+        preguicoso: Optional[bool] = None,
+        colunar: Optional[bool] = None,
+        grupo: Optional[bool] = None,
+        adiada: Optional[bool] = None,
+        caminho: Optional[str] = None,
+        estado: Optional[dict] = None,
+    ):
+        """Inicializa o repositório e carrega dados do CSV, se houver.
+
+        Com carga adiada, a leitura roda numa thread e o construtor retorna
+        na hora; cada operação espera a carga terminar antes de acessar os dados.
+        ``caminho`` troca o snapshot desta instância (padrão: CSV_FILENAME);
+        ``estado`` adota uma carga feita em outro processo (ver estado_carga).
+        """
+        if caminho is not None:
+            self.CSV_FILENAME = caminho  # journal, .meta e backups acompanham
+        self.preguicoso = self.MODO_PREGUICOSO if preguicoso is None else preguicoso
+        self.colunar = self.MODO_COLUNAR if colunar is None else colunar
+        self.grupo = self.MODO_GRUPO if grupo is None else grupo
+        self.carga_adiada = self.CARGA_ADIADA if adiada is None else adiada
+        self.tarefas = ArmazemColunar() if self.colunar else {}
+        self.indices = IndiceTarefas()
+        self.estatisticas = EstatisticasTarefas()
+        self._indices_prontos = False
+        # Índice de texto: construído na primeira busca, depois mantido a cada escrita
+        self.busca = IndiceBusca()
+        self._busca_pronta = False
+        self.relatorio_carga = RelatorioCarga()
+        self.disciplinas_existentes = DISCIPLINAS
+        self._registros_journal = 0
+        self._proximo_id = 1  # high-water mark: nunca decresce
+        # Verificação (bytes, crc32) de cada snapshot: [0] = CSV atual, [k] = backup .k
+        self._snapshots: list = []
+        # Ordem das travas: disco -> tarefas/índices -> .meta -> pendentes/IDs
+        self._trava = TravaLeituraEscrita()  # tarefas e índices em memória
+        self._trava_ids = threading.Lock()  # high-water mark
+        self._trava_meta = threading.Lock()  # arquivo .meta: um gravador por vez
+        self._trava_disco = threading.Lock()  # journal e snapshot: um gravador por vez
+        self._trava_pendentes = threading.Lock()
+        self._pendentes: list = []  # linhas ainda não gravadas no journal
+        self._seq_enfileirado = 0  # mutações enfileiradas em _pendentes
+        self._seq_gravado = 0  # mutações já em disco
+        # Thread de gravação do modo grupo (iniciada na primeira mutação)
+        self._condicao_grupo = threading.Condition()
+        self._gravador: Optional[threading.Thread] = None
+        self._sujo = False
+        self._fechado = False
+        self._carregado = threading.Event()
+        self._pronto = False  # cópia de _carregado sem custo de chamada
+        self._erro_carga: Optional[BaseException] = None
+        if estado is not None:
+            self._adotar_estado(estado)
+            self._marcar_carregado()
+        elif self.carga_adiada:
+            threading.Thread(
+                target=self._carregar_em_fundo, name="carga-tarefas", daemon=True
+            ).start()
+        else:
+            self._carregar_csv()  # garante que os dados persistidos sejam carregados
+            self._marcar_carregado()
+
+    def aguardar_carga(self, timeout: Optional[float] = None) -> bool:
+        """Espera a carga adiada terminar; False se o timeout expirar antes."""
+        return self._carregado.wait(timeout)
+
+    def _carregar_em_fundo(self) -> None:
+        try:
+            self._carregar_csv()
+        except BaseException as e:
+            # Sem os dados, gravar sobrescreveria o snapshot: as operações passam a falhar
+            self._erro_carga = e
+            print(f"AVISO: Falha ao carregar tarefas em segundo plano. Erro: {e}")
+        self._marcar_carregado()
+
+    def _marcar_carregado(self) -> None:
+        self._pronto = True
+        self._carregado.set()
+
+    def _aguardar_carga(self) -> None:
+        if self._pronto and self._erro_carga is None:
+            return
+        self._carregado.wait()
+        if self._erro_carga is not None:
+            raise RuntimeError("Tarefas indisponíveis: a carga falhou") from self._erro_carga
 
-    def __init__(self):
-        """Inicializa o repositório e carrega dados do CSV, se houver."""
-        self.tarefas = {}
-        self.disciplinas_existentes = {  # Exemplo de disciplinas existentes
-            1: "Matemática",
-            2: "Português",
-            3: "História",
-            4: "Geografia",
-            5: "Ciências",
-            6: "Biologia",
-            7: "Física",
-            8: "Química",
-            9: "Inglês",
-            10: "Espanhol",
-            11: "Artes",
-            12: "Educação Física",
-            13: "Literatura",
-            14: "Redação",
-            15: "Gramática",
-            16: "Sociologia",
-            17: "Filosofia",
-            18: "Tecnologia da Informação",
-            19: "Programação",
-            20: "Robótica",
-            21: "Educação Financeira",
-            22: "Empreendedorismo",
-            23: "Música",
-            24: "Teatro",
-            25: "Desenho Geométrico",
-            26: "Estatística",
-            27: "Geometria",
-            28: "Algebra",
-            29: "Cálculo",
-            30: "Astronomia",
-            31: "Ecologia",
-            32: "Psicologia",
-            33: "Direito",
-            34: "Metodologia Científica",
-            35: "Informática",
-            36: "Lógica",
-            37: "Educação Ambiental",
-            38: "Educação Digital",
-            39: "Projetos Interdisciplinares",
-            40: "Oficina de Texto",
-            41: "Comunicação",
-            42: "Geopolítica",
-            43: "Atualidades",
-            44: "Arqueologia",
-            45: "Antropologia",
-            46: "Administração",
-            47: "Marketing",
-            48: "Economia",
-            49: "Contabilidade",
-            50: "Desenvolvimento Web",
-        }  # Mock de disciplinas
-        self._carregar_csv()  # garante que os dados persistidos sejam carregados
+    @property
+    def versao(self) -> int:
+        """Contador de mutações: muda a cada salvar/atualizar (chave de caches de leitura)."""
+        return self._seq_enfileirado
 
     # Simula 'Verificar existência da disciplina' em criar_tarefa.puml
     def existe_disciplina(self, id_disciplina: int) -> bool:
@@ -74,141 +241,882 @@ class BancoDeDados:
         return id_disciplina in self.disciplinas_existentes
 
     # Simula 'Criar Tarefa' em criar_tarefa.puml
+    @metricas.cronometrar("db")
     def salvar_tarefa(self, tarefa: Tarefa) -> bool:
-        """Persiste/atualiza uma tarefa em memória e no CSV."""
+        """Persiste/atualiza uma tarefa em memória e no armazenamento (journal ou CSV)."""
+        self._aguardar_carga()
         # Simulação de erro de banco (Constraint/Conexão)'
         if tarefa.titulo == "ErroDB":
             raise Exception("Erro de Conexão com Banco de Dados")
         if isinstance(tarefa.tipo, str):
-            tarefa.tipo = self._tipo_from_value(tarefa.tipo)
+            tarefa.tipo = Tipo.de_texto(tarefa.tipo, Tipo.ATIVIDADE)
         if isinstance(getattr(tarefa, "status", None), str):
-            tarefa.status = self._status_from_value(tarefa.status)
+            tarefa.status = Status.de_texto(tarefa.status, Status.EM_ANDAMENTO)
 
+        with self._trava.escrita():
+            self._inserir(tarefa)
+            seq = self._enfileirar([tarefa])
+        self._persistir(seq)
+        return True
+
+    @metricas.cronometrar("db")
+    def salvar_tarefas(self, tarefas: List[Tarefa]) -> bool:
+        """Insere um lote de tarefas (IDs já reservados) com uma única gravação."""
+        self._aguardar_carga()
+        # Simulação de erro de banco: o lote inteiro falha antes de qualquer mutação
+        if any(tarefa.titulo == "ErroDB" for tarefa in tarefas):
+            raise Exception("Erro de Conexão com Banco de Dados")
+        with self._trava.escrita():
+            for tarefa in tarefas:
+                self._inserir(tarefa)
+            seq = self._enfileirar(tarefas)
+        self._persistir(seq)
+        return True
+
+    def _inserir(self, tarefa: Tarefa) -> None:
+        """Coloca a tarefa no mapa e nos índices (com a trava de escrita)."""
         # IDs devem ser únicos: rejeita se o ID já existe e está sendo reutilizado indevidamente
         # Race Condition. Se o ID já existir (ex: clique duplo), calcula-se o próximo para evitar erro 500.
-        if tarefa.id in self.tarefas and self.tarefas[tarefa.id] is not tarefa:
+        # Sem ID (0): alocado aqui, junto com a inserção.
+        if not tarefa.id or (
+            tarefa.id in self.tarefas and self.tarefas[tarefa.id] is not tarefa
+        ):
             tarefa.id = self.proximo_id()
-
+        else:
+            # ID atribuído fora do alocador: avança a marca para não reutilizá-lo
+            with self._trava_ids:
+                self._proximo_id = max(self._proximo_id, tarefa.id + 1)
         self.tarefas[tarefa.id] = tarefa
-        self._salvar_csv()
-        return True
+        self._indexar(tarefa)
 
     def buscar_tarefa(self, id_tarefa: int) -> Optional[Tarefa]:
         """Retorna a tarefa pelo ID ou None se não existir."""
-        return self.tarefas.get(id_tarefa)
+        self._aguardar_carga()
+        with self._trava.leitura():
+            return self.tarefas.get(id_tarefa)
+
+    def buscar_tarefas(self, ids: Iterable[int]) -> dict:
+        """Retorna {id: tarefa} dos IDs existentes (os ausentes ficam de fora)."""
+        self._aguardar_carga()
+        with self._trava.leitura():
+            return {
+                id_tarefa: self.tarefas[id_tarefa]
+                for id_tarefa in ids
+                if id_tarefa in self.tarefas
+            }
 
     # Simula 'Atualizar Status' e 'Desagendar Lembrete' em concluir_tarefa.puml
+    @metricas.cronometrar("db")
     def atualizar_tarefa(self, tarefa: Tarefa) -> bool:
-        """Atualiza uma tarefa existente e salva no CSV."""
-        if tarefa.id not in self.tarefas:
-            return False
-        self.tarefas[tarefa.id] = tarefa
-        self._salvar_csv()
+        """Atualiza uma tarefa existente e persiste a alteração."""
+        self._aguardar_carga()
+        with self._trava.escrita():
+            if tarefa.id not in self.tarefas:
+                return False
+            self.tarefas[tarefa.id] = tarefa
+            self._indexar(tarefa)
+            seq = self._enfileirar([tarefa])
+        self._persistir(seq)
         return True
 
+    @metricas.cronometrar("db")
+    def atualizar_tarefas(self, tarefas: List[Tarefa]) -> int:
+        """Atualiza várias tarefas existentes com uma única gravação; retorna quantas."""
+        self._aguardar_carga()
+        with self._trava.escrita():
+            existentes = [tarefa for tarefa in tarefas if tarefa.id in self.tarefas]
+            if not existentes:
+                return 0
+            for tarefa in existentes:
+                self.tarefas[tarefa.id] = tarefa
+                self._indexar(tarefa)
+            seq = self._enfileirar(existentes)
+        self._persistir(seq)
+        return len(existentes)
+
+    @metricas.cronometrar("db")
+    def alterar_tarefas(
+        self, ids: List[int], alterar: Callable[[Tarefa], bool]
+    ) -> Dict[int, Tarefa]:
+        """Lê, altera e grava tarefas de forma atômica (uma única gravação).
+
+        ``alterar`` recebe uma cópia de cada tarefa existente, dentro da trava
+        de escrita, e retorna se a alterou; só as cópias alteradas substituem
+        as guardadas. Não deve chamar o banco. Retorna a versão atual de cada
+        tarefa encontrada, por ID.
+        """
+        self._aguardar_carga()
+        encontradas, alteradas = {}, []
+        with self._trava.escrita():
+            for id_tarefa in ids:
+                atual = self.tarefas.get(id_tarefa)
+                if atual is None or id_tarefa in encontradas:
+                    continue
+                copia = atual.copiar()
+                if alterar(copia):
+                    self.tarefas[id_tarefa] = copia
+                    self._indexar(copia)
+                    alteradas.append(copia)
+                    atual = copia
+                encontradas[id_tarefa] = atual
+            if not alteradas:
+                return encontradas
+            seq = self._enfileirar(alteradas)
+        self._persistir(seq)
+        return encontradas
+
     def id_existe(self, id_tarefa: int) -> bool:
         """Verifica se um ID de tarefa já existe."""
-        return id_tarefa in self.tarefas
+        self._aguardar_carga()
+        with self._trava.leitura():
+            return id_tarefa in self.tarefas
 
     def proximo_id(self) -> int:
-        """Calcula o próximo ID com base no maior ID atual."""
-        # calcula próximo ID com base no maior ID carregado do CSV
-        return (max(self.tarefas.keys()) + 1) if self.tarefas else 1
+        """Reserva e retorna o próximo ID (contador monotônico, O(1), atômico)."""
+        self._aguardar_carga()
+        with self._trava_ids:
+            id_tarefa = self._proximo_id
+            self._proximo_id += 1
+        return id_tarefa
+
+    def reservar_ids(self, quantidade: int) -> range:
+        """Reserva um bloco contíguo de IDs para inserções em lote."""
+        self._aguardar_carga()
+        if quantidade <= 0:
+            return range(0)
+        with self._trava_ids:
+            inicio = self._proximo_id
+            self._proximo_id += quantidade
+        # Persiste a marca já: IDs reservados não voltam a ser entregues após reinício
+        try:
+            self._salvar_meta()
+        except Exception as e:
+            print(f"AVISO: Falha ao salvar metadados de IDs. Erro: {e}")
+        return range(inicio, inicio + quantidade)
 
     # CSV persistence helpers
+    @property
+    def _caminho_journal(self) -> str:
+        """Journal de mutações, ao lado do snapshot CSV."""
+        return self.CSV_FILENAME + ".journal"
+
+    @property
+    def _caminho_meta(self) -> str:
+        """Metadados do snapshot (high-water mark de IDs e verificações)."""
+        return self.CSV_FILENAME + ".meta"
+
+    def _caminho_backup(self, geracao: int) -> str:
+        return f"{self.CSV_FILENAME}.{geracao}"
+
+    @metricas.cronometrar("db")
     def _carregar_csv(self) -> None:
-        """Carrega tarefas do CSV, ignorando linhas inválidas."""
-        if not os.path.exists(self.CSV_FILENAME):
+        """Carrega o snapshot em streaming e reaplica o journal.
+
+        O snapshot é conferido com o tamanho e CRC32 gravados no .meta; se
+        estiver truncado ou corrompido, carrega o backup íntegro mais recente.
+        Linhas inválidas não interrompem a carga: são contadas em
+        ``relatorio_carga`` e resumidas num aviso. No modo preguiçoso só os
+        offsets são indexados; as tarefas são lidas em buscar_tarefa.
+        """
+        self._proximo_id = max(self._proximo_id, self._carregar_meta())
+        self.relatorio_carga = RelatorioCarga()
+        caminho = self._escolher_snapshot()
+        if caminho is not None:
+            try:
+                if self.preguicoso:
+                    cabecalho, offsets = indexar_offsets(caminho, self.relatorio_carga)
+                    self.tarefas = TarefasPreguicosas(
+                        caminho,
+                        cabecalho,
+                        offsets,
+                        self._converter_linha,
+                        self.relatorio_carga,
+                    )
+                else:
+                    self._carregar_registros(caminho)
+            except Exception as e:
+                # Falha ao carregar CSV, não bloqueia a aplicação
+                print(f"AVISO: Falha ao carregar {caminho}. Erro: {e}")
+        descartar_journal = self._reaplicar_journal()
+        # única varredura das chaves: semeia o contador com o maior ID conhecido
+        if self.tarefas:
+            self._proximo_id = max(self._proximo_id, max(self.tarefas) + 1)
+        if not self.preguicoso:
+            self._garantir_indices()
+        if self.relatorio_carga.rejeitadas:
+            print(
+                f"AVISO: {self.relatorio_carga.rejeitadas} linha(s) inválida(s) ignorada(s)"
+                f" ao carregar tarefas (ver relatorio_carga)."
+            )
+        if self.relatorio_carga.erros:
+            print(
+                f"ERRO: {self.relatorio_carga.erros} registro(s) corrompido(s) no meio do"
+                f" journal; as mutações correspondentes podem ter se perdido"
+                f" (ver relatorio_carga.detalhes_erros e {self._caminho_journal}.corrompido)."
+            )
+        if descartar_journal:
+            self._descartar_journal_corrompido()
+
+    def estado_carga(self) -> dict:
+        """Tarefas, índices e marcas de arquivo já carregados, em forma serializável (pickle).
+
+        Permite carregar num processo de trabalho e adotar o resultado com
+        BancoDeDados(caminho=..., estado=...) no processo principal.
+        """
+        self._aguardar_carga()
+        if isinstance(self.tarefas, TarefasPreguicosas):
+            raise ValueError("Modo preguiçoso: as tarefas dependem do arquivo aberto")
+        with self._trava.leitura():
+            return {
+                "tarefas": self.tarefas,
+                "indices": self.indices if self._indices_prontos else None,
+                "estatisticas": self.estatisticas if self._indices_prontos else None,
+                "proximo_id": self._proximo_id,
+                "snapshots": self._snapshots,
+                "registros_journal": self._registros_journal,
+                "relatorio_carga": self.relatorio_carga,
+            }
+
+    def _adotar_estado(self, estado: dict) -> None:
+        self.tarefas = estado["tarefas"]
+        # O modo segue o estado adotado (a carga das partições vem em colunas)
+        self.colunar = isinstance(self.tarefas, ArmazemColunar)
+        self._proximo_id = estado["proximo_id"]
+        self._snapshots = estado["snapshots"]
+        self._registros_journal = estado["registros_journal"]
+        self.relatorio_carga = estado["relatorio_carga"]
+        if estado["indices"] is not None:
+            self.indices = estado["indices"]
+            self.estatisticas = estado["estatisticas"]
+            self._indices_prontos = True
+        elif not self.preguicoso:
+            self._garantir_indices()
+
+    def _carregar_registros(self, caminho: str, cabecalho: Optional[list] = None) -> int:
+        """Converte e aplica os registros do arquivo; retorna quantos foram lidos."""
+        datas = {}  # prazos repetidos são convertidos (e guardados) uma vez só
+        lidos = 0
+        for numero, row in ler_linhas(caminho, cabecalho):
+            lidos += 1
+            try:
+                tarefa = self._converter_linha(row, datas)
+            except ValueError as e:
+                self.relatorio_carga.rejeitar(caminho, numero, str(e))
+                continue
+            self.tarefas[tarefa.id] = tarefa
+        return lidos
+
+    def _garantir_indices(self) -> None:
+        """Constrói índices e estatísticas (adiado no modo preguiçoso até a 1ª consulta)."""
+        if self._indices_prontos:
+            return
+        with self._trava.escrita():
+            if not self._indices_prontos:
+                # Uma passada só; no modo colunar os arrays do armazém são lidos direto
+                if isinstance(self.tarefas, ArmazemColunar):
+                    colunas = self.tarefas.colunas()
+                else:
+                    colunas = colunas_de_tarefas(self.tarefas.values())
+                self.indices.reconstruir_colunas(colunas)
+                self.estatisticas.reconstruir_colunas(colunas)
+                self._indices_prontos = True
+
+    def _garantir_busca(self) -> None:
+        """Constrói o índice de texto na primeira busca (quem nunca busca não paga)."""
+        if self._busca_pronta:
             return
+        with self._trava.escrita():
+            if not self._busca_pronta:
+                self.busca.reconstruir(self.tarefas.values())
+                self._busca_pronta = True
+
+    def _indexar(self, tarefa: Tarefa) -> None:
+        if self._indices_prontos:
+            self.indices.atualizar(tarefa)
+            self.estatisticas.atualizar(tarefa)
+        if self._busca_pronta:
+            self.busca.atualizar(tarefa)
+
+    def _escolher_snapshot(self) -> Optional[str]:
+        """Caminho do snapshot íntegro mais recente; None se não houver snapshot.
+
+        O CSV também é aceito com a verificação da geração anterior: é o
+        caso de uma queda entre a gravação do .meta e o rename do snapshot.
+        """
+        if not os.path.exists(self.CSV_FILENAME):
+            return None
+        if not self._snapshots:
+            return self.CSV_FILENAME  # snapshot anterior às verificações
+        candidatos = [(self.CSV_FILENAME, self._snapshots[:2])]
+        for geracao in range(1, len(self._snapshots)):
+            candidatos.append(
+                (self._caminho_backup(geracao), self._snapshots[geracao : geracao + 1])
+            )
+        for caminho, esperadas in candidatos:
+            try:
+                if verificar_arquivo(caminho) in esperadas:
+                    break
+            except OSError:
+                continue
+        else:
+            print(
+                f"AVISO: {self.CSV_FILENAME} não confere com o checksum e não há"
+                f" backup íntegro. Carregando mesmo assim (dados podem estar incompletos)."
+            )
+            return self.CSV_FILENAME
+        if caminho != self.CSV_FILENAME:
+            print(
+                f"AVISO: {self.CSV_FILENAME} está truncado ou corrompido."
+                f" Carregando o backup {caminho}."
+            )
+        return caminho
+
+    def _carregar_meta(self) -> int:
+        """Lê o .meta (verificações dos snapshots); retorna o high-water mark, 1 se ausente."""
+        import json  # só na carga e no .meta: fora do caminho de importação
+
         try:
-            with open(self.CSV_FILENAME, mode="r", newline="", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    try:
-                        id_tarefa = int(row.get("id", "").strip())
-                        titulo = row.get("titulo", "").strip()
-                        if not id_tarefa or not titulo:
-                            continue
-                        descricao = row.get("descricao", "").strip()
-                        data_raw = row.get("data_entrega", "").strip()
-                        if not data_raw:
-                            continue
-                        data_entrega = datetime.fromisoformat(data_raw)
-                        tipo = self._tipo_from_value(row.get("tipo", "").strip())
-                        status = self._status_from_value(
-                            row.get("status", Status.EM_ANDAMENTO.value).strip()
-                        )
-                        nota_str = row.get("nota", "").strip()
-                        nota = float(nota_str) if nota_str not in ("", None) else None
-
-                        tarefa = Tarefa(
-                            id_tarefa=id_tarefa,
-                            titulo=titulo,
-                            descricao=descricao,
-                            data_entrega=data_entrega,
-                            tipo=tipo,
-                        )
-                        tarefa.status = status
-                        tarefa.nota = nota
-                        # lembretes não são persistidos neste CSV simples
-                        self.tarefas[id_tarefa] = tarefa
-                    except Exception:
-                        # Ignora linhas inválidas
-                        continue
+            with open(self._caminho_meta, mode="r", encoding="utf-8") as f:
+                meta = json.load(f)
         except Exception:
-            # Falha ao carregar CSV, não bloqueia a aplicação
-            pass
+            return 1
+        self._snapshots = list(meta.get("snapshots", []))
+        try:
+            return max(1, int(meta.get("proximo_id", 1)))
+        except (TypeError, ValueError):
+            return 1
 
-    def _salvar_csv(self) -> None:
-        """Grava todas as tarefas atuais no CSV, sobrescrevendo o arquivo."""
+    def _salvar_meta(self) -> None:
+        """Grava o .meta de forma atômica (temporário + fsync + rename)."""
+        import json
+
+        temporario = self._caminho_meta + ".tmp"
+        with self._trava_meta:
+            # Só a cópia da marca segura _trava_ids: alocações não esperam o disco.
+            # Copiada já com _trava_meta: a última gravação tem a marca mais nova.
+            with self._trava_ids:
+                meta = {"proximo_id": self._proximo_id, "snapshots": list(self._snapshots)}
+            with open(temporario, mode="w", encoding="utf-8") as f:
+                json.dump(meta, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporario, self._caminho_meta)
+
+    def _reaplicar_journal(self) -> bool:
+        """Reaplica os registros do journal sobre o snapshot (último registro vence).
+
+        Cada registro traz o CRC32 do próprio texto (ver formatar_journal).
+        Registros não íntegros no fim do arquivo são o append interrompido
+        por uma queda: o journal é cortado no fim do último registro íntegro,
+        antes de aceitar novas gravações. Registros inválidos antes disso são
+        corrupção e entram como erro no relatorio_carga. Retorna True se o
+        journal precisa ser descartado por uma compactação.
+        """
+        self._registros_journal = 0
+        caminho = self._caminho_journal
+        if not os.path.exists(caminho):
+            return False
+        datas = {}
+        fim_integro = 0
+        cauda: list = []  # (linha, motivo) depois do último registro íntegro
         try:
-            with open(self.CSV_FILENAME, mode="w", newline="", encoding="utf-8") as f:
-                fieldnames = [
-                    "id",
-                    "titulo",
-                    "descricao",
-                    "data_entrega",
-                    "tipo",
-                    "status",
-                    "nota",
-                ]
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-                for tarefa in sorted(self.tarefas.values(), key=lambda t: t.id):
-                    writer.writerow(
-                        {
-                            "id": tarefa.id,
-                            "titulo": tarefa.titulo,
-                            "descricao": tarefa.descricao,
-                            "data_entrega": tarefa.data_entrega.isoformat(),
-                            "tipo": tarefa.tipo.value,
-                            "status": tarefa.status.value,
-                            "nota": "" if tarefa.nota is None else tarefa.nota,
-                        }
-                    )
+            for numero, fim, valores, motivo in ler_journal(caminho, len(CAMPOS_CSV)):
+                if motivo is not None:
+                    cauda.append((numero, motivo))
+                    continue
+                for linha, motivo_cauda in cauda:
+                    self.relatorio_carga.registrar_erro(caminho, linha, motivo_cauda)
+                cauda = []
+                fim_integro = fim
+                try:
+                    tarefa = self._converter_linha(dict(zip(CAMPOS_CSV, valores)), datas)
+                except ValueError as e:
+                    self.relatorio_carga.registrar_erro(caminho, numero, str(e))
+                    continue
+                self.tarefas[tarefa.id] = tarefa
+                self._registros_journal += 1
         except Exception as e:
+            # Journal ilegível: mantém o que foi possível reaplicar, sem gravar por cima
+            print(f"AVISO: Falha ao reaplicar o journal. Erro: {e}")
+            return True
+        if cauda:
+            linha, motivo = cauda[0]
             print(
-                f"AVISO: Falha ao salvar CSV. Verifique se o arquivo está aberto. Erro: {e}"
+                f"AVISO: Registro incompleto no fim do journal descartado"
+                f" (linha {linha}: {motivo})."
+            )
+            for linha, motivo in cauda:
+                self.relatorio_carga.rejeitar(caminho, linha, motivo)
+            try:
+                with open(caminho, mode="r+b") as f:
+                    f.truncate(fim_integro)
+                    f.flush()
+                    os.fsync(f.fileno())
+            except OSError as e:
+                print(f"AVISO: Falha ao cortar o journal. Erro: {e}")
+                return True
+        return self.relatorio_carga.erros > 0
+
+    def _descartar_journal_corrompido(self) -> None:
+        """Preserva uma cópia do journal em .corrompido e o dobra no snapshot."""
+        import shutil
+
+        try:
+            if os.path.exists(self._caminho_journal):
+                shutil.copyfile(self._caminho_journal, self._caminho_journal + ".corrompido")
+            with self._trava_disco:
+                self._compactar()
+        except Exception as e:
+            print(f"AVISO: Falha ao compactar o journal corrompido. Erro: {e}")
+
+    @staticmethod
+    def tarefa_de_linha(row: dict) -> Optional[Tarefa]:
+        """Converte uma linha do CSV/journal em Tarefa; None se a linha for inválida."""
+        try:
+            return BancoDeDados._converter_linha(row)
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _converter_linha(row: dict, datas: Optional[dict] = None) -> Tarefa:
+        """Converte uma linha em Tarefa; levanta ValueError com o motivo da rejeição.
+
+        ``datas`` é um cache opcional texto ISO -> datetime usado durante a carga.
+        """
+        try:
+            id_tarefa = int(row.get("id") or "")
+        except ValueError:
+            raise ValueError("ID ausente ou não numérico") from None
+        titulo = (row.get("titulo") or "").strip()
+        if id_tarefa <= 0 or not titulo:
+            raise ValueError("ID ou título ausente")
+        data_raw = (row.get("data_entrega") or "").strip()
+        if not data_raw:
+            raise ValueError("data_entrega ausente")
+        data_entrega = datas.get(data_raw) if datas is not None else None
+        if data_entrega is None:
+            try:
+                data_entrega = datetime.fromisoformat(data_raw)
+            except ValueError:
+                raise ValueError(f"data_entrega inválida: {data_raw!r}") from None
+            if datas is not None:
+                datas[data_raw] = data_entrega
+        nota_str = (row.get("nota") or "").strip()
+        disciplina_str = (row.get("id_disciplina") or "").strip()
+        try:
+            nota = float(nota_str) if nota_str else None
+            id_disciplina = int(disciplina_str) if disciplina_str else None
+        except ValueError:
+            raise ValueError("nota ou id_disciplina não numérico") from None
+        try:
+            lembretes = BancoDeDados.lembretes_de_texto(row.get("lembretes") or "")
+        except ValueError:
+            raise ValueError("data de lembrete inválida") from None
+
+        tarefa = Tarefa(
+            id_tarefa=id_tarefa,
+            titulo=titulo,
+            descricao=(row.get("descricao") or "").strip(),
+            data_entrega=data_entrega,
+            tipo=Tipo.de_texto(row.get("tipo"), Tipo.ATIVIDADE),
+            id_disciplina=id_disciplina,
+        )
+        tarefa.status = Status.de_texto(row.get("status"), Status.EM_ANDAMENTO)
+        tarefa.nota = nota
+        if lembretes:
+            tarefa.lembretes = lembretes
+        return tarefa
+
+    @staticmethod
+    def linha_de_tarefa(tarefa: Tarefa) -> dict:
+        """Converte a Tarefa no dicionário gravado no CSV/journal."""
+        return {
+            "id": tarefa.id,
+            "titulo": tarefa.titulo,
+            "descricao": tarefa.descricao,
+            "data_entrega": tarefa.data_entrega.isoformat(),
+            "tipo": tarefa.tipo.value,
+            "status": tarefa.status.value,
+            "nota": "" if tarefa.nota is None else tarefa.nota,
+            "id_disciplina": (
+                "" if tarefa.id_disciplina is None else tarefa.id_disciplina
+            ),
+            "lembretes": BancoDeDados.texto_de_lembretes(tarefa.lembretes),
+        }
+
+    @staticmethod
+    def texto_de_lembretes(lembretes) -> str:
+        """Serializa lembretes como 'iso;iso;...'.
+
+        Prefixos: '!' não agendado; '?' cancelamento pendente (outbox).
+        """
+        return ";".join(
+            ("?" if lembrete.cancelamento_pendente else "" if lembrete.agendado else "!")
+            + lembrete.data.isoformat()
+            for lembrete in lembretes
+        )
+
+    @staticmethod
+    def lembretes_de_texto(texto: str) -> list:
+        """Inverso de texto_de_lembretes; levanta ValueError se uma data for inválida."""
+        lembretes = []
+        for item in texto.split(";"):
+            item = item.strip()
+            if not item:
+                continue
+            lembrete = Lembrete(datetime.fromisoformat(item.lstrip("!?")))
+            lembrete.agendado = not item.startswith("!")
+            lembrete.cancelamento_pendente = item.startswith("?")
+            lembretes.append(lembrete)
+        return lembretes
+
+    def _enfileirar(self, tarefas: List[Tarefa]) -> int:
+        """Serializa as tarefas para o buffer de gravação (com a trava de escrita).
+
+        Retorna o número de sequência da mutação, usado em _descarregar.
+        """
+        linhas = [self.linha_de_tarefa(tarefa) for tarefa in tarefas]
+        with self._trava_pendentes:
+            self._pendentes.extend(linhas)
+            self._seq_enfileirado += 1
+            return self._seq_enfileirado
+
+    def _persistir(self, seq: int) -> None:
+        """Grava a mutação ``seq`` agora ou, no modo grupo, agenda a gravação."""
+        with self._trava_pendentes:
+            cheio = len(self._pendentes) >= self.LIMITE_SUJOS
+        if not self.grupo or self._fechado or cheio:
+            # Fora do modo grupo, ou pendências demais: o chamador grava (e espera)
+            self._descarregar(seq)
+            return
+        with self._condicao_grupo:
+            if not self._sujo:
+                self._sujo = True
+                self._iniciar_gravador()
+                self._condicao_grupo.notify()
+
+    def flush(self, duravel: bool = True) -> None:
+        """Grava já as mutações pendentes; com ``duravel``, também faz fsync do journal."""
+        self._aguardar_carga()
+        self._descarregar(self._seq_enfileirado, duravel)
+
+    def fechar(self) -> None:
+        """Encerra a thread do modo grupo e grava tudo de forma durável."""
+        self._carregado.wait()
+        with self._condicao_grupo:
+            self._fechado = True
+            self._condicao_grupo.notify_all()
+        if self._gravador is not None:
+            self._gravador.join()
+            self._gravador = None
+        if self._erro_carga is None:  # sem carga, nenhuma mutação foi aceita
+            self.flush(duravel=True)
+
+    def _iniciar_gravador(self) -> None:
+        """Sobe a thread do modo grupo (chamado com _condicao_grupo adquirida)."""
+        if self._gravador is not None or self._fechado:
+            return
+        self._gravador = threading.Thread(
+            target=self._executar_gravador, name="gravacao-em-grupo", daemon=True
+        )
+        self._gravador.start()
+
+    def _executar_gravador(self) -> None:
+        while True:
+            with self._condicao_grupo:
+                self._condicao_grupo.wait_for(lambda: self._sujo or self._fechado)
+                # Janela de agrupamento: acumula as mutações da rajada
+                self._condicao_grupo.wait_for(
+                    lambda: self._fechado, timeout=self.INTERVALO_GRUPO
+                )
+                if self._fechado:
+                    return  # fechar() faz a gravação final
+                self._sujo = False
+            try:
+                self._descarregar(self._seq_enfileirado)
+            except Exception as e:
+                metricas.incrementar("tarefas_persistencia_falhas_total", etapa="grupo")
+                print(f"AVISO: Falha na gravação em grupo. Erro: {e}")
+
+    @metricas.cronometrar("db")
+    def _descarregar(self, seq: int, duravel: bool = False) -> None:
+        """Garante que a mutação ``seq`` chegou ao disco (journal ou CSV).
+
+        Quem obtém a trava de disco grava num só append todas as linhas
+        pendentes, inclusive as de outras threads; quem chega depois e
+        encontra a sua mutação já gravada retorna sem tocar no disco.
+        """
+        with self._trava_disco:
+            if self._seq_gravado >= seq:
+                if duravel:
+                    self._fsync_journal()
+                return
+            limite = max(self.LIMITE_COMPACTACAO, len(self.tarefas) // 2)
+            if not self.MODO_JOURNAL or len(self._pendentes) >= limite:
+                # Lotes grandes vão direto para o snapshot (já durável): uma gravação em vez de duas
+                self._compactar()
+                return
+            with self._trava_pendentes:
+                linhas, self._pendentes = self._pendentes, []
+                ate = self._seq_enfileirado
+            try:
+                dados = formatar_journal(linhas, CAMPOS_CSV)
+                with open(self._caminho_journal, mode="ab") as f:
+                    f.write(dados)
+                    metricas.observar("tarefas_bytes_gravados", len(dados), destino="journal")
+                    if duravel:
+                        f.flush()
+                        os.fsync(f.fileno())
+                self._registros_journal += len(linhas)
+                self._seq_gravado = ate
+            except Exception as e:
+                metricas.incrementar("tarefas_persistencia_falhas_total", etapa="journal")
+                print(
+                    f"AVISO: Falha ao gravar journal. Gravando snapshot completo. Erro: {e}"
+                )
+                with self._trava_pendentes:
+                    self._pendentes[:0] = linhas  # volta ao buffer se o snapshot também falhar
+                self._compactar()
+                return
+            if self._registros_journal >= limite:
+                try:
+                    self._compactar()
+                except Exception as e:
+                    # As mutações já estão no journal: a compactação fica para a próxima
+                    metricas.incrementar(
+                        "tarefas_persistencia_falhas_total", etapa="compactacao"
+                    )
+                    print(f"AVISO: Falha ao compactar o journal. Erro: {e}")
+
+    def _fsync_journal(self) -> None:
+        if os.path.exists(self._caminho_journal):
+            with open(self._caminho_journal, mode="ab") as f:
+                os.fsync(f.fileno())
+
+    def compactar(self) -> None:
+        """Dobra o journal no snapshot CSV e descarta o journal."""
+        self._aguardar_carga()
+        with self._trava_disco:
+            self._compactar()
+
+    @metricas.cronometrar("db")
+    def _compactar(self) -> None:
+        """Implementação de compactar (com a trava de disco)."""
+        if isinstance(self.tarefas, TarefasPreguicosas):
+            # O snapshot novo é gravado lendo o atual em sequência; os offsets
+            # passam a apontar para ele. Leitores também esperam: até a troca,
+            # os offsets em memória não valem para o arquivo renomeado.
+            trava = self._trava.escrita()
+        else:
+            # Leitores continuam; escritores esperam o snapshot ficar consistente
+            trava = self._trava.leitura()
+        with trava:
+            # Se falhar, o journal fica: ainda é a única cópia das mutações
+            self._salvar_csv()
+            with self._trava_pendentes:
+                self._pendentes = []  # já refletidas no snapshot
+                self._seq_gravado = self._seq_enfileirado
+            if isinstance(self.tarefas, TarefasPreguicosas):
+                cabecalho, offsets = indexar_offsets(self.CSV_FILENAME, self.relatorio_carga)
+                self.tarefas.reindexar(self.CSV_FILENAME, cabecalho, offsets)
+        try:
+            if os.path.exists(self._caminho_journal):
+                os.remove(self._caminho_journal)
+            self._registros_journal = 0
+        except Exception as e:
+            print(f"AVISO: Falha ao remover journal compactado. Erro: {e}")
+
+    @metricas.cronometrar("db")
+    def _salvar_csv(self) -> None:
+        """Grava o snapshot de forma atômica e durável; levanta a exceção em falha.
+
+        Escreve num temporário (com fsync), gira os backups, grava tamanho e
+        CRC32 no .meta e só então troca o CSV por rename: uma queda em
+        qualquer ponto deixa um snapshot íntegro para a próxima carga.
+        """
+        temporario = self.CSV_FILENAME + ".tmp"
+        snapshots = self._snapshots
+        try:
+            with open(temporario, mode="wb") as f:
+                destino = ArquivoVerificado(f)
+                writer = csv.DictWriter(destino, fieldnames=CAMPOS_CSV)
+                writer.writeheader()
+                if isinstance(self.tarefas, TarefasPreguicosas):
+                    tarefas = self.tarefas.values()  # já em ordem de ID, sem materializar tudo
+                else:
+                    tarefas = sorted(self.tarefas.values(), key=lambda t: t.id)
+                for tarefa in tarefas:
+                    writer.writerow(self.linha_de_tarefa(tarefa))
+                destino.flush()
+                f.flush()
+                os.fsync(f.fileno())
+            self._snapshots = [destino.verificacao()] + self._girar_backups()
+            metricas.observar(
+                "tarefas_bytes_gravados", self._snapshots[0]["bytes"], destino="snapshot"
             )
-            # Em caso de erro, silenciosamente não persiste para não quebrar o fluxo
-            pass
-
-    def _tipo_from_value(self, value: str) -> Tipo:
-        """Converte nome/valor (case-insensitive) em Tipo; fallback ATIVIDADE."""
-        v = (value or "").strip().casefold()
-        for t in Tipo:
-            if v == t.value.casefold() or v == t.name.casefold():
-                return t
-        # fallback por segurança
-        return Tipo.ATIVIDADE
-
-    def _status_from_value(self, value: str) -> Status:
-        """Converte nome/valor (case-insensitive) em Status; fallback EM_ANDAMENTO."""
-        v = (value or "").strip().casefold()
-        for s in Status:
-            if v == s.value.casefold() or v == s.name.casefold():
-                return s
-        return Status.EM_ANDAMENTO
-
-    def listar_tarefas(self) -> List[Tarefa]:
-        return self.tarefas
+            self._salvar_meta()
+            os.replace(temporario, self.CSV_FILENAME)
+            _fsync_diretorio(os.path.dirname(os.path.abspath(self.CSV_FILENAME)))
+        except Exception:
+            self._snapshots = snapshots
+            if os.path.exists(temporario):
+                os.remove(temporario)
+            raise
+
+    def _girar_backups(self) -> list:
+        """Desloca os backups (.k -> .k+1) e liga o CSV atual como .1.
+
+        Retorna as verificações dos snapshots anteriores, na ordem dos backups.
+        Usa hard link: o CSV nunca é reescrito no lugar, então .1 fica intacto.
+        """
+        if not os.path.exists(self.CSV_FILENAME):
+            return []
+        # CSV anterior às verificações: calcula uma vez, na migração
+        atual = self._snapshots[:1] or [verificar_arquivo(self.CSV_FILENAME)]
+        if self.BACKUPS < 1:
+            return atual  # sem arquivo, mas aceito na carga durante a troca
+        for geracao in range(self.BACKUPS - 1, 0, -1):
+            if os.path.exists(self._caminho_backup(geracao)):
+                os.replace(self._caminho_backup(geracao), self._caminho_backup(geracao + 1))
+        backup = self._caminho_backup(1)
+        if os.path.exists(backup):
+            os.remove(backup)
+        try:
+            os.link(self.CSV_FILENAME, backup)
+        except OSError:
+            import shutil
+
+            shutil.copyfile(self.CSV_FILENAME, backup)  # sistema de arquivos sem hard link
+        return atual + self._snapshots[1 : self.BACKUPS]
+
+    def listar_tarefas(self) -> dict:
+        """Cópia de todas as tarefas por ID (prefira paginar_tarefas)."""
+        self._aguardar_carga()
+        with self._trava.leitura():
+            return dict(self.tarefas.items())
+
+    def listar_lembretes_agendados(self):
+        """Gera (id_tarefa, lembrete) de todos os lembretes ainda agendados."""
+        self._aguardar_carga()
+        with self._trava.leitura():
+            agendados = [
+                (tarefa.id, lembrete)
+                for tarefa in self.tarefas.values()
+                for lembrete in tarefa.lembretes
+                if lembrete.agendado
+            ]
+        yield from agendados
+
+    def consultar_tarefas(
+        self,
+        status=None,
+        tipo=None,
+        id_disciplina: Optional[int] = None,
+        inicio: Optional[datetime] = None,
+        fim: Optional[datetime] = None,
+    ) -> List[Tarefa]:
+        """Consulta filtrada pelos índices secundários, ordenada por data de entrega.
+
+        Ex.: PROVAs pendentes da semana:
+        consultar_tarefas(status=[Status.PENDENTE, Status.EM_ANDAMENTO],
+                          tipo=Tipo.PROVA, inicio=segunda, fim=domingo)
+        """
+        self._aguardar_carga()
+        self._garantir_indices()
+        with self._trava.leitura():
+            ids = self.indices.consultar(
+                status=status,
+                tipo=tipo,
+                id_disciplina=id_disciplina,
+                inicio=inicio,
+                fim=fim,
+            )
+            return [self.tarefas[id_tarefa] for id_tarefa in ids]
+
+    def paginar_tarefas(
+        self,
+        offset: int = 0,
+        limite: Optional[int] = None,
+        ordenar_por: str = "id",
+        decrescente: bool = False,
+        **filtros,
+    ) -> tuple:
+        """Retorna (página de tarefas, total) usando os índices; ver IndiceTarefas.paginar."""
+        self._aguardar_carga()
+        self._garantir_indices()
+        with self._trava.leitura():
+            ids, total = self.indices.paginar(
+                offset=offset,
+                limite=limite,
+                ordenar_por=ordenar_por,
+                decrescente=decrescente,
+                **filtros,
+            )
+            return [self.tarefas[id_tarefa] for id_tarefa in ids], total
+
+    def consultar_prazos(
+        self,
+        inicio: Optional[datetime] = None,
+        fim: Optional[datetime] = None,
+        tipo: Optional[Tipo] = None,
+        limite: Optional[int] = None,
+    ) -> tuple:
+        """Retorna (tarefas não concluídas com prazo em [inicio, fim], total), por prazo.
+
+        O(log n + k) sobre o índice de abertas; ver IndiceTarefas.abertas_por_prazo.
+        """
+        self._aguardar_carga()
+        self._garantir_indices()
+        with self._trava.leitura():
+            ids, total = self.indices.abertas_por_prazo(
+                inicio=inicio, fim=fim, tipo=tipo, limite=limite
+            )
+            return [self.tarefas[id_tarefa] for id_tarefa in ids], total
+
+    def pesquisar_texto(
+        self, consulta: str, limite: int = 20, frequencias: Optional[tuple] = None
+    ) -> List[tuple]:
+        """[(tarefa, pontuação)] da busca em titulo/descricao; ver IndiceBusca.buscar."""
+        self._aguardar_carga()
+        self._garantir_busca()
+        with self._trava.leitura():
+            return [
+                (self.tarefas[id_tarefa], pontuacao)
+                for id_tarefa, pontuacao in self.busca.buscar(consulta, limite, frequencias)
+            ]
+
+    def frequencias_busca(self, consulta: str) -> tuple:
+        """Estatísticas de idf da consulta, com todas as expansões; ver IndiceBusca.frequencias."""
+        self._aguardar_carga()
+        self._garantir_busca()
+        with self._trava.leitura():
+            return self.busca.frequencias(consulta, todas_expansoes=True)
+
+    def consultar_estatisticas(self, id_disciplina: Optional[int] = None) -> dict:
+        """Relatório dos agregados incrementais em O(1); ver EstatisticasTarefas.relatorio."""
+        self._aguardar_carga()
+        self._garantir_indices()
+        with self._trava.leitura():
+            return self.estatisticas.relatorio(id_disciplina)
+
+
+def criar_banco(backend: Optional[str] = None):
+    """Cria o backend de armazenamento configurado.
+
+    ``backend`` (ou a variável de ambiente TAREFAS_BACKEND) aceita "csv"
+    (padrão), "sqlite" ou "particionado" (um CSV por disciplina); o caminho
+    do SQLite vem de TAREFAS_SQLITE e o diretório das partições de
+    TAREFAS_PARTICOES.
+    """
+    backend = (backend or os.environ.get("TAREFAS_BACKEND") or "csv").strip().lower()
+    if backend == "csv":
+        return BancoDeDados()
+    if backend == "particionado":
+        from bancoParticionado import BancoDeDadosParticionado
+
+        return BancoDeDadosParticionado(os.environ.get("TAREFAS_PARTICOES"))
+    if backend == "sqlite":
+        from bancoSQLite import BancoDeDadosSQLite  # só carrega o sqlite3 quando usado
+
+        return BancoDeDadosSQLite(os.environ.get("TAREFAS_SQLITE"))
+    raise ValueError(f"Backend de armazenamento desconhecido: {backend}")
@@ -0,0 +1,181 @@
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from datetime import datetime
+from typing import Optional
+from classes import Lembrete
+import heapq
+import itertools
+import threading
+
+
+class Notificador(ABC):
+    """Interface do sistema externo que entrega os lembretes.
+
+    Uma implementação sem ``notificar`` falha ao ser instanciada, não no
+    primeiro disparo.
+    """
+
+    @abstractmethod
+    def notificar(self, id_tarefa: int, lembrete: Lembrete) -> None:
+        """Entrega o lembrete da tarefa."""
+
+
+class NotificadorConsole(Notificador):
+    """Stub local: apenas imprime o lembrete."""
+
+    def notificar(self, id_tarefa: int, lembrete: Lembrete) -> None:
+        print(f"[Sistema Email] Lembrete da tarefa {id_tarefa} ({lembrete.data}) ENVIADO.")
+
+
+class AgendadorLembretes:
+    """Min-heap de lembretes pendentes ordenado por data.
+
+    Entradas são identificadas por (id_tarefa, data). Cancelar apenas marca
+    a entrada (O(1)); entradas canceladas são descartadas ao chegar ao topo
+    ou numa recompactação quando passam de metade do heap. Disparar custa
+    O(log n) por lembrete, sem varrer tarefas.
+    """
+
+    def __init__(
+        self,
+        notificador: Optional[Notificador] = None,
+        ao_disparar: Optional[Callable[[int, Lembrete], None]] = None,
+        relogio: Callable[[], datetime] = datetime.now,
+    ):
+        self.notificador = notificador or NotificadorConsole()
+        self.ao_disparar = ao_disparar  # ex.: o model marca e persiste o lembrete
+        self.relogio = relogio
+        self._heap: list = []  # [data, seq, id_tarefa, lembrete, ativo]
+        self._entradas = {}  # (id_tarefa, data) -> entrada
+        self._por_tarefa = {}  # id_tarefa -> set de datas agendadas
+        self._cancelados = 0
+        self._seq = itertools.count()
+        self._condicao = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._parar = False
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def agendar(self, id_tarefa: int, lembrete: Lembrete) -> bool:
+        """Agenda o lembrete; False se já havia um igual (mesma tarefa e data)."""
+        with self._condicao:
+            chave = (id_tarefa, lembrete.data)
+            if chave in self._entradas:
+                return False
+            entrada = [lembrete.data, next(self._seq), id_tarefa, lembrete, True]
+            self._entradas[chave] = entrada
+            self._por_tarefa.setdefault(id_tarefa, set()).add(lembrete.data)
+            heapq.heappush(self._heap, entrada)
+            if self._heap[0] is entrada:
+                self._condicao.notify()  # novo mais próximo: acorda a thread
+            return True
+
+    def cancelar(self, id_tarefa: int, data: datetime) -> bool:
+        """Cancela um lembrete agendado; False se não estava no heap."""
+        with self._condicao:
+            return self._cancelar(id_tarefa, data)
+
+    def cancelar_tarefa(self, id_tarefa: int) -> int:
+        """Cancela todos os lembretes da tarefa; retorna quantos foram cancelados."""
+        with self._condicao:
+            datas = list(self._por_tarefa.get(id_tarefa, ()))
+            return sum(self._cancelar(id_tarefa, data) for data in datas)
+
+    def cancelar_tarefas(self, ids) -> int:
+        """Cancela os lembretes de várias tarefas com uma só aquisição da trava."""
+        with self._condicao:
+            return sum(
+                self._cancelar(id_tarefa, data)
+                for id_tarefa in ids
+                for data in list(self._por_tarefa.get(id_tarefa, ()))
+            )
+
+    def proximo(self) -> Optional[datetime]:
+        """Data do próximo lembrete pendente (None se não houver)."""
+        with self._condicao:
+            self._descartar_cancelados_no_topo()
+            return self._heap[0][0] if self._heap else None
+
+    def disparar_vencidos(self, agora: Optional[datetime] = None) -> int:
+        """Entrega todos os lembretes com data <= agora; retorna quantos disparou."""
+        agora = agora or self.relogio()
+        vencidos = []
+        with self._condicao:
+            while True:
+                self._descartar_cancelados_no_topo()
+                if not self._heap or self._heap[0][0] > agora:
+                    break
+                _, _, id_tarefa, lembrete, _ = heapq.heappop(self._heap)
+                self._remover_indices(id_tarefa, lembrete.data)
+                vencidos.append((id_tarefa, lembrete))
+        # Notificação fora da trava: um notificador lento não bloqueia agendamentos
+        for id_tarefa, lembrete in vencidos:
+            try:
+                self.notificador.notificar(id_tarefa, lembrete)
+                if self.ao_disparar is not None:
+                    self.ao_disparar(id_tarefa, lembrete)
+            except Exception as e:
+                print(f"AVISO: Falha ao disparar lembrete da tarefa {id_tarefa}. Erro: {e}")
+        return len(vencidos)
+
+    # Thread de disparo
+    def iniciar(self) -> None:
+        """Inicia a thread que dorme até o próximo lembrete e o dispara."""
+        if self._thread is not None:
+            return
+        self._parar = False
+        self._thread = threading.Thread(
+            target=self._executar, name="agendador-lembretes", daemon=True
+        )
+        self._thread.start()
+
+    def parar(self) -> None:
+        """Encerra a thread de disparo."""
+        with self._condicao:
+            self._parar = True
+            self._condicao.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _executar(self) -> None:
+        while True:
+            with self._condicao:
+                if self._parar:
+                    return
+                self._descartar_cancelados_no_topo()
+                espera = None
+                if self._heap:
+                    espera = (self._heap[0][0] - self.relogio()).total_seconds()
+                if espera is None or espera > 0:
+                    self._condicao.wait(timeout=espera)
+                    continue
+            self.disparar_vencidos()
+
+    # Helpers (chamados com a trava adquirida)
+    def _cancelar(self, id_tarefa: int, data: datetime) -> bool:
+        entrada = self._entradas.get((id_tarefa, data))
+        if entrada is None:
+            return False
+        entrada[4] = False
+        self._remover_indices(id_tarefa, data)
+        self._cancelados += 1
+        if self._cancelados > len(self._heap) // 2:
+            self._heap = [e for e in self._heap if e[4]]
+            heapq.heapify(self._heap)
+            self._cancelados = 0
+        return True
+
+    def _remover_indices(self, id_tarefa: int, data: datetime) -> None:
+        self._entradas.pop((id_tarefa, data), None)
+        datas = self._por_tarefa.get(id_tarefa)
+        if datas is not None:
+            datas.discard(data)
+            if not datas:
+                del self._por_tarefa[id_tarefa]
+
+    def _descartar_cancelados_no_topo(self) -> None:
+        while self._heap and not self._heap[0][4]:
+            heapq.heappop(self._heap)
+            self._cancelados -= 1
@@ -0,0 +1,440 @@
+from typing import Optional
+from typing import List
+from typing import Callable
+from classes import Tarefa, Tipo
+from DB import BancoDeDados, DISCIPLINAS
+from busca import IndiceBusca, limitar_expansoes
+from estatisticas import AgregadoNotas, montar_relatorio
+from collections import Counter
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from itertools import islice
+import heapq
+import json
+import os
+import re
+import threading
+
+
+_ARQUIVO_PARTICAO = re.compile(r"^(?:disciplina_(\d+)|(sem_disciplina))\.csv(?:\.journal)?$")
+_SEM_ROTA = object()  # sentinela: ID fora do roteamento (None é a partição sem disciplina)
+
+
+def _carregar_particao(caminho: str) -> dict:
+    """Carrega uma partição num processo de trabalho: leitura, journal e índices.
+
+    Sempre em colunas: tarefas (ArmazemColunar), índices e estatísticas são
+    arrays e strings, e o pickle de volta é quase uma cópia de memória, sem
+    um objeto por tarefa para o processo principal recriar.
+    """
+    banco = BancoDeDados(
+        preguicoso=False, colunar=True, grupo=False, adiada=False, caminho=caminho
+    )
+    return banco.estado_carga()
+
+
+def _chave_id(tarefa: Tarefa) -> int:
+    return tarefa.id
+
+
+def _chave_prazo(tarefa: Tarefa) -> tuple:
+    return (tarefa.data_entrega, tarefa.id)
+
+
+def _chave_pontuacao(resultado: tuple) -> tuple:
+    tarefa, pontuacao = resultado
+    return (-pontuacao, tarefa.id)
+
+
+class BancoDeDadosParticionado:
+    """Armazenamento CSV particionado por id_disciplina, com a interface do BancoDeDados.
+
+    Cada disciplina é um BancoDeDados próprio (snapshot, journal, travas e
+    índices) em ``<diretorio>/disciplina_<id>.csv``; tarefas sem disciplina
+    vão para ``sem_disciplina.csv``. O roteador guarda id -> partição e o
+    alocador global de IDs: criações vão para a partição da disciplina e
+    conclusões para a partição dona do ID, então escritas em disciplinas
+    diferentes não disputam trava nem arquivo. Consultas sem disciplina
+    juntam as partições com heapq.merge (k-way) na ordem pedida.
+
+    Na abertura, as partições são carregadas e indexadas em paralelo num
+    pool de processos (PROCESSOS_CARGA; padrão: um por núcleo) e adotadas
+    em colunas, qualquer que seja MODO_COLUNAR: recriar aqui um objeto por
+    tarefa seria trabalho serial que não escala com os núcleos. A busca
+    textual pontua com o idf do conjunto (frequências somadas entre as
+    partições).
+    """
+
+    PROCESSOS_CARGA: Optional[int] = None  # None: os.cpu_count(); 1: sem pool
+    carga_adiada = False  # a carga paralela acontece no construtor
+
+    def __init__(self, diretorio: Optional[str] = None):
+        """Abre (ou cria) o diretório das partições e carrega todas elas."""
+        self.diretorio = diretorio or (
+            os.path.splitext(BancoDeDados.CSV_FILENAME)[0] + "_particoes"
+        )
+        os.makedirs(self.diretorio, exist_ok=True)
+        self.disciplinas_existentes = DISCIPLINAS
+        self.particoes = {}  # id_disciplina (None: sem disciplina) -> BancoDeDados
+        self._roteamento = {}  # id -> chave da partição dona
+        self._trava = threading.Lock()  # partições, roteamento e alocador de IDs
+        self._proximo_id = 1
+        self._carregar()
+
+    @property
+    def versao(self) -> int:
+        """Soma das versões das partições: muda a cada mutação em qualquer uma."""
+        return sum(particao.versao for particao in list(self.particoes.values()))
+
+    def aguardar_carga(self, timeout: Optional[float] = None) -> bool:
+        return True
+
+    def existe_disciplina(self, id_disciplina: int) -> bool:
+        """Verifica se a disciplina informada existe no catálogo mockado."""
+        return id_disciplina in self.disciplinas_existentes
+
+    # Escritas: roteadas para a partição da disciplina / dona do ID
+    def salvar_tarefa(self, tarefa: Tarefa) -> bool:
+        """Persiste a tarefa na partição da sua disciplina."""
+        particao = self._particao(getattr(tarefa, "id_disciplina", None))
+        self._rotear([tarefa])
+        try:
+            return particao.salvar_tarefa(tarefa)
+        except BaseException:
+            self._desfazer_rota([tarefa], particao)
+            raise
+
+    def salvar_tarefas(self, tarefas: List[Tarefa]) -> bool:
+        """Insere um lote: uma gravação por partição envolvida.
+
+        O lote é validado antes de qualquer partição gravar; uma falha de
+        disco no meio deixa gravadas as partições anteriores.
+        """
+        if any(tarefa.titulo == "ErroDB" for tarefa in tarefas):
+            raise Exception("Erro de Conexão com Banco de Dados")
+        grupos = {}
+        for tarefa in tarefas:
+            grupos.setdefault(getattr(tarefa, "id_disciplina", None), []).append(tarefa)
+        particoes = {chave: self._particao(chave) for chave in grupos}
+        self._rotear(tarefas)
+        for chave, grupo in grupos.items():
+            try:
+                particoes[chave].salvar_tarefas(grupo)
+            except BaseException:
+                self._desfazer_rota(grupo, particoes[chave])
+                raise
+        return True
+
+    def buscar_tarefa(self, id_tarefa: int) -> Optional[Tarefa]:
+        """Retorna a tarefa pelo ID ou None se não existir."""
+        chave = self._roteamento.get(id_tarefa, _SEM_ROTA)
+        if chave is _SEM_ROTA:
+            return None
+        return self.particoes[chave].buscar_tarefa(id_tarefa)
+
+    def buscar_tarefas(self, ids: Iterable[int]) -> dict:
+        """Retorna {id: tarefa} dos IDs existentes, uma consulta por partição."""
+        ids = list(ids)
+        encontradas = {}
+        for chave, grupo in self._agrupar_ids(ids).items():
+            encontradas.update(self.particoes[chave].buscar_tarefas(grupo))
+        return {
+            id_tarefa: encontradas[id_tarefa] for id_tarefa in ids if id_tarefa in encontradas
+        }
+
+    def atualizar_tarefa(self, tarefa: Tarefa) -> bool:
+        """Atualiza a tarefa na partição dona do ID (a disciplina de criação)."""
+        chave = self._roteamento.get(tarefa.id, _SEM_ROTA)
+        if chave is _SEM_ROTA:
+            return False
+        return self.particoes[chave].atualizar_tarefa(tarefa)
+
+    def atualizar_tarefas(self, tarefas: List[Tarefa]) -> int:
+        """Atualiza várias tarefas, uma gravação por partição; retorna quantas."""
+        grupos = {}
+        for tarefa in tarefas:
+            chave = self._roteamento.get(tarefa.id, _SEM_ROTA)
+            if chave is not _SEM_ROTA:
+                grupos.setdefault(chave, []).append(tarefa)
+        return sum(
+            self.particoes[chave].atualizar_tarefas(grupo) for chave, grupo in grupos.items()
+        )
+
+    def alterar_tarefas(self, ids: List[int], alterar: Callable[[Tarefa], bool]) -> dict:
+        """Lê, altera e grava tarefas atomicamente, uma gravação por partição."""
+        ids = list(ids)
+        encontradas = {}
+        for chave, grupo in self._agrupar_ids(ids).items():
+            encontradas.update(self.particoes[chave].alterar_tarefas(grupo, alterar))
+        return {
+            id_tarefa: encontradas[id_tarefa] for id_tarefa in ids if id_tarefa in encontradas
+        }
+
+    def id_existe(self, id_tarefa: int) -> bool:
+        """Verifica se um ID de tarefa já existe."""
+        return id_tarefa in self._roteamento
+
+    def proximo_id(self) -> int:
+        """Reserva e retorna o próximo ID global (único entre as partições)."""
+        with self._trava:
+            id_tarefa = self._proximo_id
+            self._proximo_id += 1
+        return id_tarefa
+
+    def reservar_ids(self, quantidade: int) -> range:
+        """Reserva um bloco contíguo de IDs globais para inserções em lote."""
+        if quantidade <= 0:
+            return range(0)
+        with self._trava:
+            inicio = self._proximo_id
+            self._proximo_id += quantidade
+        # Persiste a marca já: IDs reservados não voltam a ser entregues após reinício
+        try:
+            self._salvar_meta()
+        except Exception as e:
+            print(f"AVISO: Falha ao salvar metadados de IDs. Erro: {e}")
+        return range(inicio, inicio + quantidade)
+
+    def flush(self, duravel: bool = True) -> None:
+        for particao in list(self.particoes.values()):
+            particao.flush(duravel)
+
+    def fechar(self) -> None:
+        for particao in list(self.particoes.values()):
+            particao.fechar()
+        self._salvar_meta()
+
+    def compactar(self) -> None:
+        for particao in list(self.particoes.values()):
+            particao.compactar()
+
+    # Consultas: uma partição quando há disciplina; senão k-way merge
+    def listar_tarefas(self) -> dict:
+        """Cópia de todas as tarefas por ID (prefira paginar_tarefas)."""
+        tarefas = {}
+        for particao in list(self.particoes.values()):
+            tarefas.update(particao.listar_tarefas())
+        return tarefas
+
+    def listar_lembretes_agendados(self):
+        """Gera (id_tarefa, lembrete) de todos os lembretes ainda agendados."""
+        for particao in list(self.particoes.values()):
+            yield from particao.listar_lembretes_agendados()
+
+    def consultar_tarefas(
+        self,
+        status=None,
+        tipo=None,
+        id_disciplina: Optional[int] = None,
+        inicio: Optional[datetime] = None,
+        fim: Optional[datetime] = None,
+    ) -> List[Tarefa]:
+        """Consulta filtrada, ordenada por data de entrega; ver BancoDeDados.consultar_tarefas."""
+        filtros = {"status": status, "tipo": tipo, "inicio": inicio, "fim": fim}
+        return list(
+            heapq.merge(
+                *(
+                    particao.consultar_tarefas(**filtros)
+                    for particao in self._alvos(id_disciplina)
+                ),
+                key=_chave_prazo,
+            )
+        )
+
+    def paginar_tarefas(
+        self,
+        offset: int = 0,
+        limite: Optional[int] = None,
+        ordenar_por: str = "id",
+        decrescente: bool = False,
+        **filtros,
+    ) -> tuple:
+        """Retorna (página de tarefas, total): as primeiras offset + limite de cada partição, intercaladas."""
+        if ordenar_por not in ("id", "data_entrega"):
+            raise ValueError(f"Ordenação inválida: {ordenar_por}")
+        alvos = self._alvos(filtros.pop("id_disciplina", None))
+        if len(alvos) == 1:
+            return alvos[0].paginar_tarefas(
+                offset, limite, ordenar_por, decrescente, **filtros
+            )
+        primeiras = None if limite is None else offset + limite
+        paginas, total = [], 0
+        for particao in alvos:
+            pagina, quantidade = particao.paginar_tarefas(
+                0, primeiras, ordenar_por, decrescente, **filtros
+            )
+            paginas.append(pagina)
+            total += quantidade
+        chave = _chave_id if ordenar_por == "id" else _chave_prazo
+        intercaladas = heapq.merge(*paginas, key=chave, reverse=decrescente)
+        return list(islice(intercaladas, offset, primeiras)), total
+
+    def consultar_prazos(
+        self,
+        inicio: Optional[datetime] = None,
+        fim: Optional[datetime] = None,
+        tipo: Optional[Tipo] = None,
+        limite: Optional[int] = None,
+    ) -> tuple:
+        """Retorna (tarefas não concluídas com prazo em [inicio, fim], total), por prazo."""
+        listas, total = [], 0
+        for particao in list(self.particoes.values()):
+            tarefas, quantidade = particao.consultar_prazos(inicio, fim, tipo, limite)
+            listas.append(tarefas)
+            total += quantidade
+        return list(islice(heapq.merge(*listas, key=_chave_prazo), limite)), total
+
+    def pesquisar_texto(self, consulta: str, limite: int = 20) -> List[tuple]:
+        """[(tarefa, pontuação)] das ``limite`` melhores de cada partição, intercaladas.
+
+        Em duas fases: as frequências dos termos (e o total de tarefas) são
+        somadas entre as partições antes de pontuar, então todas usam o idf
+        do conjunto e a ordem é a de um banco único.
+        """
+        particoes = list(self.particoes.values())
+        total, por_termo = 0, []
+        for particao in particoes:
+            quantidade, frequencias = particao.frequencias_busca(consulta)
+            total += quantidade
+            por_termo = por_termo or [Counter() for _ in frequencias]
+            for soma, frequencia in zip(por_termo, frequencias):
+                soma.update(frequencia)
+        globais = (
+            total,
+            [limitar_expansoes(soma, IndiceBusca.MAX_EXPANSOES) for soma in por_termo],
+        )
+        return list(
+            islice(
+                heapq.merge(
+                    *(
+                        particao.pesquisar_texto(consulta, limite, globais)
+                        for particao in particoes
+                    ),
+                    key=_chave_pontuacao,
+                ),
+                limite,
+            )
+        )
+
+    def consultar_estatisticas(self, id_disciplina: Optional[int] = None) -> dict:
+        """Contagens somadas das partições e notas da(s) disciplina(s) pedida(s).
+
+        Com ``id_disciplina``, o relatório (contagens inclusive) é o da partição dela.
+        """
+        por_status, por_tipo, notas = Counter(), Counter(), {}
+        for particao in self._alvos(id_disciplina):
+            relatorio = particao.consultar_estatisticas(id_disciplina)
+            por_status.update(relatorio["por_status"])
+            por_tipo.update(relatorio["por_tipo"])
+            notas.update(relatorio["notas"])
+        if id_disciplina is not None:
+            notas = {id_disciplina: notas.get(id_disciplina) or AgregadoNotas().resumo()}
+        return montar_relatorio(por_status, por_tipo, dict(sorted(notas.items())))
+
+    # Helpers
+    def _caminho(self, chave: Optional[int]) -> str:
+        nome = "sem_disciplina" if chave is None else f"disciplina_{chave}"
+        return os.path.join(self.diretorio, nome + ".csv")
+
+    @property
+    def _caminho_meta(self) -> str:
+        """High-water mark global de IDs (cada partição tem o seu .meta)."""
+        return os.path.join(self.diretorio, "roteador.meta")
+
+    def _particao(self, chave: Optional[int]) -> BancoDeDados:
+        """Partição da disciplina, criada (vazia) na primeira tarefa dela."""
+        particao = self.particoes.get(chave)
+        if particao is not None:
+            return particao
+        with self._trava:
+            if chave not in self.particoes:
+                self.particoes[chave] = BancoDeDados(adiada=False, caminho=self._caminho(chave))
+            return self.particoes[chave]
+
+    def _alvos(self, id_disciplina: Optional[int]) -> list:
+        """Partições a consultar: só a da disciplina, se houver filtro por ela."""
+        if id_disciplina is None:
+            return list(self.particoes.values())
+        particao = self.particoes.get(id_disciplina)
+        return [] if particao is None else [particao]
+
+    def _rotear(self, tarefas: List[Tarefa]) -> None:
+        """Registra a partição dona de cada tarefa; sem ID (0) ou ID já usado ganha um novo."""
+        with self._trava:
+            for tarefa in tarefas:
+                chave = getattr(tarefa, "id_disciplina", None)
+                dona = self._roteamento.get(tarefa.id, _SEM_ROTA)
+                if not tarefa.id or dona is not _SEM_ROTA and (
+                    dona != chave or self.particoes[dona].buscar_tarefa(tarefa.id) is not tarefa
+                ):
+                    tarefa.id = self._proximo_id
+                    self._proximo_id += 1
+                else:
+                    self._proximo_id = max(self._proximo_id, tarefa.id + 1)
+                self._roteamento[tarefa.id] = chave
+
+    def _desfazer_rota(self, tarefas: List[Tarefa], particao: BancoDeDados) -> None:
+        """Retira do roteamento as tarefas que a partição não chegou a guardar."""
+        with self._trava:
+            for tarefa in tarefas:
+                if not particao.id_existe(tarefa.id):
+                    self._roteamento.pop(tarefa.id, None)
+
+    def _agrupar_ids(self, ids: Iterable[int]) -> dict:
+        grupos = {}
+        for id_tarefa in ids:
+            chave = self._roteamento.get(id_tarefa, _SEM_ROTA)
+            if chave is not _SEM_ROTA:
+                grupos.setdefault(chave, []).append(id_tarefa)
+        return grupos
+
+    def _descobrir(self) -> list:
+        """Chaves das partições com snapshot ou journal no diretório."""
+        chaves = set()
+        for nome in os.listdir(self.diretorio):
+            encontrado = _ARQUIVO_PARTICAO.match(nome)
+            if encontrado:
+                chaves.add(int(encontrado.group(1)) if encontrado.group(1) else None)
+        return sorted(chaves, key=lambda chave: (chave is None, chave))
+
+    def _carregar(self) -> None:
+        """Carrega as partições (em paralelo, se houver núcleos) e monta o roteamento."""
+        chaves = self._descobrir()
+        processos = min(len(chaves), self.PROCESSOS_CARGA or os.cpu_count() or 1)
+        estados = {}
+        if processos > 1 and not BancoDeDados.MODO_PREGUICOSO:
+            caminhos = [self._caminho(chave) for chave in chaves]
+            try:
+                with ProcessPoolExecutor(processos) as pool:
+                    estados = dict(zip(chaves, pool.map(_carregar_particao, caminhos)))
+            except Exception as e:
+                # Sem processos (ex.: ambiente restrito): carrega aqui mesmo
+                print(f"AVISO: Falha na carga paralela das partições. Erro: {e}")
+                estados = {}
+        for chave in chaves:
+            self.particoes[chave] = BancoDeDados(
+                adiada=False, caminho=self._caminho(chave), estado=estados.pop(chave, None)
+            )
+        for chave, particao in self.particoes.items():
+            # Uma partição por vez: o roteamento é montado em C (dict.fromkeys)
+            self._roteamento.update(dict.fromkeys(particao.tarefas, chave))
+        self._proximo_id = max(self._carregar_meta(), max(self._roteamento, default=0) + 1)
+
+    def _carregar_meta(self) -> int:
+        try:
+            with open(self._caminho_meta, mode="r", encoding="utf-8") as f:
+                return max(1, int(json.load(f).get("proximo_id", 1)))
+        except Exception:
+            return 1
+
+    def _salvar_meta(self) -> None:
+        """Grava o high-water mark de forma atômica (temporário + fsync + rename)."""
+        temporario = self._caminho_meta + ".tmp"
+        with self._trava:
+            with open(temporario, mode="w", encoding="utf-8") as f:
+                json.dump({"proximo_id": self._proximo_id}, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporario, self._caminho_meta)
+
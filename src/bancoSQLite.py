@@ -0,0 +1,689 @@
+from typing import Optional
+from typing import List
+from typing import Callable
+from classes import Tarefa, Tipo, Status
+from DB import BancoDeDados, CAMPOS_CSV, DISCIPLINAS
+from busca import IndiceBusca, tokenizar_consulta
+from estatisticas import montar_relatorio, resumir_notas
+from collections import Counter
+from collections.abc import Iterable
+import csv
+import itertools
+import metricas
+from datetime import datetime
+import os
+import queue
+import sqlite3
+import sys
+import threading
+
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS disciplinas (
+    id INTEGER PRIMARY KEY,
+    nome TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tarefas (
+    id INTEGER PRIMARY KEY,
+    titulo TEXT NOT NULL,
+    descricao TEXT NOT NULL DEFAULT '',
+    data_entrega TEXT NOT NULL,
+    tipo TEXT NOT NULL,
+    status TEXT NOT NULL,
+    nota REAL,
+    id_disciplina INTEGER REFERENCES disciplinas(id),
+    lembretes TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_tarefas_prazo ON tarefas (data_entrega, id);
+CREATE INDEX IF NOT EXISTS idx_tarefas_status ON tarefas (status, data_entrega);
+CREATE INDEX IF NOT EXISTS idx_tarefas_tipo ON tarefas (tipo, data_entrega);
+CREATE INDEX IF NOT EXISTS idx_tarefas_disciplina ON tarefas (id_disciplina, data_entrega);
+CREATE INDEX IF NOT EXISTS idx_tarefas_abertas ON tarefas (data_entrega, id)
+    WHERE status != 'Concluido';
+CREATE INDEX IF NOT EXISTS idx_tarefas_abertas_tipo ON tarefas (tipo, data_entrega, id)
+    WHERE status != 'Concluido';
+CREATE TABLE IF NOT EXISTS meta (
+    chave TEXT PRIMARY KEY,
+    valor INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tarefas_notas ON tarefas (id_disciplina, nota)
+    WHERE nota IS NOT NULL;
+CREATE TABLE IF NOT EXISTS estatisticas_contagens (
+    id_disciplina INTEGER NOT NULL,  -- 0: sem disciplina
+    status TEXT NOT NULL,
+    tipo TEXT NOT NULL,
+    quantidade INTEGER NOT NULL,
+    PRIMARY KEY (id_disciplina, status, tipo)
+);
+CREATE TABLE IF NOT EXISTS estatisticas_notas (
+    id_disciplina INTEGER PRIMARY KEY,
+    quantidade INTEGER NOT NULL,
+    soma REAL NOT NULL,
+    media REAL NOT NULL,
+    m2 REAL NOT NULL  -- soma dos quadrados dos desvios (Welford)
+);
+CREATE TRIGGER IF NOT EXISTS estatisticas_inserir AFTER INSERT ON tarefas BEGIN
+    INSERT INTO estatisticas_contagens (id_disciplina, status, tipo, quantidade)
+        VALUES (IFNULL(new.id_disciplina, 0), new.status, new.tipo, 1)
+        ON CONFLICT (id_disciplina, status, tipo) DO UPDATE SET quantidade = quantidade + 1;
+    INSERT INTO estatisticas_notas (id_disciplina, quantidade, soma, media, m2)
+        SELECT new.id_disciplina, 1, new.nota, new.nota, 0.0
+        WHERE new.nota IS NOT NULL AND new.id_disciplina IS NOT NULL
+        ON CONFLICT (id_disciplina) DO UPDATE SET
+            quantidade = quantidade + 1,
+            soma = soma + excluded.soma,
+            media = media + (excluded.soma - media) / (quantidade + 1),
+            m2 = m2 + (excluded.soma - media)
+                * (excluded.soma - media - (excluded.soma - media) / (quantidade + 1));
+END;
+CREATE TRIGGER IF NOT EXISTS estatisticas_remover AFTER DELETE ON tarefas BEGIN
+    UPDATE estatisticas_contagens SET quantidade = quantidade - 1
+        WHERE id_disciplina = IFNULL(old.id_disciplina, 0)
+        AND status = old.status AND tipo = old.tipo;
+    DELETE FROM estatisticas_notas
+        WHERE old.nota IS NOT NULL AND id_disciplina = old.id_disciplina AND quantidade = 1;
+    UPDATE estatisticas_notas SET
+        quantidade = quantidade - 1,
+        soma = soma - old.nota,
+        media = media - (old.nota - media) / (quantidade - 1),
+        m2 = MAX(m2 - (old.nota - media)
+            * (old.nota - media + (old.nota - media) / (quantidade - 1)), 0.0)
+        WHERE old.nota IS NOT NULL AND id_disciplina = old.id_disciplina AND quantidade > 1;
+END;
+CREATE TRIGGER IF NOT EXISTS estatisticas_atualizar
+AFTER UPDATE OF status, tipo, nota, id_disciplina ON tarefas
+WHEN old.status IS NOT new.status OR old.tipo IS NOT new.tipo
+    OR old.nota IS NOT new.nota OR old.id_disciplina IS NOT new.id_disciplina BEGIN
+    UPDATE estatisticas_contagens SET quantidade = quantidade - 1
+        WHERE id_disciplina = IFNULL(old.id_disciplina, 0)
+        AND status = old.status AND tipo = old.tipo;
+    DELETE FROM estatisticas_notas
+        WHERE old.nota IS NOT NULL AND id_disciplina = old.id_disciplina AND quantidade = 1;
+    UPDATE estatisticas_notas SET
+        quantidade = quantidade - 1,
+        soma = soma - old.nota,
+        media = media - (old.nota - media) / (quantidade - 1),
+        m2 = MAX(m2 - (old.nota - media)
+            * (old.nota - media + (old.nota - media) / (quantidade - 1)), 0.0)
+        WHERE old.nota IS NOT NULL AND id_disciplina = old.id_disciplina AND quantidade > 1;
+    INSERT INTO estatisticas_contagens (id_disciplina, status, tipo, quantidade)
+        VALUES (IFNULL(new.id_disciplina, 0), new.status, new.tipo, 1)
+        ON CONFLICT (id_disciplina, status, tipo) DO UPDATE SET quantidade = quantidade + 1;
+    INSERT INTO estatisticas_notas (id_disciplina, quantidade, soma, media, m2)
+        SELECT new.id_disciplina, 1, new.nota, new.nota, 0.0
+        WHERE new.nota IS NOT NULL AND new.id_disciplina IS NOT NULL
+        ON CONFLICT (id_disciplina) DO UPDATE SET
+            quantidade = quantidade + 1,
+            soma = soma + excluded.soma,
+            media = media + (excluded.soma - media) / (quantidade + 1),
+            m2 = m2 + (excluded.soma - media)
+                * (excluded.soma - media - (excluded.soma - media) / (quantidade + 1));
+END;
+CREATE VIRTUAL TABLE IF NOT EXISTS tarefas_busca USING fts5(
+    titulo, descricao, content='tarefas', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS tarefas_busca_inserir AFTER INSERT ON tarefas BEGIN
+    INSERT INTO tarefas_busca (rowid, titulo, descricao)
+        VALUES (new.id, new.titulo, new.descricao);
+END;
+CREATE TRIGGER IF NOT EXISTS tarefas_busca_remover AFTER DELETE ON tarefas BEGIN
+    INSERT INTO tarefas_busca (tarefas_busca, rowid, titulo, descricao)
+        VALUES ('delete', old.id, old.titulo, old.descricao);
+END;
+CREATE TRIGGER IF NOT EXISTS tarefas_busca_atualizar AFTER UPDATE OF titulo, descricao ON tarefas
+WHEN old.titulo IS NOT new.titulo OR old.descricao IS NOT new.descricao BEGIN
+    INSERT INTO tarefas_busca (tarefas_busca, rowid, titulo, descricao)
+        VALUES ('delete', old.id, old.titulo, old.descricao);
+    INSERT INTO tarefas_busca (rowid, titulo, descricao)
+        VALUES (new.id, new.titulo, new.descricao);
+END;
+"""
+
+# Statements fixos: o sqlite3 mantém os prepared statements em cache por texto SQL
+_SQL_INSERIR = (
+    "INSERT INTO tarefas (id, titulo, descricao, data_entrega, tipo, status, nota, id_disciplina, lembretes)"
+    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+_SQL_ATUALIZAR = (
+    "UPDATE tarefas SET titulo = ?, descricao = ?, data_entrega = ?, tipo = ?,"
+    " status = ?, nota = ?, id_disciplina = ?, lembretes = ? WHERE id = ?"
+)
+_SQL_COLUNAS = (
+    "id, titulo, descricao, data_entrega, tipo, status, nota, id_disciplina, lembretes"
+)
+_SQL_BUSCAR = f"SELECT {_SQL_COLUNAS} FROM tarefas WHERE id = ?"
+# Literal (não parâmetro): só assim o planner usa os índices parciais de abertas
+_SQL_ABERTA = "status != 'Concluido'"
+# Busca: bm25 com o título valendo PESO_TITULO (menor = mais relevante)
+_SQL_PESQUISAR = (
+    f"SELECT {_SQL_COLUNAS}, pontuacao FROM ("
+    f"SELECT rowid AS id_busca, bm25(tarefas_busca, {IndiceBusca.PESO_TITULO}, 1) AS pontuacao"
+    " FROM tarefas_busca WHERE tarefas_busca MATCH ? ORDER BY pontuacao, rowid LIMIT ?"
+    ") JOIN tarefas ON id = id_busca ORDER BY pontuacao, id"
+)
+# Agregados de bancos anteriores às tabelas de estatísticas (os triggers mantêm dali em diante)
+_SQL_SEMEAR_ESTATISTICAS = (
+    "INSERT INTO estatisticas_contagens (id_disciplina, status, tipo, quantidade)"
+    " SELECT IFNULL(id_disciplina, 0), status, tipo, COUNT(*) FROM tarefas"
+    " GROUP BY IFNULL(id_disciplina, 0), status, tipo",
+    # Duas passadas (média, depois desvios): sem a perda de precisão de soma dos quadrados
+    "INSERT INTO estatisticas_notas (id_disciplina, quantidade, soma, media, m2)"
+    " SELECT t.id_disciplina, COUNT(*), SUM(t.nota), m.media,"
+    " SUM((t.nota - m.media) * (t.nota - m.media))"
+    " FROM tarefas t JOIN (SELECT id_disciplina, AVG(nota) AS media FROM tarefas"
+    " WHERE nota IS NOT NULL GROUP BY id_disciplina) m"
+    " ON t.id_disciplina = m.id_disciplina"
+    " WHERE t.nota IS NOT NULL GROUP BY t.id_disciplina",
+)
+# Mínimo e máximo pelo índice parcial (id_disciplina, nota): O(log n) por disciplina
+_SQL_NOTAS = (
+    "SELECT id_disciplina, quantidade, soma,"
+    " (SELECT MIN(nota) FROM tarefas t WHERE t.id_disciplina = n.id_disciplina"
+    " AND nota IS NOT NULL),"
+    " (SELECT MAX(nota) FROM tarefas t WHERE t.id_disciplina = n.id_disciplina"
+    " AND nota IS NOT NULL),"
+    " m2, media FROM estatisticas_notas n"
+)
+_SQL_RESERVAR = (
+    "UPDATE meta SET valor = MAX(valor, (SELECT IFNULL(MAX(id), 0) + 1 FROM tarefas)) + ?"
+    " WHERE chave = 'proximo_id' RETURNING valor"
+)
+
+
+class BancoDeDadosSQLite:
+    """Backend SQLite com a mesma interface do BancoDeDados (CSV).
+
+    Usa WAL, índices reais (status, tipo, disciplina e prazo), tabela de
+    disciplinas e busca textual FTS5 (mantida por triggers). O CSV continua disponível via importar_csv/exportar_csv.
+    Escritas passam por uma conexão única sob trava; leituras usam um pool
+    de conexões somente leitura e rodam em paralelo (WAL não bloqueia
+    leitores durante uma escrita).
+    """
+
+    SQLITE_FILENAME = os.path.join(os.path.dirname(__file__), "tarefas.db")
+    ORDENACOES = {"id": "id", "data_entrega": "data_entrega, id"}
+    IDS_POR_CONSULTA = 500  # abaixo do limite de parâmetros por comando do SQLite
+    carga_adiada = False  # abrir o banco não lê as tarefas: nada a adiar
+
+    def __init__(self, caminho: Optional[str] = None):
+        """Abre (ou cria) o banco e garante o esquema."""
+        self.caminho = caminho or self.SQLITE_FILENAME
+        # Uma conexão compartilhada; escritas serializadas pela trava
+        self._conexao = sqlite3.connect(
+            self.caminho, check_same_thread=False, isolation_level=None
+        )
+        self._trava = threading.Lock()
+        # Mutações feitas por este objeto (outros processos no mesmo arquivo não contam)
+        self.versao = 0
+        self._versoes = itertools.count(1)  # next() atômico: escritas concorrentes não repetem versão
+        # Conexões de leitura ociosas; crescem até o número de leitores simultâneos
+        self._leitores = queue.SimpleQueue()
+        self._conexoes_leitura: list = []
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute("PRAGMA synchronous=NORMAL")
+        self._conexao.execute("PRAGMA foreign_keys=ON")
+        # INSERT OR REPLACE (importar_csv) só dispara o trigger de remoção assim
+        self._conexao.execute("PRAGMA recursive_triggers=ON")
+        busca_existia = self._conexao.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'tarefas_busca'"
+        ).fetchone()
+        estatisticas_existiam = self._conexao.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'estatisticas_contagens'"
+        ).fetchone()
+        self._conexao.executescript(_ESQUEMA)
+        colunas = {linha[1] for linha in self._conexao.execute("PRAGMA table_info(tarefas)")}
+        if "lembretes" not in colunas:  # bancos criados antes da persistência de lembretes
+            self._conexao.execute(
+                "ALTER TABLE tarefas ADD COLUMN lembretes TEXT NOT NULL DEFAULT ''"
+            )
+        # Índice parcial: só as (poucas) tarefas com lembretes
+        self._conexao.execute(
+            "CREATE INDEX IF NOT EXISTS idx_tarefas_lembretes ON tarefas (id)"
+            " WHERE lembretes != ''"
+        )
+        with self._transacao() as c:
+            c.executemany(
+                "INSERT OR IGNORE INTO disciplinas (id, nome) VALUES (?, ?)",
+                DISCIPLINAS.items(),
+            )
+            c.execute("INSERT OR IGNORE INTO meta (chave, valor) VALUES ('proximo_id', 1)")
+            if not busca_existia:  # bancos criados antes da busca: indexa o que já existe
+                c.execute("INSERT INTO tarefas_busca (tarefas_busca) VALUES ('rebuild')")
+            if not estatisticas_existiam:  # bancos criados antes dos agregados: uma varredura
+                for sql in _SQL_SEMEAR_ESTATISTICAS:
+                    c.execute(sql)
+        # Catálogo pequeno e estável: mantido em memória para validar lotes sem ir ao disco
+        self._disciplinas = {
+            linha[0] for linha in self._ler("SELECT id FROM disciplinas")
+        }
+
+    def _transacao(self):
+        """Context manager: trava + BEGIN IMMEDIATE/COMMIT (ROLLBACK em erro)."""
+        return _Transacao(self._conexao, self._trava)
+
+    def _ler(self, sql: str, parametros=()) -> list:
+        """Executa uma consulta numa conexão de leitura do pool."""
+        if self.caminho == ":memory:":
+            # Cada conexão teria o seu próprio banco em memória: usa a compartilhada
+            with self._trava:
+                return self._conexao.execute(sql, parametros).fetchall()
+        try:
+            conexao = self._leitores.get_nowait()
+        except queue.Empty:
+            conexao = sqlite3.connect(
+                self.caminho, check_same_thread=False, isolation_level=None
+            )
+            conexao.execute("PRAGMA query_only=ON")
+            with self._trava:
+                self._conexoes_leitura.append(conexao)
+        try:
+            return conexao.execute(sql, parametros).fetchall()
+        finally:
+            self._leitores.put(conexao)
+
+    def aguardar_carga(self, timeout: Optional[float] = None) -> bool:
+        """Compatível com BancoDeDados: o SQLite não tem carga inicial."""
+        return True
+
+    def flush(self, duravel: bool = True) -> None:
+        """Commits já são imediatos; ``duravel`` faz checkpoint do WAL (synchronous=NORMAL)."""
+        if duravel:
+            with self._trava:
+                self._conexao.execute("PRAGMA wal_checkpoint(FULL)")
+
+    def fechar(self) -> None:
+        """Fecha as conexões com o banco."""
+        with self._trava:
+            for conexao in self._conexoes_leitura:
+                conexao.close()
+            self._conexoes_leitura = []
+            self._conexao.close()
+
+    # Simula 'Verificar existência da disciplina' em criar_tarefa.puml
+    def existe_disciplina(self, id_disciplina: int) -> bool:
+        """Verifica se a disciplina existe na tabela de disciplinas (cache em memória)."""
+        return id_disciplina in self._disciplinas
+
+    # Simula 'Criar Tarefa' em criar_tarefa.puml
+    @metricas.cronometrar("db")
+    def salvar_tarefa(self, tarefa: Tarefa) -> bool:
+        """Insere a tarefa numa única transação, alocando o ID nela se não houver (id 0).
+
+        Em colisão de ID, realoca um novo ID (como no CSV); disciplina
+        inexistente (chave estrangeira) levanta ValueError.
+        """
+        # Simulação de erro de banco (Constraint/Conexão)'
+        if tarefa.titulo == "ErroDB":
+            raise Exception("Erro de Conexão com Banco de Dados")
+        if isinstance(tarefa.tipo, str):
+            tarefa.tipo = Tipo.de_texto(tarefa.tipo, Tipo.ATIVIDADE)
+        if isinstance(getattr(tarefa, "status", None), str):
+            tarefa.status = Status.de_texto(tarefa.status, Status.EM_ANDAMENTO)
+
+        with self._transacao() as c:
+            if not tarefa.id:
+                tarefa.id = self._reservar(c, 1)  # mesma transação do INSERT
+            try:
+                c.execute(_SQL_INSERIR, self._parametros(tarefa))
+            except sqlite3.IntegrityError as e:
+                if not _conflito_de_id(e):
+                    raise _erro_de_integridade(e) from e
+                # Race Condition (ex: clique duplo): ID já usado, realoca
+                tarefa.id = self._reservar(c, 1)
+                c.execute(_SQL_INSERIR, self._parametros(tarefa))
+        # Só depois do COMMIT: leitores nunca cacheiam o estado antigo como novo
+        self.versao = next(self._versoes)
+        return True
+
+    @metricas.cronometrar("db")
+    def salvar_tarefas(self, tarefas: List[Tarefa]) -> bool:
+        """Insere um lote de tarefas (IDs já reservados) em uma única transação."""
+        if any(tarefa.titulo == "ErroDB" for tarefa in tarefas):
+            raise Exception("Erro de Conexão com Banco de Dados")
+        try:
+            with self._transacao() as c:
+                c.executemany(_SQL_INSERIR, (self._parametros(t) for t in tarefas))
+        except sqlite3.IntegrityError as e:
+            raise _erro_de_integridade(e) from e
+        self.versao = next(self._versoes)
+        return True
+
+    def buscar_tarefa(self, id_tarefa: int) -> Optional[Tarefa]:
+        """Retorna a tarefa pelo ID ou None se não existir."""
+        linhas = self._ler(_SQL_BUSCAR, (id_tarefa,))
+        return self._tarefa(linhas[0]) if linhas else None
+
+    def buscar_tarefas(self, ids: Iterable[int]) -> dict:
+        """Retorna {id: tarefa} dos IDs existentes, com um SELECT ... IN por bloco."""
+        ids = list(dict.fromkeys(ids))
+        tarefas = {}
+        for i in range(0, len(ids), self.IDS_POR_CONSULTA):
+            bloco = ids[i : i + self.IDS_POR_CONSULTA]
+            marcadores = ", ".join("?" * len(bloco))
+            sql = f"SELECT {_SQL_COLUNAS} FROM tarefas WHERE id IN ({marcadores})"
+            for linha in self._ler(sql, bloco):
+                tarefa = self._tarefa(linha)
+                tarefas[tarefa.id] = tarefa
+        return tarefas
+
+    # Simula 'Atualizar Status' e 'Desagendar Lembrete' em concluir_tarefa.puml
+    @metricas.cronometrar("db")
+    def atualizar_tarefa(self, tarefa: Tarefa) -> bool:
+        """Atualiza apenas a linha da tarefa (update parcial)."""
+        p = self._parametros(tarefa)
+        with self._transacao() as c:
+            cursor = c.execute(_SQL_ATUALIZAR, p[1:] + p[:1])
+        self.versao = next(self._versoes)
+        return cursor.rowcount > 0
+
+    @metricas.cronometrar("db")
+    def atualizar_tarefas(self, tarefas: List[Tarefa]) -> int:
+        """Atualiza várias tarefas numa única transação; retorna quantas existiam."""
+        if not tarefas:
+            return 0
+        parametros = [p[1:] + p[:1] for p in map(self._parametros, tarefas)]
+        with self._transacao() as c:
+            cursor = c.executemany(_SQL_ATUALIZAR, parametros)
+        self.versao = next(self._versoes)
+        return cursor.rowcount
+
+    @metricas.cronometrar("db")
+    def alterar_tarefas(self, ids: List[int], alterar: Callable[[Tarefa], bool]) -> dict:
+        """Lê, altera e grava tarefas numa única transação (ver BancoDeDados)."""
+        ids = list(dict.fromkeys(ids))
+        encontradas, parametros = {}, []
+        with self._transacao() as c:
+            for i in range(0, len(ids), self.IDS_POR_CONSULTA):
+                bloco = ids[i : i + self.IDS_POR_CONSULTA]
+                marcadores = ", ".join("?" * len(bloco))
+                sql = f"SELECT {_SQL_COLUNAS} FROM tarefas WHERE id IN ({marcadores})"
+                for linha in c.execute(sql, bloco).fetchall():
+                    tarefa = self._tarefa(linha)
+                    encontradas[tarefa.id] = tarefa
+                    if alterar(tarefa):
+                        p = self._parametros(tarefa)
+                        parametros.append(p[1:] + p[:1])
+            if parametros:
+                c.executemany(_SQL_ATUALIZAR, parametros)
+        if parametros:
+            self.versao = next(self._versoes)
+        return {id_tarefa: encontradas[id_tarefa] for id_tarefa in ids if id_tarefa in encontradas}
+
+    def id_existe(self, id_tarefa: int) -> bool:
+        """Verifica se um ID de tarefa já existe."""
+        return bool(self._ler("SELECT 1 FROM tarefas WHERE id = ?", (id_tarefa,)))
+
+    def proximo_id(self) -> int:
+        """Reserva e retorna o próximo ID (high-water mark na tabela meta)."""
+        with self._transacao() as c:
+            return self._reservar(c, 1)
+
+    def reservar_ids(self, quantidade: int) -> range:
+        """Reserva um bloco contíguo de IDs para inserções em lote."""
+        if quantidade <= 0:
+            return range(0)
+        with self._transacao() as c:
+            inicio = self._reservar(c, quantidade)
+        return range(inicio, inicio + quantidade)
+
+    def listar_tarefas(self) -> dict:
+        """Todas as tarefas por ID (prefira paginar_tarefas)."""
+        linhas = self._ler(f"SELECT {_SQL_COLUNAS} FROM tarefas ORDER BY id")
+        return {linha[0]: self._tarefa(linha) for linha in linhas}
+
+    def listar_lembretes_agendados(self):
+        """Gera (id_tarefa, lembrete) de todos os lembretes ainda agendados."""
+        linhas = self._ler("SELECT id, lembretes FROM tarefas WHERE lembretes != ''")
+        for id_tarefa, texto in linhas:
+            for lembrete in BancoDeDados.lembretes_de_texto(texto):
+                if lembrete.agendado:
+                    yield id_tarefa, lembrete
+
+    def consultar_tarefas(
+        self,
+        status=None,
+        tipo=None,
+        id_disciplina: Optional[int] = None,
+        inicio: Optional[datetime] = None,
+        fim: Optional[datetime] = None,
+    ) -> List[Tarefa]:
+        """Consulta filtrada pelos índices, ordenada por data de entrega."""
+        tarefas, _ = self.paginar_tarefas(
+            ordenar_por="data_entrega",
+            status=status,
+            tipo=tipo,
+            id_disciplina=id_disciplina,
+            inicio=inicio,
+            fim=fim,
+        )
+        return tarefas
+
+    def paginar_tarefas(
+        self,
+        offset: int = 0,
+        limite: Optional[int] = None,
+        ordenar_por: str = "id",
+        decrescente: bool = False,
+        **filtros,
+    ) -> tuple:
+        """Retorna (página de tarefas, total) com LIMIT/OFFSET sobre os índices."""
+        if ordenar_por not in self.ORDENACOES:
+            raise ValueError(f"Ordenação inválida: {ordenar_por}")
+        where, parametros = self._where(**filtros)
+        total = self._ler(f"SELECT COUNT(*) FROM tarefas{where}", parametros)[0][0]
+        ordem = ", ".join(
+            f"{coluna} DESC" if decrescente else coluna
+            for coluna in self.ORDENACOES[ordenar_por].split(", ")
+        )
+        linhas = self._ler(
+            f"SELECT {_SQL_COLUNAS} FROM tarefas{where} ORDER BY {ordem} LIMIT ? OFFSET ?",
+            parametros + [-1 if limite is None else limite, offset],
+        )
+        return [self._tarefa(linha) for linha in linhas], total
+
+    def consultar_prazos(
+        self,
+        inicio: Optional[datetime] = None,
+        fim: Optional[datetime] = None,
+        tipo: Optional[Tipo] = None,
+        limite: Optional[int] = None,
+    ) -> tuple:
+        """Retorna (tarefas não concluídas com prazo em [inicio, fim], total), por prazo.
+
+        Usa os índices parciais de tarefas abertas (geral e por tipo).
+        """
+        where, parametros = self._where(tipo=tipo, inicio=inicio, fim=fim)
+        where += (" AND " if where else " WHERE ") + _SQL_ABERTA
+        total = self._ler(f"SELECT COUNT(*) FROM tarefas{where}", parametros)[0][0]
+        linhas = self._ler(
+            f"SELECT {_SQL_COLUNAS} FROM tarefas{where} ORDER BY data_entrega, id LIMIT ?",
+            parametros + [-1 if limite is None else limite],
+        )
+        return [self._tarefa(linha) for linha in linhas], total
+
+    def pesquisar_texto(self, consulta: str, limite: int = 20) -> List[tuple]:
+        """[(tarefa, pontuação)] da busca em titulo/descricao pelo FTS5, da mais relevante em diante.
+
+        Mesma consulta do IndiceBusca (termos obrigatórios, "mat*" como
+        prefixo, sem acentos); a pontuação é o bm25 com sinal trocado.
+        """
+        termos = tokenizar_consulta(consulta)
+        if not termos or limite <= 0:
+            return []
+        expressao = " ".join(
+            f'"{termo}"*' if prefixo else f'"{termo}"' for termo, prefixo in termos
+        )
+        linhas = self._ler(_SQL_PESQUISAR, (expressao, limite))
+        return [(self._tarefa(linha[:-1]), -linha[-1]) for linha in linhas]
+
+    def consultar_estatisticas(self, id_disciplina: Optional[int] = None) -> dict:
+        """Mesmo relatório do BancoDeDados, lido dos agregados incrementais.
+
+        As tabelas estatisticas_contagens (por disciplina, status e tipo) e
+        estatisticas_notas (contagem, soma, média e m2 de Welford por
+        disciplina) são mantidas por triggers na mesma transação de cada
+        inserção, conclusão ou nota: o relatório lê poucas linhas por
+        disciplina, sem varrer as tarefas.
+        """
+        onde, parametros = "", []
+        if id_disciplina is not None:
+            onde, parametros = " WHERE id_disciplina = ?", [id_disciplina]
+        por_status, por_tipo = Counter(), Counter()
+        for status, tipo, quantidade in self._ler(
+            f"SELECT status, tipo, SUM(quantidade) FROM estatisticas_contagens{onde}"
+            " GROUP BY status, tipo",
+            parametros,
+        ):
+            por_status[Status.de_texto(status)] += quantidade
+            por_tipo[Tipo.de_texto(tipo)] += quantidade
+        notas = {}
+        for linha in self._ler(f"{_SQL_NOTAS}{onde}", parametros):
+            notas[linha[0]] = resumir_notas(*linha[1:-1])
+            notas[linha[0]]["media"] = linha[-1]  # média de Welford, como no AgregadoNotas
+        if id_disciplina is not None and not notas:
+            notas[id_disciplina] = resumir_notas(0, 0.0, None, None, 0.0)
+        return montar_relatorio(por_status, por_tipo, dict(sorted(notas.items())))
+
+    # Importação/exportação CSV
+    @metricas.cronometrar("db")
+    def importar_csv(self, caminho: str) -> int:
+        """Importa (upsert) as tarefas de um CSV no formato do BancoDeDados."""
+        with open(caminho, mode="r", newline="", encoding="utf-8") as f:
+            tarefas = (BancoDeDados.tarefa_de_linha(row) for row in csv.DictReader(f))
+            linhas = [self._parametros(t) for t in tarefas if t is not None]
+        with self._transacao() as c:
+            c.executemany(_SQL_INSERIR.replace("INSERT", "INSERT OR REPLACE", 1), linhas)
+            if linhas:
+                self._reservar(c, 0)  # puxa o high-water mark para depois dos IDs importados
+        self.versao = next(self._versoes)
+        return len(linhas)
+
+    @metricas.cronometrar("db")
+    def exportar_csv(self, caminho: str) -> int:
+        """Exporta todas as tarefas para um CSV no formato do BancoDeDados."""
+        total = 0
+        linhas = self._ler(f"SELECT {_SQL_COLUNAS} FROM tarefas ORDER BY id")
+        with open(caminho, mode="w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=CAMPOS_CSV)
+            writer.writeheader()
+            for linha in linhas:
+                writer.writerow(BancoDeDados.linha_de_tarefa(self._tarefa(linha)))
+                total += 1
+        return total
+
+    # Helpers
+    @staticmethod
+    def _reservar(c: sqlite3.Connection, quantidade: int) -> int:
+        """Avança o high-water mark em ``quantidade``; retorna o primeiro ID do bloco."""
+        valor = c.execute(_SQL_RESERVAR, (quantidade,)).fetchone()[0]
+        return valor - quantidade
+
+    @staticmethod
+    def _parametros(tarefa: Tarefa) -> tuple:
+        return (
+            tarefa.id,
+            tarefa.titulo,
+            tarefa.descricao,
+            tarefa.data_entrega.isoformat(),
+            tarefa.tipo.value,
+            tarefa.status.value,
+            tarefa.nota,
+            getattr(tarefa, "id_disciplina", None),
+            BancoDeDados.texto_de_lembretes(tarefa.lembretes),
+        )
+
+    @staticmethod
+    def _tarefa(linha: tuple) -> Tarefa:
+        id_tarefa, titulo, descricao, data, tipo, status, nota, id_disciplina, lembretes = linha
+        tarefa = Tarefa(
+            id_tarefa=id_tarefa,
+            titulo=titulo,
+            descricao=descricao,
+            data_entrega=datetime.fromisoformat(data),
+            tipo=Tipo.de_texto(tipo, Tipo.ATIVIDADE),
+            id_disciplina=id_disciplina,
+        )
+        tarefa.status = Status.de_texto(status, Status.EM_ANDAMENTO)
+        tarefa.nota = nota
+        if lembretes:
+            tarefa.lembretes = BancoDeDados.lembretes_de_texto(lembretes)
+        return tarefa
+
+    @staticmethod
+    def _where(
+        status=None, tipo=None, id_disciplina=None, inicio=None, fim=None
+    ) -> tuple:
+        """Monta a cláusula WHERE parametrizada a partir dos filtros."""
+        condicoes, parametros = [], []
+        for coluna, valor in (("status", status), ("tipo", tipo)):
+            if valor is None:
+                continue
+            valores = [valor] if not isinstance(valor, Iterable) or isinstance(
+                valor, (Status, Tipo)
+            ) else list(valor)
+            condicoes.append(f"{coluna} IN ({', '.join('?' * len(valores))})")
+            parametros.extend(v.value for v in valores)
+        if id_disciplina is not None:
+            condicoes.append("id_disciplina = ?")
+            parametros.append(id_disciplina)
+        if inicio is not None:
+            condicoes.append("data_entrega >= ?")
+            parametros.append(inicio.isoformat())
+        if fim is not None:
+            condicoes.append("data_entrega <= ?")
+            parametros.append(fim.isoformat())
+        where = f" WHERE {' AND '.join(condicoes)}" if condicoes else ""
+        return where, parametros
+
+
+def _conflito_de_id(erro: sqlite3.IntegrityError) -> bool:
+    """True se a violação é da chave primária (ID já usado), não de outra restrição."""
+    nome = getattr(erro, "sqlite_errorname", None)  # Python 3.11+
+    if nome is not None:
+        return nome == "SQLITE_CONSTRAINT_PRIMARYKEY"
+    return str(erro) == "UNIQUE constraint failed: tarefas.id"
+
+
+def _erro_de_integridade(erro: sqlite3.IntegrityError) -> Exception:
+    """Chave estrangeira violada vira ValueError (400); as demais seguem como estão."""
+    nome = getattr(erro, "sqlite_errorname", None)
+    if nome == "SQLITE_CONSTRAINT_FOREIGNKEY" or "FOREIGN KEY" in str(erro):
+        return ValueError("Disciplina inexistente")
+    return erro
+
+
+class _Transacao:
+    """Transação explícita (BEGIN IMMEDIATE) protegida pela trava do backend."""
+
+    def __init__(self, conexao: sqlite3.Connection, trava: threading.Lock):
+        self.conexao, self.trava = conexao, trava
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.trava.acquire()
+        try:
+            self.conexao.execute("BEGIN IMMEDIATE")
+        except Exception:
+            self.trava.release()
+            raise
+        return self.conexao
+
+    def __exit__(self, tipo_exc, exc, tb) -> bool:
+        try:
+            self.conexao.execute("ROLLBACK" if tipo_exc else "COMMIT")
+        finally:
+            self.trava.release()
+        return False
+
+
+if __name__ == "__main__":
+    # Uso: python bancoSQLite.py importar|exportar arquivo.csv [banco.db]
+    if len(sys.argv) < 3 or sys.argv[1] not in ("importar", "exportar"):
+        print("Uso: python bancoSQLite.py importar|exportar arquivo.csv [banco.db]")
+        sys.exit(2)
+    banco = BancoDeDadosSQLite(sys.argv[3] if len(sys.argv) > 3 else None)
+    if sys.argv[1] == "importar":
+        print(f"{banco.importar_csv(sys.argv[2])} tarefas importadas.")
+    else:
+        print(f"{banco.exportar_csv(sys.argv[2])} tarefas exportadas.")
+    banco.fechar()
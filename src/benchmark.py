@@ -0,0 +1,547 @@
+"""Benchmarks de desempenho do armazenamento de tarefas.
+
+Uso:
+    python benchmark.py snapshot [--tarefas N] [--repeticoes R]
+    python benchmark.py escrita [--base N] [--rajada M]
+    python benchmark.py datas [--valores N]
+    python benchmark.py suite [--escalas 1k 100k 1M] [--operacoes K] [--saida arquivo.json]
+                              [--comparar base.json] [--tolerancia 0.2]
+    python benchmark.py inicio [--tarefas 1000 100000] [--repeticoes R]
+    python benchmark.py memoria [--tarefas N]
+
+A suite mede os caminhos quentes (criar, concluir, listar, carregar e
+salvar o snapshot) e emite JSON; com --comparar, sai com código 1 se a
+mediana de alguma operação piorar mais que a tolerância.
+"""
+
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from DB import BancoDeDados, CAMPOS_CSV
+from classes import Tarefa, Tipo, Status
+from datas import _interpretar_texto, interpretar_data
+import argparse
+import csv
+import json
+import os
+import platform
+import random
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+
+def gerar_tarefas(quantidade: int, semente: int = 0, disciplinas: int = 50) -> list:
+    """Tarefas sintéticas com IDs 1..quantidade (determinísticas pela semente)."""
+    aleatorio = random.Random(semente)
+    inicio = datetime(2025, 1, 1, 8, 0)
+    tipos, status = list(Tipo), list(Status)
+    tarefas = []
+    for id_tarefa in range(1, quantidade + 1):
+        tarefa = Tarefa(
+            id_tarefa=id_tarefa,
+            titulo=f"Tarefa {id_tarefa}",
+            descricao="Descrição, com vírgula" if id_tarefa % 7 == 0 else "",
+            data_entrega=inicio + timedelta(hours=aleatorio.randrange(24 * 365)),
+            tipo=aleatorio.choice(tipos),
+            id_disciplina=aleatorio.randint(1, disciplinas),
+        )
+        tarefa.status = aleatorio.choice(status)
+        tarefas.append(tarefa)
+    return tarefas
+
+
+def gerar_disciplinas(quantidade: int) -> dict:
+    """Catálogo sintético de disciplinas (id -> nome), no formato de DISCIPLINAS."""
+    return {
+        id_disciplina: f"Disciplina {id_disciplina}"
+        for id_disciplina in range(1, quantidade + 1)
+    }
+
+
+def gerar_lembretes(
+    tarefas: list, proporcao: float = 0.2, por_tarefa: int = 2, semente: int = 0
+) -> int:
+    """Agenda lembretes antes do prazo em ~``proporcao`` das tarefas; retorna quantos."""
+    aleatorio = random.Random(semente)
+    criados = 0
+    for tarefa in tarefas:
+        if aleatorio.random() >= proporcao:
+            continue
+        for _ in range(por_tarefa):
+            antecedencia = timedelta(hours=aleatorio.randint(1, 72))
+            tarefa.adicionar_lembrete(tarefa.data_entrega - antecedencia)
+        criados += por_tarefa
+    return criados
+
+
+def gerar_payloads(quantidade: int, semente: int = 0, disciplinas: int = 50) -> list:
+    """Corpos de POST /tarefas como chegam ao controller (textos, não objetos)."""
+    aleatorio = random.Random(semente)
+    inicio = datetime(2025, 1, 1, 8, 0)
+    return [
+        {
+            "titulo": f"Nova tarefa {i}",
+            "id_disciplina": aleatorio.randint(1, disciplinas),
+            "data_entrega": (inicio + timedelta(hours=aleatorio.randrange(24 * 365))).strftime(
+                "%d/%m/%Y %H:%M"
+            ),
+            "tipo": aleatorio.choice(("prova", "trabalho", "atividade")),
+        }
+        for i in range(quantidade)
+    ]
+
+
+def medir(funcao, repeticoes: int) -> list:
+    """Executa ``funcao`` ``repeticoes`` vezes; retorna os tempos em segundos."""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return tempos
+
+
+def medir_cada(funcao, itens) -> list:
+    """Tempo de ``funcao(item)`` para cada item (latência por chamada)."""
+    tempos = []
+    for item in itens:
+        inicio = time.perf_counter()
+        funcao(item)
+        tempos.append(time.perf_counter() - inicio)
+    return tempos
+
+
+def percentis(tempos: list) -> dict:
+    """Resumo de latências em milissegundos (p50, p90, p99, média, máx.)."""
+    ms = [t * 1000 for t in tempos]
+    if len(ms) > 1:
+        cortes = statistics.quantiles(ms, n=100, method="inclusive")
+        p50, p90, p99 = cortes[49], cortes[89], cortes[98]
+    else:
+        p50 = p90 = p99 = ms[0]
+    return {
+        "p50_ms": p50,
+        "p90_ms": p90,
+        "p99_ms": p99,
+        "media_ms": statistics.fmean(ms),
+        "max_ms": max(ms),
+    }
+
+
+def resumo_operacao(tempos: list, itens_por_execucao: int = 1) -> dict:
+    """Latências e vazão (itens/s) de uma série de execuções."""
+    total = sum(tempos)
+    return {
+        "execucoes": len(tempos),
+        "vazao_por_s": len(tempos) * itens_por_execucao / total if total else None,
+        "latencia": percentis(tempos),
+    }
+
+
+def memoria_pico(funcao) -> tuple:
+    """Executa ``funcao`` sob tracemalloc; retorna (bytes retidos ao final, pico)."""
+    tracemalloc.start()
+    try:
+        funcao()
+        return tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+
+def banco_temporario(diretorio: str, **atributos) -> BancoDeDados:
+    """BancoDeDados vazio com o CSV em ``diretorio`` (atributos de classe sobrescritos)."""
+    atributos.setdefault("CSV_FILENAME", os.path.join(diretorio, "tarefas.csv"))
+    return type("BancoBenchmark", (BancoDeDados,), atributos)()
+
+
+def _salvar_legado(banco: BancoDeDados) -> None:
+    """Gravação anterior do snapshot: trunca e reescreve no lugar, sem fsync."""
+    with open(banco.CSV_FILENAME, mode="w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=CAMPOS_CSV)
+        writer.writeheader()
+        for tarefa in sorted(banco.tarefas.values(), key=lambda t: t.id):
+            writer.writerow(banco.linha_de_tarefa(tarefa))
+
+
+def bench_snapshot(quantidade: int, repeticoes: int) -> None:
+    """Compara a gravação do snapshot no lugar com a atômica (fsync + rename + backups)."""
+    tarefas = gerar_tarefas(quantidade)
+    variantes = [
+        ("legado (no lugar, sem fsync)", {}, _salvar_legado),
+        ("atômico, sem backups", {"BACKUPS": 0}, BancoDeDados._salvar_csv),
+        ("atômico, 3 backups", {"BACKUPS": 3}, BancoDeDados._salvar_csv),
+    ]
+    print(f"Snapshot de {quantidade} tarefas, {repeticoes} repetições")
+    referencia = None
+    for nome, atributos, salvar in variantes:
+        with tempfile.TemporaryDirectory() as diretorio:
+            banco = banco_temporario(diretorio, **atributos)
+            banco.tarefas.update((t.id, t) for t in tarefas)
+            tempos = medir(lambda: salvar(banco), repeticoes)
+        mediana = statistics.median(tempos)
+        referencia = referencia or mediana
+        print(
+            f"  {nome:<30} mediana {mediana * 1000:8.1f} ms"
+            f"  mín {min(tempos) * 1000:8.1f} ms  ({mediana / referencia - 1:+.1%})"
+        )
+
+
+def bench_escrita(base: int, rajada: int) -> None:
+    """Vazão de uma rajada de criações: reescrita completa, journal e modo grupo."""
+    tarefas = gerar_tarefas(base + rajada)
+    variantes = [
+        ("sem journal (reescrita)", {"MODO_JOURNAL": False}),
+        ("journal síncrono", {}),
+        ("modo grupo, sem journal", {"MODO_GRUPO": True, "MODO_JOURNAL": False}),
+        ("modo grupo", {"MODO_GRUPO": True}),
+    ]
+    print(f"Rajada de {rajada} criações sobre {base} tarefas")
+    for nome, atributos in variantes:
+        with tempfile.TemporaryDirectory() as diretorio:
+            banco = banco_temporario(diretorio, **atributos)
+            banco.salvar_tarefas(tarefas[:base])
+            inicio = time.perf_counter()
+            for tarefa in tarefas[base:]:
+                banco.salvar_tarefa(tarefa)
+            chamadas = time.perf_counter() - inicio
+            banco.fechar()
+            total = time.perf_counter() - inicio
+        print(
+            f"  {nome:<25} {rajada / chamadas:12,.0f} criações/s"
+            f"  (com fechar(): {total * 1000:8.1f} ms)"
+        )
+
+
+def _interpretar_legado(valor) -> tuple:
+    """Validação + conversão anteriores do controller (regex por chamada, até 12 strptime)."""
+    s = valor.strip()
+    formatos = [
+        ("%d/%m/%Y %H:%M", r"^\d{1,2}/\d{1,2}/\d{4}\s+\d{1,2}:\d{2}$"),
+        ("%d/%m/%Y", r"^\d{1,2}/\d{1,2}/\d{4}$"),
+        ("%Y-%m-%d %H:%M", r"^\d{4}-\d{1,2}-\d{1,2}\s+\d{1,2}:\d{2}$"),
+        ("%Y-%m-%d", r"^\d{4}-\d{1,2}-\d{1,2}$"),
+        ("%d-%m-%Y %H:%M", r"^\d{1,2}-\d{1,2}-\d{4}\s+\d{1,2}:\d{2}$"),
+        ("%d-%m-%Y", r"^\d{1,2}-\d{1,2}-\d{4}$"),
+    ]
+    for fmt, regex in formatos:
+        if re.match(regex, s):
+            try:
+                datetime.strptime(s, fmt)
+                break
+            except ValueError:
+                return None, "Data inexistente no calendário."
+    else:
+        return None, "Formato inválido."
+    for fmt in (
+        "%Y-%m-%d %H:%M",
+        "%Y-%m-%d",
+        "%d/%m/%Y %H:%M",
+        "%d/%m/%Y",
+        "%d-%m-%Y %H:%M",
+        "%d-%m-%Y",
+    ):
+        try:
+            return datetime.strptime(s, fmt), None
+        except ValueError:
+            pass
+    return None, "Data/Horário inválido."
+
+
+def gerar_datas(quantidade: int, semente: int = 0) -> list:
+    """Textos de data nos formatos aceitos, com ~5% de inválidos."""
+    aleatorio = random.Random(semente)
+    inicio = datetime(2025, 1, 1)
+    formatos = ("%d/%m/%Y %H:%M", "%Y-%m-%d %H:%M", "%d-%m-%Y %H:%M", "%d/%m/%Y")
+    valores = []
+    for _ in range(quantidade):
+        data = inicio + timedelta(minutes=aleatorio.randrange(2 * 365 * 24 * 60))
+        texto = data.strftime(aleatorio.choice(formatos))
+        if aleatorio.random() < 0.05:
+            texto = aleatorio.choice(("31/02/2025 10:00", "2025/01/01", "amanhã"))
+        valores.append(texto)
+    return valores
+
+
+def bench_datas(quantidade: int) -> None:
+    """Custo por data: parser anterior, parser único sem cache e com cache."""
+    distintas = gerar_datas(quantidade)
+    repetidas = [distintas[i % 100] for i in range(quantidade)]  # prazos comuns
+    variantes = [
+        ("anterior (regex + strptime)", distintas, _interpretar_legado, None),
+        ("datas.py, sem cache", distintas, _interpretar_texto.__wrapped__, None),
+        ("datas.py, valores distintos", distintas, interpretar_data, _interpretar_texto),
+        ("datas.py, valores repetidos", repetidas, interpretar_data, _interpretar_texto),
+    ]
+    print(f"Interpretação de {quantidade} datas")
+    referencia = None
+    for nome, valores, interpretar, cache in variantes:
+        if cache is not None:
+            cache.cache_clear()
+        (tempo,) = medir(lambda: [interpretar(v) for v in valores], 1)
+        por_valor = tempo / quantidade * 1e6
+        referencia = referencia or por_valor
+        print(f"  {nome:<30} {por_valor:7.2f} µs/data  ({referencia / por_valor:5.1f}x)")
+
+
+def _interpretar_escala(texto: str) -> int:
+    """'1k' -> 1000, '1M' -> 1_000_000; números simples passam direto."""
+    multiplicador = {"k": 1_000, "m": 1_000_000}.get(texto[-1:].lower(), 1)
+    return int(texto[:-1] if multiplicador > 1 else texto) * multiplicador
+
+
+def bench_escala(quantidade: int, operacoes: int, repeticoes: int, semente: int) -> dict:
+    """Mede salvar/carregar o snapshot e criar/concluir/listar via controller."""
+    from tarefaModel import TarefaModel
+    from tarefaController import TarefaController
+
+    resultado = {"tarefas": quantidade}
+    disciplinas = gerar_disciplinas(50)
+    tarefas = gerar_tarefas(quantidade, semente, len(disciplinas))
+    resultado["lembretes"] = gerar_lembretes(tarefas, semente=semente)
+    with tempfile.TemporaryDirectory() as diretorio:
+        banco = banco_temporario(diretorio)
+        banco.disciplinas_existentes = disciplinas
+        banco.salvar_tarefas(tarefas)
+        banco.compactar()
+        del tarefas
+
+        salvar = resumo_operacao(medir(banco._salvar_csv, repeticoes), quantidade)
+        _, salvar["memoria_pico_bytes"] = memoria_pico(banco._salvar_csv)
+        resultado["salvar_csv"] = salvar
+
+        def recarregar():
+            banco.tarefas = {}
+            banco._indices_prontos = False
+            banco._carregar_csv()
+
+        carregar = resumo_operacao(medir(recarregar, repeticoes), quantidade)
+        banco.tarefas = {}  # mede só a carga, não a cópia anterior ainda em memória
+        retida, carregar["memoria_pico_bytes"] = memoria_pico(recarregar)
+        carregar["memoria_dados_bytes"] = retida
+        resultado["carregar_csv"] = carregar
+
+        model = TarefaModel(banco)
+        controller = TarefaController(model)
+        payloads = gerar_payloads(operacoes, semente, len(disciplinas))
+        resultado["criar"] = resumo_operacao(
+            medir_cada(controller.post_criar_tarefa, payloads)
+        )
+
+        aleatorio = random.Random(semente)
+        abertas = [
+            tarefa.id
+            for tarefa in banco.consultar_tarefas(status=[Status.PENDENTE, Status.EM_ANDAMENTO])
+        ]
+        alvos = aleatorio.sample(abertas, min(operacoes, len(abertas)))
+        resultado["concluir"] = resumo_operacao(
+            medir_cada(controller.put_concluir_tarefa, alvos)
+        )
+
+        offsets = [
+            aleatorio.randrange(max(quantidade + operacoes - 20, 1)) for _ in range(operacoes)
+        ]
+        resultado["listar"] = resumo_operacao(
+            medir_cada(lambda offset: controller.get_listar_tarefas(limite=20, offset=offset), offsets)
+        )
+        resultado["listar_filtrado"] = resumo_operacao(
+            medir(
+                lambda: controller.get_listar_tarefas(
+                    limite=20, ordenar_por="data_entrega", status="Pendente", tipo="prova"
+                ),
+                operacoes,
+            )
+        )
+
+        model.cancelamentos.aguardar(timeout=30)
+        model.cancelamentos.parar()
+        banco.fechar()
+    return resultado
+
+
+def comparar(atual: dict, base: dict, tolerancia: float) -> list:
+    """Operações cuja mediana piorou mais que ``tolerancia`` em relação à base."""
+    regressoes = []
+    for escala, operacoes in atual["escalas"].items():
+        for nome, medida in operacoes.items():
+            anterior = base.get("escalas", {}).get(escala, {}).get(nome)
+            if not isinstance(medida, dict) or not isinstance(anterior, dict):
+                continue
+            novo, velho = medida["latencia"]["p50_ms"], anterior["latencia"]["p50_ms"]
+            if velho and novo / velho - 1 > tolerancia:
+                regressoes.append(
+                    f"{escala}/{nome}: p50 {velho:.4f} -> {novo:.4f} ms ({novo / velho - 1:+.1%})"
+                )
+    return regressoes
+
+
+def bench_suite(escalas: list, operacoes: int, repeticoes: int, semente: int) -> dict:
+    """Roda bench_escala em cada escala; mensagens do sistema vão para stderr."""
+    relatorio = {
+        "ambiente": {
+            "python": platform.python_version(),
+            "implementacao": platform.python_implementation(),
+            "plataforma": platform.platform(),
+            "processadores": os.cpu_count(),
+            "data": datetime.now().isoformat(timespec="seconds"),
+        },
+        "parametros": {"operacoes": operacoes, "repeticoes": repeticoes, "semente": semente},
+        "escalas": {},
+    }
+    for escala in escalas:
+        print(f"Escala {escala}...", file=sys.stderr)
+        # Os lembretes cancelados imprimem no stdout: não podem misturar-se ao JSON
+        with redirect_stdout(sys.stderr):
+            relatorio["escalas"][escala] = bench_escala(
+                _interpretar_escala(escala), operacoes, repeticoes, semente
+            )
+    return relatorio
+
+
+PROMPT_MENU = "Selecione uma opção: ".encode("utf-8")
+
+
+def tempo_ate_menu(csv_tarefas: str, carga: str) -> float:
+    """Segundos do início de ``python main.py`` até o prompt do menu aparecer."""
+    ambiente = dict(os.environ, TAREFAS_CSV=csv_tarefas, TAREFAS_CARGA=carga, TERM="dumb")
+    ambiente.pop("TAREFAS_BACKEND", None)
+    inicio = time.perf_counter()
+    processo = subprocess.Popen(
+        [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        env=ambiente,
+    )
+    lido = b""
+    while PROMPT_MENU not in lido:
+        bloco = processo.stdout.read1(65536)
+        if not bloco:
+            raise RuntimeError("main.py terminou antes de exibir o menu")
+        lido += bloco
+    tempo = time.perf_counter() - inicio
+    processo.communicate(b"0\n", timeout=600)  # sair (espera a carga e o fechamento)
+    return tempo
+
+
+def bench_inicio(tamanhos: list, repeticoes: int) -> None:
+    """Tempo até o primeiro prompt, com carga imediata e adiada, por tamanho do CSV."""
+    print(f"Tempo até o menu de main.py (mediana de {repeticoes})")
+    for quantidade in tamanhos:
+        with tempfile.TemporaryDirectory() as diretorio:
+            banco = banco_temporario(diretorio)
+            banco.salvar_tarefas(gerar_tarefas(quantidade))
+            banco.compactar()
+            banco.fechar()
+            medidas = {
+                carga: statistics.median(
+                    tempo_ate_menu(banco.CSV_FILENAME, carga) for _ in range(repeticoes)
+                )
+                for carga in ("imediata", "adiada")
+            }
+        print(
+            f"  {quantidade:>9,} tarefas  imediata {medidas['imediata'] * 1000:8.1f} ms"
+            f"  adiada {medidas['adiada'] * 1000:8.1f} ms"
+        )
+
+
+MODOS_MEMORIA = (
+    ("objetos", {}),
+    ("colunar", {"colunar": True}),
+    ("preguiçoso", {"preguicoso": True}),
+)
+
+
+def bench_memoria(quantidade: int) -> None:
+    """Memória do BancoDeDados inteiro (tarefas, índices e estatísticas) por modo.
+
+    Mede, sob tracemalloc, a carga do snapshot e a primeira página listada
+    (que constrói os índices no modo preguiçoso); o total é o retido ao fim.
+    """
+    print(f"Memória do BancoDeDados com {quantidade} tarefas (tracemalloc)")
+    with tempfile.TemporaryDirectory() as diretorio:
+        banco = banco_temporario(diretorio)
+        banco.salvar_tarefas(gerar_tarefas(quantidade))
+        banco.compactar()
+        banco.fechar()
+        caminho = banco.CSV_FILENAME
+        del banco
+        for nome, modo in MODOS_MEMORIA:
+            tempos, vivos = {}, []
+
+            def carregar():
+                inicio = time.perf_counter()
+                carregado = BancoDeDados(caminho=caminho, adiada=False, **modo)
+                tempos["carga"] = time.perf_counter() - inicio
+                carregado.paginar_tarefas(limite=20)
+                tempos["pagina"] = time.perf_counter() - inicio - tempos["carga"]
+                carregado.consultar_estatisticas()
+                vivos.append(carregado)  # o banco segue vivo até a leitura do retido
+
+            retido, pico = memoria_pico(carregar)
+            vivos.clear()
+            print(
+                f"  {nome:<11} {retido / quantidade:6.0f} B/tarefa"
+                f"  total {retido / 1e6:7.1f} MB  pico {pico / 1e6:7.1f} MB"
+                f"  carga {tempos['carga']:6.2f} s  1ª página {tempos['pagina']:6.2f} s"
+            )
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks do armazenamento de tarefas.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    snapshot = sub.add_parser("snapshot", help="gravação do snapshot CSV")
+    snapshot.add_argument("--tarefas", type=int, default=100_000)
+    snapshot.add_argument("--repeticoes", type=int, default=5)
+    escrita = sub.add_parser("escrita", help="rajada de criações (group commit)")
+    escrita.add_argument("--base", type=int, default=10_000)
+    escrita.add_argument("--rajada", type=int, default=1_000)
+    datas = sub.add_parser("datas", help="interpretação de datas do controller")
+    datas.add_argument("--valores", type=int, default=100_000)
+    suite = sub.add_parser("suite", help="caminhos quentes em várias escalas (JSON)")
+    suite.add_argument("--escalas", nargs="+", default=["1k", "100k"])
+    suite.add_argument("--operacoes", type=int, default=1_000)
+    suite.add_argument("--repeticoes", type=int, default=3)
+    suite.add_argument("--semente", type=int, default=0)
+    suite.add_argument("--saida", help="arquivo JSON (padrão: stdout)")
+    suite.add_argument("--comparar", help="JSON de uma execução anterior")
+    suite.add_argument("--tolerancia", type=float, default=0.2)
+    inicio = sub.add_parser("inicio", help="tempo até o menu de main.py")
+    inicio.add_argument("--tarefas", type=int, nargs="+", default=[1_000, 100_000])
+    inicio.add_argument("--repeticoes", type=int, default=5)
+    memoria = sub.add_parser("memoria", help="memória do banco inteiro por modo")
+    memoria.add_argument("--tarefas", type=int, default=100_000)
+    args = parser.parse_args(argv)
+
+    if args.comando == "snapshot":
+        bench_snapshot(args.tarefas, args.repeticoes)
+    elif args.comando == "escrita":
+        bench_escrita(args.base, args.rajada)
+    elif args.comando == "datas":
+        bench_datas(args.valores)
+    elif args.comando == "inicio":
+        bench_inicio(args.tarefas, args.repeticoes)
+    elif args.comando == "memoria":
+        bench_memoria(args.tarefas)
+    elif args.comando == "suite":
+        relatorio = bench_suite(args.escalas, args.operacoes, args.repeticoes, args.semente)
+        texto = json.dumps(relatorio, indent=2, ensure_ascii=False)
+        if args.saida:
+            with open(args.saida, "w", encoding="utf-8") as f:
+                f.write(texto + "\n")
+        else:
+            print(texto)
+        if args.comparar:
+            with open(args.comparar, encoding="utf-8") as f:
+                regressoes = comparar(relatorio, json.load(f), args.tolerancia)
+            for linha in regressoes:
+                print(f"REGRESSÃO {linha}", file=sys.stderr)
+            if regressoes:
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+from bisect import bisect_left, insort
+from itertools import groupby
+from typing import Iterable, List, Optional
+from classes import Tarefa
+import heapq
+import math
+import re
+import unicodedata
+
+
+_PALAVRA = re.compile(r"\w+")
+_TERMO_CONSULTA = re.compile(r"(\w+)(\*?)")
+# Marcas combinantes (acentos, til, cedilha) que sobram da decomposição NFKD
+_SEM_ACENTOS = dict.fromkeys(range(0x0300, 0x0370))
+
+PALAVRAS_VAZIAS = frozenset(
+    "a o as os e de da do das dos em na no nas nos um uma para por com ao".split()
+)
+
+
+def normalizar(texto: str) -> str:
+    """Minúsculas e sem acentos: "Matemática" -> "matematica"."""
+    texto = texto.casefold()
+    if texto.isascii():
+        return texto
+    return unicodedata.normalize("NFKD", texto).translate(_SEM_ACENTOS)
+
+
+def tokenizar(texto: str) -> List[str]:
+    """Termos indexáveis do texto (normalizados, sem palavras vazias)."""
+    return [
+        termo for termo in _PALAVRA.findall(normalizar(texto)) if termo not in PALAVRAS_VAZIAS
+    ]
+
+
+def tokenizar_consulta(consulta: str) -> List[tuple]:
+    """[(termo, prefixo)] da consulta; termo terminado em "*" é prefixo ("mat*")."""
+    termos = []
+    for termo, asterisco in _TERMO_CONSULTA.findall(normalizar(consulta)):
+        if asterisco or termo not in PALAVRAS_VAZIAS:
+            termos.append((termo, bool(asterisco)))
+    return termos
+
+
+class _TermoConsulta:
+    """Um termo da consulta já expandido: {termo do índice: idf}."""
+
+    __slots__ = ("expansoes", "documentos")
+
+    def __init__(self, expansoes: dict, documentos: int):
+        self.expansoes = expansoes
+        self.documentos = documentos  # estimativa (soma das frequências)
+
+
+def _contribuicao(faixa: tuple) -> float:
+    return faixa[0]
+
+
+def _agrupar(partes: Iterable[tuple]) -> dict:
+    """{pontuação: IDs} a partir de (pontuação, IDs), unindo pontuações iguais."""
+    classes = {}
+    for pontuacao, ids in partes:
+        if ids:
+            # Sem |=: os conjuntos podem ser partes compartilhadas
+            classes[pontuacao] = classes[pontuacao] | ids if pontuacao in classes else ids
+    return classes
+
+
+def _ordem(item: tuple) -> tuple:
+    """Chave de (id, pontuação): maior pontuação primeiro, empate por ID."""
+    return (-item[1], item[0])
+
+
+def limitar_expansoes(frequencias: dict, expansoes: int) -> dict:
+    """As ``expansoes`` mais frequentes de {termo: frequência}, empates pela ordem do termo.
+
+    Mesmo critério de IndiceBusca para prefixos: aplicado às frequências
+    somadas de várias partições, escolhe as expansões de um índice único.
+    """
+    if len(frequencias) <= expansoes:
+        return frequencias
+    termos = heapq.nlargest(expansoes, sorted(frequencias), key=frequencias.__getitem__)
+    return {termo: frequencias[termo] for termo in termos}
+
+
+class IndiceBusca:
+    """Índice invertido de titulo e descricao, mantido pelo BancoDeDados.
+
+    Para cada termo normalizado, listas ordenadas de IDs das tarefas com o
+    termo no título (peso PESO_TITULO) e só na descrição (peso 1); o
+    vocabulário ordenado atende prefixos por busca binária. A pontuação é
+    a soma de idf * peso dos termos da consulta, todos obrigatórios (um
+    prefixo vale a maior contribuição entre os termos que o atendem). Um
+    termo só custa O(limite), mesmo muito comum; com vários, a interseção
+    dos IDs é feita em C, do termo mais raro ao mais comum.
+    """
+
+    PESO_TITULO = 3
+    MAX_EXPANSOES = 50  # termos mais frequentes considerados por prefixo
+    MAX_CLASSES = 64  # acima disso a pontuação de vários termos é tarefa a tarefa
+
+    def __init__(self):
+        self._titulo = {}  # termo -> IDs ordenados com o termo no título
+        self._descricao = {}  # termo -> IDs ordenados com o termo só na descrição
+        self._vocabulario: List[str] = []
+        # Textos indexados por ID, como as chaves de IndiceTarefas
+        self._textos = {}  # id -> (titulo, descricao)
+
+    def __len__(self) -> int:
+        return len(self._textos)
+
+    @staticmethod
+    def _texto(tarefa: Tarefa) -> tuple:
+        return (tarefa.titulo or "", getattr(tarefa, "descricao", "") or "")
+
+    @classmethod
+    def _pesos(cls, titulo: str, descricao: str) -> dict:
+        """{termo: peso} de uma tarefa (o título prevalece sobre a descrição)."""
+        pesos = dict.fromkeys(tokenizar(descricao), 1)
+        pesos.update(dict.fromkeys(tokenizar(titulo), cls.PESO_TITULO))
+        return pesos
+
+    def _postings(self, peso: int) -> dict:
+        return self._titulo if peso == self.PESO_TITULO else self._descricao
+
+    def reconstruir(self, tarefas: Iterable[Tarefa]) -> None:
+        """Reconstrói o índice de uma vez (listas ordenadas no final)."""
+        self.__init__()
+        for tarefa in tarefas:
+            texto = self._texto(tarefa)
+            self._textos[tarefa.id] = texto
+            for termo, peso in self._pesos(*texto).items():
+                self._postings(peso).setdefault(termo, []).append(tarefa.id)
+        for postings in (self._titulo, self._descricao):
+            for ids in postings.values():
+                ids.sort()
+        self._vocabulario = sorted(self._titulo.keys() | self._descricao.keys())
+
+    def atualizar(self, tarefa: Tarefa) -> None:
+        """Insere ou reindexa a tarefa (no-op se título e descrição não mudaram)."""
+        texto = self._texto(tarefa)
+        antigo = self._textos.get(tarefa.id)
+        if antigo == texto:
+            return
+        if antigo is not None:
+            self._retirar(tarefa.id, antigo)
+        self._textos[tarefa.id] = texto
+        for termo, peso in self._pesos(*texto).items():
+            if termo not in self._titulo and termo not in self._descricao:
+                insort(self._vocabulario, termo)
+            insort(self._postings(peso).setdefault(termo, []), tarefa.id)
+
+    def remover(self, id_tarefa: int) -> None:
+        antigo = self._textos.pop(id_tarefa, None)
+        if antigo is not None:
+            self._retirar(id_tarefa, antigo)
+
+    def frequencias(self, consulta: str, todas_expansoes: bool = False) -> tuple:
+        """(total de tarefas, [{termo do índice: nº de tarefas}] por termo da consulta).
+
+        Somadas entre vários índices (partições), dão o idf do conjunto
+        para ``buscar(..., frequencias=...)``; para isso, peça todas as
+        expansões de prefixo (``todas_expansoes``) e limite depois da soma
+        com ``limitar_expansoes``.
+        """
+        expansoes = None if todas_expansoes else self.MAX_EXPANSOES
+        return len(self._textos), [
+            {
+                encontrado: self._frequencia(encontrado)
+                for encontrado in self._encontrar(termo, prefixo, expansoes)
+            }
+            for termo, prefixo in tokenizar_consulta(consulta)
+        ]
+
+    def buscar(
+        self, consulta: str, limite: int = 20, frequencias: Optional[tuple] = None
+    ) -> List[tuple]:
+        """[(id, pontuação)] das tarefas com todos os termos, da mais relevante em diante.
+
+        Empates na pontuação saem por ID crescente. ``frequencias`` (no
+        formato de ``frequencias()``, somadas entre partições) troca as
+        estatísticas locais do idf pelas do conjunto: as pontuações de
+        partições diferentes ficam comparáveis.
+        """
+        total, por_termo = frequencias or self.frequencias(consulta)
+        termos = [self._termo_consulta(total, termo) for termo in por_termo]
+        if not termos or limite <= 0 or any(termo is None for termo in termos):
+            return []
+        if len(termos) == 1:
+            return self._buscar_termo(termos[0], limite)
+
+        # Vários termos: do mais raro ao mais comum, cada um reparte os
+        # candidatos pela sua maior contribuição (interseções em C); a união
+        # das partes são os candidatos do termo seguinte
+        particoes = []
+        candidatos = None
+        for termo in sorted(termos, key=lambda termo: termo.documentos):
+            partes = self._particionar(termo, candidatos)
+            if not partes:
+                return []
+            particoes.append(partes)
+            if len(partes) == 1:
+                candidatos = partes[0][1]
+            else:
+                candidatos = set().union(*(parte for _, parte in partes))
+        # O último termo reparte exatamente os candidatos finais: começa por ele
+        particoes.reverse()
+
+        if math.prod(len(partes) for partes in particoes) > self.MAX_CLASSES:
+            # Muitas combinações de contribuições: soma tarefa a tarefa
+            pontuacoes = dict.fromkeys(candidatos, 0.0)
+            for partes in particoes:
+                for contribuicao, parte in partes:
+                    for id_tarefa in candidatos.intersection(parte):
+                        pontuacoes[id_tarefa] += contribuicao
+            return heapq.nsmallest(limite, pontuacoes.items(), key=_ordem)
+
+        # Classes de pontuação: {pontuação: IDs}, refinadas termo a termo por
+        # interseção de conjuntos (em C), sempre na mesma ordem de soma
+        classes = _agrupar(particoes[0])
+        for partes in particoes[1:]:
+            classes = _agrupar(
+                (pontuacao + contribuicao, conjunto & parte)
+                for pontuacao, conjunto in classes.items()
+                for contribuicao, parte in partes
+            )
+        melhores = []
+        for pontuacao in sorted(classes, reverse=True):
+            # Conjuntos de inteiros iteram quase em ordem: sorted é quase linear
+            ids = sorted(classes[pontuacao])[: limite - len(melhores)]
+            melhores.extend((id_tarefa, pontuacao) for id_tarefa in ids)
+            if len(melhores) == limite:
+                break
+        return melhores
+
+    def _buscar_termo(self, termo: _TermoConsulta, limite: int) -> List[tuple]:
+        """Um termo só: faixas da maior contribuição para a menor, IDs em ordem.
+
+        Cada tarefa vale a contribuição da primeira faixa em que aparece;
+        para assim que houver ``limite`` tarefas.
+        """
+        faixas = sorted(self._faixas_termo(termo), key=_contribuicao, reverse=True)
+        vistos = set() if len(termo.expansoes) > 1 else None
+        melhores = []
+        for contribuicao, grupo in groupby(faixas, key=_contribuicao):
+            if len(melhores) == limite:
+                break
+            # Faixas de mesma contribuição intercaladas: empates por ID crescente
+            for id_tarefa in heapq.merge(*(ids for _, ids in grupo)):
+                if vistos is not None:
+                    if id_tarefa in vistos:
+                        continue
+                    vistos.add(id_tarefa)
+                melhores.append((id_tarefa, contribuicao))
+                if len(melhores) == limite:
+                    break
+        return melhores
+
+    # Helpers
+    def _particionar(self, termo: _TermoConsulta, candidatos: Optional[set]) -> List[tuple]:
+        """[(contribuição, IDs)]: os candidatos com o termo, pela maior contribuição.
+
+        Sem candidatos (primeiro termo), todas as tarefas com o termo.
+        """
+        faixas = sorted(self._faixas_termo(termo), key=_contribuicao, reverse=True)
+        if candidatos is not None and (
+            len(candidatos) * len(faixas) * 16 < sum(len(ids) for _, ids in faixas)
+        ):
+            # Poucos candidatos: busca binária nas faixas, da maior para a menor
+            partes = {}
+            for id_tarefa in candidatos:
+                for contribuicao, ids in faixas:
+                    i = bisect_left(ids, id_tarefa)
+                    if i < len(ids) and ids[i] == id_tarefa:
+                        partes.setdefault(contribuicao, set()).add(id_tarefa)
+                        break
+            return list(partes.items())
+        # Uma passada (em C) por faixa; título e descrição de um mesmo termo
+        # são disjuntos, só expansões de prefixo podem repetir tarefas
+        partes = []
+        vistos = set() if len(termo.expansoes) > 1 else None
+        for contribuicao, ids in faixas:
+            parte = set(ids) if candidatos is None else candidatos.intersection(ids)
+            if vistos is not None:
+                parte -= vistos
+                vistos |= parte
+            if parte:
+                partes.append((contribuicao, parte))
+        return partes
+
+    def _frequencia(self, termo: str) -> int:
+        return len(self._titulo.get(termo, ())) + len(self._descricao.get(termo, ()))
+
+    def _faixas(self, termo: str) -> List[tuple]:
+        """[(peso, IDs)] do termo no título e só na descrição."""
+        return [
+            (peso, postings[termo])
+            for peso, postings in ((self.PESO_TITULO, self._titulo), (1, self._descricao))
+            if termo in postings
+        ]
+
+    def _faixas_termo(self, termo_consulta: _TermoConsulta) -> List[tuple]:
+        """[(idf * peso, IDs)] de todas as expansões do termo da consulta."""
+        return [
+            (idf * peso, ids)
+            for termo, idf in termo_consulta.expansoes.items()
+            for peso, ids in self._faixas(termo)
+        ]
+
+    def _encontrar(self, termo: str, prefixo: bool, expansoes: Optional[int]) -> List[str]:
+        """Termos do índice que atendem ao termo da consulta (os ``expansoes`` mais frequentes)."""
+        if not prefixo:
+            return [termo] if self._frequencia(termo) else []
+        inicio = bisect_left(self._vocabulario, termo)
+        fim = bisect_left(self._vocabulario, termo + "\U0010ffff", inicio)
+        encontrados = self._vocabulario[inicio:fim]
+        if expansoes is not None and len(encontrados) > expansoes:
+            encontrados = heapq.nlargest(expansoes, encontrados, key=self._frequencia)
+        return encontrados
+
+    def _termo_consulta(self, total: int, frequencias: dict) -> Optional[_TermoConsulta]:
+        """Expansões presentes neste índice com o idf de ``total`` tarefas (None se nenhuma)."""
+        expansoes = {
+            termo: math.log(1 + total / frequencia)
+            for termo, frequencia in frequencias.items()
+            if self._frequencia(termo)
+        }
+        if not expansoes:
+            return None
+        return _TermoConsulta(expansoes, sum(frequencias.values()))
+
+    def _retirar(self, id_tarefa: int, texto: tuple) -> None:
+        for termo, peso in self._pesos(*texto).items():
+            postings = self._postings(peso)
+            ids = postings[termo]
+            i = bisect_left(ids, id_tarefa)
+            if i < len(ids) and ids[i] == id_tarefa:
+                del ids[i]
+            if not ids:
+                del postings[termo]
+                if termo not in self._titulo and termo not in self._descricao:
+                    del self._vocabulario[bisect_left(self._vocabulario, termo)]
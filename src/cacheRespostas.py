@@ -0,0 +1,109 @@
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+import metricas
+import threading
+
+
+class EntradaCache:
+    """Resposta de uma versão dos dados, com renderizações memoizadas.
+
+    ``renderizar(formato, funcao)`` chama ``funcao(body)`` só na primeira
+    vez por formato (ex.: "texto" na CLI, "json" no servidor HTTP); as
+    seguintes devolvem o mesmo objeto já pronto.
+    """
+
+    __slots__ = ("versao", "resposta", "_renderizacoes")
+
+    def __init__(self, versao, resposta: dict):
+        self.versao = versao
+        self.resposta = resposta
+        self._renderizacoes = {}
+
+    def renderizar(self, formato: str, funcao: Callable):
+        try:
+            return self._renderizacoes[formato]
+        except KeyError:
+            pass
+        # Duas threads podem renderizar juntas; setdefault mantém a primeira
+        return self._renderizacoes.setdefault(formato, funcao(self.resposta["body"]))
+
+
+class CacheRespostas:
+    """Cache LRU de respostas do controller, invalidado pela versão dos dados.
+
+    ``versao`` é lido antes de produzir a resposta: uma escrita concorrente
+    muda a versão e a entrada gravada já nasce obsoleta, nunca servindo
+    dados antigos como novos. Qualquer mutação invalida todas as entradas
+    (a versão é global), que são descartadas na primeira consulta seguinte.
+    Acerto: O(1), sem tocar no model.
+
+    As respostas ficam no formato {"status", "body"} de sempre; as
+    renderizações (texto, JSON) ficam aqui, achadas pela própria resposta
+    em ``renderizar``.
+    """
+
+    def __init__(self, versao: Callable[[], Hashable], capacidade: int = 128):
+        self._versao = versao
+        self.capacidade = capacidade
+        self._entradas: OrderedDict = OrderedDict()  # chave -> EntradaCache
+        # id(resposta) -> EntradaCache; a entrada segura a resposta, então o id não é reusado
+        self._por_resposta = {}
+        self._versao_atual = None
+        self._trava = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def obter(self, chave: Hashable, produzir: Callable[[], dict]) -> dict:
+        """Resposta cacheada para ``chave`` ou ``produzir()`` (só respostas 200 entram).
+
+        A resposta devolvida é compartilhada entre chamadas: não deve ser alterada.
+        """
+        versao = self._versao()
+        with self._trava:
+            if versao != self._versao_atual:
+                self._limpar()
+                self._versao_atual = versao
+            entrada = self._entradas.get(chave)
+            if entrada is not None:
+                self._entradas.move_to_end(chave)
+        if entrada is not None:
+            metricas.incrementar("tarefas_cache_total", resultado="acerto")
+            return entrada.resposta
+        metricas.incrementar("tarefas_cache_total", resultado="falha")
+
+        resposta = produzir()
+        if resposta["status"] != 200:
+            return resposta
+        entrada = EntradaCache(versao, resposta)
+        with self._trava:
+            if versao == self._versao_atual:
+                antiga = self._entradas.pop(chave, None)
+                if antiga is not None:
+                    self._por_resposta.pop(id(antiga.resposta), None)
+                self._entradas[chave] = entrada
+                self._por_resposta[id(resposta)] = entrada
+                while len(self._entradas) > self.capacidade:
+                    _, removida = self._entradas.popitem(last=False)
+                    self._por_resposta.pop(id(removida.resposta), None)
+        return resposta
+
+    def renderizar(self, resposta: dict, formato: str, funcao: Callable):
+        """``funcao(resposta["body"])``, memoizada por formato se a resposta veio do cache.
+
+        Ex.: o servidor HTTP monta o JSON de uma página uma vez por versão dos dados.
+        """
+        with self._trava:
+            entrada = self._por_resposta.get(id(resposta))
+        if entrada is None or entrada.resposta is not resposta:
+            return funcao(resposta["body"])
+        return entrada.renderizar(formato, funcao)
+
+    def limpar(self) -> None:
+        with self._trava:
+            self._limpar()
+
+    def _limpar(self) -> None:
+        """Descarta todas as entradas (com a trava)."""
+        self._entradas.clear()
+        self._por_resposta.clear()
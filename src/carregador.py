@@ -0,0 +1,369 @@
+from collections import OrderedDict
+from collections.abc import Callable, Iterator, MutableMapping
+from operator import attrgetter
+from typing import Optional
+from classes import Tarefa
+import csv
+import heapq
+import io
+import threading
+import zlib
+
+
+class RelatorioCarga:
+    """Contabiliza as linhas rejeitadas durante a carga (guarda só as primeiras).
+
+    Erros são registros corrompidos no meio do journal: diferente de uma
+    linha ignorada, indicam mutações confirmadas que podem ter se perdido.
+    """
+
+    MAX_DETALHES = 100
+
+    def __init__(self):
+        self.rejeitadas = 0
+        self.detalhes: list = []  # (arquivo, linha, motivo)
+        self.erros = 0
+        self.detalhes_erros: list = []
+
+    def rejeitar(self, arquivo: str, linha: int, motivo: str) -> None:
+        self.rejeitadas += 1
+        if len(self.detalhes) < self.MAX_DETALHES:
+            self.detalhes.append((arquivo, linha, motivo))
+
+    def registrar_erro(self, arquivo: str, linha: int, motivo: str) -> None:
+        self.erros += 1
+        if len(self.detalhes_erros) < self.MAX_DETALHES:
+            self.detalhes_erros.append((arquivo, linha, motivo))
+
+
+def verificar_arquivo(caminho: str) -> dict:
+    """Tamanho e CRC32 do arquivo, lido em blocos (comparado com o .meta na carga)."""
+    crc, tamanho = 0, 0
+    with open(caminho, mode="rb") as f:
+        while bloco := f.read(1 << 20):
+            crc = zlib.crc32(bloco, crc)
+            tamanho += len(bloco)
+    return {"bytes": tamanho, "crc32": crc}
+
+
+class ArquivoVerificado:
+    """Arquivo binário com write(str) que acumula tamanho e CRC32 do que grava.
+
+    Usado como destino do csv.writer: o snapshot é verificado enquanto é
+    escrito, sem reler o arquivo. As linhas são agrupadas em blocos antes
+    de codificar, para não pagar encode/crc32 por linha.
+    """
+
+    TAMANHO_BLOCO = 512  # linhas por bloco
+
+    def __init__(self, arquivo):
+        self.arquivo = arquivo
+        self.crc = 0
+        self.tamanho = 0
+        self._bloco: list = []
+
+    def write(self, texto: str) -> None:
+        self._bloco.append(texto)
+        if len(self._bloco) >= self.TAMANHO_BLOCO:
+            self.flush()
+
+    def flush(self) -> None:
+        """Codifica e grava o bloco pendente (chamar antes de fechar o arquivo)."""
+        if not self._bloco:
+            return
+        dados = "".join(self._bloco).encode("utf-8")
+        self._bloco = []
+        self.crc = zlib.crc32(dados, self.crc)
+        self.tamanho += len(dados)
+        self.arquivo.write(dados)
+
+    def verificacao(self) -> dict:
+        return {"bytes": self.tamanho, "crc32": self.crc}
+
+
+def ler_linhas(
+    caminho: str, cabecalho: Optional[list] = None
+) -> Iterator[tuple]:
+    """Lê o CSV em streaming, produzindo (número da linha, dict da linha).
+
+    Sem ``cabecalho``, a primeira linha do arquivo é usada como cabeçalho
+    (snapshot); com ele, todas as linhas são dados (journal).
+    """
+    with open(caminho, mode="r", newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        if cabecalho is None:
+            cabecalho = next(reader, None)
+            if cabecalho is None:
+                return
+        for valores in reader:
+            if valores:
+                yield reader.line_num, dict(zip(cabecalho, valores))
+
+
+class _UltimaLinha:
+    """Destino do csv.writer que guarda só o texto da última linha escrita."""
+
+    texto = ""
+
+    def write(self, texto: str) -> None:
+        self.texto = texto
+
+
+def formatar_journal(linhas: list, campos: list) -> bytes:
+    """Registros do journal: cada linha CSV termina com o CRC32 (hex) do próprio texto.
+
+    O CRC permite distinguir, na carga, um registro completo de um append
+    interrompido ou de bytes corrompidos no meio do arquivo.
+    """
+    destino = _UltimaLinha()
+    writer = csv.writer(destino, lineterminator="")
+    partes = []
+    for linha in linhas:
+        writer.writerow([linha[campo] for campo in campos])
+        corpo = destino.texto.encode("utf-8")
+        partes.append(b"%s,%08x\r\n" % (corpo, zlib.crc32(corpo)))
+    return b"".join(partes)
+
+
+def ler_journal(caminho: str, campos: int) -> Iterator[tuple]:
+    """Lê o journal em modo binário, produzindo (linha, fim, valores, motivo).
+
+    ``fim`` é o offset logo após o registro. ``motivo`` é None para um
+    registro íntegro (terminado em quebra de linha, com ``campos`` campos
+    e o CRC32 conferindo) e descreve a falha caso contrário; ``valores``
+    só vale se íntegro. Registros sem CRC, de journals anteriores a ele,
+    são aceitos pela contagem de campos.
+    Registros com campos entre aspas que atravessam linhas são seguidos
+    pela paridade de aspas, como em indexar_offsets.
+    """
+    with open(caminho, mode="rb") as f:
+        offset = 0
+        numero = 0
+        bruto = b""
+        for linha in f:
+            numero += 1
+            if not bruto:
+                inicio = numero
+            bruto += linha
+            offset += len(linha)
+            if bruto.count(b'"') % 2:
+                continue  # campo entre aspas continua na próxima linha
+            registro, bruto = bruto, b""
+            if not registro.strip():
+                continue
+            yield (inicio, offset, *_validar_registro(registro, campos))
+        if bruto:
+            yield inicio, offset, None, "registro incompleto (campo entre aspas aberto)"
+
+
+def _validar_registro(registro: bytes, campos: int) -> tuple:
+    """(valores, None) se o registro do journal estiver íntegro; (None, motivo) se não."""
+    if not registro.endswith(b"\n"):
+        return None, "registro incompleto (sem quebra de linha)"
+    try:
+        valores = next(csv.reader((registro.decode("utf-8"),)))
+    except (csv.Error, StopIteration, UnicodeDecodeError) as e:
+        return None, f"registro ilegível: {e}"
+    if len(valores) == campos + 1:
+        corpo, _, crc = registro.rstrip(b"\r\n").rpartition(b",")
+        try:
+            confere = int(crc, 16) == zlib.crc32(corpo)
+        except ValueError:
+            confere = False
+        if not confere:
+            return None, "CRC32 do registro não confere"
+        return valores[:campos], None
+    if len(valores) != campos:
+        return None, f"{len(valores)} campo(s), esperado(s) {campos}"
+    return valores, None
+
+
+def indexar_offsets(caminho: str, relatorio: RelatorioCarga) -> tuple:
+    """Varre o snapshot em modo binário e retorna (cabeçalho, {id: offset}).
+
+    Só o prefixo numérico (ID) de cada registro é decodificado; registros
+    com campos entre aspas que atravessam linhas são seguidos pela
+    paridade de aspas.
+    """
+    offsets = {}
+    with open(caminho, mode="rb") as f:
+        primeira = f.readline()
+        if not primeira:
+            return [], offsets
+        cabecalho = next(csv.reader([primeira.decode("utf-8-sig")]))
+        offset = f.tell()
+        numero = 1
+        aberto = False  # dentro de um campo entre aspas que continua na próxima linha
+        for linha in f:
+            numero += 1
+            if not aberto:
+                inicio = offset
+                virgula = linha.find(b",")
+                try:
+                    offsets[int(linha[:virgula])] = inicio
+                except ValueError:
+                    if linha.strip():
+                        relatorio.rejeitar(caminho, numero, "ID ausente ou não numérico")
+            if linha.count(b'"') % 2:
+                aberto = not aberto
+            offset += len(linha)
+    return cabecalho, offsets
+
+
+class TarefasPreguicosas(MutableMapping):
+    """Mapa id -> Tarefa que materializa do snapshot sob demanda.
+
+    Guarda apenas o offset de cada registro; tarefas lidas ficam num cache
+    LRU limitado. Tarefas gravadas depois da carga (novas ou alteradas)
+    ficam fixadas em memória, pois o snapshot em disco está desatualizado
+    para elas, até a compactação regravar o snapshot (reindexar).
+    Leituras concorrentes são seguras: o LRU tem trava própria.
+    """
+
+    TAMANHO_CACHE = 10_000
+
+    def __init__(
+        self,
+        caminho: str,
+        cabecalho: list,
+        offsets: dict,
+        converter: Callable[[dict], Tarefa],
+        relatorio: RelatorioCarga,
+    ):
+        self.caminho = caminho
+        self.cabecalho = cabecalho
+        self.offsets = offsets
+        self.converter = converter  # levanta ValueError com o motivo
+        self.relatorio = relatorio
+        self._cache: OrderedDict = OrderedDict()
+        self._alterados: dict = {}
+        self._trava_cache = threading.Lock()  # leitores também alteram o LRU
+
+    def __getitem__(self, id_tarefa: int) -> Tarefa:
+        tarefa = self._alterados.get(id_tarefa)
+        if tarefa is not None:
+            return tarefa
+        with self._trava_cache:
+            tarefa = self._cache.get(id_tarefa)
+            if tarefa is not None:
+                self._cache.move_to_end(id_tarefa)
+                return tarefa
+        if id_tarefa not in self.offsets:
+            raise KeyError(id_tarefa)
+        tarefa = self._materializar(id_tarefa)
+        with self._trava_cache:
+            # Outra thread pode ter materializado a mesma tarefa: mantém a primeira
+            tarefa = self._cache.setdefault(id_tarefa, tarefa)
+            self._cache.move_to_end(id_tarefa)
+            if len(self._cache) > self.TAMANHO_CACHE:
+                self._cache.popitem(last=False)
+        return tarefa
+
+    def __setitem__(self, id_tarefa: int, tarefa: Tarefa) -> None:
+        with self._trava_cache:
+            self._cache.pop(id_tarefa, None)
+        self._alterados[id_tarefa] = tarefa
+
+    def __delitem__(self, id_tarefa: int) -> None:
+        encontrado = self._alterados.pop(id_tarefa, None) is not None
+        with self._trava_cache:
+            self._cache.pop(id_tarefa, None)
+        if self.offsets.pop(id_tarefa, None) is None and not encontrado:
+            raise KeyError(id_tarefa)
+
+    def __contains__(self, id_tarefa) -> bool:
+        return id_tarefa in self.offsets or id_tarefa in self._alterados
+
+    def __iter__(self):
+        yield from self.offsets
+        for id_tarefa in self._alterados:
+            if id_tarefa not in self.offsets:
+                yield id_tarefa
+
+    def __len__(self) -> int:
+        novos = sum(1 for id_tarefa in self._alterados if id_tarefa not in self.offsets)
+        return len(self.offsets) + novos
+
+    def values(self) -> Iterator[Tarefa]:
+        """Itera lendo o snapshot em sequência, com um só arquivo aberto.
+
+        As tarefas não ficam retidas (nem entram no LRU): índices, busca e a
+        gravação do snapshot percorrem tudo sem materializar o conjunto.
+        Registros inválidos são descartados e contados. A ordem é a do
+        snapshot (por ID), com as tarefas novas intercaladas por ID.
+        """
+        novos = sorted(id_tarefa for id_tarefa in self._alterados if id_tarefa not in self.offsets)
+        yield from heapq.merge(
+            self._percorrer(),
+            (self._alterados[id_tarefa] for id_tarefa in novos),
+            key=attrgetter("id"),
+        )
+
+    def items(self) -> Iterator[tuple]:
+        for tarefa in self.values():
+            yield tarefa.id, tarefa
+
+    def reindexar(self, caminho: str, cabecalho: list, offsets: dict) -> None:
+        """Aponta para um snapshot regravado com tudo o que estava em memória.
+
+        As alteradas já estão no arquivo novo e deixam de ficar fixadas;
+        quem chama garante que não há escritas concorrentes.
+        """
+        with self._trava_cache:
+            self.caminho = caminho
+            self.cabecalho = cabecalho
+            self.offsets = offsets
+            self._alterados = {}
+
+    def _percorrer(self) -> Iterator[Tarefa]:
+        """Registros do snapshot em ordem de arquivo (alterados e LRU têm precedência)."""
+        with open(self.caminho, mode="rb") as f:
+            f.readline()  # cabeçalho
+            offset = f.tell()
+            bruto = b""
+            for linha in f:
+                if not bruto:
+                    inicio = offset
+                bruto += linha
+                offset += len(linha)
+                if bruto.count(b'"') % 2:
+                    continue  # campo entre aspas continua na próxima linha
+                registro, bruto = bruto, b""
+                try:
+                    id_tarefa = int(registro[: registro.find(b",")])
+                except ValueError:
+                    continue  # já contado em indexar_offsets
+                if self.offsets.get(id_tarefa) != inicio:
+                    continue  # removido, inválido ou repetido adiante no arquivo
+                tarefa = self._alterados.get(id_tarefa)
+                if tarefa is None:
+                    with self._trava_cache:
+                        tarefa = self._cache.get(id_tarefa)
+                if tarefa is None:
+                    try:
+                        tarefa = self._converter_registro(id_tarefa, registro)
+                    except KeyError:
+                        continue
+                yield tarefa
+
+    def _materializar(self, id_tarefa: int) -> Tarefa:
+        """Lê o registro no offset indexado e converte em Tarefa."""
+        with open(self.caminho, mode="rb") as f:
+            f.seek(self.offsets[id_tarefa])
+            bruto = f.readline()
+            while bruto.count(b'"') % 2:
+                continuacao = f.readline()
+                if not continuacao:
+                    break
+                bruto += continuacao
+        return self._converter_registro(id_tarefa, bruto)
+
+    def _converter_registro(self, id_tarefa: int, bruto: bytes) -> Tarefa:
+        try:
+            valores = next(csv.reader(io.StringIO(bruto.decode("utf-8"))))
+            return self.converter(dict(zip(self.cabecalho, valores)))
+        except (ValueError, StopIteration, UnicodeDecodeError) as e:
+            # Linha corrompida: deixa de existir para o restante da sessão
+            self.offsets.pop(id_tarefa, None)
+            self.relatorio.rejeitar(self.caminho, 0, f"ID {id_tarefa}: {e}")
+            raise KeyError(id_tarefa) from e
@@ -1,10 +1,50 @@
 from enum import Enum
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Sequence
+import copy
+
+
+class _EnumCoercivel(Enum):
+    """Base dos enums de domínio: coerção de texto e códigos inteiros.
+
+    As tabelas são montadas uma vez por _preparar_enum; cada coerção é um
+    lookup em dict, sem varrer os membros.
+    """
+
+    @classmethod
+    def de_texto(cls, valor, padrao=None):
+        """Membro pelo nome ou valor (sem diferenciar maiúsculas); ``padrao`` se inválido."""
+        if isinstance(valor, cls):
+            return valor
+        if not isinstance(valor, str):
+            return padrao
+        membro = cls._por_texto.get(valor)  # caminho comum: texto exato (CSV, SQLite)
+        if membro is None:
+            membro = cls._por_texto.get(valor.strip().casefold(), padrao)
+        return membro
+
+    @classmethod
+    def de_codigo(cls, codigo: int):
+        """Membro pelo código inteiro (``membro.codigo``)."""
+        return cls._por_codigo[codigo]
+
+
+def _preparar_enum(enum_cls):
+    """Monta as tabelas de coerção e atribui ``codigo`` (ordem de definição) a cada membro."""
+    enum_cls._por_texto = {}
+    for membro in enum_cls:
+        for chave in (membro.name, membro.value):
+            enum_cls._por_texto[chave] = membro
+            enum_cls._por_texto[chave.casefold()] = membro
+    enum_cls._por_codigo = tuple(enum_cls)
+    for codigo, membro in enumerate(enum_cls):
+        membro.codigo = codigo  # códigos persistidos: não reordenar os membros
+    return enum_cls
 
 
 # Baseado em classes_tarefa.puml
-class Status(Enum):
+@_preparar_enum
+class Status(_EnumCoercivel):
     """Estados possíveis de uma tarefa."""
 
     PENDENTE = "Pendente"
@@ -12,7 +52,8 @@ class Status(Enum):
     CONCLUIDO = "Concluido"
 
 
-class Tipo(Enum):
+@_preparar_enum
+class Tipo(_EnumCoercivel):
     """Tipos de tarefa conforme o escopo do sistema."""
 
     PROVA = "Prova"
@@ -23,19 +64,41 @@ class Tipo(Enum):
 class Lembrete:
     """Representa um lembrete associado a uma tarefa."""
 
+    __slots__ = ("data", "agendado", "cancelamento_pendente")
+
     def __init__(self, data: datetime):
         self.data = data
         self.agendado = True  # Atributo 'agendado'
+        # Outbox: cancelamento pedido, ainda não confirmado pelo sistema externo
+        self.cancelamento_pendente = False
+
+    def copiar(self) -> "Lembrete":
+        return copy.copy(self)
 
     def desagendar(self):
         """Lógica para cancelar o agendamento no sistema externo"""
         self.agendado = False
+        self.cancelamento_pendente = False
         print(f"[Sistema Email] Lembrete para {self.data} foi CANCELADO.")
 
 
 class Tarefa:
     """Entidade de domínio, Tarefa com lembretes e status."""
 
+    # Sem __dict__ por instância; __weakref__ permite caches de visões (ArmazemColunar)
+    __slots__ = (
+        "id",
+        "id_disciplina",
+        "titulo",
+        "descricao",
+        "data_entrega",
+        "tipo",
+        "nota",
+        "status",
+        "_lembretes",
+        "__weakref__",
+    )
+
     def __init__(
         self,
         id_tarefa: int,
@@ -43,8 +106,10 @@ class Tarefa:
         descricao: str,
         data_entrega: datetime,
         tipo: Tipo,
+        id_disciplina: Optional[int] = None,
     ):
         self.id = id_tarefa
+        self.id_disciplina = id_disciplina
         self.titulo = titulo
         self.descricao = descricao
         self.data_entrega = data_entrega
@@ -55,8 +120,49 @@ class Tarefa:
         self.status = (
             Status.EM_ANDAMENTO  # Status inicial
         ) 
-        self.lembretes: List[Lembrete] = []
+        # A lista só é criada no primeiro lembrete: a maioria das tarefas não tem nenhum
+        self._lembretes: Optional[List[Lembrete]] = None
+
+    @property
+    def lembretes(self) -> Sequence[Lembrete]:
+        """Lembretes da tarefa (tupla vazia enquanto não houver nenhum)."""
+        return self._lembretes if self._lembretes is not None else ()
+
+    @lembretes.setter
+    def lembretes(self, lembretes: List[Lembrete]):
+        self._lembretes = list(lembretes) or None
+
+    def copiar(self) -> "Tarefa":
+        """Cópia (lembretes inclusive) para alterar e entregar a atualizar_tarefa.
+
+        A tarefa guardada no banco é compartilhada com os leitores: alterada
+        in-place, ficaria visível antes da gravação e continuaria alterada
+        se a gravação falhasse.
+        """
+        copia = copy.copy(self)
+        if self._lembretes is not None:
+            copia._lembretes = [lembrete.copiar() for lembrete in self._lembretes]
+        return copia
 
     def adicionar_lembrete(self, data: datetime):
         """Adiciona um novo lembrete para a tarefa."""
-        self.lembretes.append(Lembrete(data))
+        if self._lembretes is None:
+            self._lembretes = []
+        self._lembretes.append(Lembrete(data))
+
+    def para_dict(self) -> dict:
+        """Representação serializável (JSON) da tarefa."""
+        return {
+            "id": self.id,
+            "titulo": self.titulo,
+            "descricao": self.descricao,
+            "data_entrega": self.data_entrega.isoformat(),
+            "tipo": self.tipo.value,
+            "status": self.status.value,
+            "nota": self.nota,
+            "id_disciplina": self.id_disciplina,
+            "lembretes": [
+                {"data": lembrete.data.isoformat(), "agendado": lembrete.agendado}
+                for lembrete in self.lembretes
+            ],
+        }
@@ -0,0 +1,268 @@
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator, MutableMapping
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+from classes import Tarefa, Tipo, Status
+import math
+import sys
+import weakref
+
+
+_EPOCA = datetime(1970, 1, 1)  # datas são ingênuas (sem fuso): epoch também
+_MICROSSEGUNDO = timedelta(microseconds=1)
+
+
+def microssegundos(data: datetime) -> int:
+    """Data como inteiro (microssegundos desde a época), o formato das colunas de prazo."""
+    return (data - _EPOCA) // _MICROSSEGUNDO
+
+
+class Colunas(NamedTuple):
+    """Campos indexados de um conjunto de tarefas, um array por campo (mesma ordem).
+
+    Status e tipo vêm como códigos, disciplina 0 = sem disciplina, prazo em
+    microssegundos e nota NaN = sem nota (como no ArmazemColunar).
+    """
+
+    ids: array
+    status: array
+    tipos: array
+    disciplinas: array
+    prazos: array
+    notas: array
+
+
+def colunas_de_tarefas(tarefas: Iterable[Tarefa]) -> Colunas:
+    """Extrai as Colunas de tarefas em objetos (uma passada, sem guardar as tarefas)."""
+    colunas = Colunas(
+        array("q"), array("b"), array("b"), array("q"), array("q"), array("d")
+    )
+    for tarefa in tarefas:
+        colunas.ids.append(tarefa.id)
+        colunas.status.append(tarefa.status.codigo)
+        colunas.tipos.append(tarefa.tipo.codigo)
+        colunas.disciplinas.append(getattr(tarefa, "id_disciplina", None) or 0)
+        colunas.prazos.append(microssegundos(tarefa.data_entrega))
+        colunas.notas.append(math.nan if tarefa.nota is None else tarefa.nota)
+    return colunas
+
+
+class ColunasPorId:
+    """Mapa id -> tupla de valores numéricos em arrays paralelos ordenados por ID.
+
+    Usado pelos índices e estatísticas no lugar de um dict de tuplas: cada
+    entrada custa só os bytes dos campos. Com IDs contíguos (o caso comum)
+    a posição de um ID sai direto da diferença para o primeiro; com lacunas,
+    a busca binária fica restrita à janela em que o ID pode estar.
+    """
+
+    def __init__(self, tipos: str):
+        self.tipos = tipos
+        self.ids = array("q")
+        self.colunas = tuple(array(tipo) for tipo in tipos)
+
+    @classmethod
+    def de_colunas(cls, tipos: str, ids: array, colunas: Iterable[array]) -> "ColunasPorId":
+        """Copia as colunas (IDs distintos, em qualquer ordem) já ordenadas por ID."""
+        mapa = cls(tipos)
+        colunas = tuple(colunas)
+        if all(a < b for a, b in zip(ids, ids[1:])):
+            mapa.ids = array("q", ids)
+            mapa.colunas = tuple(array(tipo, coluna) for tipo, coluna in zip(tipos, colunas))
+        else:
+            ordem = sorted(range(len(ids)), key=ids.__getitem__)
+            mapa.ids = array("q", map(ids.__getitem__, ordem))
+            mapa.colunas = tuple(
+                array(tipo, map(coluna.__getitem__, ordem))
+                for tipo, coluna in zip(tipos, colunas)
+            )
+        return mapa
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def posicao(self, id_tarefa: int) -> int:
+        """Posição do ID nas colunas; -1 se não existir."""
+        ids = self.ids
+        if not ids:
+            return -1
+        # IDs distintos e crescentes: o ID está no máximo a (id - primeiro)
+        # posições do início e a (último - id) posições do fim
+        hi = min(id_tarefa - ids[0] + 1, len(ids))
+        lo = max(len(ids) - 1 - (ids[-1] - id_tarefa), 0)
+        if lo >= hi:
+            return -1
+        pos = lo if hi - lo == 1 else bisect_left(ids, id_tarefa, lo, hi)
+        return pos if ids[pos] == id_tarefa else -1
+
+    def obter(self, id_tarefa: int) -> Optional[tuple]:
+        pos = self.posicao(id_tarefa)
+        if pos < 0:
+            return None
+        return tuple(coluna[pos] for coluna in self.colunas)
+
+    def definir(self, id_tarefa: int, valores: tuple) -> None:
+        if not self.ids or id_tarefa > self.ids[-1]:
+            # Caminho comum: IDs crescentes vão para o fim
+            self.ids.append(id_tarefa)
+            for coluna, valor in zip(self.colunas, valores):
+                coluna.append(valor)
+            return
+        pos = self.posicao(id_tarefa)
+        if pos >= 0:
+            for coluna, valor in zip(self.colunas, valores):
+                coluna[pos] = valor
+            return
+        pos = bisect_left(self.ids, id_tarefa)
+        self.ids.insert(pos, id_tarefa)
+        for coluna, valor in zip(self.colunas, valores):
+            coluna.insert(pos, valor)
+
+    def remover(self, id_tarefa: int) -> Optional[tuple]:
+        """Remove o ID e retorna os valores que ele tinha (None se não existir)."""
+        pos = self.posicao(id_tarefa)
+        if pos < 0:
+            return None
+        valores = tuple(coluna[pos] for coluna in self.colunas)
+        del self.ids[pos]
+        for coluna in self.colunas:
+            del coluna[pos]
+        return valores
+
+
+class ArmazemColunar(MutableMapping):
+    """Mapa id -> Tarefa guardado em colunas paralelas (array) em vez de objetos.
+
+    Cada tarefa ocupa uma posição nos arrays de ID, prazo (microssegundos
+    desde a época), códigos de tipo/status, nota (NaN = sem nota) e disciplina
+    (0 = sem disciplina); títulos e descrições são strings internadas.
+    As colunas ficam ordenadas por ID (busca por bisect). O acesso devolve
+    uma Tarefa leve montada das colunas; enquanto ela estiver viva, acessos
+    seguintes devolvem o mesmo objeto.
+    """
+
+    def __init__(self):
+        # Colunas ordenadas por ID: a busca é um bisect, sem dict id -> posição
+        self._ids = array("q")
+        self._prazos = array("q")
+        self._tipos = array("b")
+        self._status = array("b")
+        self._notas = array("d")
+        self._disciplinas = array("q")
+        self._titulos: list = []
+        self._descricoes: list = []
+        self._lembretes = {}  # esparso: só tarefas que têm lembretes
+        self._visoes = weakref.WeakValueDictionary()
+
+    def __getstate__(self) -> dict:
+        # Visões são só cache (referências fracas): fora do pickle (carga em outro processo)
+        estado = self.__dict__.copy()
+        del estado["_visoes"]
+        return estado
+
+    def __setstate__(self, estado: dict) -> None:
+        self.__dict__.update(estado)
+        self._visoes = weakref.WeakValueDictionary()
+
+    def _posicao(self, id_tarefa: int) -> int:
+        """Posição do ID nas colunas; -1 se não existir."""
+        pos = bisect_left(self._ids, id_tarefa)
+        if pos < len(self._ids) and self._ids[pos] == id_tarefa:
+            return pos
+        return -1
+
+    def __getitem__(self, id_tarefa: int) -> Tarefa:
+        tarefa = self._visoes.get(id_tarefa)
+        if tarefa is not None:
+            return tarefa
+        pos = self._posicao(id_tarefa)
+        if pos < 0:
+            raise KeyError(id_tarefa)
+        tarefa = self._montar(pos)
+        self._visoes[id_tarefa] = tarefa
+        return tarefa
+
+    def __setitem__(self, id_tarefa: int, tarefa: Tarefa) -> None:
+        linha = (
+            id_tarefa,
+            microssegundos(tarefa.data_entrega),
+            tarefa.tipo.codigo,
+            tarefa.status.codigo,
+            math.nan if tarefa.nota is None else tarefa.nota,
+            tarefa.id_disciplina or 0,
+            sys.intern(tarefa.titulo),
+            sys.intern(tarefa.descricao),
+        )
+        if not self._ids or id_tarefa > self._ids[-1]:
+            # Caminho comum: IDs crescentes vão para o fim
+            for coluna, valor in zip(self._colunas(), linha):
+                coluna.append(valor)
+        else:
+            pos = bisect_left(self._ids, id_tarefa)
+            if self._ids[pos] == id_tarefa:
+                for coluna, valor in zip(self._colunas(), linha):
+                    coluna[pos] = valor
+            else:
+                for coluna, valor in zip(self._colunas(), linha):
+                    coluna.insert(pos, valor)
+        if tarefa.lembretes:
+            self._lembretes[id_tarefa] = list(tarefa.lembretes)
+        else:
+            self._lembretes.pop(id_tarefa, None)
+        self._visoes[id_tarefa] = tarefa
+
+    def __delitem__(self, id_tarefa: int) -> None:
+        pos = self._posicao(id_tarefa)
+        if pos < 0:
+            raise KeyError(id_tarefa)
+        for coluna in self._colunas():
+            del coluna[pos]
+        self._lembretes.pop(id_tarefa, None)
+        self._visoes.pop(id_tarefa, None)
+
+    def __contains__(self, id_tarefa) -> bool:
+        return self._posicao(id_tarefa) >= 0
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._ids)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def colunas(self) -> Colunas:
+        """Campos indexados direto dos arrays (sem montar visões); não alterar."""
+        return Colunas(
+            self._ids, self._status, self._tipos, self._disciplinas, self._prazos, self._notas
+        )
+
+    def _colunas(self) -> tuple:
+        return (
+            self._ids,
+            self._prazos,
+            self._tipos,
+            self._status,
+            self._notas,
+            self._disciplinas,
+            self._titulos,
+            self._descricoes,
+        )
+
+    def _montar(self, pos: int) -> Tarefa:
+        """Cria a visão Tarefa a partir da posição nas colunas."""
+        id_tarefa = self._ids[pos]
+        nota = self._notas[pos]
+        tarefa = Tarefa(
+            id_tarefa=id_tarefa,
+            titulo=self._titulos[pos],
+            descricao=self._descricoes[pos],
+            data_entrega=_EPOCA + timedelta(microseconds=self._prazos[pos]),
+            tipo=Tipo.de_codigo(self._tipos[pos]),
+            id_disciplina=self._disciplinas[pos] or None,
+        )
+        tarefa.status = Status.de_codigo(self._status[pos])
+        tarefa.nota = None if math.isnan(nota) else nota
+        lembretes = self._lembretes.get(id_tarefa)
+        if lembretes:
+            tarefa.lembretes = lembretes
+        return tarefa
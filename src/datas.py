@@ -0,0 +1,44 @@
+from datetime import datetime
+from functools import lru_cache
+import re
+
+
+FORMATOS_ACEITOS = "Use dd/mm/aaaa [HH:MM] ou yyyy-mm-dd [HH:MM]."
+
+# dd/mm/aaaa ou dd-mm-aaaa (mesmo separador) e aaaa-mm-dd, com HH:MM opcional
+_PADRAO_DMA = re.compile(r"(\d{1,2})([/-])(\d{1,2})\2(\d{4})(?:\s+(\d{1,2}):(\d{2}))?")
+_PADRAO_AMD = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})(?:\s+(\d{1,2}):(\d{2}))?")
+
+
+def interpretar_data(valor) -> tuple[datetime | None, str | None]:
+    """Converte o texto de data/horário numa única passada.
+
+    Retorna (datetime, None) ou (None, motivo do erro). Aceita os formatos
+    de FORMATOS_ACEITOS; sem horário, assume 00:00. Datetimes passam direto.
+    """
+    if isinstance(valor, datetime):
+        return valor, None
+    if not isinstance(valor, str):
+        return None, f"Data/Horário inválido. {FORMATOS_ACEITOS}"
+    return _interpretar_texto(valor.strip())
+
+
+@lru_cache(maxsize=4096)
+def _interpretar_texto(texto: str) -> tuple[datetime | None, str | None]:
+    # Resultado imutável: seguro compartilhar entre chamadas (prazos se repetem muito)
+    encontrado = _PADRAO_DMA.fullmatch(texto)
+    if encontrado:
+        dia, _, mes, ano, hora, minuto = encontrado.groups()
+    else:
+        encontrado = _PADRAO_AMD.fullmatch(texto)
+        if not encontrado:
+            return None, f"Formato inválido. {FORMATOS_ACEITOS}"
+        ano, mes, dia, hora, minuto = encontrado.groups()
+    hora, minuto = int(hora or 0), int(minuto or 0)
+    if hora > 23 or minuto > 59:
+        return None, "Horário inexistente (hora/minuto fora da faixa)."
+    try:
+        return datetime(int(ano), int(mes), int(dia), hora, minuto), None
+    except ValueError:
+        # Padrão ok, mas data impossível (ex.: 31/02/2024)
+        return None, "Data inexistente no calendário."
@@ -0,0 +1,249 @@
+from collections import Counter
+from heapq import heapify, heappop, heappush
+from typing import Iterable, Optional
+from classes import Tarefa, Tipo, Status
+from colunar import Colunas, ColunasPorId, colunas_de_tarefas
+import math
+
+
+def resumir_notas(quantidade: int, soma: float, minimo, maximo, m2: float) -> dict:
+    """Formato comum do resumo de notas (usado também pelo backend SQLite).
+
+    ``m2`` é a soma dos quadrados dos desvios em relação à média; a
+    variância é amostral (0.0 com menos de duas notas).
+    """
+    variancia = m2 / (quantidade - 1) if quantidade > 1 else 0.0
+    return {
+        "quantidade": quantidade,
+        "soma": soma,
+        "media": soma / quantidade if quantidade else None,
+        "minimo": minimo,
+        "maximo": maximo,
+        "variancia": variancia,
+        "desvio_padrao": math.sqrt(variancia),
+    }
+
+
+def montar_relatorio(por_status, por_tipo, notas: dict) -> dict:
+    """Relatório com todos os Status e Tipos (zerados quando ausentes)."""
+    total = sum(por_status.values())
+    return {
+        "total": total,
+        "por_status": {status: por_status.get(status, 0) for status in Status},
+        "por_tipo": {tipo: por_tipo.get(tipo, 0) for tipo in Tipo},
+        "taxa_conclusao": por_status.get(Status.CONCLUIDO, 0) / total if total else 0.0,
+        "notas": notas,
+    }
+
+
+class AgregadoNotas:
+    """Soma, contagem, média e variância (Welford) das notas de uma disciplina.
+
+    Aceita remoção (Welford inverso), para que a troca de uma nota custe
+    O(1). Mínimo e máximo vêm de dois heaps de notas distintas com remoção
+    preguiçosa: leitura O(1), inserção/remoção O(log k) amortizado, com k
+    notas distintas (o topo só é limpo quando a nota dele deixa de existir).
+    """
+
+    __slots__ = ("quantidade", "soma", "media", "_m2", "_contagem", "_minimos", "_maximos")
+
+    def __init__(self):
+        self.quantidade = 0
+        self.soma = 0.0
+        self.media = 0.0
+        self._m2 = 0.0  # soma dos quadrados dos desvios em relação à média
+        self._contagem: dict = {}  # nota -> ocorrências
+        self._minimos: list = []  # heap de notas
+        self._maximos: list = []  # heap de notas negadas
+
+    def adicionar(self, nota: float) -> None:
+        self.quantidade += 1
+        self.soma += nota
+        delta = nota - self.media
+        self.media += delta / self.quantidade
+        self._m2 += delta * (nota - self.media)
+        ocorrencias = self._contagem.get(nota, 0) + 1
+        self._contagem[nota] = ocorrencias
+        if ocorrencias == 1:
+            heappush(self._minimos, nota)
+            heappush(self._maximos, -nota)
+            if len(self._minimos) > 2 * len(self._contagem) + 8:
+                # Entradas obsoletas fora do topo: reconstrói com as notas distintas
+                self._minimos = list(self._contagem)
+                self._maximos = [-valor for valor in self._contagem]
+                heapify(self._minimos)
+                heapify(self._maximos)
+
+    def remover(self, nota: float) -> None:
+        ocorrencias = self._contagem.get(nota, 0)
+        if not ocorrencias:
+            return
+        if ocorrencias > 1:
+            self._contagem[nota] = ocorrencias - 1
+        else:
+            del self._contagem[nota]
+            # Remoção preguiçosa: só descarta o que chegou ao topo
+            while self._minimos and self._minimos[0] not in self._contagem:
+                heappop(self._minimos)
+            while self._maximos and -self._maximos[0] not in self._contagem:
+                heappop(self._maximos)
+        self.quantidade -= 1
+        if not self.quantidade:
+            self.soma = self.media = self._m2 = 0.0
+            return
+        self.soma -= nota
+        delta = nota - self.media
+        self.media -= delta / self.quantidade
+        # Arredondamento pode deixar um resíduo negativo ínfimo
+        self._m2 = max(self._m2 - delta * (nota - self.media), 0.0)
+
+    def resumo(self) -> dict:
+        resumo = resumir_notas(
+            self.quantidade,
+            self.soma,
+            self._minimos[0] if self._minimos else None,
+            -self._maximos[0] if self._maximos else None,
+            self._m2,
+        )
+        if self.quantidade:
+            resumo["media"] = self.media  # média de Welford: sem o erro de soma/n
+        return resumo
+
+
+class EstatisticasTarefas:
+    """Agregados mantidos incrementalmente pelo BancoDeDados.
+
+    Contagens por Status e por Tipo (no total e por disciplina) e, por
+    disciplina, um AgregadoNotas.
+    A contribuição de cada ID fica guardada em colunas de códigos
+    (ColunasPorId), como as chaves de IndiceTarefas.
+    Os relatórios não dependem do número de tarefas.
+    """
+
+    def __init__(self):
+        self.por_status = Counter()
+        self.por_tipo = Counter()
+        self.notas = {}  # id_disciplina -> AgregadoNotas
+        self.status_disciplina = {}  # id_disciplina -> Counter de Status
+        self.tipo_disciplina = {}  # id_disciplina -> Counter de Tipo
+        # id -> (código do status, código do tipo, id_disciplina ou 0, nota ou NaN)
+        self._contribuicoes = ColunasPorId("bbqd")
+
+    @staticmethod
+    def _contribuicao(tarefa: Tarefa) -> tuple:
+        return (
+            tarefa.status,
+            tarefa.tipo,
+            getattr(tarefa, "id_disciplina", None),
+            tarefa.nota,
+        )
+
+    @staticmethod
+    def _codificar(contribuicao: tuple) -> tuple:
+        status, tipo, id_disciplina, nota = contribuicao
+        return status.codigo, tipo.codigo, id_disciplina or 0, math.nan if nota is None else nota
+
+    @staticmethod
+    def _decodificar(valores: tuple) -> tuple:
+        status, tipo, id_disciplina, nota = valores
+        return (
+            Status.de_codigo(status),
+            Tipo.de_codigo(tipo),
+            id_disciplina or None,
+            None if math.isnan(nota) else nota,
+        )
+
+    def reconstruir(self, tarefas: Iterable[Tarefa]) -> None:
+        """Recalcula todos os agregados (carga inicial)."""
+        self.reconstruir_colunas(colunas_de_tarefas(tarefas))
+
+    def reconstruir_colunas(self, colunas: Colunas) -> None:
+        """Recalcula os agregados a partir das colunas (contagens via Counter, sem objetos)."""
+        self.__init__()
+        self._contribuicoes = ColunasPorId.de_colunas(
+            "bbqd",
+            colunas.ids,
+            (colunas.status, colunas.tipos, colunas.disciplinas, colunas.notas),
+        )
+        status, tipos, disciplinas, notas = self._contribuicoes.colunas
+        for codigo, quantidade in Counter(status).items():
+            self.por_status[Status.de_codigo(codigo)] = quantidade
+        for codigo, quantidade in Counter(tipos).items():
+            self.por_tipo[Tipo.de_codigo(codigo)] = quantidade
+        for (id_disciplina, codigo), quantidade in Counter(zip(disciplinas, status)).items():
+            if id_disciplina:
+                contagem = self.status_disciplina.setdefault(id_disciplina, Counter())
+                contagem[Status.de_codigo(codigo)] = quantidade
+                self.tipo_disciplina.setdefault(id_disciplina, Counter())
+        for (id_disciplina, codigo), quantidade in Counter(zip(disciplinas, tipos)).items():
+            if id_disciplina:
+                self.tipo_disciplina[id_disciplina][Tipo.de_codigo(codigo)] = quantidade
+        for id_disciplina, nota in zip(disciplinas, notas):
+            if id_disciplina and not math.isnan(nota):
+                agregado = self.notas.get(id_disciplina)
+                if agregado is None:
+                    agregado = self.notas[id_disciplina] = AgregadoNotas()
+                agregado.adicionar(nota)
+
+    def atualizar(self, tarefa: Tarefa) -> None:
+        """Aplica a tarefa nova ou alterada (no-op se nada relevante mudou)."""
+        nova = self._contribuicao(tarefa)
+        antiga = self._contribuicoes.obter(tarefa.id)
+        if antiga is not None:
+            antiga = self._decodificar(antiga)
+            if antiga == nova:
+                return
+            self._aplicar(antiga, -1)
+        self._contribuicoes.definir(tarefa.id, self._codificar(nova))
+        self._aplicar(nova, 1)
+
+    def remover(self, id_tarefa: int) -> None:
+        antiga = self._contribuicoes.remover(id_tarefa)
+        if antiga is not None:
+            self._aplicar(self._decodificar(antiga), -1)
+
+    def relatorio(self, id_disciplina: Optional[int] = None) -> dict:
+        """Contagens, taxa de conclusão e resumo de notas (de uma disciplina ou de todas).
+
+        Com ``id_disciplina``, contagens e taxa de conclusão também são só dela.
+        """
+        if id_disciplina is None:
+            por_status, por_tipo = self.por_status, self.por_tipo
+            disciplinas = self.notas
+        else:
+            por_status = self.status_disciplina.get(id_disciplina, {})
+            por_tipo = self.tipo_disciplina.get(id_disciplina, {})
+            disciplinas = {id_disciplina: self.notas.get(id_disciplina, AgregadoNotas())}
+        return montar_relatorio(
+            por_status,
+            por_tipo,
+            {
+                disciplina: agregado.resumo()
+                for disciplina, agregado in sorted(disciplinas.items())
+            },
+        )
+
+    # Helpers
+    def _aplicar(self, contribuicao: tuple, sinal: int) -> None:
+        status, tipo, id_disciplina, nota = contribuicao
+        self.por_status[status] += sinal
+        self.por_tipo[tipo] += sinal
+        if id_disciplina is None:
+            return
+        contagem = self.status_disciplina.get(id_disciplina)
+        if contagem is None:
+            contagem = self.status_disciplina[id_disciplina] = Counter()
+            self.tipo_disciplina[id_disciplina] = Counter()
+        contagem[status] += sinal
+        self.tipo_disciplina[id_disciplina][tipo] += sinal
+        if nota is None:
+            return
+        agregado = self.notas.get(id_disciplina)
+        if sinal > 0:
+            if agregado is None:
+                agregado = self.notas[id_disciplina] = AgregadoNotas()
+            agregado.adicionar(nota)
+        elif agregado is not None:
+            agregado.remover(nota)
+            if not agregado.quantidade:
+                del self.notas[id_disciplina]
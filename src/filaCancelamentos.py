@@ -0,0 +1,159 @@
+from collections.abc import Callable
+from typing import Optional
+import heapq
+import itertools
+import threading
+import time
+
+
+class FilaCancelamentos:
+    """Fila de cancelamentos de lembretes no sistema externo, fora do request.
+
+    Os trabalhos são processados em lotes por threads de fundo. Falhas são
+    retentadas com backoff exponencial até MAX_TENTATIVAS; depois disso o
+    lembrete continua no outbox persistido (cancelamento pendente) e volta a
+    ser enfileirado no próximo início do sistema. Ao final de cada lote,
+    ``ao_confirmar`` recebe os (id_tarefa, lembrete) cancelados para que o
+    model persista a confirmação. A fila trabalha com cópias dos lembretes:
+    os originais pertencem às tarefas do banco e só mudam por essa gravação.
+    """
+
+    TAMANHO_LOTE = 50
+    MAX_TENTATIVAS = 5
+    BACKOFF_INICIAL = 0.5  # segundos; dobra a cada tentativa
+    BACKOFF_MAXIMO = 30.0
+
+    def __init__(
+        self,
+        ao_confirmar: Optional[Callable[[list], None]] = None,
+        trabalhadores: int = 2,
+    ):
+        self.ao_confirmar = ao_confirmar
+        self.trabalhadores = trabalhadores
+        # Heap de (quando, seq, id_tarefa, lembrete, tentativas): prontos e em backoff
+        self._heap: list = []
+        self._seq = itertools.count()
+        self._condicao = threading.Condition()
+        self._threads: list = []
+        self._em_andamento = 0
+        self._parar = False
+        self.falhas_definitivas = 0
+
+    def enfileirar(self, id_tarefa: int, lembretes: list) -> None:
+        """Agenda o cancelamento externo dos lembretes (retorna imediatamente)."""
+        self.enfileirar_lote([(id_tarefa, lembretes)])
+
+    def enfileirar_lote(self, itens: list) -> None:
+        """Como enfileirar, para vários (id_tarefa, lembretes) de uma vez só."""
+        trabalhos = [
+            (id_tarefa, lembrete.copiar())
+            for id_tarefa, lembretes in itens
+            for lembrete in lembretes
+        ]
+        if not trabalhos:
+            return
+        agora = time.monotonic()
+        with self._condicao:
+            for id_tarefa, lembrete in trabalhos:
+                heapq.heappush(
+                    self._heap, (agora, next(self._seq), id_tarefa, lembrete, 0)
+                )
+            self._iniciar()
+            self._condicao.notify(len(trabalhos))
+
+    def pendentes(self) -> int:
+        """Cancelamentos ainda não confirmados (na fila ou em processamento)."""
+        with self._condicao:
+            return len(self._heap) + self._em_andamento
+
+    def aguardar(self, timeout: Optional[float] = None) -> bool:
+        """Bloqueia até a fila esvaziar; False se o timeout expirar antes."""
+        limite = None if timeout is None else time.monotonic() + timeout
+        with self._condicao:
+            while self._heap or self._em_andamento:
+                restante = None if limite is None else limite - time.monotonic()
+                if restante is not None and restante <= 0:
+                    return False
+                self._condicao.wait(restante)
+            return True
+
+    def parar(self) -> None:
+        """Encerra as threads; trabalhos restantes ficam no outbox persistido."""
+        with self._condicao:
+            self._parar = True
+            self._condicao.notify_all()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def _iniciar(self) -> None:
+        """Sobe as threads no primeiro uso (chamado com a trava adquirida)."""
+        if self._threads or self._parar:
+            return
+        for i in range(self.trabalhadores):
+            thread = threading.Thread(
+                target=self._executar, name=f"cancelamentos-{i}", daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def _proximo_lote(self) -> Optional[list]:
+        """Espera e retira até TAMANHO_LOTE trabalhos prontos; None ao parar."""
+        with self._condicao:
+            while True:
+                if self._parar:
+                    return None
+                agora = time.monotonic()
+                if self._heap and self._heap[0][0] <= agora:
+                    lote = []
+                    while (
+                        self._heap
+                        and self._heap[0][0] <= agora
+                        and len(lote) < self.TAMANHO_LOTE
+                    ):
+                        lote.append(heapq.heappop(self._heap))
+                    self._em_andamento += len(lote)
+                    return lote
+                espera = self._heap[0][0] - agora if self._heap else None
+                self._condicao.wait(espera)
+
+    def _executar(self) -> None:
+        while True:
+            lote = self._proximo_lote()
+            if lote is None:
+                return
+            confirmados, retentar = [], []
+            for _, _, id_tarefa, lembrete, tentativas in lote:
+                try:
+                    # Chamada ao sistema externo (pode ser lenta ou falhar)
+                    lembrete.desagendar()
+                    confirmados.append((id_tarefa, lembrete))
+                except Exception as e:
+                    tentativas += 1
+                    if tentativas >= self.MAX_TENTATIVAS:
+                        self.falhas_definitivas += 1
+                        print(
+                            f"AVISO: Cancelamento do lembrete da tarefa {id_tarefa} falhou"
+                            f" {tentativas} vezes; fica pendente no outbox. Erro: {e}"
+                        )
+                        continue
+                    atraso = min(
+                        self.BACKOFF_INICIAL * 2 ** (tentativas - 1), self.BACKOFF_MAXIMO
+                    )
+                    retentar.append((id_tarefa, lembrete, tentativas, atraso))
+
+            if confirmados and self.ao_confirmar is not None:
+                try:
+                    self.ao_confirmar(confirmados)
+                except Exception as e:
+                    print(f"AVISO: Falha ao persistir cancelamentos confirmados. Erro: {e}")
+
+            with self._condicao:
+                agora = time.monotonic()
+                for id_tarefa, lembrete, tentativas, atraso in retentar:
+                    heapq.heappush(
+                        self._heap,
+                        (agora + atraso, next(self._seq), id_tarefa, lembrete, tentativas),
+                    )
+                self._em_andamento -= len(lote)
+                self._condicao.notify_all()
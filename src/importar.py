@@ -0,0 +1,89 @@
+from collections.abc import Iterator
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+
+def ler_csv(caminho: str) -> Iterator[dict]:
+    """Lê o CSV linha a linha (colunas: titulo, id_disciplina, descricao, data_entrega, tipo)."""
+    with open(caminho, mode="r", newline="", encoding="utf-8") as f:
+        yield from csv.DictReader(f)
+
+
+def ler_jsonl(caminho: str) -> Iterator[dict | None]:
+    """Lê JSON Lines linha a linha; linhas ilegíveis viram None (erro no relatório)."""
+    with open(caminho, mode="r", encoding="utf-8") as f:
+        for linha in f:
+            if not linha.strip():
+                continue
+            try:
+                yield json.loads(linha)
+            except ValueError:
+                yield None
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Importa tarefas em lote a partir de um CSV ou JSON Lines."
+    )
+    parser.add_argument("arquivo", help="arquivo .csv ou .jsonl")
+    parser.add_argument(
+        "--formato",
+        choices=("csv", "jsonl"),
+        help="força o formato (padrão: pela extensão do arquivo)",
+    )
+    parser.add_argument(
+        "--relatorio", help="grava o relatório de erros por linha (JSON) neste arquivo"
+    )
+    args = parser.parse_args(argv)
+
+    formato = args.formato or (
+        "csv" if os.path.splitext(args.arquivo)[1].lower() == ".csv" else "jsonl"
+    )
+    linhas = ler_csv(args.arquivo) if formato == "csv" else ler_jsonl(args.arquivo)
+
+    # Imports tardios: o --help não precisa carregar o banco
+    from DB import BancoDeDados
+    from tarefaModel import TarefaModel
+    from tarefaController import TarefaController
+
+    # Mesmo arquivo que o main.py usa
+    BancoDeDados.CSV_FILENAME = os.environ.get("TAREFAS_CSV") or os.path.join(
+        os.path.dirname(__file__), "tarefas.csv"
+    )
+    model = TarefaModel()
+    try:
+        controller = TarefaController(model)
+        inicio = time.perf_counter()
+        resposta = controller.post_criar_tarefas_lote(linhas)
+        duracao = time.perf_counter() - inicio
+    finally:
+        # Grava o que estiver pendente (modo grupo) mesmo se a importação falhar
+        model.encerrar()
+
+    body = resposta["body"]
+    if not isinstance(body, dict):
+        print(f"Status {resposta['status']}: {body}")
+        return 1
+    print(
+        f"Status {resposta['status']}: {body['criadas']} tarefas criadas, "
+        f"{len(body['erros'])} linhas rejeitadas em {duracao:.2f}s."
+    )
+    if "erro" in body:
+        print(f"Erro: {body['erro']}")
+    if args.relatorio:
+        with open(args.relatorio, mode="w", encoding="utf-8") as f:
+            json.dump(body["erros"], f, ensure_ascii=False, indent=2)
+    else:
+        for erro in body["erros"][:20]:
+            print(f"  linha {erro['linha']}: [{erro['status']}] {erro['erro']}")
+        if len(body["erros"]) > 20:
+            print(f"  ... e mais {len(body['erros']) - 20} (use --relatorio)")
+    return 0 if resposta["status"] in (200, 201, 207) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
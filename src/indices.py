@@ -0,0 +1,333 @@
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from datetime import datetime
+from functools import partial
+from typing import Iterable, List, Optional
+from classes import Tarefa, Tipo, Status
+from colunar import Colunas, ColunasPorId, colunas_de_tarefas, microssegundos
+import math
+
+
+_CONCLUIDO = Status.CONCLUIDO.codigo
+
+
+class IndiceTarefas:
+    """Índices secundários mantidos pelo BancoDeDados, todos em arrays de inteiros.
+
+    - hash por Status, por Tipo e por disciplina (código -> array ordenado de IDs);
+    - (prazo, id) ordenados para consultas por intervalo;
+    - (prazo, id) ordenados só das tarefas não concluídas, geral e por Tipo,
+      para os prazos (vencendo, atrasadas, próximas);
+    - chaves por ID (ColunasPorId), cujos IDs ordenados servem à paginação por ID.
+
+    Status e Tipo entram pelo código e o prazo em microssegundos: o custo
+    por tarefa é de dezenas de bytes, sem tuplas, conjuntos ou datas.
+    """
+
+    ORDENACOES = ("id", "data_entrega")
+
+    def __init__(self):
+        self.por_status = defaultdict(partial(array, "q"))
+        self.por_tipo = defaultdict(partial(array, "q"))
+        self.por_disciplina = defaultdict(partial(array, "q"))
+        self.prazos = _ListaPrazos()
+        self.abertas = _ListaPrazos()  # só as não concluídas
+        self.abertas_por_tipo = defaultdict(_ListaPrazos)
+        # Chaves indexadas por ID (status, tipo, disciplina, prazo): permitem
+        # remover a entrada antiga mesmo quando a Tarefa foi alterada
+        # in-place antes de atualizar_tarefa.
+        self._chaves = ColunasPorId("bbqq")
+
+    @staticmethod
+    def _chave(tarefa: Tarefa) -> tuple:
+        return (
+            tarefa.status.codigo,
+            tarefa.tipo.codigo,
+            getattr(tarefa, "id_disciplina", None) or 0,
+            microssegundos(tarefa.data_entrega),
+        )
+
+    def reconstruir(self, tarefas: Iterable[Tarefa]) -> None:
+        """Reconstrói todos os índices de uma vez (carga inicial)."""
+        self.reconstruir_colunas(colunas_de_tarefas(tarefas))
+
+    def reconstruir_colunas(self, colunas: Colunas) -> None:
+        """Reconstrói os índices a partir das colunas (ex.: as do ArmazemColunar)."""
+        self.__init__()
+        chaves = self._chaves = ColunasPorId.de_colunas(
+            "bbqq",
+            colunas.ids,
+            (colunas.status, colunas.tipos, colunas.disciplinas, colunas.prazos),
+        )
+        ids = chaves.ids
+        status, tipos, disciplinas, prazos = chaves.colunas
+        # Percorridos em ordem de ID: os arrays de cada hash já saem ordenados
+        for id_tarefa, codigo_status, codigo_tipo, id_disciplina in zip(
+            ids, status, tipos, disciplinas
+        ):
+            self.por_status[codigo_status].append(id_tarefa)
+            self.por_tipo[codigo_tipo].append(id_tarefa)
+            if id_disciplina:
+                self.por_disciplina[id_disciplina].append(id_tarefa)
+        # Ordenação estável por prazo sobre posições em ordem de ID = ordem (prazo, id)
+        ordem = sorted(range(len(ids)), key=prazos.__getitem__)
+        self.prazos = _ListaPrazos.das_posicoes(ordem, prazos, ids)
+        abertas = [pos for pos in ordem if status[pos] != _CONCLUIDO]
+        self.abertas = _ListaPrazos.das_posicoes(abertas, prazos, ids)
+        por_tipo = defaultdict(list)
+        for pos in abertas:
+            por_tipo[tipos[pos]].append(pos)
+        for codigo_tipo, posicoes in por_tipo.items():
+            self.abertas_por_tipo[codigo_tipo] = _ListaPrazos.das_posicoes(
+                posicoes, prazos, ids
+            )
+
+    def atualizar(self, tarefa: Tarefa) -> None:
+        """Insere ou reindexa a tarefa (no-op se as chaves não mudaram)."""
+        chave = self._chave(tarefa)
+        antiga = self._chaves.obter(tarefa.id)
+        if antiga == chave:
+            return
+        if antiga is not None:
+            self._remover_chave(tarefa.id, antiga)
+        self._chaves.definir(tarefa.id, chave)
+        self._adicionar_chave(tarefa.id, chave)
+
+    def remover(self, id_tarefa: int) -> None:
+        """Remove a tarefa de todos os índices."""
+        antiga = self._chaves.remover(id_tarefa)
+        if antiga is not None:
+            self._remover_chave(id_tarefa, antiga)
+
+    def consultar(
+        self,
+        status=None,
+        tipo=None,
+        id_disciplina: Optional[int] = None,
+        inicio: Optional[datetime] = None,
+        fim: Optional[datetime] = None,
+    ) -> List[int]:
+        """Retorna IDs que satisfazem todos os filtros, em ordem de data de entrega.
+
+        ``status`` e ``tipo`` aceitam um valor ou uma coleção de valores (união).
+        ``inicio``/``fim`` delimitam data_entrega (ambos inclusivos).
+        """
+        # (tamanho, arrays de IDs, campo da chave, códigos aceitos) por filtro
+        filtros = []
+        if status is not None:
+            filtros.append(self._filtro(self.por_status, self._codigos(status, Status), 0))
+        if tipo is not None:
+            filtros.append(self._filtro(self.por_tipo, self._codigos(tipo, Tipo), 1))
+        if id_disciplina is not None:
+            filtros.append(self._filtro(self.por_disciplina, (id_disciplina,), 2))
+        filtros.sort(key=lambda filtro: filtro[0])
+
+        lo, hi = self.prazos.faixa(inicio, fim)
+        por_intervalo = inicio is not None or fim is not None
+
+        if por_intervalo and (not filtros or hi - lo <= filtros[0][0]):
+            # Percorre só a faixa de datas e confere os filtros nas chaves
+            return [
+                id_tarefa
+                for id_tarefa in self.prazos.ids[lo:hi]
+                if self._aceita(id_tarefa, filtros)
+            ]
+        if not filtros:
+            return list(self.prazos.ids)
+
+        # Parte do menor filtro e confere os demais (e o intervalo) nas chaves
+        _, menor, _, _ = filtros[0]
+        demais = filtros[1:]
+        minimo = -math.inf if inicio is None else microssegundos(inicio)
+        maximo = math.inf if fim is None else microssegundos(fim)
+        chaves = self._chaves
+        prazos = chaves.colunas[3]
+        conferir = [(chaves.colunas[campo], aceitos) for _, _, campo, aceitos in demais]
+        resultado = []
+        for ids in menor:
+            for id_tarefa in ids:
+                pos = chaves.posicao(id_tarefa)
+                prazo = prazos[pos]
+                if minimo <= prazo <= maximo:
+                    for coluna, aceitos in conferir:
+                        if coluna[pos] not in aceitos:
+                            break
+                    else:
+                        resultado.append((prazo, id_tarefa))
+        resultado.sort()
+        return [id_tarefa for _, id_tarefa in resultado]
+
+    def abertas_por_prazo(
+        self,
+        inicio: Optional[datetime] = None,
+        fim: Optional[datetime] = None,
+        tipo: Optional[Tipo] = None,
+        limite: Optional[int] = None,
+    ) -> tuple:
+        """Retorna (IDs não concluídos com prazo em [inicio, fim], total), por prazo.
+
+        Busca binária na lista de abertas (geral ou do tipo) e recorte:
+        O(log n + k), sem percorrer as demais tarefas.
+        """
+        if tipo is None:
+            lista = self.abertas
+        else:
+            lista = self.abertas_por_tipo.get(tipo.codigo) or _ListaPrazos()
+        lo, hi = lista.faixa(inicio, fim)
+        fim_pagina = hi if limite is None else min(hi, lo + limite)
+        return list(lista.ids[lo:fim_pagina]), hi - lo
+
+    def paginar(
+        self,
+        offset: int = 0,
+        limite: Optional[int] = None,
+        ordenar_por: str = "id",
+        decrescente: bool = False,
+        **filtros,
+    ) -> tuple:
+        """Retorna (IDs da página, total de resultados).
+
+        Sem filtros por hash, a página é um recorte direto do array ordenado
+        (custo proporcional ao tamanho da página); com filtros, só os IDs
+        candidatos são percorridos, sem materializar tarefas.
+        """
+        if ordenar_por not in self.ORDENACOES:
+            raise ValueError(f"Ordenação inválida: {ordenar_por}")
+        inicio, fim = filtros.get("inicio"), filtros.get("fim")
+        sem_hash = all(
+            filtros.get(campo) is None
+            for campo in ("status", "tipo", "id_disciplina")
+        )
+        por_intervalo = inicio is not None or fim is not None
+
+        if sem_hash and ordenar_por == "id" and not por_intervalo:
+            sequencia = self._chaves.ids
+        elif sem_hash and ordenar_por == "data_entrega":
+            lo, hi = self.prazos.faixa(inicio, fim)
+            sequencia = _Recorte(self.prazos.ids, lo, hi)
+        else:
+            sequencia = self.consultar(**filtros)
+            if ordenar_por == "id":
+                sequencia.sort()
+
+        total = len(sequencia)
+        if limite is None:
+            limite = total
+        if decrescente:
+            fim_pagina = max(total - offset, 0)
+            pagina = sequencia[max(fim_pagina - limite, 0) : fim_pagina][::-1]
+        else:
+            pagina = sequencia[offset : offset + limite]
+        return list(pagina), total
+
+    # Helpers
+    def _adicionar_chave(self, id_tarefa: int, chave: tuple) -> None:
+        status, tipo, id_disciplina, prazo = chave
+        insort(self.por_status[status], id_tarefa)  # IDs novos quase sempre vão para o fim
+        insort(self.por_tipo[tipo], id_tarefa)
+        if id_disciplina:
+            insort(self.por_disciplina[id_disciplina], id_tarefa)
+        self.prazos.inserir(prazo, id_tarefa)
+        if status != _CONCLUIDO:
+            self.abertas.inserir(prazo, id_tarefa)
+            self.abertas_por_tipo[tipo].inserir(prazo, id_tarefa)
+
+    def _remover_chave(self, id_tarefa: int, chave: tuple) -> None:
+        status, tipo, id_disciplina, prazo = chave
+        self._remover_ordenado(self.por_status[status], id_tarefa)
+        self._remover_ordenado(self.por_tipo[tipo], id_tarefa)
+        if id_disciplina:
+            self._remover_ordenado(self.por_disciplina[id_disciplina], id_tarefa)
+        self.prazos.remover(prazo, id_tarefa)
+        if status != _CONCLUIDO:
+            self.abertas.remover(prazo, id_tarefa)
+            self.abertas_por_tipo[tipo].remover(prazo, id_tarefa)
+
+    @staticmethod
+    def _remover_ordenado(ids: array, id_tarefa: int) -> None:
+        i = bisect_left(ids, id_tarefa)
+        if i < len(ids) and ids[i] == id_tarefa:
+            del ids[i]
+
+    def _aceita(self, id_tarefa: int, filtros: list) -> bool:
+        if not filtros:
+            return True
+        pos = self._chaves.posicao(id_tarefa)
+        colunas = self._chaves.colunas
+        return all(colunas[campo][pos] in aceitos for _, _, campo, aceitos in filtros)
+
+    @staticmethod
+    def _filtro(indice: dict, chaves, campo: int) -> tuple:
+        # Cada ID está em um único array por hash: a união é só a concatenação
+        listas = [indice[chave] for chave in chaves if chave in indice]
+        return sum(map(len, listas)), listas, campo, frozenset(chaves)
+
+    @staticmethod
+    def _codigos(valores, tipo_enum) -> tuple:
+        if isinstance(valores, tipo_enum):
+            return (valores.codigo,)
+        return tuple({valor.codigo for valor in valores})
+
+
+class _ListaPrazos:
+    """Pares (prazo, id) ordenados, em dois arrays paralelos (prazo em microssegundos)."""
+
+    __slots__ = ("prazos", "ids")
+
+    def __init__(self, prazos: Optional[array] = None, ids: Optional[array] = None):
+        self.prazos = array("q") if prazos is None else prazos
+        self.ids = array("q") if ids is None else ids
+
+    def __getstate__(self) -> tuple:
+        return self.prazos, self.ids
+
+    def __setstate__(self, estado: tuple) -> None:
+        self.prazos, self.ids = estado
+
+    @classmethod
+    def das_posicoes(cls, posicoes: list, prazos: array, ids: array) -> "_ListaPrazos":
+        """Lista com os pares das ``posicoes`` (já em ordem de prazo, id) das colunas."""
+        return cls(
+            array("q", map(prazos.__getitem__, posicoes)),
+            array("q", map(ids.__getitem__, posicoes)),
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def faixa(self, inicio: Optional[datetime], fim: Optional[datetime]) -> tuple:
+        """Posições [lo, hi) com prazo dentro do intervalo (ambos inclusivos)."""
+        lo = 0 if inicio is None else bisect_left(self.prazos, microssegundos(inicio))
+        hi = len(self.prazos) if fim is None else bisect_right(self.prazos, microssegundos(fim))
+        return lo, hi
+
+    def _posicao(self, prazo: int, id_tarefa: int) -> int:
+        lo = bisect_left(self.prazos, prazo)
+        hi = bisect_right(self.prazos, prazo, lo)
+        return bisect_left(self.ids, id_tarefa, lo, hi)
+
+    def inserir(self, prazo: int, id_tarefa: int) -> None:
+        pos = self._posicao(prazo, id_tarefa)
+        self.prazos.insert(pos, prazo)
+        self.ids.insert(pos, id_tarefa)
+
+    def remover(self, prazo: int, id_tarefa: int) -> None:
+        pos = self._posicao(prazo, id_tarefa)
+        if pos < len(self.ids) and self.prazos[pos] == prazo and self.ids[pos] == id_tarefa:
+            del self.prazos[pos]
+            del self.ids[pos]
+
+
+class _Recorte:
+    """Visão [lo, hi) de uma sequência sem copiá-la (len e fatiamento)."""
+
+    def __init__(self, lista, lo: int, hi: int):
+        self.lista, self.lo, self.hi = lista, lo, hi
+
+    def __len__(self) -> int:
+        return self.hi - self.lo
+
+    def __getitem__(self, fatia: slice):
+        inicio, fim, _ = fatia.indices(len(self))
+        return self.lista[self.lo + inicio : self.lo + fim]
@@ -1,5 +1,5 @@
 # from datetime import datetime
-from DB import BancoDeDados
+from DB import BancoDeDados, criar_banco
 from tarefaModel import TarefaModel
 from tarefaController import TarefaController
 from tarefaView import TarefaView
@@ -9,9 +9,15 @@ import os
 if __name__ == "__main__":
     # 1. Setup Inicial (Injeção de Dependência)
     # Garante que o CSV seja lido/escrito dentro de src/
-    BancoDeDados.CSV_FILENAME = os.path.join(os.path.dirname(__file__), "tarefas.csv")
+    BancoDeDados.CSV_FILENAME = os.environ.get("TAREFAS_CSV") or os.path.join(
+        os.path.dirname(__file__), "tarefas.csv"
+    )
+    # Carrega tudo antes do menu; TAREFAS_CARGA=adiada carrega o CSV em segundo
+    # plano enquanto o menu já responde (início rápido)
+    BancoDeDados.CARGA_ADIADA = os.environ.get("TAREFAS_CARGA", "imediata") == "adiada"
 
-    db = BancoDeDados()
+    # Backend escolhido por configuração: TAREFAS_BACKEND=csv (padrão), sqlite ou particionado
+    db = criar_banco()
 
     # O Model recebe o DB para poder persistir os dados
     model = TarefaModel(db)
@@ -22,33 +28,53 @@ if __name__ == "__main__":
     # A View recebe o Controller para enviar as ações do usuário
     view = TarefaView(controller)
 
+    # Dispara os lembretes vencidos em segundo plano
+    model.agendador.iniciar()
+
     # 2. Loop de Aplicação
-    while True:
-        try:
-            # Exibe o menu e captura a escolha
-            opcao = view.exibir_menu_principal()
-
-            if opcao == "1":
-                # Equivalente ao Cenário 1 e 2
-                # A própria View vai pedir os dados (Título, Data, etc.) e tratar tanto o sucesso (201) quanto o erro de disciplina (404)
-                view.renderizar_criar_tarefa()
-
-            elif opcao == "2":
-                # Equivalente ao Cenário 3
-                # A View pede o ID e chama o controller para concluir
-                view.renderizar_concluir_tarefa()
-
-            elif opcao == "3":
-                view.renderizar_listar_tarefas()
-
-            elif opcao == "0":
-                print("Saindo do sistema...")
-                break
+    # try/finally: o encerramento roda mesmo se o loop sair por uma exceção
+    try:
+        while True:
+            try:
+                # Exibe o menu e captura a escolha
+                opcao = view.exibir_menu_principal()
+
+                if opcao == "1":
+                    # Equivalente ao Cenário 1 e 2
+                    # A própria View vai pedir os dados (Título, Data, etc.) e tratar tanto o sucesso (201) quanto o erro de disciplina (404)
+                    view.renderizar_criar_tarefa()
+
+                elif opcao == "2":
+                    # Equivalente ao Cenário 3
+                    # A View pede o ID e chama o controller para concluir
+                    view.renderizar_concluir_tarefa()
+
+                elif opcao == "3":
+                    view.renderizar_listar_tarefas()
+
+                elif opcao == "4":
+                    view.renderizar_adicionar_lembrete()
 
-            else:
-                print("Opção inválida, tente novamente.")
-                time.sleep(1)
+                elif opcao == "5":
+                    view.renderizar_painel_prazos()
 
-        except KeyboardInterrupt:
-            print("\nSaindo do sistema...")
-            break
+                elif opcao == "6":
+                    view.renderizar_buscar_tarefas()
+
+                elif opcao == "7":
+                    view.renderizar_registrar_nota()
+
+                elif opcao == "0":
+                    print("Saindo do sistema...")
+                    break
+
+                else:
+                    print("Opção inválida, tente novamente.")
+                    time.sleep(1)
+
+            except KeyboardInterrupt:
+                print("\nSaindo do sistema...")
+                break
+    finally:
+        # Para agendador e cancelamentos (o restante fica no outbox) e fecha o banco
+        model.encerrar()
@@ -0,0 +1,249 @@
+"""Instrumentação leve dos caminhos quentes (controller, model e armazenamento).
+
+Contadores e histogramas em memória, exportados no formato texto do
+Prometheus. Desligada por padrão: com TAREFAS_METRICAS=1 (ou ativar())
+passa a medir. Desligada, cada ponto instrumentado custa um teste de flag.
+
+Uso:
+    python metricas.py    # despeja as métricas de uma carga curta de exemplo
+"""
+
+from bisect import bisect_left
+import functools
+import os
+import threading
+import time
+
+
+BUCKETS_SEGUNDOS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+BUCKETS_BYTES = tuple(1024 * 4**i for i in range(11))  # 1 KiB .. 1 GiB
+
+# nome -> (tipo, ajuda, buckets)
+DEFINICOES = {
+    "tarefas_operacao_segundos": (
+        "histogram",
+        "Duração de cada chamada instrumentada, por camada e operação.",
+        BUCKETS_SEGUNDOS,
+    ),
+    "tarefas_operacao_total": (
+        "counter",
+        "Chamadas instrumentadas por camada, operação e resultado (status HTTP, ok ou excecao).",
+        None,
+    ),
+    "tarefas_bytes_gravados": (
+        "histogram",
+        "Bytes gravados por escrita de snapshot ou append no journal.",
+        BUCKETS_BYTES,
+    ),
+    "tarefas_persistencia_falhas_total": (
+        "counter",
+        "Falhas de gravação em disco por etapa (journal, compactacao, grupo).",
+        None,
+    ),
+    "tarefas_cache_total": (
+        "counter",
+        "Consultas ao cache de respostas do controller (acerto ou falha).",
+        None,
+    ),
+    "tarefas_excecoes_total": (
+        "counter",
+        "Exceções convertidas em status 500 pelo model, por operação e tipo.",
+        None,
+    ),
+}
+
+
+class _Histograma:
+    __slots__ = ("contagens", "soma", "quantidade")
+
+    def __init__(self, buckets: tuple):
+        self.contagens = [0] * (len(buckets) + 1)  # último: acima do maior bucket
+        self.soma = 0.0
+        self.quantidade = 0
+
+
+class Registro:
+    """Séries de métricas por (nome, rótulos); seguro entre threads."""
+
+    def __init__(self, ativo: bool = False):
+        self.ativo = ativo
+        self._trava = threading.Lock()
+        self._contadores = {}  # (nome, rotulos) -> valor
+        self._histogramas = {}  # (nome, rotulos) -> _Histograma
+
+    def incrementar(self, nome: str, valor: float = 1, **rotulos) -> None:
+        if not self.ativo:
+            return
+        chave = (nome, tuple(sorted(rotulos.items())))
+        with self._trava:
+            self._contadores[chave] = self._contadores.get(chave, 0) + valor
+
+    def observar(self, nome: str, valor: float, **rotulos) -> None:
+        if not self.ativo:
+            return
+        chave = (nome, tuple(sorted(rotulos.items())))
+        with self._trava:
+            self._observar(chave, valor)
+
+    def registrar_chamada(self, chave_duracao: tuple, chave_total: tuple, duracao: float) -> None:
+        """Histograma de duração + contador de uma chamada, com chaves já montadas."""
+        with self._trava:
+            self._observar(chave_duracao, duracao)
+            self._contadores[chave_total] = self._contadores.get(chave_total, 0) + 1
+
+    def _observar(self, chave: tuple, valor: float) -> None:
+        buckets = DEFINICOES[chave[0]][2]
+        histograma = self._histogramas.get(chave)
+        if histograma is None:
+            histograma = self._histogramas[chave] = _Histograma(buckets)
+        histograma.contagens[bisect_left(buckets, valor)] += 1
+        histograma.soma += valor
+        histograma.quantidade += 1
+
+    def limpar(self) -> None:
+        with self._trava:
+            self._contadores.clear()
+            self._histogramas.clear()
+
+    def exportar(self) -> str:
+        """Todas as séries no formato de exposição texto do Prometheus (0.0.4)."""
+        with self._trava:
+            contadores = sorted(self._contadores.items())
+            histogramas = sorted(
+                (chave, list(h.contagens), h.soma, h.quantidade)
+                for chave, h in self._histogramas.items()
+            )
+        linhas = []
+        for nome, (tipo, ajuda, buckets) in DEFINICOES.items():
+            linhas.append(f"# HELP {nome} {ajuda}")
+            linhas.append(f"# TYPE {nome} {tipo}")
+            for (serie, rotulos), valor in contadores:
+                if serie == nome:
+                    linhas.append(f"{nome}{_rotulos(rotulos)} {_numero(valor)}")
+            for (serie, rotulos), contagens, soma, quantidade in histogramas:
+                if serie != nome:
+                    continue
+                acumulado = 0
+                for limite, contagem in zip(buckets, contagens):
+                    acumulado += contagem
+                    le = (("le", _numero(limite)),)
+                    linhas.append(f"{nome}_bucket{_rotulos(rotulos + le)} {acumulado}")
+                le = (("le", "+Inf"),)
+                linhas.append(f"{nome}_bucket{_rotulos(rotulos + le)} {quantidade}")
+                linhas.append(f"{nome}_sum{_rotulos(rotulos)} {_numero(soma)}")
+                linhas.append(f"{nome}_count{_rotulos(rotulos)} {quantidade}")
+        return "\n".join(linhas) + "\n"
+
+
+def _rotulos(rotulos: tuple) -> str:
+    if not rotulos:
+        return ""
+    pares = ",".join(
+        '{}="{}"'.format(
+            chave,
+            str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for chave, valor in rotulos
+    )
+    return "{" + pares + "}"
+
+
+def _numero(valor: float) -> str:
+    return repr(float(valor)) if isinstance(valor, float) else str(valor)
+
+
+REGISTRO = Registro(
+    os.environ.get("TAREFAS_METRICAS", "").strip().lower() in ("1", "true", "sim")
+)
+incrementar = REGISTRO.incrementar
+observar = REGISTRO.observar
+exportar = REGISTRO.exportar
+
+
+def ativar() -> None:
+    REGISTRO.ativo = True
+
+
+def desativar() -> None:
+    REGISTRO.ativo = False
+
+
+def _resultado(retorno) -> str:
+    """Status das respostas {"status"} (controller) e {"status_code"} (model)."""
+    if isinstance(retorno, dict):
+        status = retorno.get("status", retorno.get("status_code"))
+        if status is not None:
+            return str(status)
+    return "ok"
+
+
+def cronometrar(camada: str, operacao: str = None):
+    """Decorator: histograma de duração e contador por resultado da chamada."""
+
+    def decorar(funcao):
+        rotulos = (("camada", camada), ("operacao", operacao or funcao.__name__))
+        # Chaves montadas uma vez: por chamada só resta medir e somar
+        chave_duracao = ("tarefas_operacao_segundos", rotulos)
+        chaves_total = {}
+
+        def chave_total(resultado: str) -> tuple:
+            chave = chaves_total.get(resultado)
+            if chave is None:
+                chave = chaves_total[resultado] = (
+                    "tarefas_operacao_total",
+                    rotulos + (("resultado", resultado),),
+                )
+            return chave
+
+        @functools.wraps(funcao)
+        def instrumentada(*args, **kwargs):
+            if not REGISTRO.ativo:
+                return funcao(*args, **kwargs)
+            inicio = time.perf_counter()
+            try:
+                retorno = funcao(*args, **kwargs)
+            except BaseException:
+                REGISTRO.registrar_chamada(
+                    chave_duracao, chave_total("excecao"), time.perf_counter() - inicio
+                )
+                raise
+            REGISTRO.registrar_chamada(
+                chave_duracao, chave_total(_resultado(retorno)), time.perf_counter() - inicio
+            )
+            return retorno
+
+        return instrumentada
+
+    return decorar
+
+
+def main() -> None:
+    """Roda uma carga curta com as métricas ligadas e imprime a exposição."""
+    from contextlib import redirect_stdout
+    import sys
+    import tempfile
+    from benchmark import banco_temporario, gerar_payloads
+    from tarefaController import TarefaController
+    from tarefaModel import TarefaModel
+    # Como script este módulo é __main__: o registro usado pelas camadas é o de "metricas"
+    import metricas
+
+    metricas.ativar()
+    with tempfile.TemporaryDirectory() as diretorio, redirect_stdout(sys.stderr):
+        banco = banco_temporario(diretorio)
+        controller = TarefaController(TarefaModel(banco))
+        for dados in gerar_payloads(200):
+            controller.post_criar_tarefa(dados)
+        for id_tarefa in range(1, 101):
+            controller.put_concluir_tarefa(id_tarefa)
+        controller.get_listar_tarefas(limite=20)
+        banco.compactar()
+        banco.fechar()
+    print(metricas.exportar(), end="")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+from datetime import datetime
+from enum import Enum
+from classes import Tarefa
+import argparse
+import json
+import metricas
+import re
+
+
+_INVALIDO = object()  # sentinela: corpo JSON malformado (400 já respondido)
+
+
+def serializar(valor):
+    """Converte o body das respostas do controller em estruturas JSON."""
+    if isinstance(valor, Tarefa):
+        return valor.para_dict()
+    if isinstance(valor, dict):
+        return {chave: serializar(v) for chave, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [serializar(v) for v in valor]
+    if isinstance(valor, datetime):
+        return valor.isoformat()
+    if isinstance(valor, Enum):
+        return valor.value
+    return valor
+
+
+def _json_bytes(body) -> bytes:
+    return json.dumps(serializar(body), ensure_ascii=False).encode("utf-8")
+
+
+class ManipuladorTarefas(BaseHTTPRequestHandler):
+    """Roteia requisições HTTP para os endpoints do TarefaController.
+
+    POST /tarefas                  -> post_criar_tarefa
+    POST /tarefas/lote             -> post_criar_tarefas_lote (array JSON)
+    PUT  /tarefas/<id>/concluir    -> put_concluir_tarefa
+    PUT  /tarefas/<id>/nota        -> put_registrar_nota ({"nota": ...})
+    PUT  /tarefas/concluir         -> put_concluir_tarefas_lote
+                                      ({"ids": [...]} ou {"id_disciplina", "tipo", "data_fim"})
+    POST /tarefas/<id>/lembretes   -> post_adicionar_lembrete ({"data": ...})
+    GET  /tarefas?limite=&offset=&ordenar_por=&decrescente=&status=&tipo=&data_inicio=&data_fim=
+                                   -> get_listar_tarefas
+    GET  /prazos?data_inicio=&data_fim=&tipo=&limite=   -> get_prazos
+    GET  /prazos/atrasadas?tipo=&limite=                -> get_tarefas_atrasadas
+    GET  /prazos/proximos?quantidade=                   -> get_proximos_prazos
+    GET  /estatisticas?id_disciplina=                   -> get_estatisticas
+    GET  /busca?consulta=&limite=                       -> get_pesquisar_tarefas
+    GET  /metrics                  -> métricas no formato texto do Prometheus
+    """
+
+    protocol_version = "HTTP/1.1"  # keep-alive: Content-Length sempre enviado
+    server_version = "TarefasHTTP/1.0"
+
+    TAMANHO_MAXIMO_CORPO = 64 * 1024 * 1024  # bytes (importações em lote inclusive)
+    ROTA_TAREFA = re.compile(r"^/tarefas/(\d+)/(concluir|lembretes|nota)$")
+    PARAMETROS_LISTAGEM = (
+        "limite",
+        "offset",
+        "ordenar_por",
+        "decrescente",
+        "status",
+        "tipo",
+        "data_inicio",
+        "data_fim",
+    )
+    PARAMETROS_CONCLUSAO_LOTE = ("ids", "id_disciplina", "tipo", "data_fim")
+    ROTAS_CONSULTA = {
+        "/prazos": ("get_prazos", ("data_inicio", "data_fim", "tipo", "limite")),
+        "/prazos/atrasadas": ("get_tarefas_atrasadas", ("tipo", "limite")),
+        "/prazos/proximos": ("get_proximos_prazos", ("quantidade",)),
+        "/estatisticas": ("get_estatisticas", ("id_disciplina",)),
+        "/busca": ("get_pesquisar_tarefas", ("consulta", "limite")),
+    }
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        caminho = url.path.rstrip("/")
+        if caminho == "/metrics":
+            return self._enviar(
+                200,
+                metricas.exportar().encode("utf-8"),
+                "text/plain; version=0.0.4; charset=utf-8",
+            )
+        consulta = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        if caminho in self.ROTAS_CONSULTA:
+            metodo, aceitos = self.ROTAS_CONSULTA[caminho]
+            parametros = {k: consulta[k] for k in aceitos if k in consulta}
+            return self._despachar(lambda c: getattr(c, metodo)(**parametros))
+        if caminho != "/tarefas":
+            return self._responder(404, {"erro": "Rota não encontrada."})
+        parametros = {k: consulta[k] for k in self.PARAMETROS_LISTAGEM if k in consulta}
+        self._despachar(lambda c: c.get_listar_tarefas(**parametros))
+
+    def do_POST(self):
+        caminho = urlsplit(self.path).path.rstrip("/")
+        dados = self._ler_json()
+        if dados is _INVALIDO:
+            return
+        if caminho == "/tarefas":
+            return self._despachar(lambda c: c.post_criar_tarefa(dados))
+        if caminho == "/tarefas/lote":
+            if not isinstance(dados, list):
+                return self._responder(400, {"erro": "Esperado um array JSON de tarefas."})
+            return self._despachar(lambda c: c.post_criar_tarefas_lote(dados))
+        rota = self.ROTA_TAREFA.match(caminho)
+        if rota and rota.group(2) == "lembretes":
+            data = dados.get("data") if isinstance(dados, dict) else None
+            return self._despachar(
+                lambda c: c.post_adicionar_lembrete(int(rota.group(1)), data)
+            )
+        self._responder(404, {"erro": "Rota não encontrada."})
+
+    def do_PUT(self):
+        caminho = urlsplit(self.path).path.rstrip("/")
+        dados = self._ler_json()
+        if dados is _INVALIDO:
+            return
+        if caminho == "/tarefas/concluir":
+            if not isinstance(dados, dict):
+                return self._responder(400, {"erro": "Esperado um objeto JSON."})
+            parametros = {k: dados[k] for k in self.PARAMETROS_CONCLUSAO_LOTE if k in dados}
+            return self._despachar(lambda c: c.put_concluir_tarefas_lote(**parametros))
+        rota = self.ROTA_TAREFA.match(caminho)
+        if rota and rota.group(2) == "concluir":
+            return self._despachar(lambda c: c.put_concluir_tarefa(int(rota.group(1))))
+        if rota and rota.group(2) == "nota":
+            nota = dados.get("nota") if isinstance(dados, dict) else None
+            return self._despachar(lambda c: c.put_registrar_nota(int(rota.group(1)), nota))
+        self._responder(404, {"erro": "Rota não encontrada."})
+
+    # Helpers
+    def _despachar(self, chamada):
+        """Chama o controller e converte {"status", "body"} em resposta HTTP."""
+        try:
+            resposta = chamada(self.server.controller)
+        except Exception:
+            return self._responder(500, {"erro": "Erro interno."})
+        status, body = resposta["status"], resposta["body"]
+        if status == 200 and not isinstance(body, str):
+            # Resposta cacheada: o JSON é montado uma vez por versão dos dados
+            dados = self.server.controller.cache.renderizar(resposta, "json", _json_bytes)
+            return self._enviar(status, dados, "application/json; charset=utf-8")
+        if isinstance(body, str):
+            body = {"erro" if status >= 400 else "mensagem": body}
+        self._responder(status, serializar(body))
+
+    def _ler_json(self):
+        """Lê o corpo JSON (vazio -> None); responde e retorna _INVALIDO se não der.
+
+        400 para Content-Length inválido ou JSON malformado, 411 para corpo
+        sem Content-Length (chunked) e 413 acima de TAMANHO_MAXIMO_CORPO.
+        """
+        cabecalho = self.headers.get("Content-Length")
+        if cabecalho is None and self.headers.get("Transfer-Encoding"):
+            return self._recusar_corpo(411, "Content-Length obrigatório.")
+        try:
+            tamanho = int(cabecalho or 0)
+            if tamanho < 0:
+                raise ValueError(tamanho)
+        except ValueError:
+            return self._recusar_corpo(400, "Content-Length inválido.")
+        if tamanho > self.TAMANHO_MAXIMO_CORPO:
+            return self._recusar_corpo(413, "Corpo da requisição grande demais.")
+        bruto = self.rfile.read(tamanho) if tamanho else b""
+        if not bruto.strip():
+            return None
+        try:
+            return json.loads(bruto)
+        except ValueError:
+            self._responder(400, {"erro": "JSON inválido."})
+            return _INVALIDO
+
+    def _recusar_corpo(self, status: int, mensagem: str):
+        """Responde sem ler o corpo; a conexão fecha (o corpo não lido a dessincronizaria)."""
+        self.close_connection = True
+        self._responder(status, {"erro": mensagem})
+        return _INVALIDO
+
+    def _responder(self, status: int, corpo) -> None:
+        dados = json.dumps(corpo, ensure_ascii=False).encode("utf-8")
+        self._enviar(status, dados, "application/json; charset=utf-8")
+
+    def _enviar(self, status: int, dados: bytes, tipo_conteudo: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", tipo_conteudo)
+        self.send_header("Content-Length", str(len(dados)))
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def log_message(self, formato, *args):
+        # Silencioso por padrão: logar cada request custa mais que o request
+        pass
+
+
+class ServidorTarefas(ThreadingHTTPServer):
+    """Servidor HTTP com uma thread por conexão (keep-alive) sobre um controller."""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, endereco: tuple, controller):
+        super().__init__(endereco, ManipuladorTarefas)
+        self.controller = controller
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Servidor HTTP de tarefas.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8000)
+    parser.add_argument(
+        "--grupo", action="store_true", help="gravação em grupo (group commit) no CSV"
+    )
+    parser.add_argument(
+        "--metricas", action="store_true", help="liga a instrumentação exposta em /metrics"
+    )
+    args = parser.parse_args(argv)
+
+    from DB import BancoDeDados
+    from tarefaModel import TarefaModel
+    from tarefaController import TarefaController
+
+    if args.grupo:
+        BancoDeDados.MODO_GRUPO = True
+    if args.metricas:
+        metricas.ativar()
+
+    model = TarefaModel()
+    servidor = ServidorTarefas((args.host, args.porta), TarefaController(model))
+    model.agendador.iniciar()
+    print(f"Servindo em http://{args.host}:{args.porta} (Ctrl+C para sair)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        print("\nEncerrando servidor...")
+    finally:
+        try:
+            servidor.server_close()
+            model.agendador.parar()
+            model.cancelamentos.aguardar(timeout=5)
+            model.cancelamentos.parar()
+        finally:
+            model.db.fechar()
+
+
+if __name__ == "__main__":
+    main()
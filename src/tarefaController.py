@@ -1,74 +1,41 @@
 from tarefaModel import TarefaModel
-from classes import Tipo
-from datetime import datetime
-import re
+from classes import Tipo, Status
+from collections.abc import Iterable
+from datas import interpretar_data
+from cacheRespostas import CacheRespostas
+import math
+import metricas
 
 
 class TarefaController:
     """Camada de orquestração entre View e Model (simula endpoints HTTP)."""
 
+    LIMITE_MAXIMO = 1000  # maior página aceita por get_listar_tarefas
+    LIMITE_PADRAO = 50  # página de get_listar_tarefas sem limite informado
+    TAMANHO_BLOCO_LOTE = 5000  # linhas válidas por gravação em post_criar_tarefas_lote
+    LIMITE_BUSCA = 20  # resultados de get_pesquisar_tarefas sem limite informado
+    CAPACIDADE_CACHE = 128  # respostas de leitura guardadas (LRU)
+    NOTA_MAXIMA = 10.0  # escala das notas: 0 a NOTA_MAXIMA
+
     def __init__(self, model: TarefaModel):
         """Injeta o model que contém as regras de negócio."""
         self.model = model
+        # Leituras repetidas sem escrita no meio não chegam ao model
+        self.cache = CacheRespostas(model.versao, self.CAPACIDADE_CACHE)
 
     # Endpoint para Criar Tarefa
+    @metricas.cronometrar("controller")
     def post_criar_tarefa(self, dados: dict) -> dict:
         """Valida/coage dados de criação e delega ao model."""
         # print(f"--- Recebendo Request POST Criar Tarefa: {dados.get('titulo')} ---")
         try:
-            titulo = (dados.get("titulo") or "").strip()
-            id_disciplina = dados.get("id_disciplina")
-            descricao = (dados.get("descricao") or "").strip()
-            data_entrega = dados.get("data_entrega")
-            tipo = dados.get("tipo")
-
-            if not titulo or id_disciplina is None:
+            erro, campos = self._validar_criacao(dados)
+            if erro is not None:
                 # View <-- Controller: Resposta HTTP 400: Bad Request
-                return {"status": 400, "body": "Informe título e ID da disciplina."}
-
-            # Coerções/validações
-            try:
-                id_disciplina = int(id_disciplina)
-                if id_disciplina <= 0:
-                    return {
-                        "status": 400,
-                        "body": "ID da disciplina deve ser positivo.",
-                    }
-            except Exception:
-                return {"status": 400, "body": "ID da disciplina deve ser numérico."}
-
-            # Validação obrigando horário
-            ok, motivo = self._validar_data_str(data_entrega)
-
-            if not ok:
-                # Diagnóstico: mostra o valor recebido e a razão
-                return {
-                    "status": 400,
-                    "body": f"Data/Horário inválido: {motivo}",
-                }
-            data_entrega = self._coerce_datetime(data_entrega)
-
-            if not isinstance(data_entrega, datetime):
-                return {
-                    "status": 400,
-                    "body": f"Data/Horário inválido. Recebido: '{dados.get('data_entrega')}'. Use dd/mm/aaaa [HH:MM] ou yyyy-mm-dd [HH:MM].",
-                }
-
-            tipo = self._coerce_tipo(tipo)
-            if not isinstance(tipo, Tipo):
-                return {
-                    "status": 400,
-                    "body": "Tipo inválido. Use PROVA, TRABALHO ou ATIVIDADE.",
-                }
+                return erro
 
             # Controller -> Model : Criar Tarefa
-            resultado = self.model.criar_tarefa(
-                id_disciplina=id_disciplina,
-                titulo=titulo,
-                descricao=descricao,
-                data=data_entrega,
-                tipo=tipo,
-            )
+            resultado = self.model.criar_tarefa(**campos)
 
             return {
                 "status": resultado["status_code"],
@@ -78,7 +45,61 @@ class TarefaController:
         except Exception:
             return {"status": 500, "body": "Falha ao processar a criação."}
 
+    # Endpoint para Criar Tarefas em lote (importação)
+    @metricas.cronometrar("controller")
+    def post_criar_tarefas_lote(self, linhas: Iterable[dict]) -> dict:
+        """Valida as linhas em streaming e cria as válidas em blocos de TAMANHO_BLOCO_LOTE.
+
+        Cada bloco é uma gravação (tudo ou nada); só um bloco fica em
+        memória por vez. Uma falha do banco interrompe a importação e os
+        blocos anteriores continuam gravados (``criadas`` diz quantas).
+        Linhas inválidas não abortam o lote: voltam no relatório ``erros``
+        com o número da linha (1-based), o status e a mensagem.
+        """
+        try:
+            bloco, erros, criadas, falha = [], [], 0, None
+            for numero, dados in enumerate(linhas, start=1):
+                erro, campos = self._validar_criacao(dados)
+                if erro is not None:
+                    erros.append(
+                        {"linha": numero, "status": erro["status"], "erro": erro["body"]}
+                    )
+                    continue
+                bloco.append((numero, campos))
+                if len(bloco) >= self.TAMANHO_BLOCO_LOTE:
+                    falha, criadas = self._criar_bloco(bloco, erros, criadas)
+                    bloco = []
+                    if falha is not None:
+                        break
+            if bloco and falha is None:
+                falha, criadas = self._criar_bloco(bloco, erros, criadas)
+            erros.sort(key=lambda e: e["linha"])
+
+            status = falha["status_code"] if falha is not None else 201 if criadas else 200
+            if erros and status < 500:
+                # 207 Multi-Status: parte criada, parte rejeitada
+                status = 207 if criadas else 400
+            return {
+                "status": status,
+                "body": {
+                    "criadas": criadas,
+                    "erros": erros,
+                    **({"erro": falha["erro"]} if falha is not None else {}),
+                },
+            }
+        except Exception:
+            return {"status": 500, "body": "Falha ao processar a importação."}
+
+    def _criar_bloco(self, bloco: list, erros: list, criadas: int) -> tuple:
+        """Envia um bloco ao model; retorna (resultado se o banco falhou, total de criadas)."""
+        # Controller -> Model : Criar Tarefas (lote)
+        resultado = self.model.criar_tarefas_lote(bloco)
+        erros.extend(resultado.get("erros", []))
+        falha = resultado if "erro" in resultado else None
+        return falha, criadas + resultado.get("criadas", 0)
+
     # Endpoint para Concluir Tarefa
+    @metricas.cronometrar("controller")
     def put_concluir_tarefa(self, id_tarefa: int) -> dict:
         """Recebe o ID e delega a conclusão ao model."""
         # print(f"--- Recebendo Request PUT Concluir Tarefa ID: {id_tarefa} ---")
@@ -96,90 +117,404 @@ class TarefaController:
             "body": resultado.get("mensagem", resultado.get("erro")),
         }
 
+    # Endpoint para Registrar Nota
+    @metricas.cronometrar("controller")
+    def put_registrar_nota(self, id_tarefa: int, nota) -> dict:
+        """Valida ID e nota (0 a NOTA_MAXIMA; aceita vírgula decimal) e delega ao model."""
+        try:
+            id_tarefa = int(id_tarefa)
+            if id_tarefa <= 0:
+                return {"status": 400, "body": "ID da tarefa deve ser positivo."}
+        except Exception:
+            return {"status": 400, "body": "ID da tarefa deve ser numérico."}
+        try:
+            if isinstance(nota, bool):
+                raise ValueError(nota)
+            nota = float(nota.replace(",", ".") if isinstance(nota, str) else nota)
+        except Exception:
+            return {"status": 400, "body": "Nota deve ser numérica."}
+        if not math.isfinite(nota) or not 0 <= nota <= self.NOTA_MAXIMA:
+            return {"status": 400, "body": f"Nota deve estar entre 0 e {self.NOTA_MAXIMA:g}."}
+
+        resultado = self.model.registrar_nota(id_tarefa, nota)
+        return {
+            "status": resultado["status_code"],
+            "body": resultado.get("mensagem", resultado.get("erro")),
+        }
+
+    # Endpoint para Concluir Tarefas em lote (fechamento de período)
+    @metricas.cronometrar("controller")
+    def put_concluir_tarefas_lote(
+        self, ids=None, id_disciplina=None, tipo=None, data_fim=None
+    ) -> dict:
+        """Conclui por lista de IDs ou por filtro (disciplina, tipo, prazo até data_fim).
+
+        O body traz ``resultados`` por ID com o status que put_concluir_tarefa
+        daria (200/404); o status geral é 200, 207 (parte não encontrada) ou 404.
+        """
+        filtros = {}
+        if id_disciplina is not None:
+            try:
+                filtros["id_disciplina"] = int(id_disciplina)
+            except Exception:
+                return {"status": 400, "body": "id_disciplina deve ser numérico."}
+        if tipo is not None:
+            filtros["tipo"] = Tipo.de_texto(tipo)
+            if filtros["tipo"] is None:
+                return {
+                    "status": 400,
+                    "body": "Tipo inválido. Use PROVA, TRABALHO ou ATIVIDADE.",
+                }
+        if data_fim is not None:
+            filtros["prazo_ate"], motivo = interpretar_data(data_fim)
+            if motivo is not None:
+                return {"status": 400, "body": f"Data inválida no filtro: {motivo}"}
+
+        if ids is not None:
+            if filtros:
+                return {"status": 400, "body": "Informe IDs ou filtro, não ambos."}
+            if isinstance(ids, (str, bytes)) or not isinstance(ids, Iterable):
+                return {"status": 400, "body": "IDs devem ser uma lista."}
+            validos = []
+            for id_tarefa in ids:
+                try:
+                    id_tarefa = int(id_tarefa)
+                except Exception:
+                    return {
+                        "status": 400,
+                        "body": f"ID da tarefa deve ser numérico: {id_tarefa!r}.",
+                    }
+                if id_tarefa <= 0:
+                    return {"status": 400, "body": "ID da tarefa deve ser positivo."}
+                validos.append(id_tarefa)
+            filtros["ids"] = validos
+
+        resultado = self.model.concluir_tarefas(**filtros)
+        if "erro" in resultado:
+            return {"status": resultado["status_code"], "body": resultado["erro"]}
+        return {
+            "status": resultado["status_code"],
+            "body": {
+                "concluidas": resultado["concluidas"],
+                "resultados": resultado["resultados"],
+            },
+        }
+
+    # Endpoint para Adicionar Lembrete
+    @metricas.cronometrar("controller")
+    def post_adicionar_lembrete(self, id_tarefa: int, data) -> dict:
+        """Valida ID e data/horário do lembrete e delega ao model."""
+        try:
+            id_tarefa = int(id_tarefa)
+            if id_tarefa <= 0:
+                return {"status": 400, "body": "ID da tarefa deve ser positivo."}
+        except Exception:
+            return {"status": 400, "body": "ID da tarefa deve ser numérico."}
+
+        data, motivo = interpretar_data(data)
+        if motivo is not None:
+            return {"status": 400, "body": f"Data/Horário inválido: {motivo}"}
+        resultado = self.model.adicionar_lembrete(id_tarefa, data)
+        return {
+            "status": resultado["status_code"],
+            "body": resultado.get("mensagem", resultado.get("erro")),
+        }
+
     # Endpoint para LIstar Tarefas
-    def get_listar_tarefas(self) -> dict:
+    @metricas.cronometrar("controller")
+    def get_listar_tarefas(
+        self,
+        limite: int | None = None,
+        offset: int = 0,
+        ordenar_por: str = "id",
+        decrescente: bool = False,
+        status=None,
+        tipo=None,
+        data_inicio=None,
+        data_fim=None,
+    ) -> dict:
+        """Lista uma página de tarefas com filtros e ordenação.
+
+        ``status``/``tipo`` aceitam enum, nome/valor ou lista deles; datas
+        aceitam os mesmos formatos da criação. O body traz apenas a página
+        pedida, o total de resultados e o offset da próxima página. Sem
+        ``limite``, a página tem LIMITE_PADRAO tarefas; nunca mais que
+        LIMITE_MAXIMO. As páginas vêm do cache enquanto os dados não mudarem.
+        """
         # print(f"--- Recebendo Request GET Listar Tarefas")
-        resultado = self.model.listar_tarefas()
+        try:
+            offset = int(offset)
+            limite = None if limite is None else int(limite)
+        except Exception:
+            return {"status": 400, "body": "Limite e offset devem ser numéricos."}
+        if offset < 0 or (limite is not None and limite <= 0):
+            return {
+                "status": 400,
+                "body": "Offset não pode ser negativo e limite deve ser positivo.",
+            }
+        limite = min(self.LIMITE_PADRAO if limite is None else limite, self.LIMITE_MAXIMO)
+
+        filtros = {}
+        if status is not None:
+            filtros["status"] = self._coerce_lista(status, Status.de_texto)
+            if filtros["status"] is None:
+                return {
+                    "status": 400,
+                    "body": "Status inválido. Use PENDENTE, EM_ANDAMENTO ou CONCLUIDO.",
+                }
+        if tipo is not None:
+            filtros["tipo"] = self._coerce_lista(tipo, Tipo.de_texto)
+            if filtros["tipo"] is None:
+                return {
+                    "status": 400,
+                    "body": "Tipo inválido. Use PROVA, TRABALHO ou ATIVIDADE.",
+                }
+        for campo, valor in (("inicio", data_inicio), ("fim", data_fim)):
+            if valor is None:
+                continue
+            filtros[campo], motivo = interpretar_data(valor)
+            if motivo is not None:
+                return {
+                    "status": 400,
+                    "body": f"Data inválida no filtro: '{valor}'.",
+                }
+
+        decrescente = self._coerce_booleano(decrescente)
+        if decrescente is None:
+            return {"status": 400, "body": "Decrescente deve ser true ou false."}
+        chave = ("listar", offset, limite, ordenar_por, decrescente) + tuple(
+            self._chave_filtro(filtros.get(campo))
+            for campo in ("status", "tipo", "inicio", "fim")
+        )
+        return self.cache.obter(
+            chave, lambda: self._listar(offset, limite, ordenar_por, decrescente, filtros)
+        )
+
+    def _listar(self, offset, limite, ordenar_por, decrescente, filtros) -> dict:
+        resultado = self.model.listar_tarefas(
+            offset=offset,
+            limite=limite,
+            ordenar_por=ordenar_por,
+            decrescente=decrescente,
+            **filtros,
+        )
+        if resultado["status_code"] != 200:
+            return {"status": resultado["status_code"], "body": resultado["erro"]}
+
+        tarefas, total = resultado["tarefas"], resultado["total"]
+        proximo = offset + len(tarefas)
         return {
             "status": resultado["status_code"],
-            "body": resultado["tarefas"],
+            "body": {
+                "tarefas": tarefas,
+                "total": total,
+                "offset": offset,
+                "limite": limite,
+                "proximo_offset": proximo if proximo < total else None,
+            },
+        }
+
+    # Endpoints de Prazos
+    @metricas.cronometrar("controller")
+    def get_prazos(self, data_inicio=None, data_fim=None, tipo=None, limite=None) -> dict:
+        """Tarefas em aberto com prazo entre as datas (inclusivas), em ordem de prazo."""
+        erro, filtros = self._validar_filtros_prazo(tipo, limite)
+        if erro is not None:
+            return erro
+        for campo, valor in (("inicio", data_inicio), ("fim", data_fim)):
+            if valor is None:
+                filtros[campo] = None
+                continue
+            filtros[campo], motivo = interpretar_data(valor)
+            if motivo is not None:
+                return {"status": 400, "body": f"Data inválida no filtro: {motivo}"}
+        chave = ("prazos", filtros["inicio"], filtros["fim"], filtros["tipo"], filtros["limite"])
+        return self.cache.obter(
+            chave,
+            lambda: self._resposta_prazos(self.model.prazos_entre(**filtros), filtros["limite"]),
+        )
+
+    @metricas.cronometrar("controller")
+    def get_tarefas_atrasadas(self, tipo=None, limite=None) -> dict:
+        """Tarefas em aberto com prazo vencido, da mais atrasada em diante."""
+        erro, filtros = self._validar_filtros_prazo(tipo, limite)
+        if erro is not None:
+            return erro
+        resultado = self.model.tarefas_atrasadas(**filtros)
+        return self._resposta_prazos(resultado, filtros["limite"])
+
+    @metricas.cronometrar("controller")
+    def get_proximos_prazos(self, quantidade=5) -> dict:
+        """Próximos ``quantidade`` prazos em aberto de cada tipo (painel "vence em breve")."""
+        erro, filtros = self._validar_filtros_prazo(None, quantidade)
+        if erro is not None:
+            return erro
+        resultado = self.model.proximos_prazos(filtros["limite"])
+        return {
+            "status": resultado["status_code"],
+            "body": {
+                tipo.value: tarefas for tipo, tarefas in resultado["por_tipo"].items()
+            },
+        }
+
+    # Endpoint de Busca
+    @metricas.cronometrar("controller")
+    def get_pesquisar_tarefas(self, consulta=None, limite=None) -> dict:
+        """Busca textual em titulo/descricao ("mat*" busca por prefixo), por relevância."""
+        if not isinstance(consulta, str) or not consulta.strip():
+            return {"status": 400, "body": "Consulta é obrigatória."}
+        erro, filtros = self._validar_filtros_prazo(None, limite)
+        if erro is not None:
+            return erro
+        consulta = consulta.strip()
+        limite = filtros["limite"] or self.LIMITE_BUSCA
+        return self.cache.obter(
+            ("pesquisa", consulta, limite), lambda: self._pesquisa(consulta, limite)
+        )
+
+    def _pesquisa(self, consulta: str, limite: int) -> dict:
+        resultado = self.model.pesquisar_tarefas(consulta, limite)
+        if resultado["status_code"] != 200:
+            return {"status": resultado["status_code"], "body": resultado["erro"]}
+        return {
+            "status": 200,
+            "body": {
+                "consulta": consulta,
+                "resultados": [
+                    {"tarefa": tarefa, "pontuacao": round(pontuacao, 4)}
+                    for tarefa, pontuacao in resultado["resultados"]
+                ],
+                "limite": limite,
+            },
+        }
+
+    # Endpoint de Estatísticas
+    @metricas.cronometrar("controller")
+    def get_estatisticas(self, id_disciplina=None) -> dict:
+        """Relatório agregado (O(1)): contagens, taxa de conclusão e notas por disciplina."""
+        if id_disciplina is not None:
+            try:
+                id_disciplina = int(id_disciplina)
+            except Exception:
+                return {"status": 400, "body": "id_disciplina deve ser numérico."}
+        return self.cache.obter(
+            ("estatisticas", id_disciplina), lambda: self._estatisticas(id_disciplina)
+        )
+
+    def _estatisticas(self, id_disciplina) -> dict:
+        resultado = self.model.estatisticas(id_disciplina)
+        if resultado["status_code"] != 200:
+            return {"status": resultado["status_code"], "body": resultado["erro"]}
+        relatorio = resultado["relatorio"]
+        # Chaves como texto: o body segue direto para JSON
+        return {
+            "status": 200,
+            "body": {
+                **relatorio,
+                "por_status": {s.value: n for s, n in relatorio["por_status"].items()},
+                "por_tipo": {t.value: n for t, n in relatorio["por_tipo"].items()},
+                "notas": {str(d): r for d, r in relatorio["notas"].items()},
+            },
         }
 
     # Helpers
-    def _coerce_datetime(self, v) -> datetime | None:
-        """Converte string em datetime, exigindo horário (HH:MM)."""
-        if isinstance(v, datetime):
-            return v
-        if isinstance(v, str):
-            for fmt in (
-                "%Y-%m-%d %H:%M",
-                "%Y-%m-%d",
-                "%d/%m/%Y %H:%M",
-                "%d/%m/%Y",
-                "%d-%m-%Y %H:%M",
-                "%d-%m-%Y",
-            ):
-                try:
-                    return datetime.strptime(v.strip(), fmt)
-                except ValueError:
-                    pass
-        return None
+    def _validar_filtros_prazo(self, tipo, limite) -> tuple[dict | None, dict | None]:
+        """Coage tipo e limite das consultas de prazo. Retorna (resposta_400, None) ou (None, filtros)."""
+        if tipo is not None:
+            tipo = Tipo.de_texto(tipo)
+            if tipo is None:
+                return {
+                    "status": 400,
+                    "body": "Tipo inválido. Use PROVA, TRABALHO ou ATIVIDADE.",
+                }, None
+        if limite is not None:
+            try:
+                limite = int(limite)
+            except Exception:
+                return {"status": 400, "body": "Limite deve ser numérico."}, None
+            if limite <= 0:
+                return {"status": 400, "body": "Limite deve ser positivo."}, None
+            limite = min(limite, self.LIMITE_MAXIMO)
+        return None, {"tipo": tipo, "limite": limite}
+
+    def _resposta_prazos(self, resultado: dict, limite) -> dict:
+        if resultado["status_code"] != 200:
+            return {"status": resultado["status_code"], "body": resultado["erro"]}
+        return {
+            "status": 200,
+            "body": {
+                "tarefas": resultado["tarefas"],
+                "total": resultado["total"],
+                "limite": limite,
+            },
+        }
+
+    def _validar_criacao(self, dados) -> tuple[dict | None, dict | None]:
+        """Valida/coage o payload de criação. Retorna (resposta_400, None) ou (None, campos)."""
+        if not isinstance(dados, dict):
+            return {"status": 400, "body": "Linha inválida: esperado um objeto."}, None
+
+        titulo = (dados.get("titulo") or "").strip()
+        id_disciplina = dados.get("id_disciplina")
+        descricao = (dados.get("descricao") or "").strip()
+        data_entrega = dados.get("data_entrega")
+        tipo = dados.get("tipo")
+
+        if not titulo or id_disciplina is None or id_disciplina == "":
+            return {"status": 400, "body": "Informe título e ID da disciplina."}, None
+
+        # Coerções/validações
+        try:
+            id_disciplina = int(id_disciplina)
+            if id_disciplina <= 0:
+                return {"status": 400, "body": "ID da disciplina deve ser positivo."}, None
+        except Exception:
+            return {"status": 400, "body": "ID da disciplina deve ser numérico."}, None
+
+        # Validação e conversão numa única passada
+        data_entrega, motivo = interpretar_data(data_entrega)
+        if motivo is not None:
+            # Diagnóstico: mostra a razão
+            return {"status": 400, "body": f"Data/Horário inválido: {motivo}"}, None
 
-    def _coerce_tipo(self, v) -> Tipo | None:
-        """Converte string (nome/valor) em enum Tipo."""
-        if isinstance(v, Tipo):
+        tipo = Tipo.de_texto(tipo)
+        if tipo is None:
+            return {
+                "status": 400,
+                "body": "Tipo inválido. Use PROVA, TRABALHO ou ATIVIDADE.",
+            }, None
+
+        return None, {
+            "id_disciplina": id_disciplina,
+            "titulo": titulo,
+            "descricao": descricao,
+            "data": data_entrega,
+            "tipo": tipo,
+        }
+
+    @staticmethod
+    def _chave_filtro(valor):
+        """Filtro como parte de chave de cache (listas viram frozenset: ordem não importa)."""
+        return frozenset(valor) if isinstance(valor, list) else valor
+
+    def _coerce_lista(self, v, coerce):
+        """Coage um valor, uma lista ou 'a,b,c' com ``coerce``; None se algum for inválido."""
+        if isinstance(v, str) and "," in v:
+            v = v.split(",")
+        if isinstance(v, (list, tuple, set)):
+            itens = [coerce(item) for item in v]
+            return None if not itens or None in itens else itens
+        return coerce(v)
+
+    @staticmethod
+    def _coerce_booleano(v):
+        """bool como está; 'true'/'1'/'sim' e 'false'/'0'/'nao' em texto; None se inválido."""
+        if isinstance(v, bool):
             return v
         if isinstance(v, str):
-            s = v.strip().casefold()
-            for t in Tipo:
-                if s == t.name.casefold() or s == t.value.casefold():
-                    return t
+            texto = v.strip().lower()
+            if texto in ("1", "true", "sim"):
+                return True
+            if texto in ("0", "false", "nao", "não", ""):
+                return False
         return None
-
-    def _validar_data_str(self, v) -> tuple[bool, str | None]:
-        """Valida formato e existência no calendário, exigindo horário. Retorna (ok, motivo_erro)."""
-        if isinstance(v, datetime):
-            return True, None
-        if not isinstance(v, str):
-            return (
-                False,
-                "Data/Horário inválido. Use dd/mm/aaaa [HH:MM] ou yyyy-mm-dd [HH:MM].",
-            )
-
-        s = v.strip()
-        formatos = [
-            ("%d/%m/%Y %H:%M", r"^\d{1,2}/\d{1,2}/\d{4}\s+\d{1,2}:\d{2}$"),
-            ("%d/%m/%Y", r"^\d{1,2}/\d{1,2}/\d{4}$"),
-            ("%Y-%m-%d %H:%M", r"^\d{4}-\d{1,2}-\d{1,2}\s+\d{1,2}:\d{2}$"),
-            ("%Y-%m-%d", r"^\d{4}-\d{1,2}-\d{1,2}$"),
-            ("%d-%m-%Y %H:%M", r"^\d{1,2}-\d{1,2}-\d{4}\s+\d{1,2}:\d{2}$"),
-            ("%d-%m-%Y", r"^\d{1,2}-\d{1,2}-\d{4}$"),
-        ]
-
-        # Checa se algum formato é compatível com o padrão
-        padrao_combinou = False
-        for fmt, regex in formatos:
-            if re.match(regex, s):
-                padrao_combinou = True
-                try:
-                    # strptime já valida meses com zero à esquerda (ex.: 08)
-                    dt = datetime.strptime(s, fmt)
-                    # valida faixa de hora/minuto quando presente
-                    if "%H:%M" in fmt and not (
-                        0 <= dt.hour <= 23 and 0 <= dt.minute <= 59
-                    ):
-                        return False, "Horário inexistente (hora/minuto fora da faixa)."
-                    return True, None
-                except ValueError:
-                    # Padrão ok, mas data impossível (ex.: 31/02/2024)
-                    return False, "Data inexistente no calendário."
-
-        # Nenhum padrão bateu
-        if not padrao_combinou:
-            return (
-                False,
-                "Formato inválido. Use dd/mm/aaaa [HH:MM] ou yyyy-mm-dd [HH:MM].",
-            )
-
-        # fallback
-        return False, "Data/Horário inválido."
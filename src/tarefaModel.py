@@ -1,16 +1,69 @@
 from datetime import datetime
-from DB import BancoDeDados
-from classes import Tarefa, Tipo, Status
+from DB import BancoDeDados, criar_banco
+from agendador import AgendadorLembretes
+from busca import tokenizar_consulta
+from filaCancelamentos import FilaCancelamentos
+from classes import Tarefa, Tipo, Status, Lembrete
+import metricas
+import threading
 
 
 class TarefaModel:
     """Camada de regras de negócio para operações de Tarefa."""
 
-    def __init__(self, db: BancoDeDados):
-        """Recebe a dependência de acesso a dados."""
-        self.db = db
+    def __init__(
+        self,
+        db: BancoDeDados | None = None,
+        agendador: AgendadorLembretes | None = None,
+        cancelamentos: FilaCancelamentos | None = None,
+    ):
+        """Recebe a dependência de acesso a dados (ou cria o backend configurado)."""
+        self.db = db if db is not None else criar_banco()
+        self.agendador = agendador or AgendadorLembretes()
+        self.agendador.ao_disparar = self._lembrete_disparado
+        self.cancelamentos = cancelamentos or FilaCancelamentos()
+        self.cancelamentos.ao_confirmar = self._cancelamentos_confirmados
+        self._lembretes_restaurados = threading.Event()
+        if self.db.carga_adiada:
+            # Não espera a carga do banco: restaura numa thread
+            threading.Thread(
+                target=self._restaurar_lembretes, name="restaurar-lembretes", daemon=True
+            ).start()
+        else:
+            self._restaurar_lembretes()
+
+    def _restaurar_lembretes(self) -> None:
+        """Reconstrói o heap e reenvia o outbox a partir dos lembretes persistidos."""
+        try:
+            for id_tarefa, lembrete in self.db.listar_lembretes_agendados():
+                if lembrete.cancelamento_pendente:
+                    self.cancelamentos.enfileirar(id_tarefa, [lembrete])
+                else:
+                    self.agendador.agendar(id_tarefa, lembrete)
+        finally:
+            self._lembretes_restaurados.set()
+
+    def encerrar(self, timeout: float = 5) -> None:
+        """Para as threads do model e fecha o armazenamento.
+
+        Dá até ``timeout`` segundos à restauração dos lembretes e aos
+        cancelamentos em andamento; o que sobrar continua no outbox.
+        """
+        try:
+            self._lembretes_restaurados.wait(timeout)
+            self.agendador.parar()
+            self.cancelamentos.aguardar(timeout=timeout)
+            self.cancelamentos.parar()
+        finally:
+            # Grava o que estiver pendente (modo grupo) e fecha o armazenamento
+            self.db.fechar()
+
+    def versao(self):
+        """Versão dos dados no armazenamento; muda a cada mutação."""
+        return self.db.versao
 
     # Funcionalidade 1: Criar Tarefa (baseado em criar_tarefa.puml)
+    @metricas.cronometrar("model")
     def criar_tarefa(
         self,
         id_disciplina: int,
@@ -21,30 +74,17 @@ class TarefaModel:
     ) -> dict:
         # Model -> DB : Verificar existência da disciplina
         """Cria uma nova tarefa após validar entradas e existência de disciplina."""
-        if not isinstance(id_disciplina, int) or id_disciplina <= 0:
-            return {"sucesso": False, "erro": "Disciplina inválida", "status_code": 400}
-        if not self.db.existe_disciplina(id_disciplina):
-            return {
-                "sucesso": False,
-                "erro": "Disciplina inexistente",
-                "status_code": 404,
-            }
-        if tipo is None:
-            return {"sucesso": False, "erro": "Tipo inválido", "status_code": 400}
-        if not isinstance(data, datetime):
-            return {"sucesso": False, "erro": "Data inválida", "status_code": 400}
-
-        titulo = (titulo or "").strip()
-        descricao = (descricao or "").strip()
-        if len(titulo) < 3:
-            return {"sucesso": False, "erro": "Título muito curto", "status_code": 400}
+        erro = self._validar_criacao(id_disciplina, titulo, data, tipo)
+        if erro is not None:
+            return erro
 
         nova_tarefa = Tarefa(
-            id_tarefa=self.db.proximo_id(),  # sempre gera um ID único
-            titulo=titulo,
-            descricao=descricao,
+            id_tarefa=0,  # alocado pelo armazenamento na própria inserção
+            titulo=titulo.strip(),
+            descricao=(descricao or "").strip(),
             data_entrega=data,
             tipo=tipo,
+            id_disciplina=id_disciplina,
         )
 
         try:
@@ -55,54 +95,428 @@ class TarefaModel:
                 "tarefa": nova_tarefa,
                 "status_code": 201,
             }  # 201 Created
+        except ValueError as e:
+            # Restrição violada no armazenamento (ex.: disciplina removida do catálogo)
+            return {"sucesso": False, "erro": str(e), "status_code": 400}
         except Exception as e:
             # Controller <-- Model : Exceção de Banco de Dados
+            self._registrar_excecao("criar_tarefa", e)
             return {"sucesso": False, "erro": str(e), "status_code": 500}
 
-    # Funcionalidade 2: Concluir Tarefa (baseado em concluir_tarefa.puml)
-    def concluir_tarefa(self, id_tarefa: int) -> dict:
-        """Conclui a tarefa, desagendando lembretes e persistindo alterações."""
-        tarefa = self.db.buscar_tarefa(id_tarefa)
-        # Validação se tarefa existe (Caso de Erro 2)
-        if not tarefa:
+    @metricas.cronometrar("model")
+    def criar_tarefas_lote(self, itens: list) -> dict:
+        """Cria várias tarefas com um bloco de IDs e uma única gravação.
+
+        ``itens`` é uma lista de (numero_linha, campos de criar_tarefa).
+        Itens que violam as regras vão para ``erros``; os demais são
+        persistidos juntos (tudo ou nada em caso de falha do banco).
+        """
+        novas, erros = [], []
+        for numero, campos in itens:
+            erro = self._validar_criacao(
+                campos["id_disciplina"], campos["titulo"], campos["data"], campos["tipo"]
+            )
+            if erro is not None:
+                erros.append(
+                    {"linha": numero, "status": erro["status_code"], "erro": erro["erro"]}
+                )
+                continue
+            novas.append(
+                Tarefa(
+                    id_tarefa=0,  # atribuído pelo bloco reservado abaixo
+                    titulo=campos["titulo"].strip(),
+                    descricao=(campos.get("descricao") or "").strip(),
+                    data_entrega=campos["data"],
+                    tipo=campos["tipo"],
+                    id_disciplina=campos["id_disciplina"],
+                )
+            )
+
+        if not novas:
+            return {
+                "sucesso": not erros,
+                "criadas": 0,
+                "erros": erros,
+                "status_code": 400 if erros else 200,
+            }
+        try:
+            for tarefa, id_tarefa in zip(novas, self.db.reservar_ids(len(novas))):
+                tarefa.id = id_tarefa
+            # Model -> DB : Criar Tarefas (uma gravação para o lote inteiro)
+            self.db.salvar_tarefas(novas)
+        except ValueError as e:
             return {
                 "sucesso": False,
-                "erro": "Tarefa não encontrada",
+                "erro": str(e),
+                "criadas": 0,
+                "erros": erros,
+                "status_code": 400,
+            }
+        except Exception as e:
+            # Controller <-- Model : Exceção de Banco de Dados (nada do lote foi gravado)
+            self._registrar_excecao("criar_tarefas_lote", e)
+            return {
+                "sucesso": False,
+                "erro": str(e),
+                "criadas": 0,
+                "erros": erros,
+                "status_code": 500,
+            }
+        return {
+            "sucesso": True,
+            "criadas": len(novas),
+            "erros": erros,
+            "status_code": 201,
+        }
+
+    def _validar_criacao(
+        self, id_disciplina: int, titulo: str, data: datetime, tipo: Tipo
+    ) -> dict | None:
+        """Regras de negócio da criação; retorna o dict de erro ou None se válido."""
+        if not isinstance(id_disciplina, int) or id_disciplina <= 0:
+            return {"sucesso": False, "erro": "Disciplina inválida", "status_code": 400}
+        if not self.db.existe_disciplina(id_disciplina):
+            return {
+                "sucesso": False,
+                "erro": "Disciplina inexistente",
                 "status_code": 404,
             }
+        if tipo is None:
+            return {"sucesso": False, "erro": "Tipo inválido", "status_code": 400}
+        if not isinstance(data, datetime):
+            return {"sucesso": False, "erro": "Data inválida", "status_code": 400}
+        if len((titulo or "").strip()) < 3:
+            return {"sucesso": False, "erro": "Título muito curto", "status_code": 400}
+        return None
 
+    # Funcionalidade 2: Concluir Tarefa (baseado em concluir_tarefa.puml)
+    @metricas.cronometrar("model")
+    def concluir_tarefa(self, id_tarefa: int) -> dict:
+        """Conclui a tarefa, desagendando lembretes e persistindo alterações."""
+        # Com carga adiada, o heap precisa conter os lembretes antes de cancelá-los
+        self._lembretes_restaurados.wait()
         try:
-            # Model -> DB : Atualizar Status para CONCLUIDO
-            if tarefa.status == Status.CONCLUIDO:
+            # Model -> DB : Atualizar Status para CONCLUIDO (leitura e gravação atômicas)
+            concluidas = {}
+            encontradas = self.db.alterar_tarefas(
+                [id_tarefa], lambda tarefa: self._marcar_concluida(tarefa, concluidas)
+            )
+            # Validação se tarefa existe (Caso de Erro 2)
+            if id_tarefa not in encontradas:
+                return {
+                    "sucesso": False,
+                    "erro": "Tarefa não encontrada",
+                    "status_code": 404,
+                }
+            if id_tarefa not in concluidas:
                 return {
                     "sucesso": True,
                     "mensagem": "Tarefa já estava concluída",
                     "status_code": 200,
                 }
-            tarefa.status = Status.CONCLUIDO
-            # Loop: Itera pelos Lembretes da Tarefa
-            for lembrete in getattr(tarefa, "lembretes", []):
-                # Model -> DB : Desagendar Lembrete
-                # Tentativa de persistir alterações no sistema externo
-                try:
-                    lembrete.desagendar()
-                except Exception:
-                    continue
-            self.db.atualizar_tarefa(tarefa)
+            # Retira os lembretes do heap local (O(1) cada, por tarefa)
+            self.agendador.cancelar_tarefa(id_tarefa)
+            # Model -> DB : Desagendar Lembrete — registrado no outbox junto com o status;
+            # a chamada ao sistema externo acontece em segundo plano
+            self.cancelamentos.enfileirar(id_tarefa, concluidas[id_tarefa])
             return {
                 "sucesso": True,
                 "mensagem": "Tarefa concluída com sucesso",
                 "status_code": 200,
             }
-        except Exception:
+        except Exception as e:
             # Controller <-- Model : Exceção de Banco de Dados
+            self._registrar_excecao("concluir_tarefa", e)
+            return {"sucesso": False, "erro": "Erro interno", "status_code": 500}
+
+    @staticmethod
+    def _marcar_concluida(tarefa: Tarefa, concluidas: dict) -> bool:
+        """Conclui a cópia recebida de alterar_tarefas, guardando os lembretes a cancelar.
+
+        Roda dentro da trava de escrita do banco: a verificação do status e a
+        gravação não se intercalam com outra conclusão da mesma tarefa.
+        """
+        if tarefa.status == Status.CONCLUIDO:
+            return False
+        tarefa.status = Status.CONCLUIDO
+        pendentes = [l for l in tarefa.lembretes if l.agendado]
+        for lembrete in pendentes:
+            lembrete.cancelamento_pendente = True
+        concluidas[tarefa.id] = pendentes
+        return True
+
+    @metricas.cronometrar("model")
+    def registrar_nota(self, id_tarefa: int, nota: float) -> dict:
+        """Registra (ou corrige) a nota da tarefa; os agregados de notas acompanham a gravação."""
+
+        def anotar(tarefa: Tarefa) -> bool:
+            tarefa.nota = nota
+            return True
+
+        try:
+            encontradas = self.db.alterar_tarefas([id_tarefa], anotar)
+            if id_tarefa not in encontradas:
+                return {
+                    "sucesso": False,
+                    "erro": "Tarefa não encontrada",
+                    "status_code": 404,
+                }
+            return {
+                "sucesso": True,
+                "mensagem": "Nota registrada com sucesso",
+                "status_code": 200,
+            }
+        except Exception as e:
+            self._registrar_excecao("registrar_nota", e)
             return {"sucesso": False, "erro": "Erro interno", "status_code": 500}
-    
-    def listar_tarefas(self) -> dict:
-        tarefas = self.db.listar_tarefas()
+
+    @metricas.cronometrar("model")
+    def concluir_tarefas(
+        self,
+        ids: list | None = None,
+        id_disciplina: int | None = None,
+        tipo: Tipo | None = None,
+        prazo_ate: datetime | None = None,
+    ) -> dict:
+        """Conclui várias tarefas com uma única gravação e cancelamentos em lote.
+
+        Com ``ids``, cada ID recebe o resultado que concluir_tarefa daria
+        (200, inclusive se já concluída, ou 404). Sem ``ids``, conclui as
+        tarefas em aberto que passam no filtro (disciplina, tipo, prazo até
+        a data); ao menos um filtro é exigido.
+        """
+        self._lembretes_restaurados.wait()
+        if ids is not None:
+            ids = list(dict.fromkeys(ids))
+        else:
+            if id_disciplina is None and tipo is None and prazo_ate is None:
+                return {
+                    "sucesso": False,
+                    "erro": "Informe os IDs ou ao menos um filtro",
+                    "status_code": 400,
+                }
+            if id_disciplina is not None and not self.db.existe_disciplina(id_disciplina):
+                return {
+                    "sucesso": False,
+                    "erro": "Disciplina não encontrada",
+                    "status_code": 404,
+                }
+            tarefas = self.db.consultar_tarefas(
+                status=[Status.PENDENTE, Status.EM_ANDAMENTO],
+                tipo=tipo,
+                id_disciplina=id_disciplina,
+                fim=prazo_ate,
+            )
+            ids = [tarefa.id for tarefa in tarefas]
+
+        try:
+            # Gravação, heap local e outbox: uma operação cada para o lote inteiro
+            concluidas = {}
+            encontradas = self.db.alterar_tarefas(
+                ids, lambda tarefa: self._marcar_concluida(tarefa, concluidas)
+            )
+            self.agendador.cancelar_tarefas(list(concluidas))
+            self.cancelamentos.enfileirar_lote(list(concluidas.items()))
+        except Exception as e:
+            self._registrar_excecao("concluir_tarefas", e)
+            return {"sucesso": False, "erro": "Erro interno", "status_code": 500}
+
+        resultados = []
+        for id_tarefa in ids:
+            if id_tarefa not in encontradas:
+                resultados.append(
+                    {"id": id_tarefa, "status": 404, "erro": "Tarefa não encontrada"}
+                )
+            elif id_tarefa not in concluidas:
+                resultados.append(
+                    {"id": id_tarefa, "status": 200, "mensagem": "Tarefa já estava concluída"}
+                )
+            else:
+                resultados.append(
+                    {"id": id_tarefa, "status": 200, "mensagem": "Tarefa concluída com sucesso"}
+                )
+
+        nao_encontradas = len(ids) - len(encontradas)
+        if not nao_encontradas:
+            status_code = 200
+        else:
+            # 207 Multi-Status: parte concluída, parte não encontrada
+            status_code = 207 if encontradas else 404
+        return {
+            "sucesso": not nao_encontradas,
+            "concluidas": len(concluidas),
+            "resultados": resultados,
+            "status_code": status_code,
+        }
+
+    @metricas.cronometrar("model")
+    def adicionar_lembrete(self, id_tarefa: int, data: datetime) -> dict:
+        """Cria um lembrete para a tarefa, persiste e agenda o disparo."""
+        self._lembretes_restaurados.wait()
+        if not self.db.id_existe(id_tarefa):
+            return {
+                "sucesso": False,
+                "erro": "Tarefa não encontrada",
+                "status_code": 404,
+            }
+        if not isinstance(data, datetime):
+            return {"sucesso": False, "erro": "Data inválida", "status_code": 400}
+        erros, novos = [], []
+
+        def adicionar(tarefa: Tarefa) -> bool:
+            # Validado dentro da trava de escrita, junto com a gravação
+            if tarefa.status == Status.CONCLUIDO:
+                erros.append("Tarefa já concluída")
+            elif any(lembrete.data == data for lembrete in tarefa.lembretes):
+                erros.append("Lembrete já existe para esta data")
+            else:
+                tarefa.adicionar_lembrete(data)
+                novos.append(tarefa.lembretes[-1])
+            return not erros
+
+        try:
+            self.db.alterar_tarefas([id_tarefa], adicionar)
+            if erros:
+                return {"sucesso": False, "erro": erros[0], "status_code": 400}
+            self.agendador.agendar(id_tarefa, novos[0])
+            return {
+                "sucesso": True,
+                "mensagem": "Lembrete agendado com sucesso",
+                "status_code": 201,
+            }
+        except Exception as e:
+            self._registrar_excecao("adicionar_lembrete", e)
+            return {"sucesso": False, "erro": "Erro interno", "status_code": 500}
+
+    @staticmethod
+    def _registrar_excecao(operacao: str, erro: Exception) -> None:
+        """Conta a exceção que vira status 500 (o tipo some na resposta)."""
+        metricas.incrementar(
+            "tarefas_excecoes_total", operacao=operacao, excecao=type(erro).__name__
+        )
+
+    def _lembrete_disparado(self, id_tarefa: int, lembrete: Lembrete) -> None:
+        """Callback do agendador: marca o lembrete como entregue e persiste."""
+
+        def marcar_entregue(tarefa: Tarefa) -> bool:
+            alterada = False
+            for persistido in tarefa.lembretes:
+                if persistido.data == lembrete.data and persistido.agendado:
+                    persistido.agendado = False
+                    alterada = True
+            return alterada
+
+        self.db.alterar_tarefas([id_tarefa], marcar_entregue)
+
+    def _cancelamentos_confirmados(self, confirmados: list) -> None:
+        """Callback da fila: tira do outbox os lembretes já cancelados externamente."""
+        por_tarefa = {}
+        for id_tarefa, lembrete in confirmados:
+            por_tarefa.setdefault(id_tarefa, set()).add(lembrete.data)
+
+        def tirar_do_outbox(tarefa: Tarefa) -> bool:
+            datas = por_tarefa[tarefa.id]
+            for lembrete in tarefa.lembretes:
+                if lembrete.data in datas:
+                    lembrete.agendado = False
+                    lembrete.cancelamento_pendente = False
+            return True
+
+        # Um lote confirmado da fila vira uma única gravação
+        self.db.alterar_tarefas(list(por_tarefa), tirar_do_outbox)
+
+    @metricas.cronometrar("model")
+    def listar_tarefas(
+        self,
+        offset: int = 0,
+        limite: int | None = None,
+        ordenar_por: str = "id",
+        decrescente: bool = False,
+        **filtros,
+    ) -> dict:
+        """Lista uma página de tarefas (filtros: status, tipo, id_disciplina, inicio, fim)."""
+        try:
+            tarefas, total = self.db.paginar_tarefas(
+                offset=offset,
+                limite=limite,
+                ordenar_por=ordenar_por,
+                decrescente=decrescente,
+                **filtros,
+            )
+        except ValueError as e:
+            return {"sucesso": False, "erro": str(e), "status_code": 400}
         return {
             "sucesso": True,
             "mensagem": "Tarefas listadas com sucesso",
             "status_code": 200,
-            "tarefas" : tarefas
+            "tarefas": tarefas,
+            "total": total,
+        }
+
+    # Prazos: consultas sobre o índice ordenado de tarefas em aberto
+    @metricas.cronometrar("model")
+    def prazos_entre(
+        self,
+        inicio: datetime | None,
+        fim: datetime | None,
+        tipo: Tipo | None = None,
+        limite: int | None = None,
+    ) -> dict:
+        """Tarefas não concluídas com prazo em [inicio, fim], em ordem de prazo."""
+        if inicio is not None and fim is not None and inicio > fim:
+            return {
+                "sucesso": False,
+                "erro": "Início do intervalo depois do fim",
+                "status_code": 400,
+            }
+        tarefas, total = self.db.consultar_prazos(
+            inicio=inicio, fim=fim, tipo=tipo, limite=limite
+        )
+        return {"sucesso": True, "status_code": 200, "tarefas": tarefas, "total": total}
+
+    def tarefas_atrasadas(
+        self,
+        tipo: Tipo | None = None,
+        limite: int | None = None,
+        agora: datetime | None = None,
+    ) -> dict:
+        """Tarefas não concluídas com prazo já alcançado, da mais atrasada em diante."""
+        return self.prazos_entre(None, agora or datetime.now(), tipo, limite)
+
+    @metricas.cronometrar("model")
+    def proximos_prazos(self, quantidade: int = 5, agora: datetime | None = None) -> dict:
+        """Os ``quantidade`` próximos prazos em aberto de cada Tipo."""
+        agora = agora or datetime.now()
+        por_tipo = {
+            tipo: self.db.consultar_prazos(inicio=agora, tipo=tipo, limite=quantidade)[0]
+            for tipo in Tipo
+        }
+        return {"sucesso": True, "status_code": 200, "por_tipo": por_tipo}
+
+    # Busca textual: índice invertido de titulo/descricao mantido pelo armazenamento
+    @metricas.cronometrar("model")
+    def pesquisar_tarefas(self, consulta: str, limite: int = 20) -> dict:
+        """Tarefas com todos os termos da consulta, da mais relevante em diante."""
+        if not tokenizar_consulta(consulta):
+            return {"sucesso": False, "erro": "Consulta vazia", "status_code": 400}
+        return {
+            "sucesso": True,
+            "status_code": 200,
+            "resultados": self.db.pesquisar_texto(consulta, limite),
+        }
+
+    # Estatísticas: agregados mantidos incrementalmente pelo armazenamento
+    @metricas.cronometrar("model")
+    def estatisticas(self, id_disciplina: int | None = None) -> dict:
+        """Contagens por status/tipo, taxa de conclusão e notas por disciplina."""
+        if id_disciplina is not None and not self.db.existe_disciplina(id_disciplina):
+            return {
+                "sucesso": False,
+                "erro": "Disciplina não encontrada",
+                "status_code": 404,
+            }
+        return {
+            "sucesso": True,
+            "status_code": 200,
+            "relatorio": self.db.consultar_estatisticas(id_disciplina),
         }
@@ -1,11 +1,16 @@
 from datetime import datetime
-from classes import Tipo
+from classes import Tipo, Status
+from datas import interpretar_data
 import os
 
 
 class TarefaView:
     """Interface de linha de comando para criar e concluir tarefas."""
 
+    TAMANHO_PAGINA = 20
+    LIMITE_PAINEL = 10  # atrasadas exibidas no painel de prazos
+    PROXIMOS_POR_TIPO = 3
+
     def __init__(self, controller):
         """Recebe o controller para enviar ações do usuário."""
         self.controller = controller
@@ -17,6 +22,10 @@ class TarefaView:
         print("1. Nova Tarefa")
         print("2. Concluir Tarefa")
         print("3. Listar Tarefas")
+        print("4. Adicionar Lembrete")
+        print("5. Painel de Prazos")
+        print("6. Buscar Tarefas")
+        print("7. Registrar Nota")
         print("0. Sair")
         opcao = input("Selecione uma opção: ")
         return opcao
@@ -58,31 +67,133 @@ class TarefaView:
             input("")
 
     def renderizar_listar_tarefas(self):
-        """Fluxo de listagem de tarefas."""
-        self.limpar_tela()
-        resposta = self.controller.get_listar_tarefas()
-        self.processar_tarefas(resposta)
-        print("Pressione qualquer tecla para retornar...")
-        input("")
+        """Fluxo de listagem de tarefas, uma página por vez."""
+        offset = 0
+        while True:
+            self.limpar_tela()
+            resposta = self.controller.get_listar_tarefas(
+                limite=self.TAMANHO_PAGINA, offset=offset
+            )
+            if resposta["status"] != 200:
+                self._processar_resposta_http(resposta)
+                return
+            self.processar_tarefas(resposta)
+            proximo = resposta["body"]["proximo_offset"]
+            if proximo is None:
+                print("Pressione qualquer tecla para retornar...")
+                input("")
+                return
+            if input("Enter para a próxima página, 0 para retornar: ").strip() == "0":
+                return
+            offset = proximo
 
     def processar_tarefas(self, resposta):
-        for id_tarefa, tarefa in resposta["body"].items():
-            print(
-                f"{id_tarefa}) {tarefa.titulo} - {tarefa.tipo.value} - {tarefa.data_entrega} - {tarefa.status.value}",
-                end=" ",
+        """Imprime a página de tarefas contida no body da resposta."""
+        # Página vinda do cache: o texto é montado uma vez por versão dos dados
+        print(
+            self.controller.cache.renderizar(resposta, "texto", self._texto_pagina), end=""
+        )
+
+    def _texto_pagina(self, body) -> str:
+        texto = self._texto_tarefas(body["tarefas"])
+        if body["tarefas"]:
+            return texto + (
+                f"-- {body['offset'] + 1}-{body['offset'] + len(body['tarefas'])}"
+                f" de {body['total']} tarefas --\n"
             )
-            if tarefa.nota is not None:
-                print(f"- {tarefa.nota}")
+        return texto + "Nenhuma tarefa encontrada.\n"
+
+    def _imprimir_tarefas(self, tarefas):
+        print(self._texto_tarefas(tarefas), end="")
+
+    @staticmethod
+    def _texto_tarefas(tarefas) -> str:
+        return "".join(
+            f"{tarefa.id}) {tarefa.titulo} - {tarefa.tipo.value} - {tarefa.data_entrega} - {tarefa.status.value} "
+            + (f"- {tarefa.nota}\n" if tarefa.nota is not None else "\n")
+            for tarefa in tarefas
+        )
+
+    # Implementação do fluxo visual de "Painel de Prazos"
+    def renderizar_painel_prazos(self):
+        """Atrasadas, próximos prazos por tipo e consulta opcional por intervalo."""
+        self.limpar_tela()
+        print("\n--- [Tela] Painel de Prazos ---")
+        try:
+            resposta = self.controller.get_tarefas_atrasadas(limite=self.LIMITE_PAINEL)
+            if resposta["status"] != 200:
+                self._processar_resposta_http(resposta)
+                return
+            body = resposta["body"]
+            print(f"\nAtrasadas: {body['total']}")
+            self._imprimir_tarefas(body["tarefas"])
+            if body["total"] > len(body["tarefas"]):
+                print(f"... e mais {body['total'] - len(body['tarefas'])}")
+
+            resposta = self.controller.get_proximos_prazos(self.PROXIMOS_POR_TIPO)
+            if resposta["status"] == 200:
+                for tipo, tarefas in resposta["body"].items():
+                    print(f"\nPróximos prazos - {tipo}:")
+                    if tarefas:
+                        self._imprimir_tarefas(tarefas)
+                    else:
+                        print("Nenhum.")
+
+            if input("\nConsultar um intervalo? (s/N): ").strip().lower() == "s":
+                inicio = self._input_datetime("Início (dd/mm/aaaa [HH:MM]): ")
+                fim = self._input_datetime("Fim (dd/mm/aaaa [HH:MM]): ")
+                resposta = self.controller.get_prazos(
+                    data_inicio=inicio, data_fim=fim, limite=self.TAMANHO_PAGINA
+                )
+                if resposta["status"] != 200:
+                    self._processar_resposta_http(resposta)
+                    return
+                body = resposta["body"]
+                self._imprimir_tarefas(body["tarefas"])
+                print(f"-- {len(body['tarefas'])} de {body['total']} tarefas no intervalo --")
+            print("Pressione qualquer tecla para retornar...")
+            input("")
+        except KeyboardInterrupt:
+            print("\nOperação cancelada.")
+            print("Pressione qualquer tecla para retornar...")
+            input("")
+
+    # Implementação do fluxo visual de "Buscar Tarefas"
+    def renderizar_buscar_tarefas(self):
+        """Busca por palavras do título/descrição ("mat*" para prefixo), por relevância."""
+        self.limpar_tela()
+        print("\n--- [Tela] Buscar Tarefas ---")
+        try:
+            consulta = self._input_nonempty("Buscar por: ")
+            resposta = self.controller.get_pesquisar_tarefas(consulta, self.TAMANHO_PAGINA)
+            if resposta["status"] != 200:
+                self._processar_resposta_http(resposta)
+                return
+            tarefas = [resultado["tarefa"] for resultado in resposta["body"]["resultados"]]
+            if tarefas:
+                self._imprimir_tarefas(tarefas)
             else:
-                print("")
+                print("Nenhuma tarefa encontrada.")
+            print("Pressione qualquer tecla para retornar...")
+            input("")
+        except KeyboardInterrupt:
+            print("\nOperação cancelada.")
+            print("Pressione qualquer tecla para retornar...")
+            input("")
 
     # Implementação do fluxo visual de "Concluir Tarefa"
     def renderizar_concluir_tarefa(self):
         """Fluxo de conclusão de tarefa com validação de ID."""
         self.limpar_tela()
         print("\n--- [Tela] Concluir Tarefa ---")
-        resposta = self.controller.get_listar_tarefas()
-        self.processar_tarefas(resposta)
+        # Mostra só as próximas tarefas em aberto, não a base inteira
+        resposta = self.controller.get_listar_tarefas(
+            limite=self.TAMANHO_PAGINA,
+            ordenar_por="data_entrega",
+            status=[Status.PENDENTE, Status.EM_ANDAMENTO],
+        )
+        if resposta["status"] == 200:
+            self.processar_tarefas(resposta)
 
         # 1. Coleta de dados
         try:
@@ -96,6 +207,40 @@ class TarefaView:
             print("Pressione qualquer tecla para retornar...")
             input("")
 
+    # Implementação do fluxo visual de "Registrar Nota"
+    def renderizar_registrar_nota(self):
+        """Fluxo de registro da nota de uma tarefa existente."""
+        self.limpar_tela()
+        print("\n--- [Tela] Registrar Nota ---")
+        try:
+            id_tarefa = self._input_int("ID da Tarefa: ")
+            nota = self._input_nonempty("Nota (0 a 10): ")
+            # View -> Controller : Requisição HTTP PUT
+            resposta = self.controller.put_registrar_nota(id_tarefa, nota)
+            self._processar_resposta_http(resposta)
+        except KeyboardInterrupt:
+            print("\nOperação cancelada.")
+            print("Pressione qualquer tecla para retornar...")
+            input("")
+
+    # Implementação do fluxo visual de "Adicionar Lembrete"
+    def renderizar_adicionar_lembrete(self):
+        """Fluxo de criação de lembrete para uma tarefa existente."""
+        self.limpar_tela()
+        print("\n--- [Tela] Adicionar Lembrete ---")
+        try:
+            id_tarefa = self._input_int("ID da Tarefa: ")
+            data = self._input_datetime(
+                "Data e Horário do Lembrete (dd/mm/aaaa HH:MM ou yyyy-mm-dd HH:MM): "
+            )
+            # View -> Controller : Requisição HTTP POST
+            resposta = self.controller.post_adicionar_lembrete(id_tarefa, data)
+            self._processar_resposta_http(resposta)
+        except KeyboardInterrupt:
+            print("\nOperação cancelada.")
+            print("Pressione qualquer tecla para retornar...")
+            input("")
+
     # Método Auxiliar para tratar Códigos HTTP
     def _processar_resposta_http(self, resposta):
         """Interpreta o 'status' e o 'body' simulando códigos HTTP."""
@@ -108,6 +253,11 @@ class TarefaView:
             print("\n--- [Tela] Sucesso ---")
             print(f"{body}")
 
+        elif status == 201 and isinstance(body, str):
+            # View <-- Controller : Resposta HTTP: 201 Created (mensagem)
+            print("\n--- [Tela] Sucesso ---")
+            print(f"{body}")
+
         elif status == 201:
             print("\n--- [Tela] Sucesso ---")
             # View <-- Controller : Resposta HTTP: 201 Created
@@ -179,41 +329,20 @@ class TarefaView:
     def _input_datetime(self, prompt: str) -> datetime:
         """Aceita data com horário. Exemplos: 25/12/2025 14:30, 2025-12-25 14:30, 25-12-2025 14:30."""
         while True:
-            s = input(prompt).strip()
-            formatos = (
-                "%d/%m/%Y %H:%M",
-                "%d/%m/%Y",
-                "%Y-%m-%d %H:%M",
-                "%Y-%m-%d",
-                "%d-%m-%Y %H:%M",
-                "%d-%m-%Y",
-            )
-            for fmt in formatos:
-                try:
-                    return datetime.strptime(s, fmt)
-                except ValueError:
-                    pass
-            print(
-                "Data/Horário inválido. Use dd/mm/aaaa [HH:MM] ou yyyy-mm-dd [HH:MM]."
-            )
+            data, motivo = interpretar_data(input(prompt))
+            if motivo is None:
+                return data
+            print(f"Data/Horário inválido: {motivo}")
 
     def _input_tipo(self, prompt: str) -> Tipo:
         """Lê e normaliza o tipo (nome ou valor do enum)."""
         while True:
             s = input(prompt).strip()
-            t = self._normalizar_tipo(s)
+            t = Tipo.de_texto(s)
             if t:
                 return t
             print("Tipo inválido. Opções: PROVA, TRABALHO, ATIVIDADE.")
 
-    def _normalizar_tipo(self, valor: str):
-        """Converte texto para enum Tipo, ou None se inválido."""
-        v = valor.strip().casefold()
-        for t in Tipo:
-            if v == t.name.casefold() or v == t.value.casefold():
-                return t
-        return None
-
     def limpar_tela(self):
         """Limpa a tela do terminal (Windows/Linux/macOS)."""
         try:
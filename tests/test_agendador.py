@@ -0,0 +1,104 @@
+"""Agendador de lembretes: ordem do heap e cancelamento preguiçoso.
+
+Rodar da raiz do repositório: python -m unittest discover -s tests
+"""
+
+from datetime import datetime, timedelta
+import os
+import random
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from agendador import AgendadorLembretes, Notificador  # noqa: E402
+from classes import Lembrete  # noqa: E402
+
+INICIO = datetime(2030, 1, 1)
+
+
+class NotificadorMemoria(Notificador):
+    """Guarda (id_tarefa, data) na ordem de entrega."""
+
+    def __init__(self):
+        self.entregues = []
+        self.evento = threading.Event()
+
+    def notificar(self, id_tarefa, lembrete):
+        self.entregues.append((id_tarefa, lembrete.data))
+        self.evento.set()
+
+
+class TesteAgendador(unittest.TestCase):
+    def setUp(self):
+        self.notificador = NotificadorMemoria()
+        self.agendador = AgendadorLembretes(self.notificador)
+
+    def tearDown(self):
+        self.agendador.parar()
+
+    def agendar_aleatorios(self, quantidade: int) -> list:
+        sorteio = random.Random(0)
+        agendados = []
+        for id_tarefa in range(1, quantidade + 1):
+            data = INICIO + timedelta(minutes=sorteio.randrange(1000))
+            self.assertTrue(self.agendador.agendar(id_tarefa, Lembrete(data)))
+            agendados.append((id_tarefa, data))
+        return agendados
+
+    def test_dispara_vencidos_em_ordem_de_data(self):
+        agendados = self.agendar_aleatorios(200)
+        corte = INICIO + timedelta(minutes=500)
+        disparados = self.agendador.disparar_vencidos(corte)
+        esperado = sorted((d, i) for i, d in agendados if d <= corte)
+        self.assertEqual(disparados, len(esperado))
+        self.assertEqual([(d, i) for i, d in self.notificador.entregues], esperado)
+        self.assertEqual(len(self.agendador), len(agendados) - len(esperado))
+        self.assertGreater(self.agendador.proximo(), corte)
+
+    def test_agendamento_duplicado_recusado(self):
+        self.assertTrue(self.agendador.agendar(1, Lembrete(INICIO)))
+        self.assertFalse(self.agendador.agendar(1, Lembrete(INICIO)))
+        self.assertTrue(self.agendador.agendar(2, Lembrete(INICIO)))
+        self.assertEqual(len(self.agendador), 2)
+
+    def test_cancelados_nao_disparam(self):
+        agendados = self.agendar_aleatorios(200)
+        sorteio = random.Random(1)
+        cancelados = set(sorteio.sample(agendados, 120))  # passa de metade: recompacta
+        for id_tarefa, data in cancelados:
+            self.assertTrue(self.agendador.cancelar(id_tarefa, data))
+        self.assertFalse(self.agendador.cancelar(*next(iter(cancelados))))
+        self.assertLessEqual(len(self.agendador._heap), len(agendados))
+
+        restantes = sorted((d, i) for i, d in agendados if (i, d) not in cancelados)
+        self.assertEqual(self.agendador.proximo(), restantes[0][0])
+        self.agendador.disparar_vencidos(INICIO + timedelta(days=1))
+        self.assertEqual([(d, i) for i, d in self.notificador.entregues], restantes)
+        self.assertIsNone(self.agendador.proximo())
+        self.assertEqual(len(self.agendador._heap), 0)
+
+    def test_cancelar_tarefa_remove_todos_os_lembretes(self):
+        for minutos in (10, 20, 30):
+            self.agendador.agendar(7, Lembrete(INICIO + timedelta(minutes=minutos)))
+        self.agendador.agendar(8, Lembrete(INICIO + timedelta(minutes=15)))
+        self.assertEqual(self.agendador.cancelar_tarefa(7), 3)
+        self.assertEqual(self.agendador.cancelar_tarefa(7), 0)
+        self.assertEqual(self.agendador.proximo(), INICIO + timedelta(minutes=15))
+        # Reagendar após cancelar é aceito
+        self.assertTrue(self.agendador.agendar(7, Lembrete(INICIO)))
+
+    def test_thread_dispara_lembrete_vencido(self):
+        disparados = []
+        self.agendador.ao_disparar = lambda id_tarefa, lembrete: disparados.append(id_tarefa)
+        self.agendador.iniciar()
+        self.agendador.agendar(3, Lembrete(datetime.now() + timedelta(milliseconds=50)))
+        self.assertTrue(self.notificador.evento.wait(timeout=5))
+        self.agendador.parar()
+        self.assertEqual(self.notificador.entregues[0][0], 3)
+        self.assertEqual(disparados, [3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,145 @@
+"""Busca textual: acentos, prefixos e ranking igual ao de uma varredura.
+
+Rodar da raiz do repositório: python -m unittest discover -s tests
+"""
+
+from datetime import datetime
+import math
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from busca import IndiceBusca, normalizar, tokenizar, tokenizar_consulta  # noqa: E402
+from classes import Tarefa, Tipo  # noqa: E402
+
+PALAVRAS = (
+    "matemática materiais matriz prova provão trabalho relatório física química "
+    "cálculo álgebra revisão capítulo lista exercícios projeto"
+).split()
+
+
+def tarefa(id_tarefa: int, titulo: str, descricao: str = "") -> Tarefa:
+    return Tarefa(id_tarefa, titulo, descricao, datetime(2030, 1, 1), Tipo.ATIVIDADE, 1)
+
+
+class TesteNormalizacao(unittest.TestCase):
+    def test_sem_acentos_e_minusculas(self):
+        self.assertEqual(normalizar("Matemática Ção"), "matematica cao")
+        self.assertEqual(tokenizar("Prova de Física e Química"), ["prova", "fisica", "quimica"])
+
+    def test_consulta_com_prefixo(self):
+        self.assertEqual(
+            tokenizar_consulta("Mat* de álgebra"), [("mat", True), ("algebra", False)]
+        )
+
+
+class TesteIndiceBusca(unittest.TestCase):
+    def setUp(self):
+        self.indice = IndiceBusca()
+        self.indice.reconstruir(
+            [
+                tarefa(1, "Prova de Matemática", "capítulos 1 a 3"),
+                tarefa(2, "Lista de materiais", "para o projeto"),
+                tarefa(3, "Relatório", "revisão de matemática"),
+                tarefa(4, "Provão de física"),
+            ]
+        )
+
+    def ids(self, consulta: str) -> list:
+        return [id_tarefa for id_tarefa, _ in self.indice.buscar(consulta)]
+
+    def test_acentos_ignorados(self):
+        for consulta in ("matematica", "MATEMÁTICA", "Matemática"):
+            with self.subTest(consulta=consulta):
+                # Título (peso maior) antes da descrição
+                self.assertEqual(self.ids(consulta), [1, 3])
+        self.assertEqual(self.ids("provao"), [4])
+
+    def test_prefixo(self):
+        # "materiais" é mais raro que "matematica" (idf maior): a tarefa 2 vem antes
+        self.assertEqual(self.ids("mat*"), [2, 1, 3])
+        self.assertEqual(self.ids("prov*"), [1, 4])
+        self.assertEqual(self.ids("mat"), [])  # sem asterisco: termo exato
+        self.assertEqual(self.ids("xyz*"), [])
+
+    def test_todos_os_termos_obrigatorios(self):
+        self.assertEqual(self.ids("prova matematica"), [1])
+        self.assertEqual(self.ids("mat* revisao"), [3])
+        self.assertEqual(self.ids("prova quimica"), [])
+
+    def test_reindexa_alteracao_in_place(self):
+        alterada = tarefa(1, "Prova de Matemática")
+        self.indice.atualizar(alterada)
+        alterada.titulo = "Prova de Química"  # in-place: o índice guarda o texto antigo
+        self.indice.atualizar(alterada)
+        self.assertEqual(self.ids("matematica"), [3])
+        self.assertEqual(self.ids("quimica"), [1])
+        self.indice.remover(1)
+        self.assertEqual(self.ids("quimica"), [])
+        self.assertEqual(len(self.indice), 3)
+
+
+class TesteRankingIgualAVarredura(unittest.TestCase):
+    def setUp(self):
+        sorteio = random.Random(0)
+        self.tarefas = [
+            tarefa(
+                id_tarefa,
+                " ".join(sorteio.sample(PALAVRAS, sorteio.randint(1, 3))),
+                " ".join(sorteio.sample(PALAVRAS, sorteio.randint(0, 4))),
+            )
+            for id_tarefa in range(1, 401)
+        ]
+        self.indice = IndiceBusca()
+        self.indice.reconstruir(self.tarefas)
+
+    def varredura(self, consulta: str, limite: int) -> list:
+        """Pontua tarefa a tarefa: soma, por termo, da maior contribuição idf * peso."""
+        termos_tarefa = [IndiceBusca._pesos(t.titulo, t.descricao) for t in self.tarefas]
+        frequencia = {}
+        for pesos in termos_tarefa:
+            for termo in pesos:
+                frequencia[termo] = frequencia.get(termo, 0) + 1
+        resultados = []
+        for t, pesos in zip(self.tarefas, termos_tarefa):
+            pontuacao = 0.0
+            for termo, prefixo in tokenizar_consulta(consulta):
+                contribuicoes = [
+                    math.log(1 + len(self.tarefas) / frequencia[encontrado]) * peso
+                    for encontrado, peso in pesos.items()
+                    if encontrado == termo or (prefixo and encontrado.startswith(termo))
+                ]
+                if not contribuicoes:
+                    break
+                pontuacao += max(contribuicoes)
+            else:
+                resultados.append((t.id, round(pontuacao, 9)))
+        return sorted(resultados, key=lambda r: (-r[1], r[0]))[:limite]
+
+    def test_consultas(self):
+        consultas = [
+            "prova",
+            "matematica",
+            "mat*",
+            "prov* calculo",
+            "lista exercicios",
+            "re* pro* ma*",
+            "algebra fisica quimica",
+            "c*",
+            "inexistente",
+        ]
+        for consulta in consultas:
+            for limite in (1, 7, 1000):
+                with self.subTest(consulta=consulta, limite=limite):
+                    obtido = [
+                        (id_tarefa, round(pontuacao, 9))
+                        for id_tarefa, pontuacao in self.indice.buscar(consulta, limite)
+                    ]
+                    self.assertEqual(obtido, self.varredura(consulta, limite))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+"""Cache de respostas: acertos por versão e invalidação a cada escrita.
+
+Rodar da raiz do repositório: python -m unittest discover -s tests
+"""
+
+from datetime import datetime
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from DB import BancoDeDados  # noqa: E402
+from cacheRespostas import CacheRespostas  # noqa: E402
+from classes import Tarefa, Tipo  # noqa: E402
+from tarefaController import TarefaController  # noqa: E402
+from tarefaModel import TarefaModel  # noqa: E402
+
+
+class TesteCacheRespostas(unittest.TestCase):
+    def setUp(self):
+        self.versao = 0
+        self.produzidas = 0
+        self.cache = CacheRespostas(lambda: self.versao, capacidade=3)
+
+    def produzir(self, status=200):
+        self.produzidas += 1
+        return {"status": status, "body": {"n": self.produzidas}}
+
+    def test_acerto_ate_a_versao_mudar(self):
+        primeira = self.cache.obter("a", self.produzir)
+        self.assertIs(self.cache.obter("a", self.produzir), primeira)
+        self.assertEqual(self.produzidas, 1)
+        self.versao += 1
+        segunda = self.cache.obter("a", self.produzir)
+        self.assertIsNot(segunda, primeira)
+        self.assertEqual(segunda["body"], {"n": 2})
+
+    def test_erros_nao_entram(self):
+        self.cache.obter("a", lambda: self.produzir(400))
+        self.cache.obter("a", lambda: self.produzir(400))
+        self.assertEqual((self.produzidas, len(self.cache)), (2, 0))
+
+    def test_lru_descarta_o_menos_usado(self):
+        for chave in "abc":
+            self.cache.obter(chave, self.produzir)
+        self.cache.obter("a", self.produzir)  # "b" passa a ser o menos usado
+        self.cache.obter("d", self.produzir)
+        self.assertEqual(len(self.cache), 3)
+        self.assertEqual(self.produzidas, 4)
+        self.cache.obter("b", self.produzir)
+        self.assertEqual(self.produzidas, 5)
+        self.cache.obter("a", self.produzir)
+        self.assertEqual(self.produzidas, 5)
+
+    def test_escrita_durante_a_producao_nao_fica_cacheada(self):
+        def produzir_com_escrita():
+            self.versao += 1  # mutação concorrente enquanto a resposta é montada
+            return self.produzir()
+
+        self.cache.obter("a", produzir_com_escrita)
+        self.cache.obter("a", self.produzir)
+        self.assertEqual(self.produzidas, 2)
+
+    def test_renderizacao_memoizada_por_formato(self):
+        chamadas = []
+
+        def renderizar(body):
+            chamadas.append(body)
+            return repr(body)
+
+        resposta = self.cache.obter("a", self.produzir)
+        texto = self.cache.renderizar(resposta, "texto", renderizar)
+        self.assertIs(self.cache.renderizar(resposta, "texto", renderizar), texto)
+        self.cache.renderizar(resposta, "json", renderizar)
+        self.assertEqual(len(chamadas), 2)
+        # Resposta fora do cache: renderizada a cada chamada
+        avulsa = self.produzir()
+        self.cache.renderizar(avulsa, "texto", renderizar)
+        self.cache.renderizar(avulsa, "texto", renderizar)
+        self.assertEqual(len(chamadas), 4)
+
+
+class TesteCacheNoController(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.db = BancoDeDados(caminho=os.path.join(self.diretorio.name, "t.csv"))
+        self.model = TarefaModel(self.db)
+        self.controller = TarefaController(self.model)
+
+    def tearDown(self):
+        self.db.fechar()
+        self.diretorio.cleanup()
+
+    def test_escrita_muda_versao_e_invalida(self):
+        escritas = [
+            lambda: self.db.salvar_tarefa(
+                Tarefa(1, "prova", "", datetime(2030, 1, 1), Tipo.PROVA, 1)
+            ),
+            lambda: self.model.criar_tarefa(
+                1, "trabalho", "", datetime(2030, 2, 1), Tipo.TRABALHO
+            ),
+            lambda: self.model.registrar_nota(1, 9.0),
+            lambda: self.model.concluir_tarefa(1),
+        ]
+        anterior = self.controller.get_listar_tarefas(limite=10)
+        for escrever in escritas:
+            # As tarefas da página são as mesmas instâncias do banco: guarda o conteúdo
+            conteudo = [t.para_dict() for t in anterior["body"]["tarefas"]]
+            versao = self.model.versao()
+            self.assertIs(self.controller.get_listar_tarefas(limite=10), anterior)
+            escrever()
+            self.assertNotEqual(self.model.versao(), versao)
+            atual = self.controller.get_listar_tarefas(limite=10)
+            self.assertIsNot(atual, anterior)
+            self.assertNotEqual([t.para_dict() for t in atual["body"]["tarefas"]], conteudo)
+            anterior = atual
+
+    def test_busca_e_estatisticas_invalidadas(self):
+        self.model.criar_tarefa(1, "lista de algebra", "", datetime(2030, 1, 1), Tipo.ATIVIDADE)
+        busca = self.controller.get_pesquisar_tarefas("algebra")
+        estatisticas = self.controller.get_estatisticas()
+        self.assertIs(self.controller.get_pesquisar_tarefas("algebra"), busca)
+        self.assertIs(self.controller.get_estatisticas(), estatisticas)
+        self.model.criar_tarefa(1, "prova de algebra", "", datetime(2030, 1, 2), Tipo.PROVA)
+        resultados = self.controller.get_pesquisar_tarefas("algebra")["body"]["resultados"]
+        self.assertEqual(len(resultados), 2)
+        self.assertEqual(self.controller.get_estatisticas()["body"]["total"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
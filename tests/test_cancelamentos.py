@@ -0,0 +1,146 @@
+"""Outbox de cancelamentos: retentativas com backoff e confirmação persistida.
+
+Rodar da raiz do repositório: python -m unittest discover -s tests
+"""
+
+from collections import Counter
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from DB import BancoDeDados  # noqa: E402
+from classes import Lembrete, Tarefa, Tipo  # noqa: E402
+from filaCancelamentos import FilaCancelamentos  # noqa: E402
+from tarefaModel import TarefaModel  # noqa: E402
+
+INICIO = datetime(2030, 1, 1)
+
+
+class LembreteInstavel(Lembrete):
+    """Falha as primeiras ``falhas`` chamadas ao sistema externo.
+
+    As chamadas são contadas por data em ``chamadas``, compartilhado com as
+    cópias que a fila faz ao enfileirar.
+    """
+
+    def __init__(self, data, falhas, chamadas):
+        super().__init__(data)
+        self.falhas = falhas
+        self.chamadas = chamadas
+
+    def desagendar(self):
+        self.chamadas[self.data] += 1
+        if self.chamadas[self.data] <= self.falhas:
+            raise ConnectionError("sistema externo indisponível")
+        self.agendado = False
+        self.cancelamento_pendente = False
+
+
+class FilaRapida(FilaCancelamentos):
+    BACKOFF_INICIAL = 0.001
+    MAX_TENTATIVAS = 3
+
+
+class TesteFilaCancelamentos(unittest.TestCase):
+    def setUp(self):
+        self.confirmados = []
+        self.chamadas = Counter()
+        self.fila = FilaRapida(ao_confirmar=self.confirmados.extend)
+
+    def tearDown(self):
+        self.fila.parar()
+
+    def processar(self, itens) -> None:
+        with redirect_stdout(io.StringIO()):
+            self.fila.enfileirar_lote(itens)
+            self.assertTrue(self.fila.aguardar(timeout=5))
+
+    def test_retenta_ate_confirmar(self):
+        lembretes = [
+            LembreteInstavel(INICIO + timedelta(hours=h), h, self.chamadas) for h in range(3)
+        ]
+        self.processar([(1, lembretes)])
+        self.assertEqual([self.chamadas[l.data] for l in lembretes], [1, 2, 3])
+        self.assertEqual(sorted(l.data for _, l in self.confirmados), [l.data for l in lembretes])
+        self.assertFalse(any(l.agendado for _, l in self.confirmados))
+        # Os originais (do banco) só mudam pela confirmação persistida
+        self.assertTrue(all(l.agendado for l in lembretes))
+        self.assertFalse(any(l is c for l in lembretes for _, c in self.confirmados))
+        self.assertEqual(self.fila.falhas_definitivas, 0)
+        self.assertEqual(self.fila.pendentes(), 0)
+
+    def test_desiste_apos_max_tentativas(self):
+        lembrete = LembreteInstavel(INICIO, 10, self.chamadas)
+        lembrete.cancelamento_pendente = True
+        self.processar([(1, [lembrete])])
+        self.assertEqual(self.chamadas[INICIO], FilaRapida.MAX_TENTATIVAS)
+        self.assertEqual(self.fila.falhas_definitivas, 1)
+        self.assertEqual(self.confirmados, [])
+        # Continua no outbox: reenviado no próximo início
+        self.assertTrue(lembrete.cancelamento_pendente)
+
+    def test_lotes_grandes(self):
+        lembretes = [
+            LembreteInstavel(INICIO + timedelta(minutes=m), 0, self.chamadas) for m in range(130)
+        ]
+        self.processar([(m % 7, [l]) for m, l in enumerate(lembretes)])
+        self.assertEqual(len(self.confirmados), 130)
+
+
+class TesteOutboxPersistido(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.caminho = os.path.join(self.diretorio.name, "t.csv")
+        db = BancoDeDados(caminho=self.caminho)
+        db.salvar_tarefas([Tarefa(1, "prova", "", INICIO, Tipo.PROVA, 1)])
+        model = TarefaModel(db)
+        for horas in (1, 2):
+            model.adicionar_lembrete(1, INICIO - timedelta(hours=horas))
+        db.fechar()
+
+    def tearDown(self):
+        self.diretorio.cleanup()
+
+    def abrir(self, fila):
+        db = BancoDeDados(caminho=self.caminho)
+        return db, TarefaModel(db, cancelamentos=fila)
+
+    def test_cancelamento_sobrevive_a_reinicio(self):
+        # Fila parada: a conclusão grava o outbox, mas nada chega ao sistema externo
+        parada = FilaCancelamentos()
+        parada.parar()
+        db, model = self.abrir(parada)
+        self.assertEqual(model.concluir_tarefa(1)["status_code"], 200)
+        self.assertEqual(len(model.agendador), 0)
+        db.fechar()
+        db = BancoDeDados(caminho=self.caminho)
+        self.assertTrue(all(l.cancelamento_pendente for l in db.buscar_tarefa(1).lembretes))
+        db.fechar()
+
+        db, model = self.abrir(FilaRapida())
+        try:
+            with redirect_stdout(io.StringIO()):
+                self.assertTrue(model.cancelamentos.aguardar(timeout=5))
+            lembretes = db.buscar_tarefa(1).lembretes
+        finally:
+            model.cancelamentos.parar()
+            db.fechar()
+        self.assertEqual(len(lembretes), 2)
+        self.assertFalse(any(l.agendado or l.cancelamento_pendente for l in lembretes))
+
+        db, model = self.abrir(FilaRapida())
+        try:
+            self.assertEqual(model.cancelamentos.pendentes(), 0)
+            self.assertEqual(len(model.agendador), 0)
+        finally:
+            db.fechar()
+
+
+if __name__ == "__main__":
+    unittest.main()
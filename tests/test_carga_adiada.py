@@ -0,0 +1,187 @@
+"""Carga adiada (TAREFAS_CARGA=adiada): operações esperam a carga e nada se perde.
+
+Rodar da raiz do repositório: python -m unittest discover -s tests
+"""
+
+from contextlib import redirect_stdout
+from datetime import timedelta
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+
+SRC = os.path.join(os.path.dirname(__file__), "..", "src")
+sys.path.insert(0, SRC)
+
+from DB import BancoDeDados  # noqa: E402
+from classes import Status  # noqa: E402
+from tarefaController import TarefaController  # noqa: E402
+from tarefaModel import TarefaModel  # noqa: E402
+from test_journal import nova_tarefa  # noqa: E402
+
+ESPERA = 5  # segundos
+
+
+class BancoLento(BancoDeDados):
+    """Carga em fundo que só prossegue quando ``liberar`` é sinalizado."""
+
+    def __init__(self, liberar: threading.Event, **kwargs):
+        self.liberar = liberar
+        super().__init__(adiada=True, **kwargs)
+
+    def _carregar_csv(self) -> None:
+        self.liberar.wait(ESPERA)
+        super()._carregar_csv()
+
+
+class BancoQuebrado(BancoDeDados):
+    def _carregar_csv(self) -> None:
+        raise OSError("disco indisponível")
+
+
+class TesteCargaAdiada(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.caminho = os.path.join(self.diretorio.name, "t.csv")
+        db = BancoDeDados(caminho=self.caminho)
+        db.salvar_tarefas([nova_tarefa(id_tarefa) for id_tarefa in range(1, 21)])
+        db.compactar()
+        db.fechar()
+        self.liberar = threading.Event()
+
+    def tearDown(self):
+        self.liberar.set()
+        self.diretorio.cleanup()
+
+    def em_thread(self, alvo) -> tuple:
+        resultado = []
+        thread = threading.Thread(target=lambda: resultado.append(alvo()), daemon=True)
+        thread.start()
+        return thread, resultado
+
+    def test_operacoes_esperam_a_carga(self):
+        db = BancoLento(self.liberar, caminho=self.caminho)
+        self.addCleanup(db.fechar)
+        self.assertFalse(db.aguardar_carga(0))  # o construtor não esperou
+        leitura, lida = self.em_thread(lambda: db.buscar_tarefa(20))
+        escrita, _ = self.em_thread(lambda: db.salvar_tarefa(nova_tarefa(21)))
+        leitura.join(0.05)
+        self.assertTrue(leitura.is_alive())  # bloqueada até a carga terminar
+
+        self.liberar.set()
+        leitura.join(ESPERA)
+        escrita.join(ESPERA)
+        self.assertEqual(lida[0].titulo, "tarefa 20")
+        # A escrita feita durante a carga não foi sobrescrita pelo snapshot
+        self.assertEqual(sorted(db.listar_tarefas()), list(range(1, 22)))
+        self.assertGreater(db.proximo_id(), 21)
+
+        db.fechar()
+        reaberto = BancoDeDados(caminho=self.caminho)
+        self.addCleanup(reaberto.fechar)
+        self.assertEqual(len(reaberto.tarefas), 21)
+
+    def test_model_restaura_lembretes_em_fundo(self):
+        db = BancoDeDados(caminho=self.caminho)
+        model = TarefaModel(db)
+        for id_tarefa in (3, 4):
+            data = nova_tarefa(id_tarefa).data_entrega - timedelta(days=1)
+            model.adicionar_lembrete(id_tarefa, data)
+        model.encerrar()
+
+        db = BancoLento(self.liberar, caminho=self.caminho)
+        model = TarefaModel(db)
+        self.addCleanup(model.encerrar)
+        controller = TarefaController(model)
+        self.assertFalse(model._lembretes_restaurados.is_set())
+        conclusao, resposta = self.em_thread(lambda: controller.put_concluir_tarefa(3))
+
+        self.liberar.set()
+        conclusao.join(ESPERA)
+        self.assertEqual(resposta[0]["status"], 200)
+        # Só o lembrete da tarefa 4 continua no heap; o da 3 foi para o outbox
+        self.assertEqual(len(model.agendador), 1)
+        with redirect_stdout(io.StringIO()):
+            self.assertTrue(model.cancelamentos.aguardar(timeout=ESPERA))
+        concluida = db.buscar_tarefa(3)
+        self.assertIs(concluida.status, Status.CONCLUIDO)
+        self.assertFalse(any(l.agendado for l in concluida.lembretes))
+        pagina = controller.get_listar_tarefas(limite=50)["body"]
+        self.assertEqual(pagina["total"], 20)
+
+    def test_falha_na_carga_nao_sobrescreve_o_snapshot(self):
+        with redirect_stdout(io.StringIO()):
+            db = BancoQuebrado(caminho=self.caminho, adiada=True)
+            self.assertTrue(db.aguardar_carga(ESPERA))
+        with self.assertRaises(RuntimeError):
+            db.buscar_tarefa(1)
+        with self.assertRaises(RuntimeError):
+            db.salvar_tarefa(nova_tarefa(21))
+        db.fechar()
+        reaberto = BancoDeDados(caminho=self.caminho)
+        self.addCleanup(reaberto.fechar)
+        self.assertEqual(sorted(reaberto.tarefas), list(range(1, 21)))
+
+
+class TesteMainCarga(unittest.TestCase):
+    """main.py de ponta a ponta: imediata por padrão, adiada com TAREFAS_CARGA=adiada."""
+
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.caminho = os.path.join(self.diretorio.name, "t.csv")
+        db = BancoDeDados(caminho=self.caminho)
+        db.salvar_tarefas([nova_tarefa(id_tarefa) for id_tarefa in range(1, 4)])
+        db.fechar()
+
+    def tearDown(self):
+        self.diretorio.cleanup()
+
+    def executar(self, entrada: str, carga: str | None, *argumentos: str) -> str:
+        ambiente = dict(os.environ, TAREFAS_CSV=self.caminho, TAREFAS_BACKEND="csv")
+        ambiente.pop("TAREFAS_CARGA", None)
+        if carga is not None:
+            ambiente["TAREFAS_CARGA"] = carga
+        processo = subprocess.run(
+            [sys.executable, *(argumentos or [os.path.join(SRC, "main.py")])],
+            input=entrada,
+            cwd=SRC,
+            capture_output=True,
+            text=True,
+            env=ambiente,
+            timeout=60,
+        )
+        self.assertEqual(processo.returncode, 0, processo.stderr)
+        return processo.stdout
+
+    def test_listar_e_criar(self):
+        criar = "1\n1\nSeminário de física\n\n10/05/2030 12:00\nTRABALHO\n\n"
+        listar = "3\n\n"
+        for carga in (None, "adiada"):
+            with self.subTest(carga=carga):
+                saida = self.executar(criar + listar + "0\n", carga)
+                for id_tarefa in range(1, 4):
+                    self.assertIn(f"tarefa {id_tarefa}", saida)
+                self.assertIn("Seminário de física", saida)
+        db = BancoDeDados(caminho=self.caminho)
+        self.addCleanup(db.fechar)
+        titulos = [t.titulo for t in db.listar_tarefas().values()]
+        self.assertEqual(titulos.count("Seminário de física"), 2)
+        self.assertEqual(len(titulos), 5)
+
+    def test_carga_imediata_por_padrao(self):
+        # Roda o main.py (saindo na hora) e mostra o modo que ele configurou
+        codigo = (
+            "import runpy; runpy.run_path('main.py', run_name='__main__'); "
+            "from DB import BancoDeDados; print(BancoDeDados.CARGA_ADIADA)"
+        )
+        for carga, esperado in ((None, "False"), ("imediata", "False"), ("adiada", "True")):
+            with self.subTest(carga=carga):
+                saida = self.executar("0\n", carga, "-c", codigo)
+                self.assertEqual(saida.splitlines()[-1], esperado)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+"""Armazenamento colunar: inserção no meio, remoção e leitura iguais a um dict.
+
+Rodar da raiz do repositório: python -m unittest discover -s tests
+"""
+
+from array import array
+from datetime import datetime, timedelta
+import math
+import os
+import pickle
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from classes import Status  # noqa: E402
+from colunar import ArmazemColunar, ColunasPorId, colunas_de_tarefas  # noqa: E402
+from test_indices import tarefas_aleatorias  # noqa: E402
+
+
+class TesteColunasPorId(unittest.TestCase):
+    def test_igual_a_um_dict(self):
+        sorteio = random.Random(0)
+        mapa, esperado = ColunasPorId("bq"), {}
+        # IDs crescentes (caminho rápido), depois inserções no meio, trocas e remoções
+        for id_tarefa in range(10, 200, 3):
+            valores = (sorteio.randrange(3), sorteio.randrange(10**12))
+            mapa.definir(id_tarefa, valores)
+            esperado[id_tarefa] = valores
+        for _ in range(600):
+            id_tarefa = sorteio.randrange(1, 260)
+            if sorteio.random() < 0.3:
+                self.assertEqual(mapa.remover(id_tarefa), esperado.pop(id_tarefa, None))
+            else:
+                valores = (sorteio.randrange(3), sorteio.randrange(10**12))
+                mapa.definir(id_tarefa, valores)
+                esperado[id_tarefa] = valores
+            self.assertEqual(list(mapa.ids), sorted(esperado))
+        self.assertEqual(len(mapa), len(esperado))
+        for id_tarefa in range(0, 270):
+            with self.subTest(id_tarefa=id_tarefa):
+                self.assertEqual(mapa.obter(id_tarefa), esperado.get(id_tarefa))
+
+    def test_posicao_com_lacunas(self):
+        mapa = ColunasPorId("q")
+        for id_tarefa in (5, 6, 7, 50, 51, 1000):
+            mapa.definir(id_tarefa, (id_tarefa,))
+        casos = ((5, 0), (7, 2), (50, 3), (1000, 5), (4, -1), (8, -1), (999, -1))
+        for id_tarefa, posicao in casos:
+            with self.subTest(id_tarefa=id_tarefa):
+                self.assertEqual(mapa.posicao(id_tarefa), posicao)
+        self.assertEqual(ColunasPorId("q").posicao(1), -1)
+
+    def test_de_colunas_fora_de_ordem(self):
+        ids = array("q", [30, 10, 20])
+        colunas = [array("b", [3, 1, 2]), array("d", [0.3, 0.1, 0.2])]
+        mapa = ColunasPorId.de_colunas("bd", ids, colunas)
+        self.assertEqual(list(mapa.ids), [10, 20, 30])
+        self.assertEqual(mapa.obter(20), (2, 0.2))
+        mapa.definir(15, (9, 9.0))
+        self.assertEqual(list(ids), [30, 10, 20])  # a origem não é alterada
+
+
+class TesteArmazemColunar(unittest.TestCase):
+    def setUp(self):
+        self.armazem = ArmazemColunar()
+        self.tarefas = {}
+        # Pares primeiro (no fim, crescentes), ímpares depois: inseridos no meio
+        for tarefa in sorted(tarefas_aleatorias(200), key=lambda t: (t.id % 2, t.id)):
+            if tarefa.id % 7 == 0:
+                tarefa.nota = tarefa.id / 10
+            if tarefa.id % 11 == 0:
+                tarefa.adicionar_lembrete(tarefa.data_entrega - timedelta(hours=1))
+            self.armazem[tarefa.id] = tarefa
+            self.tarefas[tarefa.id] = tarefa.para_dict()
+
+    def conferir(self) -> None:
+        self.assertEqual(list(self.armazem), sorted(self.tarefas))
+        self.assertEqual(len(self.armazem), len(self.tarefas))
+        for id_tarefa, esperado in self.tarefas.items():
+            with self.subTest(id_tarefa=id_tarefa):
+                # Visões remontadas das colunas (as originais já foram descartadas)
+                self.assertEqual(self.armazem[id_tarefa].para_dict(), esperado)
+
+    def test_insercao_no_meio(self):
+        self.conferir()
+        colunas = self.armazem.colunas()
+        self.assertEqual(list(colunas.ids), list(range(1, 201)))
+        esperadas = colunas_de_tarefas(self.armazem[i] for i in range(1, 201))
+        for campo in colunas._fields:
+            obtido, esperado = getattr(colunas, campo), getattr(esperadas, campo)
+            self.assertEqual(
+                [None if isinstance(v, float) and math.isnan(v) else v for v in obtido],
+                [None if isinstance(v, float) and math.isnan(v) else v for v in esperado],
+                campo,
+            )
+
+    def test_remocao_e_substituicao(self):
+        sorteio = random.Random(1)
+        for id_tarefa in sorteio.sample(sorted(self.tarefas), 80):
+            del self.armazem[id_tarefa]
+            del self.tarefas[id_tarefa]
+        with self.assertRaises(KeyError):
+            del self.armazem[10_000]
+        for id_tarefa in sorteio.sample(sorted(self.tarefas), 40):
+            tarefa = self.armazem[id_tarefa]
+            tarefa.status = Status.CONCLUIDO
+            tarefa.nota = None
+            self.armazem[id_tarefa] = tarefa
+            self.tarefas[id_tarefa] = tarefa.para_dict()
+        # Reinserção de um ID removido no meio das colunas
+        removido = next(i for i in range(2, 200) if i not in self.tarefas)
+        tarefa = tarefas_aleatorias(removido)[-1]
+        self.armazem[removido] = tarefa
+        self.tarefas[removido] = tarefa.para_dict()
+        self.assertNotIn(10_000, self.armazem)
+        self.conferir()
+
+    def test_visao_reaproveitada_e_pickle(self):
+        tarefa = self.armazem[22]
+        self.assertIs(self.armazem[22], tarefa)  # enquanto a visão estiver viva
+        self.assertEqual(
+            [l.data for l in tarefa.lembretes], [tarefa.data_entrega - timedelta(hours=1)]
+        )
+        copia = pickle.loads(pickle.dumps(self.armazem))
+        self.assertEqual(
+            [t.para_dict() for t in copia.values()],
+            [t.para_dict() for t in self.armazem.values()],
+        )
+
+    def test_prazo_com_microssegundos(self):
+        tarefa = tarefas_aleatorias(1)[0]
+        tarefa.data_entrega = datetime(1969, 12, 31, 23, 59, 59, 999_999)  # antes da época
+        self.armazem[500] = tarefa
+        del tarefa
+        self.assertEqual(
+            self.armazem[500].data_entrega, datetime(1969, 12, 31, 23, 59, 59, 999_999)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+"""Conclusão em lote: status por ID, uma gravação por lote e lembretes cancelados.
+
+Rodar da raiz do repositório: python -m unittest discover -s tests
+"""
+
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+import io
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from DB import BancoDeDados  # noqa: E402
+from classes import Status, Tarefa, Tipo  # noqa: E402
+from filaCancelamentos import FilaCancelamentos  # noqa: E402
+from tarefaController import TarefaController  # noqa: E402
+from tarefaModel import TarefaModel  # noqa: E402
+
+INICIO = datetime(2030, 1, 1)
+
+
+class FilaRegistrada(FilaCancelamentos):
+    """Registra cada enfileirar_lote; os cancelamentos rodam de verdade."""
+
+    def __init__(self):
+        super().__init__()
+        self.lotes = []
+
+    def enfileirar_lote(self, itens: list) -> None:
+        self.lotes.append([(id_tarefa, list(lembretes)) for id_tarefa, lembretes in itens])
+        super().enfileirar_lote(itens)
+
+
+class TesteConclusaoEmLote(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.db = BancoDeDados(caminho=os.path.join(self.diretorio.name, "t.csv"))
+        # 1-10: disciplina 1 (PROVA nos pares), 11-20: disciplina 2; 5 e 15 já concluídas
+        tarefas = []
+        for id_tarefa in range(1, 21):
+            tipo = Tipo.PROVA if id_tarefa % 2 == 0 else Tipo.TRABALHO
+            tarefa = Tarefa(
+                id_tarefa,
+                f"tarefa {id_tarefa}",
+                "",
+                INICIO + timedelta(days=id_tarefa),
+                tipo,
+                1 if id_tarefa <= 10 else 2,
+            )
+            if id_tarefa in (5, 15):
+                tarefa.status = Status.CONCLUIDO
+            tarefas.append(tarefa)
+        self.db.salvar_tarefas(tarefas)
+        self.fila = FilaRegistrada()
+        self.model = TarefaModel(self.db, cancelamentos=self.fila)
+        self.controller = TarefaController(self.model)
+        for id_tarefa in (2, 3, 4, 12):
+            for horas in (1, 2):
+                data = INICIO + timedelta(days=id_tarefa, hours=-horas)
+                self.model.adicionar_lembrete(id_tarefa, data)
+
+    def tearDown(self):
+        with redirect_stdout(io.StringIO()):
+            self.model.encerrar()
+        self.diretorio.cleanup()
+
+    def concluir(self, **parametros) -> dict:
+        with redirect_stdout(io.StringIO()):
+            return self.controller.put_concluir_tarefas_lote(**parametros)
+
+    def test_status_por_id(self):
+        casos = [
+            ([1, 2], 200, [200, 200]),
+            ([3, 999, 5], 207, [200, 404, 200]),  # 5 já estava concluída
+            ([998, 999], 404, [404, 404]),
+        ]
+        for ids, status, por_id in casos:
+            with self.subTest(ids=ids):
+                resposta = self.concluir(ids=ids)
+                self.assertEqual(resposta["status"], status)
+                resultados = resposta["body"]["resultados"]
+                self.assertEqual([r["id"] for r in resultados], ids)
+                self.assertEqual([r["status"] for r in resultados], por_id)
+        resultados = self.concluir(ids=[5, 1])["body"]["resultados"]
+        self.assertEqual({r["mensagem"] for r in resultados}, {"Tarefa já estava concluída"})
+        for id_tarefa in (1, 2, 3):
+            self.assertIs(self.db.buscar_tarefa(id_tarefa).status, Status.CONCLUIDO)
+
+    def test_ids_repetidos_e_filtros(self):
+        body = self.concluir(ids=[4, 4, 6])["body"]
+        self.assertEqual(([r["id"] for r in body["resultados"]], body["concluidas"]), ([4, 6], 2))
+        # Filtro: só as abertas da disciplina 2 do tipo PROVA
+        body = self.concluir(id_disciplina=2, tipo="PROVA")["body"]
+        self.assertEqual([r["id"] for r in body["resultados"]], [12, 14, 16, 18, 20])
+        body = self.concluir(data_fim=(INICIO + timedelta(days=9)).strftime("%d/%m/%Y"))["body"]
+        self.assertEqual([r["id"] for r in body["resultados"]], [1, 2, 3, 7, 8, 9])
+        self.assertEqual(self.concluir()["status"], 400)
+        self.assertEqual(self.concluir(ids=[1], tipo="PROVA")["status"], 400)
+        self.assertEqual(self.concluir(id_disciplina=99)["status"], 404)
+
+    def test_uma_gravacao_por_lote(self):
+        with mock.patch.object(
+            self.db, "_enfileirar", wraps=self.db._enfileirar
+        ) as enfileirar, mock.patch.object(
+            self.db, "_descarregar", wraps=self.db._descarregar
+        ) as descarregar:
+            resposta = self.concluir(ids=list(range(1, 21)) + [999])
+        self.assertEqual(resposta["body"]["concluidas"], 18)
+        # Um só registro no buffer e um só append ao journal para as 18 tarefas
+        self.assertEqual(enfileirar.call_count, 1)
+        self.assertEqual(len(enfileirar.call_args.args[0]), 18)
+        self.assertEqual(descarregar.call_count, 1)
+        self.assertEqual(len(self.fila.lotes), 1)
+
+    def test_lembretes_cancelados(self):
+        self.assertEqual(len(self.model.agendador), 8)
+        self.fila.parar()  # segura os cancelamentos: o outbox fica persistido
+        self.concluir(ids=[2, 3, 7])
+        # Heap local: saem só os lembretes das tarefas concluídas
+        self.assertEqual(len(self.model.agendador), 4)
+        self.assertEqual(
+            [(id_tarefa, len(lembretes)) for id_tarefa, lembretes in self.fila.lotes[0]],
+            [(2, 2), (3, 2), (7, 0)],
+        )
+        for id_tarefa in (2, 3):
+            lembretes = self.db.buscar_tarefa(id_tarefa).lembretes
+            self.assertTrue(all(l.cancelamento_pendente for l in lembretes))
+        self.assertFalse(any(l.cancelamento_pendente for l in self.db.buscar_tarefa(4).lembretes))
+
+        # Reinício: o outbox é reenviado e a confirmação persistida
+        self.db.fechar()
+        self.db = BancoDeDados(caminho=self.db.CSV_FILENAME)
+        self.fila = FilaRegistrada()
+        self.model = TarefaModel(self.db, cancelamentos=self.fila)
+        with redirect_stdout(io.StringIO()):
+            self.assertTrue(self.fila.aguardar(timeout=5))
+        for id_tarefa in (2, 3):
+            lembretes = self.db.buscar_tarefa(id_tarefa).lembretes
+            self.assertFalse(any(l.agendado or l.cancelamento_pendente for l in lembretes))
+        self.assertEqual(len(self.model.agendador), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
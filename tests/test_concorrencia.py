@@ -0,0 +1,199 @@
+"""Concorrência: trava leitor/escritor e IDs únicos entre threads.
+
+Rodar da raiz do repositório: python -m unittest discover -s tests
+"""
+
+from datetime import datetime
+import os
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from DB import BancoDeDados  # noqa: E402
+from classes import Status, Tarefa, Tipo  # noqa: E402
+from concorrencia import TravaLeituraEscrita  # noqa: E402
+from tarefaModel import TarefaModel  # noqa: E402
+
+ESPERA = 5  # segundos; só estoura se a trava estiver errada
+
+
+class TesteTravaLeituraEscrita(unittest.TestCase):
+    def setUp(self):
+        self.trava = TravaLeituraEscrita()
+
+    def em_thread(self, alvo) -> threading.Thread:
+        thread = threading.Thread(target=alvo, daemon=True)
+        thread.start()
+        return thread
+
+    def test_leituras_em_paralelo(self):
+        barreira = threading.Barrier(3, timeout=ESPERA)
+
+        def ler():
+            with self.trava.leitura():
+                barreira.wait()  # só passa se os três leitores estão dentro juntos
+
+        threads = [self.em_thread(ler) for _ in range(3)]
+        for thread in threads:
+            thread.join(ESPERA)
+        self.assertFalse(barreira.broken)
+
+    def test_escrita_exclusiva_e_com_preferencia(self):
+        eventos = []
+        leitor_dentro, soltar_leitor = threading.Event(), threading.Event()
+
+        def primeiro_leitor():
+            with self.trava.leitura():
+                leitor_dentro.set()
+                soltar_leitor.wait(ESPERA)
+                eventos.append("leitor 1 sai")
+
+        def escritor():
+            with self.trava.escrita():
+                eventos.append("escritor")
+
+        def segundo_leitor():
+            with self.trava.leitura():
+                eventos.append("leitor 2")
+
+        threads = [self.em_thread(primeiro_leitor)]
+        leitor_dentro.wait(ESPERA)
+        threads.append(self.em_thread(escritor))
+        self.esperar(lambda: self.trava._escritores_esperando == 1)
+        # Com um escritor na fila, uma nova leitura não passa à frente dele
+        threads.append(self.em_thread(segundo_leitor))
+        soltar_leitor.set()
+        for thread in threads:
+            thread.join(ESPERA)
+        self.assertEqual(eventos, ["leitor 1 sai", "escritor", "leitor 2"])
+
+    def test_contador_protegido_pela_escrita(self):
+        contador = [0]
+
+        def incrementar():
+            for _ in range(2000):
+                with self.trava.escrita():
+                    valor = contador[0]
+                    contador[0] = valor + 1
+
+        threads = [self.em_thread(incrementar) for _ in range(4)]
+        for thread in threads:
+            thread.join(ESPERA)
+        self.assertEqual(contador[0], 8000)
+
+    def esperar(self, condicao) -> None:
+        evento = threading.Event()
+        for _ in range(ESPERA * 1000):
+            if condicao():
+                return
+            evento.wait(0.001)
+        self.fail("condição não atingida")
+
+
+class TesteIdsConcorrentes(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.caminho = os.path.join(self.diretorio.name, "t.csv")
+        self.db = BancoDeDados(caminho=self.caminho)
+
+    def tearDown(self):
+        self.db.fechar()
+        self.diretorio.cleanup()
+
+    def test_ids_unicos_entre_threads(self):
+        obtidos = [[] for _ in range(6)]
+
+        def reservar(destino, indice):
+            for _ in range(200):
+                if indice % 2:
+                    destino.extend(self.db.reservar_ids(3))
+                else:
+                    destino.append(self.db.proximo_id())
+
+        threads = [
+            threading.Thread(target=reservar, args=(destino, i))
+            for i, destino in enumerate(obtidos)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        ids = [id_tarefa for destino in obtidos for id_tarefa in destino]
+        self.assertEqual(len(ids), 3 * 200 * 4)
+        self.assertEqual(len(set(ids)), len(ids))
+
+    def test_gravacoes_concorrentes_persistem(self):
+        def criar(quantidade):
+            for _ in range(quantidade):
+                id_tarefa = self.db.proximo_id()
+                tarefa = Tarefa(
+                    id_tarefa, f"tarefa {id_tarefa}", "", datetime(2030, 1, 1), Tipo.PROVA, 1
+                )
+                self.db.salvar_tarefa(tarefa)
+
+        threads = [threading.Thread(target=criar, args=(50,)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        reservados = self.db.reservar_ids(10)
+        self.db.fechar()
+
+        self.db = BancoDeDados(caminho=self.caminho)
+        self.assertEqual(len(self.db.tarefas), 200)
+        self.assertEqual(sorted(self.db.tarefas), list(range(1, 201)))
+        # IDs reservados antes de fechar não voltam a ser entregues
+        self.assertGreaterEqual(self.db.proximo_id(), reservados.stop)
+
+
+class TesteAlteracaoAtomica(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.db = BancoDeDados(caminho=os.path.join(self.diretorio.name, "t.csv"))
+        self.model = TarefaModel(self.db)
+        for id_tarefa in range(1, 21):
+            self.model.criar_tarefa(1, f"tarefa {id_tarefa}", "", datetime(2030, 1, 1), Tipo.PROVA)
+            self.model.adicionar_lembrete(id_tarefa, datetime(2029, 12, 1))
+
+    def tearDown(self):
+        self.model.agendador.parar()
+        self.model.cancelamentos.parar()
+        self.db.fechar()
+        self.diretorio.cleanup()
+
+    def test_leitor_nao_ve_a_conclusao_em_andamento(self):
+        lida = self.db.buscar_tarefa(1)
+        status = lida.status
+        self.model.concluir_tarefa(1)
+        self.model.registrar_nota(1, 8.0)
+        # A referência lida antes continua como estava; o banco guarda a nova versão
+        self.assertEqual((lida.status, lida.nota), (status, None))
+        self.assertFalse(lida.lembretes[0].cancelamento_pendente)
+        atual = self.db.buscar_tarefa(1)
+        self.assertIsNot(atual, lida)
+        self.assertEqual((atual.status, atual.nota), (Status.CONCLUIDO, 8.0))
+
+    def test_conclusoes_concorrentes_concluem_uma_vez(self):
+        barreira = threading.Barrier(4, timeout=ESPERA)
+        mensagens = []
+
+        def concluir():
+            barreira.wait()
+            for id_tarefa in range(1, 21):
+                mensagens.append(self.model.concluir_tarefa(id_tarefa)["mensagem"])
+
+        threads = [threading.Thread(target=concluir) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(mensagens.count("Tarefa concluída com sucesso"), 20)
+        self.assertEqual(mensagens.count("Tarefa já estava concluída"), 60)
+        self.assertTrue(self.model.cancelamentos.aguardar(timeout=ESPERA))
+
+
+if __name__ == "__main__":
+    unittest.main()
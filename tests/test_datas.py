@@ -0,0 +1,107 @@
+"""datas.interpretar_data: formatos aceitos, motivo de cada erro e paridade com strptime.
+
+Rodar da raiz do repositório: python -m unittest discover -s tests
+"""
+
+from datetime import datetime
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from datas import FORMATOS_ACEITOS, _interpretar_texto, interpretar_data  # noqa: E402
+
+# Formatos do antigo TarefaController._coerce_datetime, tentados em sequência
+FORMATOS_STRPTIME = (
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%d",
+    "%d/%m/%Y %H:%M",
+    "%d/%m/%Y",
+    "%d-%m-%Y %H:%M",
+    "%d-%m-%Y",
+)
+
+
+def por_strptime(texto: str) -> datetime | None:
+    for formato in FORMATOS_STRPTIME:
+        try:
+            return datetime.strptime(texto.strip(), formato)
+        except ValueError:
+            pass
+    return None
+
+
+class TesteInterpretarData(unittest.TestCase):
+    def test_formatos_aceitos(self):
+        casos = [
+            ("10/05/2030 14:30", datetime(2030, 5, 10, 14, 30)),
+            ("10/05/2030", datetime(2030, 5, 10)),
+            ("1/5/2030 9:05", datetime(2030, 5, 1, 9, 5)),
+            ("10-05-2030 23:59", datetime(2030, 5, 10, 23, 59)),
+            ("2030-05-10", datetime(2030, 5, 10)),
+            ("2030-5-1 00:00", datetime(2030, 5, 1)),
+            ("  29/02/2028   08:00 ", datetime(2028, 2, 29, 8)),
+        ]
+        for texto, esperado in casos:
+            with self.subTest(texto=texto):
+                self.assertEqual(interpretar_data(texto), (esperado, None))
+
+    def test_motivo_de_cada_erro(self):
+        formato = f"Formato inválido. {FORMATOS_ACEITOS}"
+        casos = [
+            ("", formato),
+            ("amanhã", formato),
+            ("10/05-2030", formato),  # separadores misturados
+            ("2030/05/10", formato),
+            ("2030-05-10T14:30", formato),  # isoformat com T não é aceito
+            ("10/05/2030 14:3", formato),
+            ("10/05/30", formato),
+            ("31/02/2024", "Data inexistente no calendário."),
+            ("29/02/2027 10:00", "Data inexistente no calendário."),
+            ("2030-13-01", "Data inexistente no calendário."),
+            ("10/05/2030 24:00", "Horário inexistente (hora/minuto fora da faixa)."),
+            ("10/05/2030 12:60", "Horário inexistente (hora/minuto fora da faixa)."),
+        ]
+        for texto, motivo in casos:
+            with self.subTest(texto=texto):
+                self.assertEqual(interpretar_data(texto), (None, motivo))
+
+    def test_valores_que_nao_sao_texto(self):
+        data = datetime(2030, 5, 10, 14, 30)
+        self.assertIs(interpretar_data(data)[0], data)
+        for valor in (None, 20300510, b"10/05/2030"):
+            with self.subTest(valor=valor):
+                data, motivo = interpretar_data(valor)
+                self.assertIsNone(data)
+                self.assertIn(FORMATOS_ACEITOS, motivo)
+
+    def test_mesmo_resultado_que_strptime(self):
+        sorteio = random.Random(15)
+        for _ in range(3000):
+            dia, mes = sorteio.randrange(0, 33), sorteio.randrange(0, 14)
+            ano = sorteio.choice((2024, 2027, 2030))
+            dia_txt = str(dia) if sorteio.random() < 0.5 else f"{dia:02d}"
+            if sorteio.random() < 0.5:
+                texto = f"{ano}-{mes:02d}-{dia_txt}"
+            else:
+                # Inclui separadores misturados, recusados pelos dois
+                antes, depois = sorteio.choice(("//", "--", "/-", "-/"))
+                texto = f"{dia_txt}{antes}{mes:02d}{depois}{ano}"
+            if sorteio.random() < 0.5:
+                texto += f" {sorteio.randrange(0, 26)}:{sorteio.randrange(0, 62):02d}"
+            with self.subTest(texto=texto):
+                self.assertEqual(interpretar_data(texto)[0], por_strptime(texto))
+
+    def test_textos_repetidos_vem_do_cache(self):
+        _interpretar_texto.cache_clear()
+        for _ in range(3):
+            interpretar_data("10/05/2030 14:30")
+            interpretar_data(" 10/05/2030 14:30 ")  # mesmo texto depois do strip
+        info = _interpretar_texto.cache_info()
+        self.assertEqual((info.misses, info.hits), (1, 5))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+"""Enums de domínio: coerção de texto, códigos inteiros e fallback na carga.
+
+Rodar da raiz do repositório: python -m unittest discover -s tests
+"""
+
+import os
+import random
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from DB import BancoDeDados  # noqa: E402
+from classes import Status, Tipo  # noqa: E402
+
+
+def por_varredura(enum_cls, valor):
+    """Coerção antiga (varredura dos membros), usada como referência."""
+    if isinstance(valor, enum_cls):
+        return valor
+    if isinstance(valor, str):
+        texto = valor.strip().casefold()
+        for membro in enum_cls:
+            if texto in (membro.name.casefold(), membro.value.casefold()):
+                return membro
+    return None
+
+
+class TesteEnums(unittest.TestCase):
+    def test_de_texto_por_nome_ou_valor(self):
+        for enum_cls in (Status, Tipo):
+            for membro in enum_cls:
+                for chave in (membro.name, membro.value):
+                    variantes = (chave, chave.upper(), chave.lower(), f"  {chave.title()}\t")
+                    for texto in variantes:
+                        with self.subTest(texto=texto):
+                            self.assertIs(enum_cls.de_texto(texto), membro)
+                with self.subTest(membro=membro):
+                    self.assertIs(enum_cls.de_texto(membro), membro)
+
+    def test_invalido_retorna_o_padrao(self):
+        casos = ["", "   ", "Provas", "em-andamento", None, 0, Tipo.PROVA]
+        for valor in casos:
+            with self.subTest(valor=valor):
+                self.assertIsNone(Status.de_texto(valor))
+                self.assertIs(Status.de_texto(valor, Status.EM_ANDAMENTO), Status.EM_ANDAMENTO)
+        self.assertIsNone(Tipo.de_texto(Status.PENDENTE))  # membro de outro enum
+
+    def test_igual_a_varredura(self):
+        sorteio = random.Random(16)
+        pedacos = ["prova", "Trabalho", "ATIVIDADE", "pendente", "em_andamento", "Em Andamento"]
+        pedacos += ["concluido", " ", "_", "x"]
+        for _ in range(2000):
+            texto = "".join(sorteio.choices(pedacos, k=sorteio.randrange(1, 3)))
+            for enum_cls in (Status, Tipo):
+                with self.subTest(enum=enum_cls.__name__, texto=texto):
+                    self.assertIs(enum_cls.de_texto(texto), por_varredura(enum_cls, texto))
+
+    def test_codigos_estaveis(self):
+        # Persistidos nas colunas: a ordem de definição não pode mudar
+        esperados = {
+            Status.PENDENTE: 0,
+            Status.EM_ANDAMENTO: 1,
+            Status.CONCLUIDO: 2,
+            Tipo.PROVA: 0,
+            Tipo.TRABALHO: 1,
+            Tipo.ATIVIDADE: 2,
+        }
+        for membro, codigo in esperados.items():
+            with self.subTest(membro=membro):
+                self.assertEqual(membro.codigo, codigo)
+                self.assertIs(type(membro).de_codigo(codigo), membro)
+        with self.assertRaises(IndexError):
+            Tipo.de_codigo(len(Tipo))
+
+    def test_fallback_na_carga(self):
+        linha = {"id": "1", "titulo": "t", "data_entrega": "2030-01-01T00:00:00"}
+        casos = [
+            ({}, Tipo.ATIVIDADE, Status.EM_ANDAMENTO),
+            ({"tipo": "Prova", "status": "Concluido"}, Tipo.PROVA, Status.CONCLUIDO),
+            ({"tipo": " trabalho ", "status": "PENDENTE"}, Tipo.TRABALHO, Status.PENDENTE),
+            ({"tipo": "seminário", "status": "arquivada"}, Tipo.ATIVIDADE, Status.EM_ANDAMENTO),
+        ]
+        for campos, tipo, status in casos:
+            with self.subTest(campos=campos):
+                tarefa = BancoDeDados.tarefa_de_linha(dict(linha, **campos))
+                self.assertIs(tarefa.tipo, tipo)
+                self.assertIs(tarefa.status, status)
+
+
+if __name__ == "__main__":
+    unittest.main()
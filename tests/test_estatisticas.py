@@ -0,0 +1,128 @@
+"""Estatísticas incrementais: Welford com remoção e relatório igual ao recálculo.
+
+Rodar da raiz do repositório: python -m unittest discover -s tests
+"""
+
+import os
+import random
+import statistics
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from DB import BancoDeDados  # noqa: E402
+from classes import Status  # noqa: E402
+from estatisticas import AgregadoNotas, EstatisticasTarefas  # noqa: E402
+from test_indices import tarefas_aleatorias  # noqa: E402
+
+
+class TesteAgregadoNotas(unittest.TestCase):
+    def assertResumoIgual(self, obtido: dict, esperado: dict) -> None:
+        self.assertEqual(obtido.keys(), esperado.keys())
+        for campo, valor in esperado.items():
+            if isinstance(valor, float):
+                self.assertAlmostEqual(obtido[campo], valor, places=9, msg=campo)
+            else:
+                self.assertEqual(obtido[campo], valor, msg=campo)
+
+    def test_remover_apos_adicionar_restaura_o_anterior(self):
+        sorteio = random.Random(0)
+        agregado = AgregadoNotas()
+        for _ in range(200):
+            agregado.adicionar(round(sorteio.uniform(0, 10), 1))
+            antes = agregado.resumo()
+            nota = round(sorteio.uniform(0, 10), 1)
+            agregado.adicionar(nota)
+            agregado.remover(nota)
+            self.assertResumoIgual(agregado.resumo(), antes)
+
+    def test_igual_ao_calculo_direto(self):
+        sorteio = random.Random(1)
+        agregado, notas = AgregadoNotas(), []
+        for _ in range(2000):
+            if notas and sorteio.random() < 0.4:
+                nota = notas.pop(sorteio.randrange(len(notas)))
+                agregado.remover(nota)
+            else:
+                # Notas repetidas exercitam a contagem dos heaps de mínimo/máximo
+                nota = sorteio.choice([0.0, 5.0, 10.0, round(sorteio.uniform(0, 10), 2)])
+                notas.append(nota)
+                agregado.adicionar(nota)
+        resumo = agregado.resumo()
+        self.assertEqual(resumo["quantidade"], len(notas))
+        self.assertAlmostEqual(resumo["media"], statistics.fmean(notas), places=9)
+        self.assertAlmostEqual(resumo["variancia"], statistics.variance(notas), places=6)
+        self.assertEqual((resumo["minimo"], resumo["maximo"]), (min(notas), max(notas)))
+
+    def test_minimo_e_maximo_apos_remover_extremos(self):
+        agregado = AgregadoNotas()
+        for nota in (3.0, 9.0, 1.0, 9.0, 5.0):
+            agregado.adicionar(nota)
+        agregado.remover(1.0)
+        agregado.remover(9.0)
+        self.assertEqual((agregado.resumo()["minimo"], agregado.resumo()["maximo"]), (3.0, 9.0))
+        agregado.remover(9.0)
+        self.assertEqual(agregado.resumo()["maximo"], 5.0)
+        agregado.remover(42.0)  # nota ausente: ignorada
+        self.assertEqual(agregado.quantidade, 2)
+        for nota in (3.0, 5.0):
+            agregado.remover(nota)
+        resumo = agregado.resumo()
+        self.assertEqual(
+            (resumo["quantidade"], resumo["media"], resumo["variancia"]), (0, None, 0.0)
+        )
+        self.assertIsNone(resumo["minimo"])
+
+
+class TesteEstatisticasTarefas(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.db = BancoDeDados(caminho=os.path.join(self.diretorio.name, "t.csv"))
+        tarefas = tarefas_aleatorias(300)
+        sorteio = random.Random(2)
+        for tarefa in tarefas:
+            tarefa.nota = sorteio.choice([None, round(sorteio.uniform(0, 10), 1)])
+        self.db.salvar_tarefas(tarefas)
+
+    def tearDown(self):
+        self.db.fechar()
+        self.diretorio.cleanup()
+
+    def conferir(self) -> None:
+        recalculado = EstatisticasTarefas()
+        recalculado.reconstruir(self.db.tarefas.values())
+        for id_disciplina in (None, 1, 2, 3, 99):
+            with self.subTest(id_disciplina=id_disciplina):
+                obtido = self.db.consultar_estatisticas(id_disciplina)
+                esperado = recalculado.relatorio(id_disciplina)
+                self.assertEqual(
+                    {k: v for k, v in obtido.items() if k != "notas"},
+                    {k: v for k, v in esperado.items() if k != "notas"},
+                )
+                self.assertEqual(obtido["notas"].keys(), esperado["notas"].keys())
+                for disciplina, resumo in esperado["notas"].items():
+                    for campo, valor in resumo.items():
+                        if isinstance(valor, float):
+                            self.assertAlmostEqual(obtido["notas"][disciplina][campo], valor)
+                        else:
+                            self.assertEqual(obtido["notas"][disciplina][campo], valor)
+
+    def test_relatorio_igual_ao_recalculo(self):
+        self.conferir()
+
+    def test_relatorio_acompanha_alteracoes(self):
+        sorteio = random.Random(3)
+        for id_tarefa in sorteio.sample(range(1, 301), 120):
+            tarefa = self.db.buscar_tarefa(id_tarefa)
+            # Alterada in-place: a contribuição antiga vem da cópia guardada
+            tarefa.status = sorteio.choice(list(Status))
+            tarefa.nota = sorteio.choice([None, round(sorteio.uniform(0, 10), 1)])
+            tarefa.id_disciplina = sorteio.choice([None, 1, 2, 3])
+            self.db.atualizar_tarefa(tarefa)
+        self.conferir()
+
+
+if __name__ == "__main__":
+    unittest.main()
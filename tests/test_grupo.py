@@ -0,0 +1,110 @@
+"""Gravação em grupo (group commit): mutações adiadas chegam ao disco.
+
+Rodar da raiz do repositório: python -m unittest discover -s tests
+"""
+
+from datetime import datetime
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from DB import BancoDeDados  # noqa: E402
+from classes import Status, Tarefa, Tipo  # noqa: E402
+
+
+def nova_tarefa(id_tarefa: int) -> Tarefa:
+    return Tarefa(id_tarefa, f"tarefa {id_tarefa}", "", datetime(2030, 1, 1), Tipo.TRABALHO, 1)
+
+
+class TesteGravacaoEmGrupo(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.caminho = os.path.join(self.diretorio.name, "t.csv")
+        self.journal = self.caminho + ".journal"
+        self.db = self.abrir()
+
+    def tearDown(self):
+        self.db.fechar()
+        self.diretorio.cleanup()
+
+    def abrir(self, intervalo: float = 60.0) -> BancoDeDados:
+        db = BancoDeDados(caminho=self.caminho, grupo=True)
+        db.INTERVALO_GRUPO = intervalo  # longo: só fechar/flush/limite gravam
+        return db
+
+    def reabrir(self) -> BancoDeDados:
+        self.db.fechar()
+        self.db = BancoDeDados(caminho=self.caminho)
+        return self.db
+
+    def tamanho_journal(self) -> int:
+        return os.path.getsize(self.journal) if os.path.exists(self.journal) else 0
+
+    def test_mutacao_adiada_ate_fechar(self):
+        for id_tarefa in range(1, 11):
+            self.db.salvar_tarefa(nova_tarefa(id_tarefa))
+        tarefa = self.db.buscar_tarefa(3)
+        tarefa.status = Status.CONCLUIDO
+        self.db.atualizar_tarefa(tarefa)
+        # Visível em memória na hora, mas ainda não gravado
+        self.assertEqual(self.db.buscar_tarefa(3).status, Status.CONCLUIDO)
+        self.assertEqual(self.tamanho_journal(), 0)
+
+        db = self.reabrir()
+        self.assertEqual(sorted(db.tarefas), list(range(1, 11)))
+        self.assertEqual(db.buscar_tarefa(3).status, Status.CONCLUIDO)
+
+    def test_flush_grava_na_hora(self):
+        self.db.salvar_tarefa(nova_tarefa(1))
+        self.db.flush(duravel=True)
+        self.assertGreater(self.tamanho_journal(), 0)
+        # Uma segunda instância já enxerga a tarefa (sem esperar o fechamento)
+        outro = BancoDeDados(caminho=self.caminho)
+        try:
+            self.assertIsNotNone(outro.buscar_tarefa(1))
+        finally:
+            outro.fechar()
+
+    def test_limite_de_sujos_grava_pelo_chamador(self):
+        self.db.LIMITE_SUJOS = 5
+        for id_tarefa in range(1, 5):
+            self.db.salvar_tarefa(nova_tarefa(id_tarefa))
+        self.assertEqual(self.tamanho_journal(), 0)
+        self.db.salvar_tarefa(nova_tarefa(5))
+        self.assertGreater(self.tamanho_journal(), 0)
+
+    def test_thread_de_fundo_grava_apos_intervalo(self):
+        self.db.fechar()
+        self.db = self.abrir(intervalo=0.01)
+        self.db.salvar_tarefa(nova_tarefa(1))
+        limite = time.monotonic() + 5
+        while not self.tamanho_journal() and time.monotonic() < limite:
+            time.sleep(0.005)
+        self.assertGreater(self.tamanho_journal(), 0)
+
+    def test_rajada_concorrente_sobrevive_ao_fechamento(self):
+        ids = iter(range(1, 401))
+        trava = threading.Lock()
+
+        def criar():
+            for _ in range(100):
+                with trava:
+                    id_tarefa = next(ids)
+                self.db.salvar_tarefa(nova_tarefa(id_tarefa))
+
+        threads = [threading.Thread(target=criar) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        db = self.reabrir()
+        self.assertEqual(sorted(db.tarefas), list(range(1, 401)))
+
+
+if __name__ == "__main__":
+    unittest.main()
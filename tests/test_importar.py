@@ -0,0 +1,107 @@
+"""Importação em lote pela linha de comando: grava no TAREFAS_CSV e sobrevive à recarga.
+
+Rodar da raiz do repositório: python -m unittest discover -s tests
+"""
+
+from contextlib import redirect_stdout
+import csv
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from DB import BancoDeDados  # noqa: E402
+from classes import Tipo  # noqa: E402
+import importar  # noqa: E402
+
+COLUNAS = ["titulo", "id_disciplina", "descricao", "data_entrega", "tipo"]
+
+
+class TesteImportar(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.caminho = os.path.join(self.diretorio.name, "tarefas.csv")
+        # main() troca o CSV_FILENAME da classe: restaurado ao final
+        self.csv_original = BancoDeDados.CSV_FILENAME
+        self.ambiente = mock.patch.dict(
+            os.environ, {"TAREFAS_CSV": self.caminho, "TAREFAS_BACKEND": "csv"}
+        )
+        self.ambiente.start()
+
+    def tearDown(self):
+        self.ambiente.stop()
+        BancoDeDados.CSV_FILENAME = self.csv_original
+        self.diretorio.cleanup()
+
+    def arquivo(self, nome: str, linhas: list) -> str:
+        caminho = os.path.join(self.diretorio.name, nome)
+        with open(caminho, mode="w", newline="", encoding="utf-8") as f:
+            if nome.endswith(".csv"):
+                escritor = csv.DictWriter(f, fieldnames=COLUNAS)
+                escritor.writeheader()
+                escritor.writerows(linhas)
+            else:
+                for linha in linhas:
+                    f.write(linha if isinstance(linha, str) else json.dumps(linha))
+                    f.write("\n")
+        return caminho
+
+    def importar(self, *argumentos) -> tuple:
+        saida = io.StringIO()
+        with redirect_stdout(saida):
+            codigo = importar.main(list(argumentos))
+        return codigo, saida.getvalue()
+
+    def recarregar(self) -> BancoDeDados:
+        db = BancoDeDados(caminho=self.caminho)
+        self.addCleanup(db.fechar)
+        return db
+
+    def test_importa_csv_e_recarrega(self):
+        linhas = [
+            {
+                "titulo": f"Lista {i}",
+                "id_disciplina": 1 + i % 3,
+                "descricao": "",
+                "data_entrega": f"{10 + i}/05/2030 12:00",
+                "tipo": "TRABALHO",
+            }
+            for i in range(10)
+        ]
+        codigo, saida = self.importar(self.arquivo("entrada.csv", linhas))
+        self.assertEqual(codigo, 0, saida)
+        self.assertIn("10 tarefas criadas", saida)
+
+        db = self.recarregar()
+        tarefas = sorted(db.listar_tarefas().values(), key=lambda t: t.id)
+        self.assertEqual([t.titulo for t in tarefas], [l["titulo"] for l in linhas])
+        self.assertTrue(all(t.tipo is Tipo.TRABALHO for t in tarefas))
+        self.assertEqual(tarefas[3].id_disciplina, 1)
+
+    def test_linhas_rejeitadas_no_relatorio(self):
+        valida = {
+            "titulo": "Prova final",
+            "id_disciplina": 2,
+            "data_entrega": "01/06/2030",
+            "tipo": "PROVA",
+        }
+        entrada = self.arquivo(
+            "entrada.jsonl", [valida, "{nao e json", dict(valida, tipo="SEMINARIO")]
+        )
+        relatorio = os.path.join(self.diretorio.name, "erros.json")
+        codigo, saida = self.importar(entrada, "--relatorio", relatorio)
+        self.assertEqual(codigo, 0, saida)
+        with open(relatorio, encoding="utf-8") as f:
+            self.assertEqual([erro["linha"] for erro in json.load(f)], [2, 3])
+        self.assertEqual(
+            [t.titulo for t in self.recarregar().listar_tarefas().values()], ["Prova final"]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+"""Índices secundários: consultas indexadas iguais a uma varredura completa.
+
+Rodar da raiz do repositório: python -m unittest discover -s tests
+"""
+
+from datetime import datetime, timedelta
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from DB import BancoDeDados  # noqa: E402
+from classes import Status, Tarefa, Tipo  # noqa: E402
+
+INICIO = datetime(2030, 1, 1)
+
+
+def tarefas_aleatorias(quantidade: int, semente: int = 0) -> list:
+    sorteio = random.Random(semente)
+    tarefas = []
+    for id_tarefa in range(1, quantidade + 1):
+        tarefa = Tarefa(
+            id_tarefa,
+            f"tarefa {id_tarefa}",
+            "",
+            INICIO + timedelta(hours=sorteio.randrange(200)),  # prazos repetidos
+            sorteio.choice(list(Tipo)),
+            sorteio.choice([None, 1, 2, 3]),
+        )
+        tarefa.status = sorteio.choice(list(Status))
+        tarefas.append(tarefa)
+    return tarefas
+
+
+class TesteIndices(unittest.TestCase):
+    COLUNAR = False
+
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.db = BancoDeDados(
+            caminho=os.path.join(self.diretorio.name, "t.csv"), colunar=self.COLUNAR
+        )
+        self.db.salvar_tarefas(tarefas_aleatorias(300))
+
+    def tearDown(self):
+        self.db.fechar()
+        self.diretorio.cleanup()
+
+    def varredura(self, status=None, tipo=None, id_disciplina=None, inicio=None, fim=None):
+        """IDs por (data_entrega, id) filtrando todas as tarefas, sem índices."""
+        status = {status} if isinstance(status, Status) else status
+        tipo = {tipo} if isinstance(tipo, Tipo) else tipo
+        selecionadas = [
+            t
+            for t in self.db.tarefas.values()
+            if (status is None or t.status in status)
+            and (tipo is None or t.tipo in tipo)
+            and (id_disciplina is None or t.id_disciplina == id_disciplina)
+            and (inicio is None or t.data_entrega >= inicio)
+            and (fim is None or t.data_entrega <= fim)
+        ]
+        return [t.id for t in sorted(selecionadas, key=lambda t: (t.data_entrega, t.id))]
+
+    def consultas(self) -> list:
+        meio = INICIO + timedelta(hours=100)
+        return [
+            {},
+            {"status": Status.PENDENTE},
+            {"status": [Status.PENDENTE, Status.CONCLUIDO], "tipo": Tipo.PROVA},
+            {"id_disciplina": 2, "tipo": [Tipo.TRABALHO, Tipo.ATIVIDADE]},
+            {"inicio": meio},
+            {"fim": meio, "status": Status.EM_ANDAMENTO},
+            {"inicio": meio, "fim": meio + timedelta(hours=10), "id_disciplina": 1},
+            {"inicio": meio, "fim": meio - timedelta(hours=1)},  # intervalo vazio
+            {"id_disciplina": 99},
+        ]
+
+    def conferir(self) -> None:
+        for filtros in self.consultas():
+            with self.subTest(**{k: str(v) for k, v in filtros.items()}):
+                esperado = self.varredura(**filtros)
+                obtido = [t.id for t in self.db.consultar_tarefas(**filtros)]
+                self.assertEqual(obtido, esperado)
+
+    def test_consulta_indexada_igual_a_varredura(self):
+        self.conferir()
+
+    def test_indices_acompanham_alteracao_in_place(self):
+        sorteio = random.Random(1)
+        for id_tarefa in sorteio.sample(range(1, 301), 60):
+            tarefa = self.db.buscar_tarefa(id_tarefa)
+            # Alterada in-place antes de atualizar: o índice guarda as chaves antigas
+            tarefa.status = sorteio.choice(list(Status))
+            tarefa.data_entrega += timedelta(hours=sorteio.randrange(-50, 50))
+            self.db.atualizar_tarefa(tarefa)
+        self.conferir()
+
+    def test_prazos_em_aberto_excluem_concluidas(self):
+        tarefa = self.db.buscar_tarefa(1)
+        tarefa.status = Status.CONCLUIDO
+        self.db.atualizar_tarefa(tarefa)
+        tarefas, total = self.db.consultar_prazos(tipo=Tipo.PROVA)
+        esperado = [
+            i
+            for i in self.varredura(tipo=Tipo.PROVA)
+            if self.db.buscar_tarefa(i).status is not Status.CONCLUIDO
+        ]
+        self.assertEqual([t.id for t in tarefas], esperado)
+        self.assertEqual(total, len(esperado))
+        self.assertNotIn(1, [t.id for t in tarefas])
+
+
+class TesteIndicesColunar(TesteIndices):
+    COLUNAR = True
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+"""Regressão: journal cortado por uma queda no meio de um append.
+
+Rodar da raiz do repositório: python -m unittest discover -s tests
+"""
+
+from datetime import datetime
+import csv
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from DB import CAMPOS_CSV, BancoDeDados  # noqa: E402
+from classes import Tarefa, Tipo  # noqa: E402
+
+
+def nova_tarefa(id_tarefa: int) -> Tarefa:
+    return Tarefa(
+        id_tarefa,
+        f"tarefa {id_tarefa}",
+        'descrição "com aspas", vírgula\ne quebra de linha',
+        datetime(2030, 1, id_tarefa),
+        Tipo.PROVA,
+        1,
+    )
+
+
+class TesteJournal(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.caminho = os.path.join(self.diretorio.name, "t.csv")
+
+    def tearDown(self):
+        self.diretorio.cleanup()
+
+    def abrir(self) -> BancoDeDados:
+        return BancoDeDados(caminho=self.caminho)
+
+    def gravar(self, *ids: int) -> BancoDeDados:
+        db = self.abrir()
+        for id_tarefa in ids:
+            db.salvar_tarefa(nova_tarefa(id_tarefa))
+        db.fechar()
+        return db
+
+    def journal(self) -> bytes:
+        with open(self.caminho + ".journal", mode="rb") as f:
+            return f.read()
+
+    def reescrever_journal(self, dados: bytes) -> None:
+        with open(self.caminho + ".journal", mode="wb") as f:
+            f.write(dados)
+
+    def test_corte_no_meio_do_registro_nao_contamina_novas_gravacoes(self):
+        self.gravar(1, 2, 3)
+        dados = self.journal()
+        cortes = [
+            dados.rfind(b'"com') + 6,  # dentro do campo entre aspas
+            len(dados) - 2,  # antes do \r\n final
+            len(dados) - 1,  # entre \r e \n
+        ]
+        for corte in cortes:
+            with self.subTest(corte=corte):
+                self.reescrever_journal(dados[:corte])
+                db = self.abrir()
+                self.assertEqual(sorted(db.tarefas), [1, 2])
+                self.assertEqual(db.relatorio_carga.erros, 0)
+                for id_tarefa in (3, 4, 5):
+                    db.salvar_tarefa(nova_tarefa(id_tarefa))
+                db.fechar()
+
+                db = self.abrir()
+                self.assertEqual(sorted(db.tarefas), [1, 2, 3, 4, 5])
+                self.assertEqual(db.relatorio_carga.rejeitadas, 0)
+                self.assertEqual(db.relatorio_carga.erros, 0)
+                self.assertEqual(db.proximo_id(), 6)
+                self.assertEqual(db.buscar_tarefa(3).descricao, nova_tarefa(3).descricao)
+                db.fechar()
+
+    def test_registro_corrompido_no_meio_vira_erro(self):
+        self.gravar(1, 2, 3)
+        dados = self.journal()
+        inicio = dados.find(b"\n2,") + 1
+        self.reescrever_journal(dados[:inicio] + b"2,lixo\r\n" + dados[inicio:])
+        db = self.abrir()
+        self.assertEqual(sorted(db.tarefas), [1, 2, 3])
+        self.assertEqual(db.relatorio_carga.erros, 1)
+        self.assertTrue(os.path.exists(self.caminho + ".journal.corrompido"))
+        # O journal corrompido foi dobrado no snapshot: o erro não se repete
+        self.assertFalse(os.path.exists(self.caminho + ".journal"))
+        db = self.abrir()
+        self.assertEqual(sorted(db.tarefas), [1, 2, 3])
+        self.assertEqual(db.relatorio_carga.erros, 0)
+
+    def test_crc_detecta_byte_alterado_no_meio(self):
+        self.gravar(1, 2, 3)
+        # Mesmo número de campos: só o CRC32 do registro denuncia a alteração
+        self.reescrever_journal(self.journal().replace(b"tarefa 2", b"tarefa X"))
+        db = self.abrir()
+        self.assertEqual(sorted(db.tarefas), [1, 3])
+        self.assertEqual(db.relatorio_carga.erros, 1)
+        self.assertIn("CRC32", db.relatorio_carga.detalhes_erros[0][2])
+
+    def test_journal_sem_crc_continua_legivel(self):
+        db = self.gravar(1, 2)
+        linhas = [db.linha_de_tarefa(db.buscar_tarefa(i)) for i in (1, 2)]
+        with open(self.caminho + ".journal", mode="w", newline="", encoding="utf-8") as f:
+            csv.DictWriter(f, fieldnames=CAMPOS_CSV).writerows(linhas)
+        db = self.gravar(3)
+        db = self.abrir()
+        self.assertEqual(sorted(db.tarefas), [1, 2, 3])
+        self.assertEqual(db.relatorio_carga.rejeitadas + db.relatorio_carga.erros, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+"""Listagem paginada: páginas via índices iguais a uma ordenação da varredura completa.
+
+Rodar da raiz do repositório: python -m unittest discover -s tests
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from DB import BancoDeDados  # noqa: E402
+from classes import Status, Tipo  # noqa: E402
+from tarefaController import TarefaController  # noqa: E402
+from tarefaModel import TarefaModel  # noqa: E402
+from test_indices import INICIO, tarefas_aleatorias  # noqa: E402
+
+
+class TesteListagem(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.db = BancoDeDados(caminho=os.path.join(self.diretorio.name, "t.csv"))
+        self.db.salvar_tarefas(tarefas_aleatorias(120))
+        self.controller = TarefaController(TarefaModel(self.db))
+
+    def tearDown(self):
+        self.db.fechar()
+        self.diretorio.cleanup()
+
+    def varredura(self, ordenar_por, decrescente, status=None, tipo=None):
+        """IDs ordenados a partir de todas as tarefas, sem índices."""
+        chave = (lambda t: t.id) if ordenar_por == "id" else (lambda t: (t.data_entrega, t.id))
+        selecionadas = [
+            t
+            for t in self.db.tarefas.values()
+            if (status is None or t.status.name in status.split(","))
+            and (tipo is None or t.tipo.name == tipo)
+        ]
+        return [t.id for t in sorted(selecionadas, key=chave, reverse=decrescente)]
+
+    def percorrer(self, limite, **parametros) -> list:
+        """Segue proximo_offset página a página e junta os IDs."""
+        ids, offset = [], 0
+        while offset is not None:
+            resposta = self.controller.get_listar_tarefas(
+                limite=limite, offset=offset, **parametros
+            )
+            self.assertEqual(resposta["status"], 200)
+            body = resposta["body"]
+            self.assertLessEqual(len(body["tarefas"]), body["limite"])
+            ids.extend(t.id for t in body["tarefas"])
+            offset = body["proximo_offset"]
+        self.assertEqual(body["total"], len(ids))
+        return ids
+
+    def test_paginas_iguais_a_varredura_ordenada(self):
+        for ordenar_por in ("id", "data_entrega"):
+            for decrescente in (False, True):
+                for filtros in ({}, {"status": "PENDENTE,CONCLUIDO"}, {"tipo": "PROVA"}):
+                    with self.subTest(ordenar_por=ordenar_por, decrescente=decrescente, **filtros):
+                        esperado = self.varredura(ordenar_por, decrescente, **filtros)
+                        obtido = self.percorrer(
+                            7, ordenar_por=ordenar_por, decrescente=decrescente, **filtros
+                        )
+                        self.assertEqual(obtido, esperado)
+
+    def test_filtro_por_intervalo(self):
+        fim = INICIO.replace(day=3)
+        resposta = self.controller.get_listar_tarefas(
+            ordenar_por="data_entrega", data_fim=fim.strftime("%d/%m/%Y %H:%M"), limite=500
+        )
+        esperado = [
+            t.id
+            for t in sorted(self.db.tarefas.values(), key=lambda t: (t.data_entrega, t.id))
+            if t.data_entrega <= fim
+        ]
+        self.assertEqual([t.id for t in resposta["body"]["tarefas"]], esperado)
+        self.assertIsNone(resposta["body"]["proximo_offset"])
+
+    def test_pagina_reflete_escrita(self):
+        antes = self.controller.get_listar_tarefas(limite=5, status="CONCLUIDO")
+        tarefa = next(t for t in self.db.tarefas.values() if t.status is not Status.CONCLUIDO)
+        tarefa.status = Status.CONCLUIDO
+        self.db.atualizar_tarefa(tarefa)
+        depois = self.controller.get_listar_tarefas(limite=5, status="CONCLUIDO")
+        self.assertEqual(depois["body"]["total"], antes["body"]["total"] + 1)
+
+    def test_sem_limite_usa_pagina_padrao_com_cursor(self):
+        self.controller.LIMITE_PADRAO = 50
+        primeira = self.controller.get_listar_tarefas()
+        body = primeira["body"]
+        self.assertEqual((len(body["tarefas"]), body["limite"]), (50, 50))
+        self.assertEqual((body["total"], body["proximo_offset"]), (120, 50))
+        # Página padrão também vem do cache
+        self.assertIs(self.controller.get_listar_tarefas(), primeira)
+        self.assertEqual(self.percorrer(None), sorted(self.db.tarefas))
+
+    def test_limite_acima_do_maximo_e_reduzido(self):
+        self.controller.LIMITE_MAXIMO = 30
+        body = self.controller.get_listar_tarefas(limite=10_000)["body"]
+        self.assertEqual((len(body["tarefas"]), body["limite"]), (30, 30))
+        self.assertEqual(body["proximo_offset"], 30)
+        self.controller.LIMITE_PADRAO = 100  # o padrão também respeita o máximo
+        self.assertEqual(len(self.controller.get_listar_tarefas()["body"]["tarefas"]), 30)
+
+    def test_parametros_invalidos(self):
+        casos = [
+            {"limite": 0},
+            {"limite": "dez"},
+            {"offset": -1},
+            {"ordenar_por": "titulo"},
+            {"decrescente": "talvez"},
+            {"status": "ARQUIVADO"},
+            {"tipo": [Tipo.PROVA, "SEMINARIO"]},
+            {"data_inicio": "ontem"},
+        ]
+        for parametros in casos:
+            with self.subTest(**{k: str(v) for k, v in parametros.items()}):
+                resposta = self.controller.get_listar_tarefas(**parametros)
+                self.assertEqual(resposta["status"], 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+"""Métricas: contadores, histogramas cumulativos, exposição Prometheus e cronometrar.
+
+Rodar da raiz do repositório: python -m unittest discover -s tests
+"""
+
+from contextlib import redirect_stdout
+import io
+import os
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import metricas  # noqa: E402
+from DB import BancoDeDados  # noqa: E402
+from tarefaController import TarefaController  # noqa: E402
+from tarefaModel import TarefaModel  # noqa: E402
+from test_journal import nova_tarefa  # noqa: E402
+
+
+def series(texto: str) -> dict:
+    """Linhas de amostra da exposição (sem # HELP/# TYPE): série -> valor."""
+    amostras = {}
+    for linha in texto.splitlines():
+        if linha and not linha.startswith("#"):
+            serie, valor = linha.rsplit(" ", 1)
+            amostras[serie] = valor
+    return amostras
+
+
+class TesteRegistro(unittest.TestCase):
+    def test_desligado_nao_registra(self):
+        registro = metricas.Registro()
+        registro.incrementar("tarefas_cache_total", resultado="acerto")
+        registro.observar("tarefas_bytes_gravados", 10, destino="journal")
+        texto = registro.exportar()
+        self.assertEqual(series(texto), {})
+        # Cabeçalhos de todas as métricas, mesmo sem amostras
+        for nome, (tipo, _, _) in metricas.DEFINICOES.items():
+            self.assertIn(f"# TYPE {nome} {tipo}\n", texto)
+
+    def test_contadores_e_rotulos(self):
+        registro = metricas.Registro(ativo=True)
+        registro.incrementar("tarefas_operacao_total", camada="db", operacao="x")
+        registro.incrementar("tarefas_operacao_total", 2, operacao="x", camada="db")
+        registro.incrementar("tarefas_cache_total", 0.5)
+        registro.incrementar("tarefas_excecoes_total", operacao='a"b\\c\nd')
+        self.assertEqual(
+            series(registro.exportar()),
+            {
+                'tarefas_operacao_total{camada="db",operacao="x"}': "3",  # ordem dos rótulos
+                "tarefas_cache_total": "0.5",
+                'tarefas_excecoes_total{operacao="a\\"b\\\\c\\nd"}': "1",
+            },
+        )
+        registro.limpar()
+        self.assertEqual(series(registro.exportar()), {})
+
+    def test_histograma_cumulativo(self):
+        registro = metricas.Registro(ativo=True)
+        # O limite do bucket é inclusivo (le = "menor ou igual")
+        for valor in (1024, 1025, 4096, 10**10):
+            registro.observar("tarefas_bytes_gravados", valor, destino="snapshot")
+        amostras = series(registro.exportar())
+        prefixo = 'tarefas_bytes_gravados_bucket{destino="snapshot",le='
+        esperados = {"1024": "1", "4096": "3", "16384": "3", "+Inf": "4"}
+        for limite, acumulado in esperados.items():
+            with self.subTest(le=limite):
+                self.assertEqual(amostras[f'{prefixo}"{limite}"}}'], acumulado)
+        self.assertEqual(amostras['tarefas_bytes_gravados_count{destino="snapshot"}'], "4")
+        soma = amostras['tarefas_bytes_gravados_sum{destino="snapshot"}']
+        self.assertEqual(float(soma), 10**10 + 6145)
+
+    def test_concorrente(self):
+        registro = metricas.Registro(ativo=True)
+
+        def incrementar():
+            for _ in range(2000):
+                registro.incrementar("tarefas_cache_total", resultado="acerto")
+                registro.observar("tarefas_operacao_segundos", 0.001, camada="t", operacao="t")
+
+        threads = [threading.Thread(target=incrementar) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        amostras = series(registro.exportar())
+        self.assertEqual(amostras['tarefas_cache_total{resultado="acerto"}'], "16000")
+        contagem = 'tarefas_operacao_segundos_count{camada="t",operacao="t"}'
+        self.assertEqual(amostras[contagem], "16000")
+
+
+class TesteCronometrar(unittest.TestCase):
+    def setUp(self):
+        self.ativo = metricas.REGISTRO.ativo
+        metricas.REGISTRO.limpar()
+        metricas.ativar()
+
+    def tearDown(self):
+        metricas.REGISTRO.ativo = self.ativo
+        metricas.REGISTRO.limpar()
+
+    def total(self, camada: str, operacao: str, resultado: str) -> str | None:
+        serie = (
+            f'tarefas_operacao_total{{camada="{camada}",operacao="{operacao}",'
+            f'resultado="{resultado}"}}'
+        )
+        return series(metricas.exportar()).get(serie)
+
+    def test_resultado_por_retorno(self):
+        @metricas.cronometrar("teste", "op")
+        def operacao(retorno):
+            if isinstance(retorno, Exception):
+                raise retorno
+            return retorno
+
+        for retorno in ({"status": 201}, {"status_code": 404}, {"outro": 1}, None, 7):
+            operacao(retorno)
+        with self.assertRaises(KeyError):
+            operacao(KeyError("x"))
+        for resultado, vezes in (("201", "1"), ("404", "1"), ("ok", "3"), ("excecao", "1")):
+            with self.subTest(resultado=resultado):
+                self.assertEqual(self.total("teste", "op", resultado), vezes)
+        duracao = 'tarefas_operacao_segundos_count{camada="teste",operacao="op"}'
+        self.assertEqual(series(metricas.exportar())[duracao], "6")
+
+        metricas.desativar()
+        self.assertEqual(operacao({"status": 201}), {"status": 201})
+        self.assertEqual(self.total("teste", "op", "201"), "1")  # desligado: não conta
+
+    def test_camadas_instrumentadas(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            db = BancoDeDados(caminho=os.path.join(diretorio, "t.csv"))
+            db.salvar_tarefa(nova_tarefa(1))
+            model = TarefaModel(db)
+            controller = TarefaController(model)
+            with redirect_stdout(io.StringIO()):
+                controller.put_concluir_tarefa(1)
+                controller.put_concluir_tarefa(99)
+                controller.get_listar_tarefas()
+                controller.get_listar_tarefas()  # acerto no cache
+                db.compactar()
+                model.encerrar()
+        self.assertEqual(self.total("controller", "put_concluir_tarefa", "200"), "1")
+        self.assertEqual(self.total("controller", "put_concluir_tarefa", "404"), "1")
+        self.assertEqual(self.total("db", "_salvar_csv", "ok"), "1")
+        amostras = series(metricas.exportar())
+        self.assertEqual(amostras['tarefas_cache_total{resultado="acerto"}'], "1")
+        self.assertIn('tarefas_bytes_gravados_count{destino="snapshot"}', amostras)
+        self.assertIn('tarefas_bytes_gravados_count{destino="journal"}', amostras)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+"""Banco particionado: roteamento por disciplina e consultas iguais às de um banco único.
+
+Rodar da raiz do repositório: python -m unittest discover -s tests
+"""
+
+from datetime import timedelta
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from DB import BancoDeDados  # noqa: E402
+from bancoParticionado import BancoDeDadosParticionado  # noqa: E402
+from classes import Status, Tipo  # noqa: E402
+from test_indices import INICIO, tarefas_aleatorias  # noqa: E402
+
+PALAVRAS = "prova lista trabalho relatório revisão matemática física álgebra projeto".split()
+
+
+def tarefas_com_texto(quantidade: int) -> list:
+    """Tarefas aleatórias (sempre as mesmas) com títulos e descrições para a busca."""
+    sorteio = random.Random(5)
+    tarefas = tarefas_aleatorias(quantidade)
+    for tarefa in tarefas:
+        tarefa.titulo = " ".join(sorteio.sample(PALAVRAS, sorteio.randint(1, 3)))
+        tarefa.descricao = " ".join(sorteio.sample(PALAVRAS, sorteio.randint(0, 3)))
+        tarefa.nota = sorteio.choice([None, round(sorteio.uniform(0, 10), 1)])
+    return tarefas
+
+
+class TesteBancoParticionado(unittest.TestCase):
+    PROCESSOS_CARGA = 1
+
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.caminho_particoes = os.path.join(self.diretorio.name, "particoes")
+        self.particionado = BancoDeDadosParticionado(self.caminho_particoes)
+        self.particionado.salvar_tarefas(tarefas_com_texto(300))
+        # Banco único com cópias independentes das mesmas tarefas
+        self.unico = BancoDeDados(caminho=os.path.join(self.diretorio.name, "unico.csv"))
+        self.unico.salvar_tarefas(tarefas_com_texto(300))
+
+    def tearDown(self):
+        self.particionado.fechar()
+        self.unico.fechar()
+        self.diretorio.cleanup()
+
+    def reabrir(self) -> None:
+        self.particionado.fechar()
+        anterior = BancoDeDadosParticionado.PROCESSOS_CARGA
+        BancoDeDadosParticionado.PROCESSOS_CARGA = self.PROCESSOS_CARGA
+        try:
+            self.particionado = BancoDeDadosParticionado(self.caminho_particoes)
+        finally:
+            BancoDeDadosParticionado.PROCESSOS_CARGA = anterior
+
+    def conferir(self) -> None:
+        meio = INICIO + timedelta(hours=100)
+        filtros = [
+            {},
+            {"status": Status.PENDENTE},
+            {"tipo": [Tipo.PROVA, Tipo.TRABALHO], "inicio": meio},
+            {"id_disciplina": 2},
+            {"id_disciplina": 2, "status": [Status.CONCLUIDO]},
+            {"id_disciplina": 99},
+        ]
+        for filtro in filtros:
+            for ordenar_por in ("id", "data_entrega"):
+                for decrescente in (False, True):
+                    for offset, limite in ((0, 10), (25, 7), (290, 20), (0, None)):
+                        with self.subTest(
+                            filtro=str(filtro),
+                            ordenar_por=ordenar_por,
+                            decrescente=decrescente,
+                            offset=offset,
+                            limite=limite,
+                        ):
+                            parametros = dict(
+                                offset=offset,
+                                limite=limite,
+                                ordenar_por=ordenar_por,
+                                decrescente=decrescente,
+                                **filtro,
+                            )
+                            obtido, total = self.particionado.paginar_tarefas(**parametros)
+                            esperado, total_esperado = self.unico.paginar_tarefas(**parametros)
+                            self.assertEqual([t.id for t in obtido], [t.id for t in esperado])
+                            self.assertEqual(total, total_esperado)
+
+        for filtro in filtros[:5]:
+            with self.subTest(consultar=str(filtro)):
+                self.assertEqual(
+                    [t.id for t in self.particionado.consultar_tarefas(**filtro)],
+                    [t.id for t in self.unico.consultar_tarefas(**filtro)],
+                )
+        obtido, total = self.particionado.consultar_prazos(fim=meio, limite=15)
+        esperado, total_esperado = self.unico.consultar_prazos(fim=meio, limite=15)
+        self.assertEqual([t.id for t in obtido], [t.id for t in esperado])
+        self.assertEqual(total, total_esperado)
+
+        for id_disciplina in (None, 1, 3):
+            with self.subTest(estatisticas=id_disciplina):
+                obtido = self.particionado.consultar_estatisticas(id_disciplina)
+                esperado = self.unico.consultar_estatisticas(id_disciplina)
+                for campo in ("total", "por_status", "por_tipo", "taxa_conclusao"):
+                    self.assertEqual(obtido[campo], esperado[campo])
+                self.assertEqual(obtido["notas"].keys(), esperado["notas"].keys())
+
+    def conferir_busca(self) -> None:
+        for consulta in ("prova", "matematica revisao", "pro*", "re* algebra", "xyz"):
+            for limite in (1, 5, 50):
+                with self.subTest(consulta=consulta, limite=limite):
+                    # idf do conjunto: pontuações (e ordem) iguais às do banco único
+                    obtido = self.particionado.pesquisar_texto(consulta, limite)
+                    esperado = self.unico.pesquisar_texto(consulta, limite)
+                    self.assertEqual(
+                        [(t.id, round(p, 9)) for t, p in obtido],
+                        [(t.id, round(p, 9)) for t, p in esperado],
+                    )
+
+    def test_roteamento_por_disciplina(self):
+        # Uma partição (snapshot e/ou journal) por disciplina
+        particoes = {
+            nome.split(".")[0]
+            for nome in os.listdir(self.caminho_particoes)
+            if not nome.startswith("roteador")
+        }
+        self.assertEqual(
+            particoes, {"disciplina_1", "disciplina_2", "disciplina_3", "sem_disciplina"}
+        )
+        for chave, particao in self.particionado.particoes.items():
+            for id_tarefa in particao.listar_tarefas():
+                self.assertEqual(self.unico.buscar_tarefa(id_tarefa).id_disciplina, chave)
+
+        tarefa = self.particionado.buscar_tarefa(10)
+        tarefa.status = Status.CONCLUIDO
+        self.assertTrue(self.particionado.atualizar_tarefa(tarefa))
+        dona = self.particionado.particoes[tarefa.id_disciplina]
+        self.assertIs(dona.buscar_tarefa(10).status, Status.CONCLUIDO)
+        self.assertIsNone(self.particionado.buscar_tarefa(9999))
+
+    def test_consultas_iguais_ao_banco_unico(self):
+        self.conferir()
+        self.conferir_busca()
+
+    def test_consultas_apos_escritas_e_reabertura(self):
+        for banco in (self.particionado, self.unico):
+            sorteio, alteradas = random.Random(6), []  # mesmas alterações nos dois bancos
+            for id_tarefa in random.Random(7).sample(range(1, 301), 80):
+                tarefa = banco.buscar_tarefa(id_tarefa)
+                tarefa.status = sorteio.choice(list(Status))
+                tarefa.data_entrega += timedelta(hours=sorteio.randrange(-30, 30))
+                alteradas.append(tarefa)
+            banco.atualizar_tarefas(alteradas)
+        self.reabrir()
+        self.conferir()
+        self.conferir_busca()
+        # IDs globais continuam únicos entre as partições
+        self.assertGreater(self.particionado.proximo_id(), 300)
+
+
+class TesteBancoParticionadoCargaParalela(TesteBancoParticionado):
+    PROCESSOS_CARGA = 2  # pool de processos mesmo com um núcleo
+
+
+if __name__ == "__main__":
+    unittest.main()
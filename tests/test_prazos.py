@@ -0,0 +1,132 @@
+"""Prazos em aberto: intervalo, atrasadas e painel "vence em breve" iguais a uma varredura.
+
+Rodar da raiz do repositório: python -m unittest discover -s tests
+"""
+
+from contextlib import redirect_stdout
+from datetime import timedelta
+import io
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from DB import BancoDeDados  # noqa: E402
+from classes import Status, Tipo  # noqa: E402
+from tarefaController import TarefaController  # noqa: E402
+from tarefaModel import TarefaModel  # noqa: E402
+from test_indices import INICIO, tarefas_aleatorias  # noqa: E402
+
+
+class TestePrazos(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.db = BancoDeDados(caminho=os.path.join(self.diretorio.name, "t.csv"))
+        self.db.salvar_tarefas(tarefas_aleatorias(300))
+        self.model = TarefaModel(self.db)
+        self.controller = TarefaController(self.model)
+
+    def tearDown(self):
+        with redirect_stdout(io.StringIO()):
+            self.model.encerrar()
+        self.diretorio.cleanup()
+
+    def varredura(self, inicio=None, fim=None, tipo=None) -> list:
+        """IDs abertos com prazo em [inicio, fim], por (prazo, id), sem índices."""
+        return [
+            t.id
+            for t in sorted(self.db.tarefas.values(), key=lambda t: (t.data_entrega, t.id))
+            if t.status is not Status.CONCLUIDO
+            and (tipo is None or t.tipo is tipo)
+            and (inicio is None or t.data_entrega >= inicio)
+            and (fim is None or t.data_entrega <= fim)
+        ]
+
+    def conferir(self, sorteio: random.Random) -> None:
+        for _ in range(40):
+            # Prazos em horas cheias: os extremos caem em cima de tarefas
+            inicio = INICIO + timedelta(hours=sorteio.randrange(-10, 210))
+            fim = inicio + timedelta(hours=sorteio.randrange(0, 80))
+            inicio = sorteio.choice((inicio, None))
+            for tipo in (None, *Tipo):
+                for limite in (None, 1, 7):
+                    with self.subTest(inicio=inicio, fim=fim, tipo=tipo, limite=limite):
+                        esperado = self.varredura(inicio, fim, tipo)
+                        resultado = self.model.prazos_entre(inicio, fim, tipo, limite)
+                        ids = [t.id for t in resultado["tarefas"]]
+                        self.assertEqual(ids, esperado[:limite])
+                        self.assertEqual(resultado["total"], len(esperado))
+
+    def test_intervalo_igual_a_varredura(self):
+        sorteio = random.Random(17)
+        self.conferir(sorteio)
+        with redirect_stdout(io.StringIO()):
+            for id_tarefa in sorteio.sample(range(1, 301), 60):
+                self.model.concluir_tarefa(id_tarefa)
+        # Reabertas e prazos remarcados (cópias: o armazenado não muda por fora)
+        for id_tarefa in sorteio.sample(range(1, 301), 60):
+            tarefa = self.db.buscar_tarefa(id_tarefa).copiar()
+            tarefa.status = Status.PENDENTE
+            tarefa.data_entrega += timedelta(hours=sorteio.randrange(-30, 30))
+            self.db.atualizar_tarefa(tarefa)
+        self.conferir(sorteio)
+
+    def test_atrasadas_e_proximos(self):
+        # Agora coincide com o prazo de uma prova em aberto
+        agora = self.db.buscar_tarefa(self.varredura(tipo=Tipo.PROVA)[20]).data_entrega
+        atrasadas = self.model.tarefas_atrasadas(tipo=Tipo.PROVA, agora=agora)
+        # O prazo que vence exatamente agora já conta como atrasado
+        self.assertEqual(
+            [t.id for t in atrasadas["tarefas"]], self.varredura(fim=agora, tipo=Tipo.PROVA)
+        )
+        self.assertTrue(any(t.data_entrega == agora for t in atrasadas["tarefas"]))
+
+        por_tipo = self.model.proximos_prazos(3, agora=agora)["por_tipo"]
+        self.assertEqual(list(por_tipo), list(Tipo))
+        for tipo, tarefas in por_tipo.items():
+            with self.subTest(tipo=tipo):
+                self.assertEqual([t.id for t in tarefas], self.varredura(agora, tipo=tipo)[:3])
+
+    def test_intervalo_invertido(self):
+        resultado = self.model.prazos_entre(INICIO + timedelta(days=1), INICIO)
+        self.assertEqual(resultado["status_code"], 400)
+
+    def test_controller(self):
+        casos = [
+            ({"tipo": "seminario"}, 400),
+            ({"limite": "x"}, 400),
+            ({"limite": 0}, 400),
+            ({"data_inicio": "31/02/2030"}, 400),
+            ({"data_inicio": "02/01/2030", "data_fim": "01/01/2030"}, 400),
+            ({"data_inicio": "2030-01-02", "data_fim": "05/01/2030 12:00", "tipo": "prova"}, 200),
+        ]
+        for parametros, status in casos:
+            with self.subTest(parametros=parametros):
+                self.assertEqual(self.controller.get_prazos(**parametros)["status"], status)
+
+        body = self.controller.get_prazos(
+            data_inicio="02/01/2030", data_fim="05/01/2030 12:00", tipo="PROVA", limite="4"
+        )["body"]
+        esperado = self.varredura(
+            INICIO + timedelta(days=1), INICIO + timedelta(hours=108), Tipo.PROVA
+        )
+        self.assertEqual([t.id for t in body["tarefas"]], esperado[:4])
+        self.assertEqual(body["total"], len(esperado))
+        self.assertEqual(body["limite"], 4)
+        limite = self.controller.get_prazos(limite=10**6)["body"]["limite"]
+        self.assertEqual(limite, self.controller.LIMITE_MAXIMO)
+
+        # Prazos em 2030: nada atrasado hoje, tudo ainda por vencer
+        self.assertEqual(self.controller.get_tarefas_atrasadas()["body"]["total"], 0)
+        painel = self.controller.get_proximos_prazos(quantidade=2)["body"]
+        self.assertEqual(sorted(painel), sorted(t.value for t in Tipo))
+        for tipo in Tipo:
+            with self.subTest(painel=tipo):
+                self.assertEqual([t.id for t in painel[tipo.value]], self.varredura(tipo=tipo)[:2])
+
+
+if __name__ == "__main__":
+    unittest.main()
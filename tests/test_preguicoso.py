@@ -0,0 +1,112 @@
+"""Modo preguiçoso: offsets do snapshot, LRU limitado e journal por cima do arquivo.
+
+Rodar da raiz do repositório: python -m unittest discover -s tests
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from DB import BancoDeDados  # noqa: E402
+from carregador import RelatorioCarga, TarefasPreguicosas, indexar_offsets  # noqa: E402
+from classes import Status  # noqa: E402
+from test_journal import nova_tarefa  # noqa: E402
+
+
+class TestePreguicoso(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.caminho = os.path.join(self.diretorio.name, "t.csv")
+        # Snapshot com 20 tarefas; descrições com aspas e quebra de linha
+        db = BancoDeDados(caminho=self.caminho)
+        db.salvar_tarefas([nova_tarefa(id_tarefa) for id_tarefa in range(1, 21)])
+        db.compactar()
+        db.fechar()
+
+    def tearDown(self):
+        self.diretorio.cleanup()
+
+    def abrir(self) -> BancoDeDados:
+        db = BancoDeDados(caminho=self.caminho, preguicoso=True)
+        self.addCleanup(db.fechar)
+        self.assertIsInstance(db.tarefas, TarefasPreguicosas)
+        return db
+
+    def test_offsets_apontam_para_o_inicio_de_cada_registro(self):
+        with open(self.caminho, mode="ab") as f:
+            f.write(b"sem-id,registro\r\n")
+        relatorio = RelatorioCarga()
+        cabecalho, offsets = indexar_offsets(self.caminho, relatorio)
+        self.assertEqual(cabecalho[0], "id")
+        self.assertEqual(list(offsets), list(range(1, 21)))
+        self.assertEqual(relatorio.rejeitadas, 1)
+        with open(self.caminho, mode="rb") as f:
+            for id_tarefa, offset in offsets.items():
+                f.seek(offset)
+                self.assertTrue(f.readline().startswith(f"{id_tarefa},".encode()))
+
+    def test_lru_descarta_o_menos_usado(self):
+        db = self.abrir()
+        db.tarefas.TAMANHO_CACHE = 5
+        primeira = db.buscar_tarefa(1)
+        for id_tarefa in range(2, 6):
+            db.buscar_tarefa(id_tarefa)
+        self.assertIs(db.buscar_tarefa(1), primeira)  # acerto: 1 volta ao fim do LRU
+        db.buscar_tarefa(6)  # descarta a 2, a menos usada
+        self.assertEqual(list(db.tarefas._cache), [3, 4, 5, 1, 6])
+        for id_tarefa in range(7, 21):
+            db.buscar_tarefa(id_tarefa)
+        self.assertEqual(len(db.tarefas._cache), 5)
+        # Descartada: lida de novo do arquivo, com o mesmo conteúdo
+        relida = db.buscar_tarefa(1)
+        self.assertIsNot(relida, primeira)
+        self.assertEqual(relida.para_dict(), primeira.para_dict())
+        self.assertEqual(relida.descricao, nova_tarefa(1).descricao)
+
+    def test_journal_sobre_os_offsets(self):
+        db = BancoDeDados(caminho=self.caminho)
+        alterada = db.buscar_tarefa(7)
+        alterada.status = Status.CONCLUIDO
+        db.atualizar_tarefa(alterada)
+        db.salvar_tarefa(nova_tarefa(25))
+        db.fechar()  # só o journal recebe as mutações
+        self.assertTrue(os.path.getsize(self.caminho + ".journal"))
+
+        db = self.abrir()
+        self.assertEqual(len(db.tarefas), 21)
+        self.assertIn(25, db.tarefas)
+        self.assertIs(db.buscar_tarefa(7).status, Status.CONCLUIDO)
+        self.assertIsNot(db.buscar_tarefa(8).status, Status.CONCLUIDO)
+        self.assertEqual(db.buscar_tarefa(25).titulo, "tarefa 25")
+        # A fixada não entra no LRU; a do snapshot entra
+        self.assertNotIn(7, db.tarefas._cache)
+        self.assertIn(8, db.tarefas._cache)
+
+    def test_ordem_de_iteracao(self):
+        db = self.abrir()
+        for id_tarefa in (23, 21):
+            db.salvar_tarefa(nova_tarefa(id_tarefa))
+        alterada = db.buscar_tarefa(4)
+        alterada.status = Status.CONCLUIDO
+        db.atualizar_tarefa(alterada)
+
+        # Chaves: snapshot em ordem de arquivo, depois as novas em ordem de gravação
+        self.assertEqual(list(db.tarefas), list(range(1, 21)) + [23, 21])
+        # values: ordem do snapshot (por ID) com as novas intercaladas, alteradas por cima
+        tarefas = list(db.tarefas.values())
+        self.assertEqual([t.id for t in tarefas], list(range(1, 22)) + [23])
+        self.assertIs(tarefas[3].status, Status.CONCLUIDO)
+        self.assertEqual(len(db.tarefas._cache), 0)  # a varredura não enche o LRU
+
+        # Compactação: o snapshot novo passa a ter tudo e nada fica fixado
+        db.compactar()
+        self.assertEqual(db.tarefas._alterados, {})
+        self.assertEqual([t.id for t in db.tarefas.values()], list(range(1, 22)) + [23])
+        self.assertIs(db.buscar_tarefa(4).status, Status.CONCLUIDO)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+"""Servidor HTTP: rotas, códigos de status e limites do corpo.
+
+Rodar da raiz do repositório: python -m unittest discover -s tests
+"""
+
+import http.client
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from DB import BancoDeDados  # noqa: E402
+from classes import Status  # noqa: E402
+from servidor import ManipuladorTarefas, ServidorTarefas  # noqa: E402
+from tarefaController import TarefaController  # noqa: E402
+from tarefaModel import TarefaModel  # noqa: E402
+
+
+class TesteServidor(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.db = BancoDeDados(caminho=os.path.join(self.diretorio.name, "t.csv"))
+        self.model = TarefaModel(self.db)
+        self.servidor = ServidorTarefas(("127.0.0.1", 0), TarefaController(self.model))
+        self.thread = threading.Thread(
+            target=self.servidor.serve_forever, args=(0.01,), daemon=True
+        )
+        self.thread.start()
+        self.conexao = http.client.HTTPConnection(*self.servidor.server_address, timeout=5)
+
+    def tearDown(self):
+        self.conexao.close()
+        self.servidor.shutdown()
+        self.servidor.server_close()
+        self.model.cancelamentos.parar()
+        self.db.fechar()
+        self.diretorio.cleanup()
+
+    def requisitar(self, metodo, caminho, corpo=None, cabecalhos=None):
+        """Retorna (status, JSON da resposta) na mesma conexão keep-alive."""
+        dados = corpo if isinstance(corpo, bytes) or corpo is None else json.dumps(corpo)
+        self.conexao.request(metodo, caminho, body=dados, headers=cabecalhos or {})
+        resposta = self.conexao.getresponse()
+        return resposta.status, json.loads(resposta.read())
+
+    def criar(self, titulo, data="10/05/2030 12:00", tipo="PROVA"):
+        status, body = self.requisitar(
+            "POST",
+            "/tarefas",
+            {"titulo": titulo, "id_disciplina": 1, "data_entrega": data, "tipo": tipo},
+        )
+        self.assertEqual(status, 201)
+        return body
+
+    def test_criar_listar_e_concluir(self):
+        primeira = self.criar("Prova de cálculo")
+        self.criar("Trabalho final", "01/04/2030", "TRABALHO")
+
+        status, body = self.requisitar("GET", "/tarefas?ordenar_por=data_entrega&limite=1")
+        self.assertEqual(status, 200)
+        self.assertEqual([t["titulo"] for t in body["tarefas"]], ["Trabalho final"])
+        self.assertEqual((body["total"], body["proximo_offset"]), (2, 1))
+
+        status, _ = self.requisitar("PUT", f"/tarefas/{primeira['id']}/concluir")
+        self.assertEqual(status, 200)
+        status, body = self.requisitar("GET", "/tarefas?status=CONCLUIDO")
+        self.assertEqual([t["id"] for t in body["tarefas"]], [primeira["id"]])
+        self.assertEqual(body["tarefas"][0]["status"], Status.CONCLUIDO.value)
+        # Sem ?limite=: página padrão, sempre com o cursor da próxima
+        status, body = self.requisitar("GET", "/tarefas")
+        self.assertEqual(
+            (body["limite"], body["proximo_offset"]), (TarefaController.LIMITE_PADRAO, None)
+        )
+
+    def test_lote_nota_lembrete_e_busca(self):
+        status, body = self.requisitar(
+            "POST",
+            "/tarefas/lote",
+            [
+                {
+                    "titulo": titulo,
+                    "id_disciplina": 2,
+                    "data_entrega": "01/06/2030",
+                    "tipo": "ATIVIDADE",
+                }
+                for titulo in ("Lista de álgebra", "x")  # título curto: linha 2 rejeitada
+            ],
+        )
+        self.assertEqual(status, 207)
+        self.assertEqual(body["criadas"], 1)
+        self.assertEqual([erro["linha"] for erro in body["erros"]], [2])
+
+        id_tarefa = self.requisitar("GET", "/tarefas")[1]["tarefas"][0]["id"]
+        status, _ = self.requisitar("PUT", f"/tarefas/{id_tarefa}/nota", {"nota": 8.5})
+        self.assertEqual(status, 200)
+        status, _ = self.requisitar(
+            "POST", f"/tarefas/{id_tarefa}/lembretes", {"data": "31/05/2030 08:00"}
+        )
+        self.assertEqual(status, 201)
+        status, body = self.requisitar("GET", "/busca?consulta=algebra")
+        self.assertEqual(status, 200)
+        self.assertIn(id_tarefa, [r["tarefa"]["id"] for r in body["resultados"]])
+        status, _ = self.requisitar("GET", "/estatisticas?id_disciplina=2")
+        self.assertEqual(status, 200)
+
+    def test_erros_de_rota_e_de_dados(self):
+        casos = [
+            ("GET", "/inexistente", None, 404),
+            ("POST", "/tarefas/1/concluir", None, 404),
+            ("PUT", "/tarefas/999/concluir", None, 404),
+            ("POST", "/tarefas", b"{nao e json", 400),
+            ("POST", "/tarefas/lote", {"titulo": "objeto"}, 400),
+            ("GET", "/tarefas?limite=0", None, 400),
+            ("POST", "/tarefas", {"titulo": "Sem disciplina"}, 400),
+        ]
+        for metodo, caminho, corpo, esperado in casos:
+            with self.subTest(metodo=metodo, caminho=caminho):
+                self.assertEqual(self.requisitar(metodo, caminho, corpo)[0], esperado)
+
+    def test_limites_do_corpo(self):
+        casos = [
+            ({"Content-Length": "-1"}, 400),
+            ({"Content-Length": str(ManipuladorTarefas.TAMANHO_MAXIMO_CORPO + 1)}, 413),
+            ({"Transfer-Encoding": "chunked"}, 411),
+        ]
+        for cabecalhos, esperado in casos:
+            with self.subTest(**cabecalhos):
+                # Corpo recusado sem leitura: o servidor fecha a conexão
+                conexao = http.client.HTTPConnection(*self.servidor.server_address, timeout=5)
+                conexao.putrequest("POST", "/tarefas")
+                for nome, valor in cabecalhos.items():
+                    conexao.putheader(nome, valor)
+                conexao.endheaders()
+                resposta = conexao.getresponse()
+                self.assertEqual(resposta.status, esperado)
+                self.assertIn("erro", json.loads(resposta.read()))
+                conexao.close()
+
+    def test_metricas(self):
+        self.conexao.request("GET", "/metrics")
+        resposta = self.conexao.getresponse()
+        self.assertEqual(resposta.status, 200)
+        self.assertTrue(resposta.getheader("Content-Type").startswith("text/plain"))
+        resposta.read()
+
+
+if __name__ == "__main__":
+    unittest.main()
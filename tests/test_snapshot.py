@@ -0,0 +1,117 @@
+"""Snapshot atômico: backups girados, verificação no .meta e queda no meio da troca.
+
+Rodar da raiz do repositório: python -m unittest discover -s tests
+"""
+
+from contextlib import redirect_stdout
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import DB  # noqa: E402
+from DB import BancoDeDados  # noqa: E402
+from carregador import ler_linhas, verificar_arquivo  # noqa: E402
+from test_journal import nova_tarefa  # noqa: E402
+
+
+class TesteSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.caminho = os.path.join(self.diretorio.name, "t.csv")
+        # Geração k: tarefas 1..k no snapshot
+        self.db = BancoDeDados(caminho=self.caminho)
+        for id_tarefa in range(1, 6):
+            self.db.salvar_tarefa(nova_tarefa(id_tarefa))
+            self.db.compactar()
+
+    def tearDown(self):
+        self.db.fechar()
+        self.diretorio.cleanup()
+
+    def reabrir(self) -> str:
+        """Reabre o banco e retorna os avisos impressos na carga."""
+        self.db.fechar()
+        saida = io.StringIO()
+        with redirect_stdout(saida):
+            self.db = BancoDeDados(caminho=self.caminho)
+        return saida.getvalue()
+
+    def ids_no_arquivo(self, caminho: str) -> list:
+        return sorted(int(linha["id"]) for _, linha in ler_linhas(caminho))
+
+    def meta(self) -> dict:
+        with open(self.caminho + ".meta", mode="r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_backups_girados(self):
+        self.assertEqual(self.db.BACKUPS, 3)
+        # .1 é a geração anterior, .3 a mais antiga mantida; a 1ª já saiu
+        for geracao, tamanho in ((1, 4), (2, 3), (3, 2)):
+            with self.subTest(geracao=geracao):
+                caminho = f"{self.caminho}.{geracao}"
+                self.assertEqual(self.ids_no_arquivo(caminho), list(range(1, tamanho + 1)))
+        self.assertFalse(os.path.exists(self.caminho + ".4"))
+        self.assertFalse(os.path.exists(self.caminho + ".tmp"))
+        self.assertFalse(os.path.exists(self.caminho + ".journal"))
+
+        # O .meta traz a verificação de cada arquivo, na mesma ordem
+        arquivos = [self.caminho] + [f"{self.caminho}.{geracao}" for geracao in (1, 2, 3)]
+        self.assertEqual(self.meta()["snapshots"], [verificar_arquivo(a) for a in arquivos])
+        self.assertEqual(self.meta()["proximo_id"], 6)
+
+    def test_snapshot_truncado_carrega_o_backup(self):
+        with open(self.caminho, mode="r+b") as f:
+            f.truncate(os.path.getsize(self.caminho) // 2)
+        avisos = self.reabrir()
+        self.assertIn("Carregando o backup " + self.caminho + ".1", avisos)
+        self.assertEqual(sorted(self.db.listar_tarefas()), [1, 2, 3, 4])
+        # O high-water mark do .meta vale mesmo com o snapshot antigo
+        self.assertEqual(self.db.proximo_id(), 6)
+
+    def test_queda_entre_o_meta_e_o_rename(self):
+        self.db.salvar_tarefa(nova_tarefa(6))
+        replace = os.replace
+
+        def cair_no_rename(origem, destino):
+            if destino == self.caminho:
+                raise OSError("queda simulada")
+            replace(origem, destino)
+
+        with mock.patch.object(DB.os, "replace", side_effect=cair_no_rename):
+            with self.assertRaises(OSError):
+                self.db.compactar()
+        # O .meta já descreve o snapshot novo; o CSV continua o anterior
+        self.assertFalse(os.path.exists(self.caminho + ".tmp"))
+        self.assertEqual(self.ids_no_arquivo(self.caminho), [1, 2, 3, 4, 5])
+        self.assertEqual(self.meta()["snapshots"][1], verificar_arquivo(self.caminho))
+
+        # O CSV é aceito com a verificação da geração anterior; o journal completa
+        avisos = self.reabrir()
+        self.assertNotIn("AVISO", avisos)
+        self.assertEqual(sorted(self.db.listar_tarefas()), [1, 2, 3, 4, 5, 6])
+
+    def test_falha_ao_gravar_preserva_snapshot_e_journal(self):
+        self.db.salvar_tarefa(nova_tarefa(6))
+        antes = verificar_arquivo(self.caminho)
+        with mock.patch.object(
+            BancoDeDados, "linha_de_tarefa", side_effect=ValueError("disco cheio")
+        ):
+            with self.assertRaises(ValueError):
+                self.db.compactar()
+        self.assertEqual(verificar_arquivo(self.caminho), antes)
+        self.assertFalse(os.path.exists(self.caminho + ".tmp"))
+        self.assertTrue(os.path.getsize(self.caminho + ".journal"))
+        self.assertEqual(self.ids_no_arquivo(self.caminho + ".1"), [1, 2, 3, 4])
+
+        self.assertEqual(self.reabrir(), "")
+        self.assertEqual(sorted(self.db.listar_tarefas()), [1, 2, 3, 4, 5, 6])
+
+
+if __name__ == "__main__":
+    unittest.main()
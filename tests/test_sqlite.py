@@ -0,0 +1,188 @@
+"""Backend SQLite: mesmos cenários do BancoDeDados (CSV), mesmos resultados.
+
+Rodar da raiz do repositório: python -m unittest discover -s tests
+"""
+
+from contextlib import redirect_stdout
+from datetime import timedelta
+import io
+import os
+import random
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from DB import BancoDeDados  # noqa: E402
+from bancoSQLite import BancoDeDadosSQLite  # noqa: E402
+from classes import Status, Tipo  # noqa: E402
+from tarefaModel import TarefaModel  # noqa: E402
+from test_indices import INICIO  # noqa: E402
+from test_particionado import tarefas_com_texto  # noqa: E402
+
+
+class TesteSQLiteIgualAoCSV(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.caminho_csv = os.path.join(self.diretorio.name, "t.csv")
+        self.caminho_sqlite = os.path.join(self.diretorio.name, "t.db")
+        # Cópias independentes das mesmas tarefas em cada backend
+        self.csv = BancoDeDados(caminho=self.caminho_csv)
+        self.csv.salvar_tarefas(tarefas_com_texto(300))
+        self.sqlite = BancoDeDadosSQLite(self.caminho_sqlite)
+        self.sqlite.salvar_tarefas(tarefas_com_texto(300))
+
+    def tearDown(self):
+        self.csv.fechar()
+        self.sqlite.fechar()
+        self.diretorio.cleanup()
+
+    def bancos(self) -> tuple:
+        return self.csv, self.sqlite
+
+    def reabrir(self) -> None:
+        self.csv.fechar()
+        self.sqlite.fechar()
+        self.csv = BancoDeDados(caminho=self.caminho_csv)
+        self.sqlite = BancoDeDadosSQLite(self.caminho_sqlite)
+
+    def assertRelatorioIgual(self, obtido: dict, esperado: dict) -> None:
+        for campo in ("total", "por_status", "por_tipo", "taxa_conclusao"):
+            self.assertEqual(obtido[campo], esperado[campo], campo)
+        self.assertEqual(obtido["notas"].keys(), esperado["notas"].keys())
+        for disciplina, resumo in esperado["notas"].items():
+            for campo, valor in resumo.items():
+                if isinstance(valor, float):
+                    self.assertAlmostEqual(obtido["notas"][disciplina][campo], valor, places=6)
+                else:
+                    self.assertEqual(obtido["notas"][disciplina][campo], valor, campo)
+
+    def conferir(self) -> None:
+        meio = INICIO + timedelta(hours=100)
+        filtros = [
+            {},
+            {"status": [Status.PENDENTE, Status.EM_ANDAMENTO]},
+            {"tipo": [Tipo.PROVA], "inicio": meio},
+            {"id_disciplina": 2, "fim": meio},
+        ]
+        for filtro in filtros:
+            for ordenar_por in ("id", "data_entrega"):
+                for decrescente in (False, True):
+                    for offset, limite in ((0, 10), (37, 25), (290, 20), (0, None)):
+                        with self.subTest(
+                            filtro=str(filtro),
+                            ordenar_por=ordenar_por,
+                            decrescente=decrescente,
+                            offset=offset,
+                            limite=limite,
+                        ):
+                            parametros = dict(
+                                offset=offset,
+                                limite=limite,
+                                ordenar_por=ordenar_por,
+                                decrescente=decrescente,
+                                **filtro,
+                            )
+                            esperado, total_esperado = self.csv.paginar_tarefas(**parametros)
+                            obtido, total = self.sqlite.paginar_tarefas(**parametros)
+                            self.assertEqual(
+                                [t.para_dict() for t in obtido], [t.para_dict() for t in esperado]
+                            )
+                            self.assertEqual(total, total_esperado)
+
+        for tipo in (None, Tipo.TRABALHO):
+            with self.subTest(prazos=tipo):
+                parametros = dict(fim=meio, tipo=tipo, limite=15)
+                obtido, total = self.sqlite.consultar_prazos(**parametros)
+                esperado, total_esperado = self.csv.consultar_prazos(**parametros)
+                self.assertEqual([t.id for t in obtido], [t.id for t in esperado])
+                self.assertEqual(total, total_esperado)
+
+        for id_disciplina in (None, 1, 3, 99):
+            with self.subTest(estatisticas=id_disciplina):
+                self.assertRelatorioIgual(
+                    self.sqlite.consultar_estatisticas(id_disciplina),
+                    self.csv.consultar_estatisticas(id_disciplina),
+                )
+
+        for consulta in ("prova", "matematica revisao", "pro*", "re* algebra", "xyz"):
+            with self.subTest(consulta=consulta):
+                # bm25 e o idf do IndiceBusca pontuam diferente: compara o conjunto encontrado
+                self.assertEqual(
+                    {t.id for t, _ in self.sqlite.pesquisar_texto(consulta, 1000)},
+                    {t.id for t, _ in self.csv.pesquisar_texto(consulta, 1000)},
+                )
+
+    def test_consultas_iguais(self):
+        self.conferir()
+
+    def test_conclusoes_e_notas_pelo_model(self):
+        for banco in self.bancos():
+            # Mesmas operações nos dois: sorteios com as mesmas sementes
+            sorteio = random.Random(8)
+            model = TarefaModel(banco)
+            ids = sorteio.sample(range(1, 320), 60)  # inclui IDs inexistentes
+            resultado = model.concluir_tarefas(ids=ids)
+            self.assertEqual(resultado["status_code"], 207)
+            for id_tarefa in sorteio.sample(range(1, 301), 120):
+                nota = round(sorteio.uniform(0, 10), 1)
+                self.assertEqual(model.registrar_nota(id_tarefa, nota)["status_code"], 200)
+            # Corrige notas já dadas: o Welford remove a contribuição anterior
+            for id_tarefa in sorteio.sample(range(1, 301), 40):
+                model.registrar_nota(id_tarefa, None)
+            model.agendador.parar()
+            model.cancelamentos.parar()
+        self.conferir()
+        self.reabrir()
+        self.conferir()
+
+    def test_reabrir_mantem_ids_reservados(self):
+        reservados = [banco.reservar_ids(10) for banco in self.bancos()]
+        self.assertTrue(all(bloco.start > 300 for bloco in reservados))
+        self.reabrir()
+        for banco, bloco in zip(self.bancos(), reservados):
+            with self.subTest(banco=type(banco).__name__):
+                # Reservados antes de fechar não voltam a ser entregues
+                self.assertGreaterEqual(banco.proximo_id(), bloco.stop)
+                self.assertEqual(len(banco.listar_tarefas()), 300)
+        self.conferir()
+
+    def test_leitura_nao_espera_transacao_aberta(self):
+        # WAL: leitores (pool de conexões) veem o último commit durante uma escrita
+        self.assertEqual(
+            self.sqlite._conexao.execute("PRAGMA journal_mode").fetchone()[0], "wal"
+        )
+        antes = self.sqlite.buscar_tarefa(1).titulo
+        with self.sqlite._transacao() as c:
+            c.execute("UPDATE tarefas SET titulo = 'alterado' WHERE id = 1")
+            self.assertEqual(self.sqlite.buscar_tarefa(1).titulo, antes)
+        self.assertEqual(self.sqlite.buscar_tarefa(1).titulo, "alterado")
+        self.assertEqual({t.id for t, _ in self.sqlite.pesquisar_texto("alterado")}, {1})
+
+    def test_exportar_e_importar_csv(self):
+        exportado = os.path.join(self.diretorio.name, "exportado.csv")
+        self.assertEqual(self.sqlite.exportar_csv(exportado), 300)
+        # O CSV exportado abre como snapshot do BancoDeDados
+        lido = BancoDeDados(caminho=exportado)
+        self.addCleanup(lido.fechar)
+        self.assertEqual(
+            [t.para_dict() for t in lido.listar_tarefas().values()],
+            [t.para_dict() for t in self.csv.listar_tarefas().values()],
+        )
+
+        # E o snapshot do BancoDeDados importa num SQLite vazio (upsert)
+        self.csv.compactar()
+        novo = BancoDeDadosSQLite(os.path.join(self.diretorio.name, "novo.db"))
+        self.addCleanup(novo.fechar)
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual(novo.importar_csv(self.caminho_csv), 300)
+            self.assertEqual(novo.importar_csv(self.caminho_csv), 300)  # de novo: substitui
+        self.assertGreater(novo.proximo_id(), 300)
+        self.sqlite.fechar()
+        self.sqlite = novo
+        self.conferir()
+
+
+if __name__ == "__main__":
+    unittest.main()